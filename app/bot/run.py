@@ -200,18 +200,21 @@ class Bot:
         ╚══════════════════════════════════════════════════════════════╝
         """)
         
-        while True:
-            time.sleep(Bot.SLEEP)
-            try:
-                self.process_candles(self.candle_manager.update_timings())
-            except KeyboardInterrupt:
-                print("\n\n Bot stopped by user")
-                self.log_to_main("Bot stopped by user")
-                break
-            except Exception as error:
-                self.log_to_error(f"CRASH: {error}")
-                print(f"Bot crashed: {error}")
-                break
+        try:
+            while True:
+                time.sleep(Bot.SLEEP)
+                try:
+                    self.process_candles(self.candle_manager.update_timings())
+                except KeyboardInterrupt:
+                    print("\n\n Bot stopped by user")
+                    self.log_to_main("Bot stopped by user")
+                    break
+                except Exception as error:
+                    self.log_to_error(f"CRASH: {error}")
+                    print(f"Bot crashed: {error}")
+                    break
+        finally:
+            self.api.close()
 
 
 if __name__ == "__main__":
@@ -60,6 +60,11 @@ const endPoints = {
     options: () => requests.get("/options"),
     technicals: (p, g) => requests.get(`/technicals/${p}/${g}`),
     prices: (p, g, c) => requests.get(`/prices/${p}/${g}/${c}`),
+    indicator: (p, g, c, id, params = {}) => {
+        const queryParams = new URLSearchParams(params);
+        const query = queryParams.toString() ? `?${queryParams.toString()}` : '';
+        return requests.get(`/indicators/${p}/${g}/${c}/${id}${query}`);
+    },
     spread: (pair) => requests.get(`/spread/${pair}`),
     spreads: (pairs) => requests.get(`/spreads?pairs=${pairs.join(',')}`),
     openTrades: () => requests.get("/trades/open"),
@@ -106,12 +111,20 @@ const endPoints = {
     saveBacktest: (backtest) => requests.post("/backtests", { backtest }),
     listBacktests: () => requests.get("/backtests"),
     getBacktest: (id) => requests.get(`/backtests/${id}`),
+    // One page of the full trade ledger; pass the previous page's next_cursor as params.cursor
+    getBacktestTrades: (id, params = {}) =>
+        requests.get(`/backtests/${id}/trades?${new URLSearchParams(params)}`),
+    getBacktestSeries: (id, params = {}) =>
+        requests.get(`/backtests/${id}/series?${new URLSearchParams(params)}`),
     deleteBacktest: (id) => requests.delete(`/backtests/${id}`),
     duplicateBacktest: (id) => requests.post(`/backtests/${id}/duplicate`),
     // Backtest execution endpoints
     runBacktest: (id, keepPartialOnCancel = false) =>
         requests.post(`/backtests/${id}/run`, { keep_partial_on_cancel: keepPartialOnCancel }),
     getBacktestProgress: (id) => requests.get(`/backtests/${id}/progress`),
+    // Moves the end date forward; a completed run only simulates the new candles
+    extendBacktest: (id, endDate) =>
+        requests.post(`/backtests/${id}/extend`, { end_date: endDate }),
     cancelBacktest: (id, keepPartialResults = false) =>
         requests.post(`/backtests/${id}/cancel`, { keep_partial_results: keepPartialResults }),
     // Backtest notes and export endpoints
@@ -360,6 +360,45 @@ export function calculateTotalPages(totalTrades, pageSize) {
   return Math.ceil(totalTrades / pageSize);
 }
 
+/**
+ * Trade list columns the /backtests/{id}/trades endpoint can sort by,
+ * mapped to its sort_by values. 'number' is trade order (exit time).
+ */
+export const SERVER_SORT_FIELDS = {
+  number: 'exit_time',
+  entry_date: 'entry_time',
+  exit_date: 'exit_time',
+  pnl: 'pnl',
+  duration: 'duration',
+};
+
+/**
+ * Build query params for one page of the backtest trade ledger
+ * @param {Object} filters - Trade list filters (see filterTrades)
+ * @param {string} sortColumn - Trade list column (see SERVER_SORT_FIELDS)
+ * @param {string} sortDirection - 'asc' | 'desc'
+ * @param {number} limit - Trades per page
+ * @returns {Object} Query params for endPoints.getBacktestTrades
+ */
+export function buildTradePageParams(filters = {}, sortColumn, sortDirection = 'asc', limit = 50) {
+  const params = {
+    sort_by: SERVER_SORT_FIELDS[sortColumn] || 'exit_time',
+    descending: sortDirection === 'desc',
+    limit,
+  };
+
+  if (filters.outcome === 'winners') params.outcome = 'win';
+  if (filters.outcome === 'losers') params.outcome = 'loss';
+  if (filters.direction === 'long' || filters.direction === 'short') {
+    params.side = filters.direction;
+  }
+  // The server filters by exit time; the end date covers its whole day
+  if (filters.startDate) params.start = `${filters.startDate}T00:00:00`;
+  if (filters.endDate) params.end = `${filters.endDate}T23:59:59`;
+
+  return params;
+}
+
 /**
  * Find the closest time index in chart data for a target timestamp
  * Used to map trade timestamps to chart candle indices for marker placement
@@ -21,6 +21,7 @@ import BacktestNotesEditor from './BacktestNotesEditor';
 import BacktestExportDialog from './BacktestExportDialog';
 import PerformanceByTimePeriod from './PerformanceByTimePeriod';
 import RiskAnalytics from './RiskAnalytics';
+import { useBacktestTrades } from '../hooks/useBacktestTrades';
 import {
   METRIC_DEFINITIONS,
   getMetricTrend,
@@ -30,6 +31,7 @@ import {
   filterTrades,
   sortTrades,
   exportTradesToCSV,
+  SERVER_SORT_FIELDS,
 } from '../app/tradeUtils';
 
 /**
@@ -78,6 +80,17 @@ function BacktestResultsSummary({
   const [selectedTradeId, setSelectedTradeId] = useState(null);
   const [highlightedTrade, setHighlightedTrade] = useState(null);
 
+  // Saved backtests page through their full trade ledger; results only keep the last 100 trades
+  const ledgerBacktestId = backtest?.id && results && !results.partial ? backtest.id : null;
+  const ledgerTrades = useBacktestTrades(isTradeListExpanded ? ledgerBacktestId : null, {
+    filters,
+    sortColumn,
+    sortDirection,
+    page: currentPage,
+    pageSize,
+  });
+  const useLedger = Boolean(ledgerBacktestId) && !ledgerTrades.error;
+
   // Handle missing or incomplete results
   if (!results) {
     return null;
@@ -93,6 +106,7 @@ function BacktestResultsSummary({
   const filteredTrades = filterTrades(allTrades, filters);
   const sortedTrades = sortTrades(filteredTrades, sortColumn, sortDirection);
   const displayedTrades = sortedTrades; // Pagination happens in BacktestTradeList
+  const tradeCount = useLedger ? (results.total_trades ?? allTrades.length) : allTrades.length;
 
   // Handle trade list interactions
   const handleFilterChange = (newFilters) => {
@@ -103,6 +117,7 @@ function BacktestResultsSummary({
   const handleSort = (column, direction) => {
     setSortColumn(column);
     setSortDirection(direction);
+    setCurrentPage(1); // Ledger pages restart in the new order
   };
 
   const handlePageChange = (page) => {
@@ -504,7 +519,7 @@ function BacktestResultsSummary({
           )}
 
           {/* Trade List Section */}
-          {allTrades.length > 0 && (
+          {tradeCount > 0 && (
             <div
               ref={tradeListRef}
               className="bg-white border border-neutral-200 rounded-md"
@@ -520,9 +535,9 @@ function BacktestResultsSummary({
                     Trade List
                   </h4>
                   <span className="px-2 py-0.5 text-xs font-semibold rounded-full bg-primary text-white">
-                    {allTrades.length}
+                    {tradeCount}
                   </span>
-                  {allTrades.length >= 100 && (
+                  {!useLedger && allTrades.length >= 100 && (
                     <span className="text-xs text-warning">
                       (Last 100 trades)
                     </span>
@@ -561,7 +576,14 @@ function BacktestResultsSummary({
 
                   {/* Trade Table */}
                   <BacktestTradeList
-                    trades={displayedTrades}
+                    {...(useLedger
+                      ? {
+                          trades: ledgerTrades.trades,
+                          totalCount: ledgerTrades.matched ?? 0,
+                          loading: ledgerTrades.loading || ledgerTrades.matched === null,
+                          sortableColumns: Object.keys(SERVER_SORT_FIELDS),
+                        }
+                      : { trades: displayedTrades })}
                     onTradeClick={handleTradeClick}
                     selectedTradeId={selectedTradeId}
                     sortColumn={sortColumn}
@@ -26,6 +26,12 @@ import {
  * - Trade details formatting
  * - Pagination controls
  * - Empty state handling
+ *
+ * By default `trades` holds every trade and pages are sliced locally. When
+ * `totalCount` is given, `trades` is the current page already fetched from
+ * the server (see useBacktestTrades) and `totalCount` the number of trades
+ * across all pages; `sortableColumns` then limits sorting to the columns
+ * the server can sort by.
  */
 function BacktestTradeList({
   trades = [],
@@ -39,6 +45,9 @@ function BacktestTradeList({
   onPageChange,
   onPageSizeChange,
   currency = '$',
+  totalCount = null,
+  loading = false,
+  sortableColumns = null,
 }) {
   // Format date for display
   const formatDate = (dateString) => {
@@ -89,6 +98,7 @@ function BacktestTradeList({
 
   // Handle column sort
   const handleSort = (column) => {
+    if (sortableColumns && !sortableColumns.includes(column)) return;
     if (sortColumn === column) {
       // Toggle direction
       onSort(column, sortDirection === 'asc' ? 'desc' : 'asc');
@@ -109,10 +119,28 @@ function BacktestTradeList({
   };
 
   // Calculate pagination values
-  const totalPages = calculateTotalPages(trades.length, pageSize);
-  const startIndex = (currentPage - 1) * pageSize;
-  const endIndex = pageSize === 0 ? trades.length : Math.min(startIndex + pageSize, trades.length);
-  const visibleTrades = pageSize === 0 ? trades : trades.slice(startIndex, endIndex);
+  const isServerPaged = totalCount !== null;
+  const total = isServerPaged ? totalCount : trades.length;
+  const totalPages = calculateTotalPages(total, pageSize);
+  const startIndex = pageSize === 0 ? 0 : (currentPage - 1) * pageSize;
+  let endIndex;
+  let visibleTrades;
+  if (isServerPaged) {
+    endIndex = startIndex + trades.length;
+    visibleTrades = trades;
+  } else {
+    endIndex = pageSize === 0 ? trades.length : Math.min(startIndex + pageSize, trades.length);
+    visibleTrades = pageSize === 0 ? trades : trades.slice(startIndex, endIndex);
+  }
+
+  // Loading state (first page of a server-paged list)
+  if (loading && (!trades || trades.length === 0)) {
+    return (
+      <div className="flex items-center justify-center py-8 text-sm text-neutral-500">
+        Loading trades...
+      </div>
+    );
+  }
 
   // Empty state
   if (!trades || trades.length === 0) {
@@ -134,7 +162,8 @@ function BacktestTradeList({
       {/* Pagination Info & Controls (Top) */}
       <div className="flex items-center justify-between text-sm">
         <span className="text-neutral-600">
-          Showing {startIndex + 1}-{endIndex} of {trades.length} trades
+          Showing {startIndex + 1}-{endIndex} of {total} trades
+          {loading && <span className="ml-2 text-neutral-400">Loading...</span>}
         </span>
 
         {/* Page Size Selector */}
@@ -0,0 +1,95 @@
+import { useState, useEffect, useRef } from 'react';
+import endPoints from '../app/api';
+import { buildTradePageParams } from '../app/tradeUtils';
+
+// Largest page the trades endpoint serves; used to stream the "All" view
+const MAX_PAGE_SIZE = 1000;
+
+/**
+ * Custom hook for paging through the full trade ledger of a backtest
+ *
+ * Pages come from /backtests/{id}/trades with cursor pagination, so a page
+ * is reached by following the cursors of the pages before it. Fetched pages
+ * are kept until the filters, sort or page size change, so moving back and
+ * forth costs no requests. With pageSize 0 ("All") every page is fetched
+ * and the trades are shown as they arrive.
+ *
+ * @param {string} backtestId - Backtest ID (null disables fetching)
+ * @param {Object} options - filters, sortColumn, sortDirection, page (1-based) and pageSize
+ */
+export function useBacktestTrades(
+  backtestId,
+  { filters = {}, sortColumn = null, sortDirection = 'asc', page = 1, pageSize = 50 } = {}
+) {
+  const [trades, setTrades] = useState([]);
+  const [matched, setMatched] = useState(null);
+  const [totalTrades, setTotalTrades] = useState(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(null);
+
+  // Pages fetched for the current query and the cursor of the next one
+  const ledger = useRef({ key: null, pages: [], nextCursor: null, done: false });
+
+  const limit = pageSize === 0 ? MAX_PAGE_SIZE : pageSize;
+  const queryKey = JSON.stringify([backtestId, filters, sortColumn, sortDirection, limit]);
+
+  useEffect(() => {
+    if (!backtestId) return undefined;
+
+    let cancelled = false;
+    if (ledger.current.key !== queryKey) {
+      ledger.current = { key: queryKey, pages: [], nextCursor: null, done: false };
+    }
+    const state = ledger.current;
+    const params = buildTradePageParams(filters, sortColumn, sortDirection, limit);
+    const pagesWanted = pageSize === 0 ? Infinity : page;
+
+    const show = () => {
+      setTrades(pageSize === 0 ? state.pages.flat() : state.pages[page - 1] || []);
+    };
+
+    const load = async () => {
+      setLoading(true);
+      setError(null);
+      try {
+        while (state.pages.length < pagesWanted && !state.done) {
+          const query = state.nextCursor ? { ...params, cursor: state.nextCursor } : params;
+          const data = await endPoints.getBacktestTrades(backtestId, query);
+          if (cancelled) return;
+
+          state.pages.push(data.trades || []);
+          state.nextCursor = data.next_cursor;
+          state.done = !data.next_cursor;
+          setMatched(data.matched);
+          setTotalTrades(data.total_trades);
+          if (pageSize === 0) show();
+        }
+        show();
+      } catch (err) {
+        if (!cancelled) {
+          console.error('Error fetching backtest trades:', err);
+          setError(err);
+        }
+      } finally {
+        if (!cancelled) setLoading(false);
+      }
+    };
+
+    load();
+    return () => {
+      cancelled = true;
+    };
+    // queryKey covers the filters, sort and page size
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [queryKey, page]);
+
+  return {
+    trades,
+    matched,
+    totalTrades,
+    loading,
+    error,
+  };
+}
+
+export default useBacktestTrades;
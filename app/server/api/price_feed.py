@@ -11,7 +11,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from config import settings
-from core.openfx_api import OpenFxApi
+from core.async_openfx_api import AsyncOpenFxApi
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +38,13 @@ class BatchSpreadsResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error message if fetch failed")
 
 
-def fetch_batch_spreads(pairs: List[str], api: OpenFxApi) -> BatchSpreadsResponse:
+async def fetch_batch_spreads(pairs: List[str], api: AsyncOpenFxApi) -> BatchSpreadsResponse:
     """
     Fetch spread data for multiple pairs in a batch.
 
     Args:
         pairs: List of currency pair symbols (e.g., ['EUR_USD', 'GBP_USD'])
-        api: OpenFxApi instance
+        api: AsyncOpenFxApi instance
 
     Returns:
         BatchSpreadsResponse with spread data for all requested pairs
@@ -68,7 +68,7 @@ def fetch_batch_spreads(pairs: List[str], api: OpenFxApi) -> BatchSpreadsRespons
 
     try:
         # Fetch all prices in a single API call
-        prices = api.get_prices(symbols)
+        prices = await api.get_prices(symbols)
 
         if prices is None:
             logger.warning("[WARNING] Could not fetch prices from API")
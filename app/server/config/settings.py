@@ -36,6 +36,31 @@ SECURE_HEADER = {
     "Accept": "application/json",
 }
 
+# Directory of the broker rate limit state shared by the server and bot processes, created
+# private to their user (empty limits each process on its own)
+OPENFX_RATE_LIMIT_DIR = os.getenv(
+    "OPENFX_RATE_LIMIT_DIR", str(Path(__file__).resolve().parent.parent / "data" / "rate-limits")
+)
+
+# Sustained market data and read requests per second (quote history, ticks, symbols,
+# account, open trades and trade history)
+OPENFX_MARKET_DATA_REQUESTS_PER_SECOND = float(
+    os.getenv("OPENFX_MARKET_DATA_REQUESTS_PER_SECOND", 3.0)
+)
+
+# Market data requests allowed at once after an idle period (e.g. bid and ask bars together)
+OPENFX_MARKET_DATA_BURST = int(os.getenv("OPENFX_MARKET_DATA_BURST", 4))
+
+# Sustained order requests per second (placing, changing and closing trades)
+OPENFX_TRADING_REQUESTS_PER_SECOND = float(os.getenv("OPENFX_TRADING_REQUESTS_PER_SECOND", 2.0))
+
+# Order requests allowed at once after an idle period
+OPENFX_TRADING_BURST = int(os.getenv("OPENFX_TRADING_BURST", 4))
+
+# Connection pool of the async client used by the API routes
+OPENFX_MAX_CONNECTIONS = int(os.getenv("OPENFX_MAX_CONNECTIONS", 20))
+OPENFX_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENFX_MAX_KEEPALIVE_CONNECTIONS", 10))
+
 # =============================================================================
 # Database Configuration (Supabase)
 # =============================================================================
@@ -127,3 +152,109 @@ USE_MOCK_DATA = os.getenv("USE_MOCK_DATA", "true").lower() == "true"
 
 # CORS Configuration
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
+
+# =============================================================================
+# Candle Store Configuration
+# =============================================================================
+
+# Local directory of stored historical candles (empty disables the candle store)
+CANDLE_STORE_DIR = os.getenv(
+    "CANDLE_STORE_DIR", str(Path(__file__).resolve().parent.parent / "data" / "candles")
+)
+
+# Candles requested per quotehistory call when filling the candle store
+CANDLE_STORE_PAGE_SIZE = int(os.getenv("CANDLE_STORE_PAGE_SIZE", 1000))
+
+# Candle windows of the price endpoints cached until their next candle closes
+PRICE_CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", 128))
+
+# Total size of the cached candle windows (MB); least recently used windows are evicted first
+PRICE_CACHE_MAX_MB = int(os.getenv("PRICE_CACHE_MAX_MB", 32))
+
+# =============================================================================
+# Indicator Engine Configuration
+# =============================================================================
+
+# Maximum number of indicator results kept in the shared LRU cache
+INDICATOR_CACHE_MAX_ENTRIES = int(os.getenv("INDICATOR_CACHE_MAX_ENTRIES", 256))
+
+# Total size of the cached indicator series (MB); least recently used series are evicted first
+INDICATOR_CACHE_MAX_MB = int(os.getenv("INDICATOR_CACHE_MAX_MB", 256))
+
+# =============================================================================
+# Backtest Execution Configuration
+# =============================================================================
+
+# Where backtests run: "thread" (in the API process) or "process" (worker pool)
+BACKTEST_EXECUTION_BACKEND = os.getenv("BACKTEST_EXECUTION_BACKEND", "thread").lower()
+
+# Number of worker processes for the "process" backend
+BACKTEST_WORKER_PROCESSES = int(os.getenv("BACKTEST_WORKER_PROCESSES", os.cpu_count() or 2))
+
+# Maximum number of backtests running at once; further runs wait in the queue
+BACKTEST_MAX_CONCURRENT = int(os.getenv("BACKTEST_MAX_CONCURRENT", BACKTEST_WORKER_PROCESSES))
+
+# Maximum number of backtests waiting in the queue
+BACKTEST_MAX_QUEUED = int(os.getenv("BACKTEST_MAX_QUEUED", 100))
+
+# Estimated memory the running backtests may use together (MB)
+BACKTEST_MEMORY_BUDGET_MB = int(os.getenv("BACKTEST_MEMORY_BUDGET_MB", 1024))
+
+# Minimum time between two progress writes of one backtest (ms); updates in between are merged
+PROGRESS_PUBLISH_INTERVAL_MS = int(os.getenv("PROGRESS_PUBLISH_INTERVAL_MS", 500))
+
+# Points kept in the per-candle series of saved results (full resolution is stored separately)
+RESULT_SERIES_MAX_POINTS = int(os.getenv("RESULT_SERIES_MAX_POINTS", 2000))
+
+# Finished runs reused for identical backtests (0 entries disables the result cache)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 64))
+
+# Total size of the cached runs (MB); least recently used runs are evicted first
+RESULT_CACHE_MAX_MB = int(os.getenv("RESULT_CACHE_MAX_MB", 256))
+
+# Local directory for engine checkpoints of running backtests, created private to the
+# server's user (empty disables checkpoints)
+BACKTEST_CHECKPOINT_DIR = os.getenv(
+    "BACKTEST_CHECKPOINT_DIR", str(Path(__file__).resolve().parent.parent / "data" / "checkpoints")
+)
+
+# Minimum time between two checkpoints of one run (seconds)
+BACKTEST_CHECKPOINT_INTERVAL_SECONDS = float(os.getenv("BACKTEST_CHECKPOINT_INTERVAL_SECONDS", 30))
+
+# Checkpoints of runs that were never resumed are deleted after this many hours
+BACKTEST_CHECKPOINT_MAX_AGE_HOURS = float(os.getenv("BACKTEST_CHECKPOINT_MAX_AGE_HOURS", 72))
+
+# Final engine states of completed runs (used to extend them) are deleted after this many days
+BACKTEST_FINAL_STATE_MAX_AGE_DAYS = float(os.getenv("BACKTEST_FINAL_STATE_MAX_AGE_DAYS", 30))
+
+# Maximum number of parameter combinations in one sweep
+SWEEP_MAX_COMBINATIONS = int(os.getenv("SWEEP_MAX_COMBINATIONS", 500))
+
+# Threads running the combinations of a sweep
+SWEEP_WORKERS = int(os.getenv("SWEEP_WORKERS", os.cpu_count() or 2))
+
+# =============================================================================
+# Monte Carlo Configuration
+# =============================================================================
+
+# Seed for risk of ruin simulations; set it for reproducible results
+MONTE_CARLO_SEED = int(os.getenv("MONTE_CARLO_SEED")) if os.getenv("MONTE_CARLO_SEED") else None
+
+# Paths simulated before the risk of ruin estimate may stop early
+MONTE_CARLO_MIN_SIMULATIONS = int(os.getenv("MONTE_CARLO_MIN_SIMULATIONS", 1000))
+
+# Stop once the 95% confidence half-width of risk of ruin is within this many points
+MONTE_CARLO_TOLERANCE = float(os.getenv("MONTE_CARLO_TOLERANCE", 0.5))
+
+# Memory budget of one batch of simulated equity paths (bytes)
+MONTE_CARLO_CHUNK_BYTES = int(os.getenv("MONTE_CARLO_CHUNK_BYTES", 32 * 1024 * 1024))
+
+# =============================================================================
+# Backtest Comparison Configuration
+# =============================================================================
+
+# Permutations drawn per statistical significance test
+COMPARISON_PERMUTATIONS = int(os.getenv("COMPARISON_PERMUTATIONS", 1000))
+
+# Maximum number of backtest sets whose significance tests stay cached
+COMPARISON_CACHE_MAX_ENTRIES = int(os.getenv("COMPARISON_CACHE_MAX_ENTRIES", 128))
@@ -7,6 +7,7 @@ from .data_models import (
     HeadlineItem,
     HeadlinesResponse,
     HealthCheckResponse,
+    IndicatorDataResponse,
     PriceDataResponse,
     TechnicalsResponse,
     TradeRequest,
@@ -32,6 +33,7 @@ __all__ = [
     "TradingOptionsResponse",
     "TechnicalsResponse",
     "PriceDataResponse",
+    "IndicatorDataResponse",
     "TradeRequest",
     "TradeResponse",
     "ErrorResponse",
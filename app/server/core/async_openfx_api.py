@@ -0,0 +1,268 @@
+"""
+Async OpenFX API Client
+=======================
+asyncio-native client for the OpenFX trading API, used by the FastAPI
+routes.
+
+The synchronous OpenFxApi blocks the event loop for a whole round trip
+plus its throttle sleep, so one slow broker call stalls every other
+request. This client instead:
+
+- Keeps a pooled keep-alive ``httpx.AsyncClient`` per event loop
+- Reserves from the shared rate limit budgets on a worker thread (they
+  lock a file) and waits with ``asyncio.sleep``
+- Applies a timeout to every request (overridable per request)
+- Lets cancellation propagate, so a cancelled route also cancels its
+  broker request
+
+Responses are parsed into the same models as OpenFxApi. Candle requests
+go through the candle store and price cache, which do file I/O, so they
+run the synchronous client on a worker thread.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from config import settings
+from core.openfx_api import OpenFxApi, rate_limiter_for, trade_history_request
+from models.api_price import ApiPrice
+from models.open_trade import OpenTrade
+
+logger = logging.getLogger(__name__)
+
+# Default timeouts (seconds), as for the synchronous client
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 10.0
+
+
+class AsyncOpenFxApi:
+    """
+    Async client for the OpenFX trading API.
+
+    Methods mirror OpenFxApi and return the same values, but must be
+    awaited.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[httpx.Timeout] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client; connections are opened on first use.
+
+        Args:
+            timeout: Default timeout of every request
+            transport: HTTP transport (the pooled default if omitted)
+        """
+        self.timeout = timeout or httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=settings.OPENFX_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENFX_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_api: Optional[OpenFxApi] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """The pooled client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=settings.OPENFX_URL,
+                headers=settings.SECURE_HEADER,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        if self._client is not None:
+            client, self._client, self._client_loop = self._client, None, None
+            await client.aclose()
+        if self._sync_api is not None:
+            sync_api, self._sync_api = self._sync_api, None
+            await asyncio.to_thread(sync_api.close)
+
+    async def _throttle(self, url: str, verb: str = "get") -> None:
+        """Wait for the rate limit budget of the call without blocking the event loop."""
+        wait = await asyncio.to_thread(rate_limiter_for(url, verb).reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _make_request(
+        self,
+        url: str,
+        verb: str = "get",
+        code: int = 200,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[bool, Any]:
+        """
+        Make an HTTP request to the API.
+
+        Args:
+            url: API endpoint path
+            verb: HTTP method (get, post, put, delete)
+            code: Expected success status code
+            params: URL parameters
+            data: Request body data
+            headers: Additional headers
+            timeout: Timeout of this request in seconds (client default if omitted)
+
+        Returns:
+            Tuple of (success, response_data)
+        """
+        if verb not in ("get", "post", "put", "delete"):
+            return False, {"error": "verb not found"}
+
+        await self._throttle(url, verb)
+        content = json.dumps(data) if data is not None else None
+
+        try:
+            response = await self._get_client().request(
+                verb.upper(),
+                url,
+                params=params,
+                content=content,
+                headers=headers,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+            if response.status_code == code:
+                return True, response.json()
+            return False, response.json()
+        except Exception as error:
+            return False, {"Exception": str(error)}
+
+    # =========================================================================
+    # Account Operations
+    # =========================================================================
+
+    async def get_account_summary(self) -> Optional[Dict]:
+        """
+        Get account summary information.
+
+        Returns:
+            Account data or None on error
+        """
+        ok, data = await self._make_request("account")
+
+        if ok:
+            return data
+        logger.error(f"get_account_summary(): {data}")
+        return None
+
+    # =========================================================================
+    # Candle/Price Data Operations
+    # =========================================================================
+
+    async def web_api_candles(self, pair_name: str, granularity: str, count: int) -> Dict:
+        """
+        Get candle data formatted for web API response (see OpenFxApi.web_api_candles).
+
+        Runs on a worker thread, as it reads and fills the candle store.
+        """
+        if self._sync_api is None:
+            self._sync_api = OpenFxApi()
+        return await asyncio.to_thread(
+            self._sync_api.web_api_candles, pair_name, granularity, count
+        )
+
+    # =========================================================================
+    # Trading Operations
+    # =========================================================================
+
+    async def get_open_trade(self, trade_id: int) -> Optional[OpenTrade]:
+        """
+        Get an open trade by ID.
+
+        Returns:
+            OpenTrade or None if not found
+        """
+        ok, response = await self._make_request(f"trade/{trade_id}")
+
+        if ok and "Id" in response:
+            return OpenTrade(response)
+        return None
+
+    async def get_open_trades(self) -> Optional[List[OpenTrade]]:
+        """
+        Get all open trades.
+
+        Returns:
+            List of OpenTrade objects or None on error
+        """
+        ok, response = await self._make_request("trade")
+
+        if ok:
+            return [OpenTrade(x) for x in response]
+        return None
+
+    async def get_trade_history(
+        self, timestamp_from: int, timestamp_to: int, request_page_size: int = 1000
+    ) -> Optional[Dict]:
+        """
+        Get account trade history.
+
+        Args:
+            timestamp_from: Start timestamp in milliseconds (Unix time)
+            timestamp_to: End timestamp in milliseconds (Unix time)
+            request_page_size: Maximum number of records to return (default: 1000)
+
+        Returns:
+            Trade history report dictionary or None on error
+        """
+        ok, response = await self._make_request(
+            "tradehistory",
+            verb="post",
+            data=trade_history_request(timestamp_from, timestamp_to, request_page_size),
+        )
+
+        if ok:
+            return response
+        logger.error(f"get_trade_history(): {response}")
+        return None
+
+    async def close_trade(self, trade_id: int) -> bool:
+        """
+        Close an open trade.
+
+        Returns:
+            True on success, False on failure
+        """
+        params = {"trade.type": "Close", "trade.id": trade_id}
+
+        ok, _ = await self._make_request("trade", verb="delete", params=params)
+
+        if ok:
+            logger.info(f"Closed {trade_id} successfully")
+        else:
+            logger.error(f"Failed to close {trade_id}")
+        return ok
+
+    # =========================================================================
+    # Price Operations
+    # =========================================================================
+
+    async def get_prices(self, instruments_list: List[str]) -> Optional[List[ApiPrice]]:
+        """
+        Get current prices for instruments.
+
+        Returns:
+            List of ApiPrice objects or None on error
+        """
+        ok, response = await self._make_request(f"tick/{' '.join(instruments_list)}")
+
+        if ok:
+            return [ApiPrice(x) for x in response]
+        return None
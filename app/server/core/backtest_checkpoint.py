@@ -0,0 +1,331 @@
+"""
+Backtest Checkpoints
+====================
+Engine state of long-running backtests saved to local disk, so a run
+interrupted by a server restart, a crash or a cancellation continues from
+its last checkpoint instead of starting over.
+
+A checkpoint holds the engine state after a number of candles (candle
+cursor, balance, closed trades, equity curve and any open position) plus
+what is needed to rebuild the same run:
+
+- The seed the simulated candles were generated from, so a resumed run
+  sees the same candles
+- The run key (see result_cache.result_cache_key), so a checkpoint is only
+  used while the strategy logic, backtest settings and candle data are
+  unchanged
+
+The live metric accumulator is not stored: it is rebuilt on resume by
+replaying the checkpointed trades, which gives identical values.
+
+A completed run leaves its final engine state in a second store. When the
+backtest's end date is later moved forward, the engine continues from
+that state over the new candles only (see
+BacktestExecutor.extend_backtest), provided the candles up to the old end
+date are unchanged.
+
+Each checkpoint is a JSON file named after its backtest, replaced
+atomically on every save. Checkpoints are only read from a private
+directory (mode 0700) owned by the server's user, and only from regular
+files of that user that no one else can write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import stat
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the engine state layout changes, so older checkpoints are ignored
+CHECKPOINT_VERSION = 2
+
+# Backtest IDs are UUIDs; anything else is never used as a file name
+_BACKTEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+_SUFFIX = ".json"
+
+# Tag of datetimes (open position entry times) in checkpoint files
+_DATETIME_TAG = "__datetime__"
+
+
+def derive_candle_seed(pair: str, timeframe: str, start: int, end: int) -> int:
+    """
+    Seed for the simulated candles of a new run.
+
+    Derived from the market and date range, so identical backtests (e.g. a
+    duplicate) simulate the same candles and share result cache entries.
+    """
+    digest = hashlib.sha256(f"{pair}|{timeframe}|{start}|{end}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+@dataclass
+class EngineState:
+    """
+    Engine state after the candles before ``cursor`` were processed.
+
+    Attributes:
+        cursor: Index of the next candle to process
+        balance: Account balance
+        trades: Closed trades in order
+        winning_trades: Number of closed trades with a profit
+        equity_curve: Equity after each closed trade, starting at the initial balance
+        position: Open position of the loop engine, if any
+        peak_equity: Highest balance so far (live drawdown)
+    """
+
+    cursor: int
+    balance: float
+    trades: List[Dict[str, Any]] = field(default_factory=list)
+    winning_trades: int = 0
+    equity_curve: List[float] = field(default_factory=list)
+    position: Optional[Dict[str, Any]] = None
+    peak_equity: float = 0.0
+
+
+@dataclass
+class BacktestCheckpoint:
+    """Saved state of one backtest run."""
+
+    backtest_id: str
+    run_key: str
+    candle_seed: int
+    state: EngineState
+    # Epoch seconds of the backtest end date (final states of completed runs)
+    end_time: Optional[int] = None
+    saved_at: float = field(default_factory=time.time)
+    version: int = CHECKPOINT_VERSION
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON form of the values json cannot write itself."""
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in a checkpoint")
+
+
+def _decode_object(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and _DATETIME_TAG in value:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def _to_json(checkpoint: BacktestCheckpoint) -> bytes:
+    return json.dumps(asdict(checkpoint), default=_encode_value).encode()
+
+
+def _from_json(data: bytes) -> BacktestCheckpoint:
+    document = json.loads(data, object_hook=_decode_object)
+    state = EngineState(**document.pop("state"))
+    return BacktestCheckpoint(state=state, **document)
+
+
+def _is_private(status: os.stat_result, writable_mask: int) -> bool:
+    """Whether a file is owned by this process's user and not open to others."""
+    if hasattr(os, "getuid") and status.st_uid != os.getuid():
+        return False
+    return not status.st_mode & writable_mask
+
+
+class CheckpointStore:
+    """
+    Directory of backtest checkpoints, one file per backtest.
+
+    Reads never raise: a missing, unreadable or outdated checkpoint is
+    treated as absent so the run simply starts over.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, backtest_id: str) -> Optional[str]:
+        if not _BACKTEST_ID_PATTERN.match(backtest_id):
+            return None
+        return os.path.join(self.directory, backtest_id + _SUFFIX)
+
+    def _private_directory(self, create: bool) -> bool:
+        """
+        Whether the directory is private to this user, creating it (mode 0700) if asked.
+
+        A directory of this user that others can access is made private;
+        one owned by another user is never used.
+        """
+        if create:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        status = os.lstat(self.directory)
+        if not stat.S_ISDIR(status.st_mode) or not _is_private(status, 0):
+            return False
+        if status.st_mode & 0o077:
+            os.chmod(self.directory, 0o700)
+        return True
+
+    def save(self, checkpoint: BacktestCheckpoint) -> bool:
+        """
+        Write a checkpoint, replacing the previous one of its backtest.
+
+        Returns:
+            Whether the checkpoint was written
+        """
+        path = self._path(checkpoint.backtest_id)
+        if path is None:
+            return False
+        try:
+            if not self._private_directory(create=True):
+                raise PermissionError(f"{self.directory} is not a private directory")
+            data = _to_json(checkpoint)
+            # mkstemp creates the file with mode 0600
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(
+                f"[BACKTEST_CHECKPOINT] Could not save checkpoint of "
+                f"{checkpoint.backtest_id}: {e}"
+            )
+            return False
+        return True
+
+    def load(self, backtest_id: str) -> Optional[BacktestCheckpoint]:
+        """Read a backtest's checkpoint, or None if there is no usable one."""
+        path = self._path(backtest_id)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            if not self._private_directory(create=False):
+                raise PermissionError(f"{self.directory} is not a private directory")
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+            with os.fdopen(fd, "rb") as handle:
+                status = os.fstat(handle.fileno())
+                if not stat.S_ISREG(status.st_mode) or not _is_private(status, 0o022):
+                    raise PermissionError(f"{path} is not a private file")
+                checkpoint = _from_json(handle.read())
+        except Exception as e:
+            logger.warning(
+                f"[BACKTEST_CHECKPOINT] Ignoring unreadable checkpoint of {backtest_id}: {e}"
+            )
+            return None
+        if (
+            not isinstance(checkpoint, BacktestCheckpoint)
+            or checkpoint.version != CHECKPOINT_VERSION
+            or checkpoint.backtest_id != backtest_id
+        ):
+            return None
+        return checkpoint
+
+    def discard(self, backtest_id: str) -> None:
+        """Delete a backtest's checkpoint, if any."""
+        path = self._path(backtest_id)
+        if path is None:
+            return
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(
+                f"[BACKTEST_CHECKPOINT] Could not delete checkpoint of {backtest_id}: {e}"
+            )
+
+    def backtest_ids(self) -> List[str]:
+        """IDs of the backtests that have a checkpoint."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(name[: -len(_SUFFIX)] for name in names if name.endswith(_SUFFIX))
+
+    def prune(self, max_age_seconds: float) -> List[str]:
+        """
+        Delete checkpoints not written for longer than ``max_age_seconds``.
+
+        Returns:
+            IDs of the backtests whose checkpoints were deleted
+        """
+        cutoff = time.time() - max_age_seconds
+        pruned = []
+        for backtest_id in self.backtest_ids():
+            try:
+                stale = os.path.getmtime(self._path(backtest_id)) < cutoff
+            except OSError:
+                continue
+            if stale:
+                self.discard(backtest_id)
+                pruned.append(backtest_id)
+        return pruned
+
+
+class RunCheckpointer:
+    """
+    Saves the engine state of one run, at most once per ``interval`` seconds.
+
+    Engines ask ``due()`` at their progress points and call ``save()`` when
+    it is, and once more when they are cancelled. A run that reaches the
+    last candle hands its final state to ``finish()`` instead.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        backtest_id: str,
+        run_key: str,
+        candle_seed: int,
+        interval: float,
+    ):
+        self.store = store
+        self.backtest_id = backtest_id
+        self.run_key = run_key
+        self.candle_seed = candle_seed
+        self.interval = interval
+        self.saves = 0
+        self.final_state: Optional[EngineState] = None
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """Whether the interval since the last save has passed."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state: EngineState) -> bool:
+        """Write a checkpoint of ``state`` now."""
+        self._last_save = time.monotonic()
+        saved = self.store.save(
+            BacktestCheckpoint(
+                backtest_id=self.backtest_id,
+                run_key=self.run_key,
+                candle_seed=self.candle_seed,
+                state=state,
+            )
+        )
+        if saved:
+            self.saves += 1
+        return saved
+
+    def finish(self, state: EngineState) -> None:
+        """Keep the state of a run that reached the last candle."""
+        self.final_state = state
+
+    def final_checkpoint(self, end_time: int) -> Optional[BacktestCheckpoint]:
+        """Checkpoint of the finished run for extending it later, if it finished."""
+        if self.final_state is None:
+            return None
+        return BacktestCheckpoint(
+            backtest_id=self.backtest_id,
+            run_key=self.run_key,
+            candle_seed=self.candle_seed,
+            state=self.final_state,
+            end_time=end_time,
+        )
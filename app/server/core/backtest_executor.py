@@ -6,16 +6,62 @@ Follows the BotController singleton pattern for background execution management.
 """
 
 import logging
-import math
+import os
 import threading
 import time
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from threading import Event, Lock
-from typing import Any, Dict, List, Literal, Optional
-
+from typing import Any, Callable, Dict, List, Literal, Optional, Union
+
+import numpy as np
+
+from config import settings
+from core.backtest_checkpoint import (
+    BacktestCheckpoint,
+    CheckpointStore,
+    EngineState,
+    RunCheckpointer,
+    derive_candle_seed,
+)
+from core.backtest_scheduler import BacktestScheduler, QueuedJob, estimate_job
+from core.backtest_workers import (
+    BacktestProcessPool,
+    ExecutionSnapshot,
+    SharedCancelFlag,
+    wait_for,
+)
+from core.candle_buffer import CandleBuffer, to_epoch_seconds
+from core.condition_compiler import EvaluationPlan, IndicatorValues, compile_strategy
 from core.data_models import BacktestProgress, BacktestResultsSummary
+from core.equity_analytics import EquityAnalytics, sharpe_ratio, sortino_ratio
+from core.indicator_engine import data_version, indicator_cache
+from core.metric_accumulators import MetricAccumulator, expectancy, recovery_factor
+from core.monte_carlo import MonteCarloResult, simulate_trade_paths
+from core.openfx_api import OpenFxApi
+from core.progress_publisher import ProgressPublisher
+from core.result_cache import result_cache, result_cache_key
+from core.result_series import ResultSeries
+from core.trade_analytics import (
+    TradeAnalytics,
+    holding_period_distribution,
+    pnl_distribution,
+    streak_summary,
+    trade_duration_minutes,
+    value_at_risk,
+)
+from core.trade_ledger import LEDGER_ENCODING, TradeLedger
+from core.vectorized_engine import (
+    ENGINE_VECTORIZED,
+    ENGINES,
+    build_entry_masks,
+    exit_thresholds,
+    find_exit,
+    find_next_entry,
+)
 from db.supabase_client import get_supabase_client, is_configured
+from infrastructure.candle_store import get_candle_store
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +90,12 @@ class BacktestExecution:
     equity_curve: List[float] = field(default_factory=list)
     peak_equity: float = 0.0
     initial_balance: float = 0.0
+    # Live metrics accumulated as trades close (live_metrics: copy from a worker process)
+    metrics: Optional[MetricAccumulator] = None
+    live_metrics: Optional[Dict[str, Any]] = None
+    # Process backend: job future and last applied worker snapshot
+    future: Optional[Future] = None
+    snapshot_sequence: int = 0
 
 
 class BacktestExecutor:
@@ -51,9 +103,14 @@ class BacktestExecutor:
     Singleton class to manage backtest execution.
 
     Features:
-    - Background thread execution
+    - Background execution in a thread or a worker process pool
+      (``settings.BACKTEST_EXECUTION_BACKEND``)
+    - Bounded priority queue with concurrency and memory admission control
     - Progress tracking
     - Cancellation support with partial results
+    - Result cache reusing identical earlier runs
+    - Checkpoints on local disk, so interrupted runs resume where they stopped
+    - Extension of completed runs to a later end date over the new candles only
     - Thread-safe access via singleton pattern
     """
 
@@ -63,6 +120,9 @@ class BacktestExecutor:
     # Configuration
     PROGRESS_UPDATE_INTERVAL = 100  # Update progress every N candles
     CANCEL_CHECK_INTERVAL = 50  # Check cancel event every N candles
+    VECTORIZED_PROGRESS_STEPS = 20  # Progress writes per run for the vectorized engine
+    DEFAULT_ENGINE = ENGINE_VECTORIZED
+    BACKENDS = ("thread", "process")
 
     def __new__(cls) -> "BacktestExecutor":
         if cls._instance is None:
@@ -79,6 +139,36 @@ class BacktestExecutor:
         self._running_backtests: Dict[str, BacktestExecution] = {}
         self._executions_lock: Lock = Lock()
 
+        # Execution backend; the process pool is created on first use
+        self.backend = settings.BACKTEST_EXECUTION_BACKEND
+        if self.backend not in self.BACKENDS:
+            logger.warning(
+                f"[BACKTEST_EXECUTOR] Unknown execution backend '{self.backend}', using threads"
+            )
+            self.backend = "thread"
+        self._process_pool: Optional[BacktestProcessPool] = None
+        self._scheduler = BacktestScheduler(
+            max_concurrent=settings.BACKTEST_MAX_CONCURRENT,
+            max_queued=settings.BACKTEST_MAX_QUEUED,
+            memory_budget_bytes=settings.BACKTEST_MEMORY_BUDGET_MB * 1024 * 1024,
+        )
+        # Set in worker processes to mirror progress to the parent
+        self._progress_sink: Optional[Callable[[BacktestExecution], None]] = None
+        # Progress rows are written in the background so the engines never wait on them
+        self._progress_publisher = ProgressPublisher(
+            lambda backtest_id, fields: self._update_backtest_progress(backtest_id, **fields),
+            min_interval=settings.PROGRESS_PUBLISH_INTERVAL_MS / 1000,
+        )
+        # Engine checkpoints of running backtests and final engine states of
+        # completed ones (None when disabled)
+        self._checkpoints: Optional[CheckpointStore] = None
+        self._final_states: Optional[CheckpointStore] = None
+        if settings.BACKTEST_CHECKPOINT_DIR:
+            self._checkpoints = CheckpointStore(settings.BACKTEST_CHECKPOINT_DIR)
+            self._final_states = CheckpointStore(
+                os.path.join(settings.BACKTEST_CHECKPOINT_DIR, "completed")
+            )
+
         self._initialized = True
         logger.info("[BACKTEST_EXECUTOR] BacktestExecutor initialized")
 
@@ -92,19 +182,29 @@ class BacktestExecutor:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        strategy, error = self._load_strategy_for_execution(strategy_id)
+        return strategy is not None, error
+
+    def _load_strategy_for_execution(self, strategy_id: str) -> tuple[Optional[dict], Optional[str]]:
+        """
+        Fetch a strategy and validate it for backtest execution.
+
+        Returns:
+            Tuple of (strategy, error_message); strategy is None when invalid
+        """
         if not is_configured():
-            return False, "Database not configured"
+            return None, "Database not configured"
 
         client = get_supabase_client()
         if client is None:
-            return False, "Failed to connect to database"
+            return None, "Failed to connect to database"
 
         try:
             # Fetch the strategy
             result = client.table("strategies").select("*").eq("id", strategy_id).execute()
 
             if not result.data or len(result.data) == 0:
-                return False, f"Strategy not found: {strategy_id}"
+                return None, f"Strategy not found: {strategy_id}"
 
             strategy = result.data[0]
 
@@ -124,127 +224,259 @@ class BacktestExecutor:
 
             if not long_entry and not short_entry:
                 return (
-                    False,
+                    None,
                     "Strategy must have at least one entry condition (long_entry or short_entry)",
                 )
 
-            return True, None
+            return strategy, None
 
         except Exception as e:
             logger.error(f"[BACKTEST_EXECUTOR] Error validating strategy {strategy_id}: {e}")
-            return False, f"Failed to validate strategy: {str(e)}"
+            return None, f"Failed to validate strategy: {str(e)}"
 
-    def start_backtest(self, backtest_id: str, keep_partial_on_cancel: bool = False) -> dict:
+    def start_backtest(
+        self,
+        backtest_id: str,
+        keep_partial_on_cancel: bool = False,
+        priority: int = 0,
+        use_cache: bool = True,
+    ) -> dict:
         """
-        Start a backtest execution in a background thread.
+        Queue a backtest execution; it starts as soon as the scheduler admits it.
 
         Args:
             backtest_id: The backtest ID to execute
             keep_partial_on_cancel: Whether to save partial results if cancelled
+            priority: Queue priority (higher starts first, FIFO within a priority)
+            use_cache: Whether an identical earlier run may supply the results
 
         Returns:
             dict with success status, message, and error
         """
         with self._executions_lock:
-            # Check if already running
-            if backtest_id in self._running_backtests:
-                existing = self._running_backtests[backtest_id]
-                if existing.status in ["running", "cancelling"]:
+            return self._queue_backtest(backtest_id, keep_partial_on_cancel, priority, use_cache)
+
+    def _queue_backtest(
+        self,
+        backtest_id: str,
+        keep_partial_on_cancel: bool,
+        priority: int,
+        use_cache: bool,
+    ) -> dict:
+        """Queue a backtest execution (see start_backtest); the caller holds _executions_lock."""
+        # Check if already running
+        if backtest_id in self._running_backtests:
+            existing = self._running_backtests[backtest_id]
+            if existing.status in ["running", "cancelling"] or self._scheduler.is_queued(
+                backtest_id
+            ):
+                return {
+                    "success": False,
+                    "message": "Backtest is already running",
+                    "error": "conflict",
+                }
+
+        # Validate backtest exists
+        if not is_configured():
+            return {
+                "success": False,
+                "message": "Database not configured",
+                "error": "configuration_error",
+            }
+
+        client = get_supabase_client()
+        if client is None:
+            return {
+                "success": False,
+                "message": "Failed to connect to database",
+                "error": "connection_error",
+            }
+
+        try:
+            # Fetch the backtest
+            result = client.table("backtests").select("*").eq("id", backtest_id).execute()
+
+            if not result.data or len(result.data) == 0:
+                return {
+                    "success": False,
+                    "message": f"Backtest not found: {backtest_id}",
+                    "error": "not_found",
+                }
+
+            backtest = result.data[0]
+            strategy_id = backtest.get("strategy_id")
+
+            # Validate strategy has entry conditions
+            if strategy_id:
+                strategy, validation_error = self._load_strategy_for_execution(strategy_id)
+                if strategy is None:
                     return {
                         "success": False,
-                        "message": "Backtest is already running",
-                        "error": "conflict",
+                        "message": validation_error,
+                        "error": "validation_error",
                     }
+            else:
+                return {
+                    "success": False,
+                    "message": "Backtest has no linked strategy",
+                    "error": "validation_error",
+                }
 
-            # Validate backtest exists
-            if not is_configured():
+            # Queue the run; the estimated candle count drives memory admission, so
+            # it uses the pair and timeframe the run will resolve
+            pair, timeframe = self._backtest_market(backtest, strategy)
+            estimated_candles, estimated_seconds = estimate_job(
+                {**backtest, "pair": pair, "timeframe": timeframe}
+            )
+            job = QueuedJob(
+                backtest_id=backtest_id,
+                priority=priority,
+                estimated_candles=estimated_candles,
+                estimated_seconds=estimated_seconds,
+                payload={**backtest, "use_result_cache": use_cache},
+            )
+            if not self._scheduler.enqueue(job):
                 return {
                     "success": False,
-                    "message": "Database not configured",
-                    "error": "configuration_error",
+                    "message": "Backtest queue is full, try again later",
+                    "error": "busy",
                 }
 
-            client = get_supabase_client()
-            if client is None:
+            # Create execution tracker
+            self._running_backtests[backtest_id] = BacktestExecution(
+                backtest_id=backtest_id,
+                thread=None,  # Set when the scheduler starts the run
+                cancel_event=Event(),
+                keep_partial_on_cancel=keep_partial_on_cancel,
+                status="pending",
+            )
+
+            started = [job.backtest_id for job in self._start_ready_jobs()]
+            if backtest_id in started:
+                return {
+                    "success": True,
+                    "message": "Backtest started successfully",
+                    "error": None,
+                }
+
+            queue_status = self._scheduler.queue_status(backtest_id)
+            position = queue_status[0] if queue_status else None
+            logger.info(
+                f"[BACKTEST_EXECUTOR] Queued backtest {backtest_id} at position {position}"
+            )
+            return {
+                "success": True,
+                "message": f"Backtest queued (position {position})",
+                "error": None,
+            }
+
+        except Exception as e:
+            logger.error(f"[BACKTEST_EXECUTOR] Error starting backtest {backtest_id}: {e}")
+            return {
+                "success": False,
+                "message": f"Failed to start backtest: {str(e)}",
+                "error": "internal_error",
+            }
+
+    def extend_backtest(self, backtest_id: str, end_date: datetime, priority: int = 0) -> dict:
+        """
+        Move a completed backtest's end date forward and run it again.
+
+        When its last completed run left a final engine state, the run
+        continues from it and only the candles after the old end date are
+        simulated; the results are then computed over all trades.
+
+        Args:
+            backtest_id: The backtest ID to extend
+            end_date: New end date, after the current one
+            priority: Queue priority (higher starts first)
+
+        Returns:
+            dict with success status, message, and error (as start_backtest)
+        """
+        if not is_configured():
+            return {
+                "success": False,
+                "message": "Database not configured",
+                "error": "configuration_error",
+            }
+        client = get_supabase_client()
+        if client is None:
+            return {
+                "success": False,
+                "message": "Failed to connect to database",
+                "error": "connection_error",
+            }
+
+        # Held from the running check until the run is queued, so concurrent
+        # extend or start requests cannot both pass the check
+        with self._executions_lock:
+            existing = self._running_backtests.get(backtest_id)
+            if existing is not None and existing.status in ["pending", "running", "cancelling"]:
                 return {
                     "success": False,
-                    "message": "Failed to connect to database",
-                    "error": "connection_error",
+                    "message": "Backtest is already running",
+                    "error": "conflict",
                 }
 
             try:
-                # Fetch the backtest
-                result = client.table("backtests").select("*").eq("id", backtest_id).execute()
-
-                if not result.data or len(result.data) == 0:
+                result = (
+                    client.table("backtests")
+                    .select("id, status, end_date, updated_at")
+                    .eq("id", backtest_id)
+                    .execute()
+                )
+                if not result.data:
                     return {
                         "success": False,
                         "message": f"Backtest not found: {backtest_id}",
                         "error": "not_found",
                     }
-
                 backtest = result.data[0]
-                strategy_id = backtest.get("strategy_id")
-
-                # Validate strategy has entry conditions
-                if strategy_id:
-                    is_valid, validation_error = self.validate_strategy_for_execution(strategy_id)
-                    if not is_valid:
-                        return {
-                            "success": False,
-                            "message": validation_error,
-                            "error": "validation_error",
-                        }
-                else:
+                if backtest.get("status") != "completed":
                     return {
                         "success": False,
-                        "message": "Backtest has no linked strategy",
+                        "message": "Only completed backtests can be extended",
                         "error": "validation_error",
                     }
-
-                # Create execution tracker
-                cancel_event = Event()
-                execution = BacktestExecution(
-                    backtest_id=backtest_id,
-                    thread=None,  # Will be set after thread creation
-                    cancel_event=cancel_event,
-                    keep_partial_on_cancel=keep_partial_on_cancel,
-                    status="pending",
-                    started_at=datetime.now(timezone.utc),
-                )
-
-                # Create and start the execution thread
-                thread = threading.Thread(
-                    target=self._execute_backtest,
-                    args=(backtest_id, cancel_event, backtest),
-                    daemon=True,
-                    name=f"backtest-{backtest_id[:8]}",
-                )
-                execution.thread = thread
-
-                # Store the execution
-                self._running_backtests[backtest_id] = execution
-
-                # Update database status to running
-                self._update_backtest_status(
-                    backtest_id, "running", started_at=datetime.now(timezone.utc)
-                )
-
-                # Start the thread
-                thread.start()
-
-                logger.info(f"[BACKTEST_EXECUTOR] Started backtest {backtest_id}")
-
-                return {"success": True, "message": "Backtest started successfully", "error": None}
-
+                previous = {
+                    "end_date": backtest.get("end_date"),
+                    "updated_at": backtest.get("updated_at"),
+                }
+                previous_end = previous["end_date"]
+                if previous_end and to_epoch_seconds(end_date) <= to_epoch_seconds(previous_end):
+                    return {
+                        "success": False,
+                        "message": "The new end date must be after the current end date",
+                        "error": "validation_error",
+                    }
+                client.table("backtests").update(
+                    {
+                        "end_date": end_date.isoformat(),
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                ).eq("id", backtest_id).execute()
             except Exception as e:
-                logger.error(f"[BACKTEST_EXECUTOR] Error starting backtest {backtest_id}: {e}")
+                logger.error(f"[BACKTEST_EXECUTOR] Error extending backtest {backtest_id}: {e}")
                 return {
                     "success": False,
-                    "message": f"Failed to start backtest: {str(e)}",
+                    "message": f"Failed to extend backtest: {str(e)}",
                     "error": "internal_error",
                 }
 
+            outcome = self._queue_backtest(
+                backtest_id, keep_partial_on_cancel=False, priority=priority, use_cache=True
+            )
+            if not outcome["success"]:
+                # Leave the backtest as it was
+                try:
+                    client.table("backtests").update(previous).eq("id", backtest_id).execute()
+                except Exception as e:
+                    logger.error(
+                        f"[BACKTEST_EXECUTOR] Error restoring end date of {backtest_id}: {e}"
+                    )
+            return outcome
+
     def get_progress(self, backtest_id: str) -> Optional[BacktestProgress]:
         """
         Get the current progress of a backtest.
@@ -259,9 +491,19 @@ class BacktestExecutor:
             if backtest_id in self._running_backtests:
                 execution = self._running_backtests[backtest_id]
 
+                # Queued runs report their position and estimated start
+                queue_position = None
+                queue_eta = None
+                queue_status = self._scheduler.queue_status(backtest_id)
+                if queue_status is not None:
+                    queue_position, queue_eta = queue_status
+
                 # Calculate estimated time remaining
                 estimated_seconds = None
-                if execution.progress_percentage > 0 and execution.started_at:
+                if queue_status is not None:
+                    job_duration = self._scheduler.estimated_duration(backtest_id)
+                    estimated_seconds = queue_eta + (job_duration or 0.0)
+                elif execution.progress_percentage > 0 and execution.started_at:
                     elapsed = (datetime.now(timezone.utc) - execution.started_at).total_seconds()
                     if execution.progress_percentage < 100:
                         estimated_seconds = (
@@ -287,6 +529,13 @@ class BacktestExecutor:
                     current_drawdown=execution.current_drawdown,
                     equity_curve=execution.equity_curve if execution.equity_curve else None,
                     peak_equity=execution.peak_equity if execution.peak_equity > 0 else None,
+                    live_metrics=(
+                        execution.metrics.summary()
+                        if execution.metrics is not None
+                        else execution.live_metrics
+                    ),
+                    queue_position=queue_position,
+                    queue_eta_seconds=queue_eta,
                 )
 
         # Check database for completed/failed backtests
@@ -355,6 +604,17 @@ class BacktestExecutor:
 
             execution = self._running_backtests[backtest_id]
 
+            # A queued run has not started: drop it without touching the database
+            if self._scheduler.remove(backtest_id) is not None:
+                del self._running_backtests[backtest_id]
+                logger.info(f"[BACKTEST_EXECUTOR] Removed queued backtest {backtest_id}")
+                return {
+                    "success": True,
+                    "message": "Queued backtest cancelled",
+                    "partial_results_saved": False,
+                    "error": None,
+                }
+
             if execution.status not in ["running", "pending"]:
                 return {
                     "success": False,
@@ -368,13 +628,35 @@ class BacktestExecutor:
             execution.status = "cancelling"
 
             # Signal cancellation
-            execution.cancel_event.set()
+            if isinstance(execution.cancel_event, SharedCancelFlag):
+                execution.cancel_event.set(keep_partial=keep_partial_results)
+            else:
+                execution.cancel_event.set()
+
+            # A job still waiting for a worker process can be dropped outright
+            dequeued = execution.future is not None and execution.future.cancel()
+            if dequeued:
+                execution.status = "pending"
 
             logger.info(f"[BACKTEST_EXECUTOR] Cancellation requested for backtest {backtest_id}")
 
-        # Wait for thread to finish (max 2 seconds as per spec)
+        if dequeued:
+            self._update_backtest_status(backtest_id, "pending")
+            self._on_run_finished(backtest_id)
+            self._schedule_cleanup(backtest_id)
+            return {
+                "success": True,
+                "message": "Backtest cancelled",
+                "partial_results_saved": False,
+                "error": None,
+            }
+
+        # Wait for the run to finish (max 2 seconds as per spec)
         try:
-            execution.thread.join(timeout=2.0)
+            if execution.thread is not None:
+                execution.thread.join(timeout=2.0)
+            else:
+                wait_for(execution.future, timeout=2.0)
         except Exception as e:
             logger.error(f"[BACKTEST_EXECUTOR] Error waiting for thread: {e}")
 
@@ -417,6 +699,7 @@ class BacktestExecutor:
                     return
                 execution = self._running_backtests[backtest_id]
                 execution.status = "running"
+            self._publish_progress(execution)
 
             logger.info(f"[BACKTEST_EXECUTOR] Executing backtest {backtest_id}")
 
@@ -431,32 +714,47 @@ class BacktestExecutor:
             strategy = strategy_result.data[0]
 
             # Get backtest parameters
-            start_date = backtest_data.get("start_date")
-            end_date = backtest_data.get("end_date")
-            _pair = backtest_data.get("pair") or strategy.get("pair", "EUR_USD")  # noqa: F841
-            timeframe = backtest_data.get("timeframe") or strategy.get("timeframe", "H1")
             initial_balance = float(backtest_data.get("initial_balance", 10000))
             position_sizing = backtest_data.get("position_sizing", {})
             risk_management = backtest_data.get("risk_management", {})
 
-            # Parse dates
-            if isinstance(start_date, str):
-                start_date = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-            if isinstance(end_date, str):
-                end_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-
-            # Normalize to timezone-naive for consistent comparisons
-            if start_date.tzinfo is not None:
-                start_date = start_date.replace(tzinfo=None)
-            if end_date.tzinfo is not None:
-                end_date = end_date.replace(tzinfo=None)
+            # A checkpoint left by an interrupted run of this backtest, or else the
+            # final state of its last completed run (to extend it to a later end date)
+            checkpoint = (
+                self._checkpoints.load(backtest_id) if self._checkpoints is not None else None
+            )
+            final_state = (
+                self._final_states.load(backtest_id)
+                if checkpoint is None and self._final_states is not None
+                else None
+            )
+            engine = backtest_data.get("engine") or self.DEFAULT_ENGINE
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown backtest engine: {engine}")
+
+            pair, timeframe = self._backtest_market(backtest_data, strategy)
+            saved = checkpoint or final_state
+            candle_seed = (
+                saved.candle_seed
+                if saved is not None
+                else derive_candle_seed(
+                    pair,
+                    timeframe,
+                    to_epoch_seconds(backtest_data["start_date"]),
+                    to_epoch_seconds(backtest_data["end_date"]),
+                )
+            )
 
-            logger.debug(f"[BACKTEST_EXECUTOR] Normalized dates - start_date: {start_date} (tzinfo: {start_date.tzinfo}), end_date: {end_date} (tzinfo: {end_date.tzinfo})")
+            # Identical strategy logic, settings and candles give identical results;
+            # look the run up before loading (and possibly fetching) its candles
+            use_result_cache = backtest_data.get("use_result_cache", True)
+            cache_key = self._run_key(
+                strategy, backtest_data, pair, timeframe, engine, candle_seed
+            )
+            if use_result_cache and self._serve_from_cache(backtest_id, execution, cache_key):
+                return
 
-            # Simulate fetching historical data
-            # In a real implementation, this would fetch from a data provider
-            # For now, we'll simulate with generated candles
-            candles = self._generate_simulated_candles(start_date, end_date, timeframe)
+            candles, pair, timeframe = self._load_candles(backtest_data, strategy, candle_seed)
             total_candles = len(candles)
 
             with self._executions_lock:
@@ -471,12 +769,6 @@ class BacktestExecutor:
                 trade_count=0,
             )
 
-            # Initialize trading state
-            trades = []
-            current_position = None
-            balance = initial_balance
-            trade_count = 0
-
             # Initialize live metrics tracking
             with self._executions_lock:
                 execution.initial_balance = initial_balance
@@ -486,143 +778,105 @@ class BacktestExecutor:
                 execution.running_win_rate = 0.0
                 execution.current_drawdown = 0.0
 
-            winning_trades = 0
-            # Track full equity curve for final results (separate from limited progress curve)
-            full_equity_curve = [initial_balance]
-
-            # Get strategy conditions
-            # Conditions can be a list of condition objects with 'section' field
-            # or a dict with 'long_entry'/'short_entry' keys
-            conditions = strategy.get("conditions", []) or []
+            if cache_key is None:
+                # Candles without a version of their own are identified by content
+                cache_key = self._run_key(
+                    strategy, backtest_data, pair, timeframe, engine, candle_seed, candles
+                )
+                if use_result_cache and self._serve_from_cache(backtest_id, execution, cache_key):
+                    return
+            if checkpoint is not None and checkpoint.run_key != cache_key:
+                logger.info(
+                    f"[BACKTEST_EXECUTOR] Backtest {backtest_id} changed since its checkpoint, "
+                    "starting over"
+                )
+                checkpoint = None
+            if final_state is not None:
+                checkpoint = self._extension_checkpoint(
+                    final_state, strategy, backtest_data, candles, pair, timeframe, engine
+                )
 
-            if isinstance(conditions, list):
-                # New format: list of condition objects with 'section' field
-                long_entry_conditions = [c for c in conditions if c.get("section") == "long_entry"]
-                short_entry_conditions = [c for c in conditions if c.get("section") == "short_entry"]
-                _long_exit_conditions = [c for c in conditions if c.get("section") == "long_exit"]  # noqa: F841
-                _short_exit_conditions = [c for c in conditions if c.get("section") == "short_exit"]  # noqa: F841
+            logger.info(f"[BACKTEST_EXECUTOR] Running backtest {backtest_id} with {engine} engine")
+
+            walk_forward_report = None
+            checkpointer = None
+            warnings: List[str] = []
+            if (backtest_data.get("walk_forward") or {}).get("enabled"):
+                outcome = self._run_walk_forward(
+                    backtest_id,
+                    execution,
+                    cancel_event,
+                    backtest_data,
+                    strategy,
+                    candles,
+                    pair,
+                    timeframe,
+                    engine,
+                )
+                if outcome is None:
+                    return
+                trades, balance, full_equity_curve, walk_forward_report = outcome
+                # Results cover the stitched out-of-sample span only
+                candles = candles.slice_dates(
+                    walk_forward_report["out_of_sample_start"],
+                    walk_forward_report["out_of_sample_end"],
+                )
             else:
-                # Legacy format: dict with entry type keys
-                long_entry_conditions = conditions.get("long_entry", []) or []
-                short_entry_conditions = conditions.get("short_entry", []) or []
-                _long_exit_conditions = conditions.get("long_exit", []) or []  # noqa: F841
-                _short_exit_conditions = conditions.get("short_exit", []) or []  # noqa: F841
-
-            # Process candles
-            for i, candle in enumerate(candles):
-                # Check for cancellation frequently
-                if i % self.CANCEL_CHECK_INTERVAL == 0:
-                    if cancel_event.is_set():
-                        logger.info(
-                            f"[BACKTEST_EXECUTOR] Backtest {backtest_id} cancelled at candle {i}"
-                        )
-                        self._handle_cancellation(backtest_id, execution, trades)
-                        return
-
-                # Simulate condition evaluation and trading
-                candle_time = candle["time"]
-                candle_close = candle["close"]
-
-                # Simplified trading logic
-                if current_position is None:
-                    # Check entry conditions (simplified simulation)
-                    if long_entry_conditions and self._evaluate_entry(candle, "long"):
-                        # Open long position
-                        current_position = {
-                            "type": "long",
-                            "entry_price": candle_close,
-                            "entry_time": candle_time,
-                            "size": self._calculate_position_size(balance, position_sizing),
-                        }
-                    elif short_entry_conditions and self._evaluate_entry(candle, "short"):
-                        # Open short position
-                        current_position = {
-                            "type": "short",
-                            "entry_price": candle_close,
-                            "entry_time": candle_time,
-                            "size": self._calculate_position_size(balance, position_sizing),
-                        }
-                else:
-                    # Check exit conditions (simplified simulation)
-                    exit_triggered, exit_reason = self._check_exit_conditions(
-                        current_position, candle, risk_management
+                # Compile the strategy logic once and evaluate it for every candle
+                plan = compile_strategy(strategy)
+                indicator_values = self._calculate_indicator_values(
+                    plan, candles, pair, timeframe
+                )
+                signals = plan.evaluate(candles, indicator_values)
+                if plan.missing:
+                    # Pattern detection is not computed server-side yet
+                    logger.warning(
+                        f"[BACKTEST_EXECUTOR] Backtest {backtest_id}: no values for "
+                        f"{', '.join(plan.missing)}; their conditions never signal"
+                    )
+                    warnings.append(
+                        "Conditions on these operands were evaluated as never true: "
+                        + ", ".join(plan.missing)
                     )
 
-                    if exit_triggered:
-                        # Close position
-                        pnl = self._calculate_pnl(current_position, candle_close)
-                        balance += pnl
-
-                        trade = {
-                            "type": current_position["type"],
-                            "entry_price": current_position["entry_price"],
-                            "entry_time": current_position["entry_time"].isoformat()
-                            if hasattr(current_position["entry_time"], "isoformat")
-                            else current_position["entry_time"],
-                            "exit_price": candle_close,
-                            "exit_time": candle_time.isoformat()
-                            if hasattr(candle_time, "isoformat")
-                            else candle_time,
-                            "pnl": pnl,
-                            "exit_reason": exit_reason,
-                        }
-                        trades.append(trade)
-                        trade_count += 1
-                        if pnl > 0:
-                            winning_trades += 1
-                        current_position = None
-
-                        # Update live metrics
-                        with self._executions_lock:
-                            execution.trade_count = trade_count
-                            execution.trades = trades
-                            # Calculate cumulative P/L
-                            execution.current_pnl = round(balance - initial_balance, 2)
-                            # Calculate win rate
-                            execution.running_win_rate = (
-                                round((winning_trades / trade_count) * 100, 1)
-                                if trade_count > 0
-                                else 0.0
-                            )
-                            # Update peak equity and drawdown
-                            if balance > execution.peak_equity:
-                                execution.peak_equity = balance
-                            if execution.peak_equity > 0:
-                                execution.current_drawdown = round(
-                                    ((execution.peak_equity - balance) / execution.peak_equity)
-                                    * 100,
-                                    2,
-                                )
-
-                        # Add to full equity curve for final stats
-                        full_equity_curve.append(round(balance, 2))
-
-                # Update progress periodically
-                if i % self.PROGRESS_UPDATE_INTERVAL == 0 or i == total_candles - 1:
-                    progress_pct = int((i + 1) * 100 / total_candles)
-
-                    with self._executions_lock:
-                        execution.candles_processed = i + 1
-                        execution.progress_percentage = progress_pct
-                        execution.current_date = candle_time
-                        # Update equity curve (limit to last 50 points)
-                        execution.equity_curve.append(balance)
-                        if len(execution.equity_curve) > 50:
-                            execution.equity_curve = execution.equity_curve[-50:]
-
-                    self._update_backtest_progress(
-                        backtest_id,
-                        progress_percentage=progress_pct,
-                        candles_processed=i + 1,
-                        trade_count=trade_count,
-                        current_date=candle_time,
+                run_engine = (
+                    self._run_vectorized_engine
+                    if engine == ENGINE_VECTORIZED
+                    else self._run_loop_engine
+                )
+                if checkpoint is not None:
+                    logger.info(
+                        f"[BACKTEST_EXECUTOR] Continuing backtest {backtest_id} from candle "
+                        f"{checkpoint.state.cursor} of {total_candles}"
                     )
+                checkpointer = self._run_checkpointer(backtest_id, cache_key, candle_seed)
+                outcome = run_engine(
+                    backtest_id=backtest_id,
+                    execution=execution,
+                    cancel_event=cancel_event,
+                    candles=candles,
+                    signals=signals,
+                    initial_balance=initial_balance,
+                    position_sizing=position_sizing,
+                    risk_management=risk_management,
+                    resume=checkpoint.state if checkpoint is not None else None,
+                    checkpointer=checkpointer,
+                )
+                if outcome is None:
+                    # Cancelled - cancellation already handled by the engine
+                    return
+
+                trades, balance, full_equity_curve = outcome
+            trade_count = len(trades)
 
             # Backtest completed
             logger.info(
                 f"[BACKTEST_EXECUTOR] Backtest {backtest_id} completed with {trade_count} trades"
             )
 
+            # Columnar ledger shared by the results analytics and the stored trade list
+            ledger = TradeLedger.from_trades(trades)
+
             # Calculate final results with full equity curve and candles for buy-hold comparison
             results = self._calculate_results(
                 trades=trades,
@@ -630,10 +884,23 @@ class BacktestExecutor:
                 final_balance=balance,
                 equity_curve=full_equity_curve,
                 candles=candles,
+                ledger=ledger,
             )
+            if walk_forward_report is not None:
+                results["walk_forward"] = walk_forward_report
+            if warnings:
+                results["warnings"] = warnings
+            result_cache.put(cache_key, results, ledger)
 
             # Update database
-            self._complete_backtest(backtest_id, results)
+            self._complete_backtest(backtest_id, results, ledger)
+            self._discard_checkpoint(backtest_id)
+            if checkpointer is not None and self._final_states is not None:
+                final_checkpoint = checkpointer.final_checkpoint(
+                    to_epoch_seconds(backtest_data["end_date"])
+                )
+                if final_checkpoint is not None:
+                    self._final_states.save(final_checkpoint)
 
             with self._executions_lock:
                 execution.status = "completed"
@@ -652,79 +919,1030 @@ class BacktestExecutor:
             self._update_backtest_status(backtest_id, "failed", error_message=str(e))
 
         finally:
-            # Clean up after a delay to allow final progress queries
-            def cleanup():
-                time.sleep(5)
-                with self._executions_lock:
-                    if backtest_id in self._running_backtests:
-                        del self._running_backtests[backtest_id]
+            # Write the last progress update (if still pending) before the run is released
+            self._progress_publisher.flush(backtest_id)
+            stats = self._progress_publisher.stats()
+            logger.debug(
+                f"[BACKTEST_EXECUTOR] Progress writes so far: {stats['written']} written, "
+                f"{stats['saved']} saved by coalescing"
+            )
+            # Free the scheduler slot, then clean up after a delay to allow final progress queries
+            self._on_run_finished(backtest_id, execution.candles_processed if execution else 0)
+            self._schedule_cleanup(backtest_id)
+
+    def _run_walk_forward(
+        self,
+        backtest_id: str,
+        execution: BacktestExecution,
+        cancel_event: Event,
+        backtest_data: dict,
+        strategy: dict,
+        candles: CandleBuffer,
+        pair: str,
+        timeframe: str,
+        engine: str,
+    ) -> Optional[tuple[List[Dict[str, Any]], float, List[float], Dict[str, Any]]]:
+        """
+        Run the backtest in walk-forward mode (see core.walk_forward).
+
+        Returns:
+            Tuple of (trades, final_balance, full_equity_curve, walk_forward_report),
+            or None if cancelled
+        """
+        # Imported here: walk_forward builds on this module
+        from core.walk_forward import run_walk_forward
+
+        total_candles = len(candles)
+
+        def on_window(done: int, total: int):
+            self._record_progress(
+                backtest_id,
+                execution,
+                total_candles * done // total,
+                total_candles,
+                0,
+                execution.initial_balance,
+                None,
+            )
+
+        outcome = run_walk_forward(
+            self,
+            backtest_data,
+            strategy,
+            candles,
+            pair,
+            timeframe,
+            engine,
+            cancel_event=cancel_event,
+            on_window=on_window,
+        )
+        if outcome is None:
+            logger.info(f"[BACKTEST_EXECUTOR] Walk-forward backtest {backtest_id} cancelled")
+            self._handle_cancellation(backtest_id, execution, [])
+            return None
+
+        trades, balance, _, _ = outcome
+        with self._executions_lock:
+            execution.trade_count = len(trades)
+            execution.trades = trades
+            execution.current_pnl = round(balance - execution.initial_balance, 2)
+        return outcome
+
+    def _load_candles(
+        self, backtest_data: dict, strategy: dict, seed: Optional[int] = None
+    ) -> tuple[CandleBuffer, str, str]:
+        """
+        Load the candles a backtest runs on.
+
+        Args:
+            backtest_data: The backtest configuration from database
+            strategy: The linked strategy row (fallback pair and timeframe)
+            seed: Seed of the simulated candles (random if omitted)
+
+        Returns:
+            Tuple of (candles, pair, timeframe)
+        """
+        start_date = backtest_data.get("start_date")
+        end_date = backtest_data.get("end_date")
+        pair, timeframe = self._backtest_market(backtest_data, strategy)
+
+        # Parse dates
+        if isinstance(start_date, str):
+            start_date = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+        if isinstance(end_date, str):
+            end_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+
+        # Normalize to timezone-naive for consistent comparisons
+        if start_date.tzinfo is not None:
+            start_date = start_date.replace(tzinfo=None)
+        if end_date.tzinfo is not None:
+            end_date = end_date.replace(tzinfo=None)
+
+        logger.debug(f"[BACKTEST_EXECUTOR] Normalized dates - start_date: {start_date} (tzinfo: {start_date.tzinfo}), end_date: {end_date} (tzinfo: {end_date.tzinfo})")
+
+        if not settings.USE_MOCK_DATA:
+            candles = self._load_stored_candles(pair, timeframe, start_date, end_date)
+            if candles is not None:
+                return candles, pair, timeframe
+
+        # Without historical data (mock mode or no stored candles), simulate candles
+        candles = CandleBuffer.coerce(
+            self._generate_simulated_candles(
+                start_date, end_date, timeframe, rng=np.random.default_rng(seed)
+            )
+        )
+        return candles, pair, timeframe
+
+    @staticmethod
+    def _backtest_market(backtest_data: dict, strategy: dict) -> tuple[str, str]:
+        """Pair and timeframe of a backtest, falling back to those of its strategy."""
+        pair = backtest_data.get("pair") or strategy.get("pair", "EUR_USD")
+        timeframe = backtest_data.get("timeframe") or strategy.get("timeframe", "H1")
+        return pair, timeframe
+
+    def _candle_version(
+        self, backtest_data: dict, pair: str, timeframe: str, seed: int
+    ) -> Optional[str]:
+        """
+        Version of the candles a backtest runs on, known without loading them.
+
+        Simulated candles are determined by their seed, stored candles by the
+        fully fetched range they come from (see CandleStore.version).
+
+        Returns:
+            Version string, or None if only the loaded candles can tell
+        """
+        store = None if settings.USE_MOCK_DATA else get_candle_store()
+        if store is None:
+            return f"simulated:{seed}"
+        return store.version(
+            pair,
+            timeframe,
+            to_epoch_seconds(backtest_data["start_date"]),
+            to_epoch_seconds(backtest_data["end_date"]),
+        )
+
+    def _run_key(
+        self,
+        strategy: dict,
+        backtest_data: dict,
+        pair: str,
+        timeframe: str,
+        engine: str,
+        seed: int,
+        candles: Optional[CandleBuffer] = None,
+    ) -> Optional[str]:
+        """
+        Result cache key of a run (see result_cache.result_cache_key).
+
+        Args:
+            candles: Loaded candles, hashed when their version is unknown
+
+        Returns:
+            Cache key, or None if the version is unknown and no candles were given
+        """
+        version = self._candle_version(backtest_data, pair, timeframe, seed)
+        if version is None:
+            if candles is None:
+                return None
+            version = data_version(candles)
+        return result_cache_key(strategy, backtest_data, pair, timeframe, engine, version)
+
+    def _serve_from_cache(
+        self, backtest_id: str, execution: BacktestExecution, cache_key: Optional[str]
+    ) -> bool:
+        """Complete a run from the result cache if it holds ``cache_key``."""
+        cached = result_cache.get(cache_key) if cache_key is not None else None
+        if cached is None:
+            return False
+        self._complete_from_cache(backtest_id, execution, *cached)
+        return True
+
+    def _load_stored_candles(
+        self, pair: str, timeframe: str, start_date: datetime, end_date: datetime
+    ) -> Optional[CandleBuffer]:
+        """
+        Historical candles from the local candle store, fetching missing ranges first.
+
+        Returns:
+            Mid price candles, or None if the store is disabled or has no candles
+        """
+        store = get_candle_store()
+        if store is None:
+            return None
+
+        with OpenFxApi() as api:
+            synced, columns = store.load(
+                pair,
+                timeframe,
+                to_epoch_seconds(start_date),
+                to_epoch_seconds(end_date),
+                api=api,
+            )
+        if not synced:
+            logger.warning(
+                f"[BACKTEST_EXECUTOR] Could not fetch all {pair}/{timeframe} candles, "
+                "using the stored ones"
+            )
+        if len(columns["time"]) == 0:
+            logger.warning(
+                f"[BACKTEST_EXECUTOR] No stored {pair}/{timeframe} candles, "
+                "using simulated candles"
+            )
+            return None
+
+        return CandleBuffer.from_arrays(
+            time=columns["time"],
+            open=columns["mid_o"],
+            high=columns["mid_h"],
+            low=columns["mid_l"],
+            close=columns["mid_c"],
+            volume=columns["volume"],
+        )
+
+    def _schedule_cleanup(self, backtest_id: str, delay: float = 5.0):
+        """Forget a finished execution after a delay so final progress stays queryable."""
+
+        def cleanup():
+            time.sleep(delay)
+            with self._executions_lock:
+                if backtest_id in self._running_backtests:
+                    del self._running_backtests[backtest_id]
+
+        cleanup_thread = threading.Thread(target=cleanup, daemon=True)
+        cleanup_thread.start()
+
+    # =========================================================================
+    # Job Queue
+    # =========================================================================
+
+    def _start_ready_jobs(self) -> List[QueuedJob]:
+        """
+        Launch every queued run the scheduler admits.
+
+        Must be called with ``_executions_lock`` held.
+
+        Returns:
+            The jobs that were started
+        """
+        started = self._scheduler.pop_ready()
+        for job in started:
+            execution = self._running_backtests.get(job.backtest_id)
+            if execution is None:
+                self._scheduler.finish(job.backtest_id)
+                continue
+            try:
+                self._launch(execution, job.payload)
+            except Exception as e:
+                logger.error(
+                    f"[BACKTEST_EXECUTOR] Failed to launch backtest {job.backtest_id}: {e}"
+                )
+                execution.status = "failed"
+                execution.error_message = str(e)
+                self._scheduler.finish(job.backtest_id)
+                self._update_backtest_status(job.backtest_id, "failed", error_message=str(e))
+                self._schedule_cleanup(job.backtest_id)
+        return started
+
+    def _launch(self, execution: BacktestExecution, backtest_data: dict):
+        """
+        Start an admitted run on the configured backend.
+
+        Must be called with ``_executions_lock`` held.
+        """
+        backtest_id = execution.backtest_id
+        execution.started_at = datetime.now(timezone.utc)
+
+        if self.backend == "process":
+            self._submit_to_process_pool(execution, backtest_data)
+        else:
+            execution.thread = threading.Thread(
+                target=self._execute_backtest,
+                args=(backtest_id, execution.cancel_event, backtest_data),
+                daemon=True,
+                name=f"backtest-{backtest_id[:8]}",
+            )
+
+        # Update database status to running
+        self._update_backtest_status(backtest_id, "running", started_at=execution.started_at)
+
+        # Start the thread (worker processes pick up submitted jobs on their own)
+        if execution.thread is not None:
+            execution.thread.start()
+
+        logger.info(f"[BACKTEST_EXECUTOR] Started backtest {backtest_id} ({self.backend} backend)")
+
+    def _on_run_finished(self, backtest_id: str, candles_processed: int = 0):
+        """Release a finished run's slot and start whatever the queue admits next."""
+        self._scheduler.finish(backtest_id, candles_processed)
+        with self._executions_lock:
+            self._start_ready_jobs()
+
+    # =========================================================================
+    # Process Pool Backend
+    # =========================================================================
+
+    def _submit_to_process_pool(self, execution: BacktestExecution, backtest_data: dict):
+        """
+        Submit a backtest to the worker process pool.
+
+        Must be called with ``_executions_lock`` held. The shared cancel flag
+        and job future replace the execution's thread-backend handles.
+
+        Raises:
+            RuntimeError: If every job slot of the pool is in use
+        """
+        backtest_id = execution.backtest_id
+        if self._process_pool is None:
+            self._process_pool = BacktestProcessPool(
+                max_workers=settings.BACKTEST_WORKER_PROCESSES,
+                on_snapshot=self._apply_snapshot,
+            )
 
-            cleanup_thread = threading.Thread(target=cleanup, daemon=True)
-            cleanup_thread.start()
+        submitted = self._process_pool.submit(backtest_id, backtest_data)
+        if submitted is None:
+            raise RuntimeError("Too many backtests are running, try again later")
+        execution.future, execution.cancel_event = submitted
+        future = execution.future
+        # Handled on a separate thread: the callback runs inline if the job is
+        # already done, and we are holding _executions_lock here
+        future.add_done_callback(
+            lambda f: threading.Thread(
+                target=self._on_process_job_done, args=(backtest_id, f), daemon=True
+            ).start()
+        )
+
+    def _apply_snapshot(self, snapshot: ExecutionSnapshot):
+        """Apply a progress snapshot received from a worker process."""
+        with self._executions_lock:
+            execution = self._running_backtests.get(snapshot.backtest_id)
+            if execution is None or snapshot.sequence <= execution.snapshot_sequence:
+                return
+            cancelling = execution.status == "cancelling"
+            snapshot.apply_to(execution)
+            execution.snapshot_sequence = snapshot.sequence
+            if cancelling and snapshot.status == "running":
+                # The worker has not seen the cancel flag yet
+                execution.status = "cancelling"
+
+    def _on_process_job_done(self, backtest_id: str, future: Future):
+        """Record the final state of a worker process job."""
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None:
+            self._apply_snapshot(future.result())
+        else:
+            # The worker died or the job could not be delivered to it
+            logger.error(f"[BACKTEST_EXECUTOR] Worker failed for backtest {backtest_id}: {error}")
+            with self._executions_lock:
+                execution = self._running_backtests.get(backtest_id)
+                if execution is not None:
+                    execution.status = "failed"
+                    execution.error_message = str(error)
+            self._update_backtest_status(backtest_id, "failed", error_message=str(error))
+
+        with self._executions_lock:
+            execution = self._running_backtests.get(backtest_id)
+            candles_processed = execution.candles_processed if execution else 0
+        self._on_run_finished(backtest_id, candles_processed)
+        self._schedule_cleanup(backtest_id)
+
+    def _publish_progress(self, execution: BacktestExecution):
+        """Mirror execution state to the parent process (worker processes only)."""
+        if self._progress_sink is not None:
+            self._progress_sink(execution)
+
+    def shutdown(self):
+        """Stop the worker process pool, if one was started."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    # =========================================================================
+    # Checkpoints
+    # =========================================================================
+
+    def resume_interrupted(self) -> List[str]:
+        """
+        Restart the runs a previous server process left unfinished.
+
+        Every backtest with a checkpoint that the database still marks as
+        running was interrupted by a restart or crash; it is queued again
+        and continues from its checkpoint. Checkpoints older than
+        ``BACKTEST_CHECKPOINT_MAX_AGE_HOURS`` and final states older than
+        ``BACKTEST_FINAL_STATE_MAX_AGE_DAYS`` are deleted first.
+
+        Returns:
+            IDs of the backtests that were restarted
+        """
+        if self._checkpoints is None:
+            return []
+        self._checkpoints.prune(settings.BACKTEST_CHECKPOINT_MAX_AGE_HOURS * 3600)
+        self._final_states.prune(settings.BACKTEST_FINAL_STATE_MAX_AGE_DAYS * 86400)
+        if not is_configured():
+            return []
+        client = get_supabase_client()
+        if client is None:
+            return []
+
+        resumed = []
+        for backtest_id in self._checkpoints.backtest_ids():
+            try:
+                result = (
+                    client.table("backtests").select("id, status").eq("id", backtest_id).execute()
+                )
+            except Exception as e:
+                logger.error(f"[BACKTEST_EXECUTOR] Error checking backtest {backtest_id}: {e}")
+                continue
+            if not result.data:
+                # The backtest was deleted
+                self._checkpoints.discard(backtest_id)
+                continue
+            if result.data[0].get("status") != "running":
+                # Cancelled runs keep their checkpoint until they are run again
+                continue
+            outcome = self.start_backtest(backtest_id)
+            if outcome["success"]:
+                resumed.append(backtest_id)
+            else:
+                logger.warning(
+                    f"[BACKTEST_EXECUTOR] Could not resume backtest {backtest_id}: "
+                    f"{outcome['message']}"
+                )
+        return resumed
+
+    def _extension_checkpoint(
+        self,
+        final_state: BacktestCheckpoint,
+        strategy: dict,
+        backtest_data: dict,
+        candles: CandleBuffer,
+        pair: str,
+        timeframe: str,
+        engine: str,
+    ) -> Optional[BacktestCheckpoint]:
+        """
+        The final state of a completed run, if this run extends it.
+
+        The run extends it when it ends later and everything else, including
+        the candles up to the old end date, is unchanged: the key of the
+        completed run is recomputed for those candles (or their version) and
+        must match.
+
+        Returns:
+            The final state to continue from, or None to run from the start
+        """
+        if final_state.end_time is None:
+            return None
+        if to_epoch_seconds(backtest_data["end_date"]) <= final_state.end_time:
+            return None
+        previous = candles.slice_dates(end=final_state.end_time)
+        if len(previous) < final_state.state.cursor:
+            return None
+        previous_key = self._run_key(
+            strategy,
+            {**backtest_data, "end_date": final_state.end_time},
+            pair,
+            timeframe,
+            engine,
+            final_state.candle_seed,
+            previous,
+        )
+        return final_state if previous_key == final_state.run_key else None
+
+    def _run_checkpointer(
+        self, backtest_id: str, run_key: str, candle_seed: int
+    ) -> Optional[RunCheckpointer]:
+        """Checkpointer for one engine run (None when checkpoints are disabled)."""
+        if self._checkpoints is None:
+            return None
+        return RunCheckpointer(
+            self._checkpoints,
+            backtest_id,
+            run_key,
+            candle_seed,
+            interval=settings.BACKTEST_CHECKPOINT_INTERVAL_SECONDS,
+        )
+
+    def _discard_checkpoint(self, backtest_id: str):
+        """Delete the checkpoint of a finished run."""
+        if self._checkpoints is not None:
+            self._checkpoints.discard(backtest_id)
+
+    def _run_loop_engine(
+        self,
+        backtest_id: Optional[str],
+        execution: BacktestExecution,
+        cancel_event: Event,
+        candles: CandleBuffer,
+        signals: Dict[str, np.ndarray],
+        initial_balance: float,
+        position_sizing: dict,
+        risk_management: dict,
+        resume: Optional[EngineState] = None,
+        checkpointer: Optional[RunCheckpointer] = None,
+    ) -> Optional[tuple[List[Dict[str, Any]], float, List[float]]]:
+        """
+        Run the backtest by evaluating every candle in order.
+
+        Args:
+            resume: Checkpointed state to continue from instead of the first candle
+            checkpointer: Saves the engine state periodically and on cancellation
+
+        Returns:
+            Tuple of (trades, final_balance, full_equity_curve), or None if cancelled
+        """
+        total_candles = len(candles)
+        trades = []
+        current_position = None
+        balance = initial_balance
+        winning_trades = 0
+        # Track full equity curve for final results (separate from limited progress curve)
+        full_equity_curve = [initial_balance]
+        start = 0
+        if resume is not None:
+            trades = list(resume.trades)
+            current_position = resume.position
+            balance = resume.balance
+            winning_trades = resume.winning_trades
+            full_equity_curve = list(resume.equity_curve)
+            start = resume.cursor
+        self._start_metrics(execution, initial_balance, resume)
+
+        for i in range(start, total_candles):
+            # Check for cancellation frequently
+            if i % self.CANCEL_CHECK_INTERVAL == 0:
+                if cancel_event.is_set():
+                    logger.info(
+                        f"[BACKTEST_EXECUTOR] Backtest {backtest_id} cancelled at candle {i}"
+                    )
+                    if checkpointer is not None:
+                        checkpointer.save(
+                            self._engine_state(
+                                execution,
+                                i,
+                                balance,
+                                trades,
+                                winning_trades,
+                                full_equity_curve,
+                                current_position,
+                            )
+                        )
+                    self._handle_cancellation(backtest_id, execution, trades)
+                    return None
+
+            # Simulate condition evaluation and trading
+            candle = candles[i]
+            candle_time = candle["time"]
+            candle_close = candle["close"]
+
+            # Simplified trading logic
+            if current_position is None:
+                # Check entry conditions (simplified simulation)
+                if self._evaluate_entry(signals, i, "long"):
+                    # Open long position
+                    current_position = {
+                        "type": "long",
+                        "entry_price": candle_close,
+                        "entry_time": candle_time,
+                        "size": self._calculate_position_size(balance, position_sizing),
+                    }
+                elif self._evaluate_entry(signals, i, "short"):
+                    # Open short position
+                    current_position = {
+                        "type": "short",
+                        "entry_price": candle_close,
+                        "entry_time": candle_time,
+                        "size": self._calculate_position_size(balance, position_sizing),
+                    }
+            else:
+                # Check exit conditions (simplified simulation)
+                exit_signal = bool(signals[f"{current_position['type']}_exit"][i])
+                exit_triggered, exit_reason = self._check_exit_conditions(
+                    current_position, candle, risk_management, exit_signal
+                )
+
+                if exit_triggered:
+                    # Close position
+                    pnl = self._calculate_pnl(current_position, candle_close)
+                    balance += pnl
+
+                    trades.append(
+                        self._build_trade(
+                            current_position, candle_close, candle_time, pnl, exit_reason
+                        )
+                    )
+                    if pnl > 0:
+                        winning_trades += 1
+                    current_position = None
+
+                    self._record_closed_trade(
+                        execution, trades, balance, initial_balance, winning_trades
+                    )
+
+                    # Add to full equity curve for final stats
+                    full_equity_curve.append(round(balance, 2))
+
+            # Update progress periodically
+            if i % self.PROGRESS_UPDATE_INTERVAL == 0 or i == total_candles - 1:
+                self._record_progress(
+                    backtest_id, execution, i + 1, total_candles, len(trades), balance, candle_time
+                )
+                if checkpointer is not None and checkpointer.due():
+                    checkpointer.save(
+                        self._engine_state(
+                            execution,
+                            i + 1,
+                            balance,
+                            trades,
+                            winning_trades,
+                            full_equity_curve,
+                            current_position,
+                        )
+                    )
+
+        if checkpointer is not None:
+            checkpointer.finish(
+                self._engine_state(
+                    execution,
+                    total_candles,
+                    balance,
+                    trades,
+                    winning_trades,
+                    full_equity_curve,
+                    current_position,
+                )
+            )
+        return trades, balance, full_equity_curve
+
+    def _run_vectorized_engine(
+        self,
+        backtest_id: Optional[str],
+        execution: BacktestExecution,
+        cancel_event: Event,
+        candles: CandleBuffer,
+        signals: Dict[str, np.ndarray],
+        initial_balance: float,
+        position_sizing: dict,
+        risk_management: dict,
+        resume: Optional[EngineState] = None,
+        checkpointer: Optional[RunCheckpointer] = None,
+    ) -> Optional[tuple[List[Dict[str, Any]], float, List[float]]]:
+        """
+        Run the backtest by jumping between state changes with NumPy.
+
+        Entry masks are computed once for all candles; exits are located with
+        a vectorized scan from the entry candle. Decisions match the loop
+        engine exactly, so trades, equity curve and summary are identical.
+
+        Args:
+            resume: Checkpointed state to continue from instead of the first candle
+            checkpointer: Saves the engine state periodically and on cancellation
+
+        Returns:
+            Tuple of (trades, final_balance, full_equity_curve), or None if cancelled
+        """
+        total_candles = len(candles)
+        trades = []
+        balance = initial_balance
+        winning_trades = 0
+        full_equity_curve = [initial_balance]
+        cursor = 0
+        if resume is not None:
+            trades = list(resume.trades)
+            balance = resume.balance
+            winning_trades = resume.winning_trades
+            full_equity_curve = list(resume.equity_curve)
+            cursor = resume.cursor
+        self._start_metrics(execution, initial_balance, resume)
+
+        if total_candles == 0:
+            return trades, balance, full_equity_curve
+
+        closes = candles.close
+        long_mask, short_mask = build_entry_masks(signals["long_entry"], signals["short_entry"])
+        entry_indices = np.flatnonzero(long_mask | short_mask)
+        sl_pips, tp_pips = exit_thresholds(risk_management)
+
+        # Write progress to the database at most once per progress step
+        progress_step = max(total_candles // self.VECTORIZED_PROGRESS_STEPS, 1)
+        next_progress_at = cursor + progress_step
+
+        while cursor < total_candles:
+            if cancel_event.is_set():
+                logger.info(
+                    f"[BACKTEST_EXECUTOR] Backtest {backtest_id} cancelled at candle {cursor}"
+                )
+                if checkpointer is not None:
+                    checkpointer.save(
+                        self._engine_state(
+                            execution, cursor, balance, trades, winning_trades, full_equity_curve
+                        )
+                    )
+                self._handle_cancellation(backtest_id, execution, trades)
+                return None
+
+            entry_index = find_next_entry(entry_indices, cursor)
+            if entry_index is None:
+                break
+
+            position = {
+                "type": "long" if long_mask[entry_index] else "short",
+                "entry_price": float(closes[entry_index]),
+                "entry_time": candles.datetime_at(entry_index),
+                "size": self._calculate_position_size(balance, position_sizing),
+            }
+
+            exit_index, exit_reason = find_exit(
+                closes,
+                signals[f"{position['type']}_exit"],
+                entry_index + 1,
+                position["entry_price"],
+                position["type"] == "long",
+                sl_pips,
+                tp_pips,
+            )
+            if exit_index is None:
+                # Position still open at the end of the data
+                break
+
+            exit_price = float(closes[exit_index])
+            exit_time = candles.datetime_at(exit_index)
+            pnl = self._calculate_pnl(position, exit_price)
+            balance += pnl
+
+            trades.append(self._build_trade(position, exit_price, exit_time, pnl, exit_reason))
+            if pnl > 0:
+                winning_trades += 1
+
+            self._record_closed_trade(execution, trades, balance, initial_balance, winning_trades)
+            full_equity_curve.append(round(balance, 2))
+
+            cursor = exit_index + 1
+            if cursor >= next_progress_at and cursor < total_candles:
+                self._record_progress(
+                    backtest_id,
+                    execution,
+                    cursor,
+                    total_candles,
+                    len(trades),
+                    balance,
+                    exit_time,
+                )
+                next_progress_at = cursor + progress_step
+                if checkpointer is not None and checkpointer.due():
+                    checkpointer.save(
+                        self._engine_state(
+                            execution, cursor, balance, trades, winning_trades, full_equity_curve
+                        )
+                    )
+
+        self._record_progress(
+            backtest_id,
+            execution,
+            total_candles,
+            total_candles,
+            len(trades),
+            balance,
+            candles.datetime_at(-1),
+        )
+
+        if checkpointer is not None:
+            # The cursor stops at the entry of a position still open at the end, so
+            # an extended run reopens it and looks for its exit in the new candles
+            checkpointer.finish(
+                self._engine_state(
+                    execution, cursor, balance, trades, winning_trades, full_equity_curve
+                )
+            )
+        return trades, balance, full_equity_curve
+
+    def _build_trade(
+        self,
+        position: dict,
+        exit_price: float,
+        exit_time: Any,
+        pnl: float,
+        exit_reason: str,
+    ) -> Dict[str, Any]:
+        """Build the trade record for a closed position."""
+        entry_time = position["entry_time"]
+        return {
+            "type": position["type"],
+            "size": position["size"],
+            "entry_price": position["entry_price"],
+            "entry_time": entry_time.isoformat()
+            if hasattr(entry_time, "isoformat")
+            else entry_time,
+            "exit_price": exit_price,
+            "exit_time": exit_time.isoformat() if hasattr(exit_time, "isoformat") else exit_time,
+            "pnl": pnl,
+            "exit_reason": exit_reason,
+        }
+
+    def _start_metrics(
+        self,
+        execution: BacktestExecution,
+        initial_balance: float,
+        resume: Optional[EngineState] = None,
+    ):
+        """
+        Give the execution a fresh live metric accumulator for an engine run.
+
+        A resumed run gets the accumulator and live metrics it had at its
+        checkpoint, rebuilt by replaying the checkpointed trades.
+        """
+        if resume is None:
+            with self._executions_lock:
+                execution.metrics = MetricAccumulator(initial_balance)
+            return
+
+        metrics = MetricAccumulator.from_trades(resume.trades, initial_balance)
+        trade_count = len(resume.trades)
+        with self._executions_lock:
+            execution.metrics = metrics
+            execution.trades = list(resume.trades)
+            execution.trade_count = trade_count
+            execution.current_pnl = round(resume.balance - initial_balance, 2)
+            execution.running_win_rate = (
+                round((resume.winning_trades / trade_count) * 100, 1) if trade_count > 0 else 0.0
+            )
+            execution.peak_equity = resume.peak_equity
+            if resume.peak_equity > 0:
+                execution.current_drawdown = round(
+                    ((resume.peak_equity - resume.balance) / resume.peak_equity) * 100, 2
+                )
+
+    def _engine_state(
+        self,
+        execution: BacktestExecution,
+        cursor: int,
+        balance: float,
+        trades: List[Dict[str, Any]],
+        winning_trades: int,
+        equity_curve: List[float],
+        position: Optional[dict] = None,
+    ) -> EngineState:
+        """Engine state of a run for a checkpoint."""
+        with self._executions_lock:
+            peak_equity = execution.peak_equity
+        return EngineState(
+            cursor=cursor,
+            balance=balance,
+            trades=trades,
+            winning_trades=winning_trades,
+            equity_curve=equity_curve,
+            position=position,
+            peak_equity=peak_equity,
+        )
+
+    def _record_closed_trade(
+        self,
+        execution: BacktestExecution,
+        trades: List[Dict[str, Any]],
+        balance: float,
+        initial_balance: float,
+        winning_trades: int,
+    ):
+        """Update live performance metrics after a trade closes."""
+        trade_count = len(trades)
+        with self._executions_lock:
+            execution.trade_count = trade_count
+            execution.trades = trades
+            if execution.metrics is not None:
+                execution.metrics.add_trade(trades[-1], balance)
+            # Calculate cumulative P/L
+            execution.current_pnl = round(balance - initial_balance, 2)
+            # Calculate win rate
+            execution.running_win_rate = (
+                round((winning_trades / trade_count) * 100, 1) if trade_count > 0 else 0.0
+            )
+            # Update peak equity and drawdown
+            if balance > execution.peak_equity:
+                execution.peak_equity = balance
+            if execution.peak_equity > 0:
+                execution.current_drawdown = round(
+                    ((execution.peak_equity - balance) / execution.peak_equity) * 100,
+                    2,
+                )
+
+    def _record_progress(
+        self,
+        backtest_id: Optional[str],
+        execution: BacktestExecution,
+        candles_processed: int,
+        total_candles: int,
+        trade_count: int,
+        balance: float,
+        current_date: Any,
+    ):
+        """Update in-memory and database progress (detached runs have no backtest_id)."""
+        progress_pct = int(candles_processed * 100 / total_candles)
+
+        with self._executions_lock:
+            execution.candles_processed = candles_processed
+            execution.progress_percentage = progress_pct
+            execution.current_date = current_date
+            # Update equity curve (limit to last 50 points)
+            execution.equity_curve.append(balance)
+            if len(execution.equity_curve) > 50:
+                execution.equity_curve = execution.equity_curve[-50:]
+
+        if backtest_id is None:
+            return
+        self._progress_publisher.publish(
+            backtest_id,
+            {
+                "progress_percentage": progress_pct,
+                "candles_processed": candles_processed,
+                "trade_count": trade_count,
+                "current_date": current_date,
+            },
+        )
+        self._publish_progress(execution)
 
     def _generate_simulated_candles(
-        self, start_date: datetime, end_date: datetime, timeframe: str
-    ) -> List[Dict[str, Any]]:
-        """Generate simulated candles for backtesting."""
-        import random
-
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        timeframe: str,
+        rng: Optional[np.random.Generator] = None,
+    ) -> CandleBuffer:
+        """Generate simulated candles for backtesting as a columnar buffer."""
         logger.debug(f"[BACKTEST_EXECUTOR] Generating candles - start_date: {start_date} (tzinfo: {start_date.tzinfo}), end_date: {end_date} (tzinfo: {end_date.tzinfo})")
 
         # Map timeframe to minutes
         tf_minutes = {"M1": 1, "M5": 5, "M15": 15, "M30": 30, "H1": 60, "H4": 240, "D": 1440}
-        minutes = tf_minutes.get(timeframe, 60)
-
-        candles = []
-        current_time = start_date
-        price = 1.1000  # Starting price for simulation
-
-        while current_time <= end_date:
-            if len(candles) == 0:  # Log only first candle
-                logger.debug(f"[BACKTEST_EXECUTOR] First candle - current_time: {current_time} (tzinfo: {current_time.tzinfo})")
-            # Generate random OHLC data
-            change = random.uniform(-0.002, 0.002)
-            high_extra = random.uniform(0, 0.001)
-            low_extra = random.uniform(0, 0.001)
-
-            open_price = price
-            close_price = price + change
-            high_price = max(open_price, close_price) + high_extra
-            low_price = min(open_price, close_price) - low_extra
-
-            candles.append(
-                {
-                    "time": current_time,
-                    "open": open_price,
-                    "high": high_price,
-                    "low": low_price,
-                    "close": close_price,
-                    "volume": random.randint(100, 10000),
-                }
-            )
+        step_seconds = tf_minutes.get(timeframe, 60) * 60
+
+        start_ts = to_epoch_seconds(start_date)
+        end_ts = to_epoch_seconds(end_date)
+        if end_ts < start_ts:
+            return CandleBuffer.empty()
+
+        n = (end_ts - start_ts) // step_seconds + 1
+        rng = rng if rng is not None else np.random.default_rng()
+
+        # Generate random OHLC data as a random walk from the starting price. Each
+        # candle draws one row, so a longer range keeps the earlier candles unchanged
+        draws = rng.random((n, 4))
+        change = draws[:, 0] * 0.004 - 0.002
+        high_extra = draws[:, 1] * 0.001
+        low_extra = draws[:, 2] * 0.001
+
+        close_prices = 1.1000 + np.cumsum(change)  # Starting price for simulation
+        open_prices = np.empty(n)
+        open_prices[0] = 1.1000
+        open_prices[1:] = close_prices[:-1]
+
+        return CandleBuffer.from_arrays(
+            time=start_ts + np.arange(n, dtype=np.int64) * step_seconds,
+            open=open_prices,
+            high=np.maximum(open_prices, close_prices) + high_extra,
+            low=np.minimum(open_prices, close_prices) - low_extra,
+            close=close_prices,
+            volume=100 + (draws[:, 3] * 9901).astype(np.int64),
+        )
 
-            price = close_price
+    def _calculate_indicator_values(
+        self,
+        plan: EvaluationPlan,
+        candles: CandleBuffer,
+        pair: Optional[str] = None,
+        timeframe: Optional[str] = None,
+    ) -> IndicatorValues:
+        """
+        Calculate the indicator series required by a compiled strategy.
 
-            # Move to next candle
-            from datetime import timedelta
+        Series come from the shared indicator cache, so identical indicators
+        on the same candles are computed once across backtests and the API.
+        Indicators that fail to calculate are skipped and their conditions
+        do not signal.
 
-            current_time += timedelta(minutes=minutes)
+        Args:
+            plan: Compiled strategy
+            candles: Candles the strategy is evaluated on
+            pair: Currency pair of the candles
+            timeframe: Candle timeframe
 
-        return candles
+        Returns:
+            Indicator series keyed by instance ID and component
+        """
+        indicator_values: IndicatorValues = {}
+        if plan.required_indicators:
+            version = data_version(candles)
+            for instance_id, (indicator_id, params) in plan.required_indicators.items():
+                try:
+                    indicator_values[instance_id] = indicator_cache.get_or_calculate(
+                        candles,
+                        indicator_id,
+                        params,
+                        pair=pair,
+                        timeframe=timeframe,
+                        version=version,
+                    )
+                except ValueError as e:
+                    logger.warning(
+                        f"[BACKTEST_EXECUTOR] Cannot calculate indicator {instance_id}: {e}"
+                    )
 
-    def _evaluate_entry(self, candle: dict, direction: str) -> bool:
-        """Simplified entry condition evaluation."""
-        # In a real implementation, this would evaluate the actual strategy conditions
-        # For simulation, we use a simple probability-based approach
-        import random
+        if plan.required_reference_indicators:
+            logger.warning(
+                "[BACKTEST_EXECUTOR] Multi-timeframe reference indicators are not supported "
+                "server-side; their conditions will not signal"
+            )
+        return indicator_values
 
-        return random.random() < 0.02  # 2% chance of entry signal per candle
+    def _evaluate_entry(self, signals: Dict[str, np.ndarray], index: int, direction: str) -> bool:
+        """Check the compiled entry signal for a direction at a candle index."""
+        return bool(signals[f"{direction}_entry"][index])
 
     def _check_exit_conditions(
-        self, position: dict, candle: dict, risk_management: dict
+        self, position: dict, candle: dict, risk_management: dict, exit_signal: bool = False
     ) -> tuple[bool, str]:
         """Check if exit conditions are met."""
-        import random
-
         entry_price = position["entry_price"]
         current_price = candle["close"]
         is_long = position["type"] == "long"
@@ -758,8 +1976,8 @@ class BacktestExecutor:
             elif tp_type == "risk_reward" and sl_value and pips_change > sl_value * tp_value:
                 return True, "take_profit"
 
-        # Random exit for simulation (if no explicit conditions met)
-        if random.random() < 0.05:  # 5% chance of random exit
+        # Strategy exit conditions
+        if exit_signal:
             return True, "signal"
 
         return False, ""
@@ -807,23 +2025,7 @@ class BacktestExecutor:
         Returns:
             Annualized Sharpe Ratio or None if not calculable
         """
-        if len(daily_returns) < 2:
-            return None
-
-        # Calculate mean and standard deviation of daily returns
-        mean_return = sum(daily_returns) / len(daily_returns)
-        variance = sum((r - mean_return) ** 2 for r in daily_returns) / len(daily_returns)
-        std_dev = math.sqrt(variance) if variance > 0 else 0
-
-        if std_dev == 0:
-            return None
-
-        # Annualize: multiply by sqrt(252) for daily returns
-        daily_risk_free = risk_free_rate / 252
-        sharpe = (mean_return - daily_risk_free) / std_dev
-        annualized_sharpe = sharpe * math.sqrt(252)
-
-        return round(annualized_sharpe, 2)
+        return sharpe_ratio(daily_returns, risk_free_rate)
 
     def _calculate_sortino_ratio(
         self, daily_returns: List[float], risk_free_rate: float = 0.0
@@ -838,30 +2040,7 @@ class BacktestExecutor:
         Returns:
             Annualized Sortino Ratio or None if not calculable
         """
-        if len(daily_returns) < 2:
-            return None
-
-        # Calculate mean return
-        mean_return = sum(daily_returns) / len(daily_returns)
-
-        # Calculate downside deviation (only negative returns)
-        negative_returns = [r for r in daily_returns if r < 0]
-        if not negative_returns:
-            # No negative returns means infinite Sortino (very good), but we cap it
-            return None
-
-        downside_variance = sum(r**2 for r in negative_returns) / len(daily_returns)
-        downside_deviation = math.sqrt(downside_variance) if downside_variance > 0 else 0
-
-        if downside_deviation == 0:
-            return None
-
-        # Annualize
-        daily_risk_free = risk_free_rate / 252
-        sortino = (mean_return - daily_risk_free) / downside_deviation
-        annualized_sortino = sortino * math.sqrt(252)
-
-        return round(annualized_sortino, 2)
+        return sortino_ratio(daily_returns, risk_free_rate)
 
     def _calculate_max_drawdown(self, equity_curve: List[float]) -> tuple[float, float]:
         """
@@ -873,25 +2052,8 @@ class BacktestExecutor:
         Returns:
             Tuple of (max_drawdown_dollars, max_drawdown_percent)
         """
-        if len(equity_curve) < 2:
-            return 0.0, 0.0
-
-        max_dd_dollars = 0.0
-        max_dd_percent = 0.0
-        peak = equity_curve[0]
-
-        for equity in equity_curve:
-            if equity > peak:
-                peak = equity
-            drawdown_dollars = peak - equity
-            drawdown_percent = (drawdown_dollars / peak * 100) if peak > 0 else 0
-
-            if drawdown_dollars > max_dd_dollars:
-                max_dd_dollars = drawdown_dollars
-            if drawdown_percent > max_dd_percent:
-                max_dd_percent = drawdown_percent
-
-        return round(max_dd_dollars, 2), round(max_dd_percent, 2)
+        summary = EquityAnalytics(equity_curve).summary()
+        return summary["max_drawdown_dollars"], summary["max_drawdown_percent"]
 
     def _identify_drawdown_periods(self, equity_curve: List[float]) -> List[Dict[str, Any]]:
         """
@@ -903,55 +2065,7 @@ class BacktestExecutor:
         Returns:
             List of drawdown period dicts with start_index, end_index, max_drawdown_pct
         """
-        if len(equity_curve) < 2:
-            return []
-
-        drawdown_periods = []
-        peak = equity_curve[0]
-        peak_index = 0
-        in_drawdown = False
-        drawdown_start = 0
-        max_drawdown_in_period = 0.0
-
-        for i, equity in enumerate(equity_curve):
-            if equity >= peak:
-                # New peak reached
-                if in_drawdown and max_drawdown_in_period > 0.01:  # Only record if > 0.01%
-                    # End of drawdown period
-                    drawdown_periods.append(
-                        {
-                            "start_index": drawdown_start,
-                            "end_index": i - 1,
-                            "max_drawdown_pct": round(max_drawdown_in_period, 2),
-                        }
-                    )
-                peak = equity
-                peak_index = i
-                in_drawdown = False
-                max_drawdown_in_period = 0.0
-            else:
-                # In drawdown
-                if not in_drawdown:
-                    # Start of new drawdown period
-                    in_drawdown = True
-                    drawdown_start = peak_index
-
-                # Calculate current drawdown percentage
-                drawdown_pct = ((peak - equity) / peak * 100) if peak > 0 else 0
-                if drawdown_pct > max_drawdown_in_period:
-                    max_drawdown_in_period = drawdown_pct
-
-        # Handle case where we end in a drawdown
-        if in_drawdown and max_drawdown_in_period > 0.01:
-            drawdown_periods.append(
-                {
-                    "start_index": drawdown_start,
-                    "end_index": len(equity_curve) - 1,
-                    "max_drawdown_pct": round(max_drawdown_in_period, 2),
-                }
-            )
-
-        return drawdown_periods
+        return EquityAnalytics(equity_curve).drawdown_periods()
 
     def _calculate_recovery_factor(self, total_return: float, max_drawdown: float) -> float:
         """
@@ -964,9 +2078,7 @@ class BacktestExecutor:
         Returns:
             Recovery factor (higher is better)
         """
-        if max_drawdown <= 0:
-            return 0.0
-        return round(total_return / max_drawdown, 2)
+        return recovery_factor(total_return, max_drawdown)
 
     def _calculate_expectancy(self, win_rate: float, avg_win: float, avg_loss: float) -> float:
         """
@@ -980,255 +2092,40 @@ class BacktestExecutor:
         Returns:
             Expected profit per trade
         """
-        win_rate_decimal = win_rate / 100
-        loss_rate_decimal = 1 - win_rate_decimal
-        expectancy = (win_rate_decimal * avg_win) - (loss_rate_decimal * avg_loss)
-        return round(expectancy, 2)
+        return expectancy(win_rate, avg_win, avg_loss)
 
     def _calculate_buy_hold_return(
-        self, candles: List[Dict[str, Any]], initial_balance: float
+        self, candles: Union[CandleBuffer, List[Dict[str, Any]]], initial_balance: float
     ) -> tuple[float, List[float]]:
         """
         Calculate buy-and-hold benchmark return.
 
         Args:
-            candles: List of candle data
+            candles: Candle buffer or list of candle data
             initial_balance: Starting balance
 
         Returns:
             Tuple of (buy_hold_return_percent, buy_hold_equity_curve)
         """
-        if not candles or len(candles) < 2:
+        if candles is None or len(candles) < 2:
             return 0.0, [initial_balance]
 
-        first_price = candles[0]["close"]
-        last_price = candles[-1]["close"]
+        closes = (
+            candles.close
+            if isinstance(candles, CandleBuffer)
+            else np.array([candle["close"] for candle in candles], dtype=np.float64)
+        )
+        first_price = float(closes[0])
+        last_price = float(closes[-1])
 
         buy_hold_return = ((last_price - first_price) / first_price) * 100
 
         # Calculate buy-hold equity curve
-        buy_hold_curve = []
-        for candle in candles:
-            price_change = (candle["close"] - first_price) / first_price
-            equity = initial_balance * (1 + price_change)
-            buy_hold_curve.append(round(equity, 2))
+        equity = initial_balance * (1 + (closes - first_price) / first_price)
+        buy_hold_curve = [round(value, 2) for value in equity.tolist()]
 
         return round(buy_hold_return, 2), buy_hold_curve
 
-    def _calculate_time_period_metrics(
-        self, trades: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """
-        Calculate time period performance metrics from trades.
-
-        Groups trades by month, day of week, and hour of day to identify
-        temporal patterns in strategy performance.
-
-        Args:
-            trades: List of trade dictionaries with entry_time and pnl
-
-        Returns:
-            Dict containing monthly_performance, day_of_week_performance,
-            hourly_performance, and day_hour_heatmap
-        """
-        from collections import defaultdict
-
-        if not trades:
-            return {
-                "monthly_performance": None,
-                "day_of_week_performance": None,
-                "hourly_performance": None,
-                "day_hour_heatmap": None,
-            }
-
-        # Initialize aggregation structures
-        monthly_data = defaultdict(lambda: {"trades": 0, "wins": 0, "pnl": 0.0})
-        day_of_week_data = defaultdict(lambda: {"trades": 0, "wins": 0, "pnl": 0.0})
-        hourly_data = defaultdict(lambda: {"trades": 0, "wins": 0, "pnl": 0.0})
-        day_hour_data = defaultdict(lambda: {"trades": 0, "pnl": 0.0})
-
-        day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-
-        for trade in trades:
-            entry_time = trade.get("entry_time")
-            pnl = trade.get("pnl", 0)
-
-            if entry_time is None:
-                continue
-
-            # Parse entry_time if string
-            if isinstance(entry_time, str):
-                try:
-                    entry_time = datetime.fromisoformat(entry_time.replace("Z", "+00:00"))
-                    if entry_time.tzinfo is not None:
-                        entry_time = entry_time.replace(tzinfo=None)
-                except (ValueError, TypeError):
-                    continue
-
-            if not hasattr(entry_time, "month"):
-                continue
-
-            # Extract time components
-            month_key = entry_time.strftime("%Y-%m")
-            day_of_week = entry_time.weekday()  # 0=Monday, 6=Sunday
-            hour = entry_time.hour
-
-            is_winner = pnl > 0
-
-            # Aggregate monthly data
-            monthly_data[month_key]["trades"] += 1
-            monthly_data[month_key]["pnl"] += pnl
-            if is_winner:
-                monthly_data[month_key]["wins"] += 1
-
-            # Aggregate day of week data
-            day_of_week_data[day_of_week]["trades"] += 1
-            day_of_week_data[day_of_week]["pnl"] += pnl
-            if is_winner:
-                day_of_week_data[day_of_week]["wins"] += 1
-
-            # Aggregate hourly data
-            hourly_data[hour]["trades"] += 1
-            hourly_data[hour]["pnl"] += pnl
-            if is_winner:
-                hourly_data[hour]["wins"] += 1
-
-            # Aggregate day-hour heatmap data
-            day_hour_key = (day_of_week, hour)
-            day_hour_data[day_hour_key]["trades"] += 1
-            day_hour_data[day_hour_key]["pnl"] += pnl
-
-        # Convert to output format with best/worst identification
-
-        # Monthly performance
-        monthly_performance = []
-        for month_key in sorted(monthly_data.keys()):
-            data = monthly_data[month_key]
-            win_rate = (data["wins"] / data["trades"] * 100) if data["trades"] > 0 else 0.0
-            monthly_performance.append({
-                "month": month_key,
-                "trades": data["trades"],
-                "win_rate": round(win_rate, 1),
-                "net_pnl": round(data["pnl"], 2),
-                "is_best": False,
-                "is_worst": False,
-            })
-
-        # Identify best/worst months by net P/L
-        if monthly_performance:
-            pnl_values = [m["net_pnl"] for m in monthly_performance]
-            max_pnl = max(pnl_values)
-            min_pnl = min(pnl_values)
-            for m in monthly_performance:
-                if m["net_pnl"] == max_pnl:
-                    m["is_best"] = True
-                if m["net_pnl"] == min_pnl:
-                    m["is_worst"] = True
-
-        # Day of week performance
-        day_of_week_performance = []
-        for day in range(7):
-            if day in day_of_week_data:
-                data = day_of_week_data[day]
-                win_rate = (data["wins"] / data["trades"] * 100) if data["trades"] > 0 else 0.0
-                day_of_week_performance.append({
-                    "day": day,
-                    "day_name": day_names[day],
-                    "trades": data["trades"],
-                    "win_rate": round(win_rate, 1),
-                    "net_pnl": round(data["pnl"], 2),
-                    "is_best": False,
-                    "is_worst": False,
-                })
-            else:
-                day_of_week_performance.append({
-                    "day": day,
-                    "day_name": day_names[day],
-                    "trades": 0,
-                    "win_rate": 0.0,
-                    "net_pnl": 0.0,
-                    "is_best": False,
-                    "is_worst": False,
-                })
-
-        # Identify best/worst days by net P/L (only among days with trades)
-        days_with_trades = [d for d in day_of_week_performance if d["trades"] > 0]
-        if days_with_trades:
-            pnl_values = [d["net_pnl"] for d in days_with_trades]
-            max_pnl = max(pnl_values)
-            min_pnl = min(pnl_values)
-            for d in day_of_week_performance:
-                if d["trades"] > 0:
-                    if d["net_pnl"] == max_pnl:
-                        d["is_best"] = True
-                    if d["net_pnl"] == min_pnl:
-                        d["is_worst"] = True
-
-        # Hourly performance
-        hourly_performance = []
-        for hour in range(24):
-            if hour in hourly_data:
-                data = hourly_data[hour]
-                win_rate = (data["wins"] / data["trades"] * 100) if data["trades"] > 0 else 0.0
-                hourly_performance.append({
-                    "hour": hour,
-                    "trades": data["trades"],
-                    "win_rate": round(win_rate, 1),
-                    "net_pnl": round(data["pnl"], 2),
-                    "is_best": False,
-                    "is_worst": False,
-                })
-            else:
-                hourly_performance.append({
-                    "hour": hour,
-                    "trades": 0,
-                    "win_rate": 0.0,
-                    "net_pnl": 0.0,
-                    "is_best": False,
-                    "is_worst": False,
-                })
-
-        # Identify best/worst hours by net P/L (only among hours with trades)
-        hours_with_trades = [h for h in hourly_performance if h["trades"] > 0]
-        if hours_with_trades:
-            pnl_values = [h["net_pnl"] for h in hours_with_trades]
-            max_pnl = max(pnl_values)
-            min_pnl = min(pnl_values)
-            for h in hourly_performance:
-                if h["trades"] > 0:
-                    if h["net_pnl"] == max_pnl:
-                        h["is_best"] = True
-                    if h["net_pnl"] == min_pnl:
-                        h["is_worst"] = True
-
-        # Day-hour heatmap
-        day_hour_heatmap = []
-        for day in range(7):
-            for hour in range(24):
-                key = (day, hour)
-                if key in day_hour_data:
-                    data = day_hour_data[key]
-                    day_hour_heatmap.append({
-                        "day": day,
-                        "hour": hour,
-                        "net_pnl": round(data["pnl"], 2),
-                        "trades": data["trades"],
-                    })
-                else:
-                    day_hour_heatmap.append({
-                        "day": day,
-                        "hour": hour,
-                        "net_pnl": 0.0,
-                        "trades": 0,
-                    })
-
-        return {
-            "monthly_performance": monthly_performance if monthly_performance else None,
-            "day_of_week_performance": day_of_week_performance if day_of_week_performance else None,
-            "hourly_performance": hourly_performance if hourly_performance else None,
-            "day_hour_heatmap": day_hour_heatmap if day_hour_heatmap else None,
-        }
-
     def _calculate_consecutive_streaks(self, trades: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Calculate consecutive win/loss streaks from trade history.
@@ -1240,59 +2137,7 @@ class BacktestExecutor:
             Dict with max_consecutive_wins, max_consecutive_losses,
             avg_consecutive_wins, avg_consecutive_losses
         """
-        if not trades:
-            return {
-                "max_consecutive_wins": 0,
-                "max_consecutive_losses": 0,
-                "avg_consecutive_wins": 0.0,
-                "avg_consecutive_losses": 0.0,
-            }
-
-        # Track streaks
-        win_streaks = []
-        loss_streaks = []
-        current_streak = 0
-        current_type = None  # 'win' or 'loss'
-
-        for trade in trades:
-            pnl = trade.get("pnl", 0)
-            is_win = pnl > 0
-
-            if current_type is None:
-                # First trade
-                current_type = "win" if is_win else "loss"
-                current_streak = 1
-            elif (is_win and current_type == "win") or (not is_win and current_type == "loss"):
-                # Same type, continue streak
-                current_streak += 1
-            else:
-                # Type changed, record streak and start new one
-                if current_type == "win":
-                    win_streaks.append(current_streak)
-                else:
-                    loss_streaks.append(current_streak)
-                current_type = "win" if is_win else "loss"
-                current_streak = 1
-
-        # Don't forget the last streak
-        if current_streak > 0 and current_type:
-            if current_type == "win":
-                win_streaks.append(current_streak)
-            else:
-                loss_streaks.append(current_streak)
-
-        # Calculate stats
-        max_wins = max(win_streaks) if win_streaks else 0
-        max_losses = max(loss_streaks) if loss_streaks else 0
-        avg_wins = sum(win_streaks) / len(win_streaks) if win_streaks else 0.0
-        avg_losses = sum(loss_streaks) / len(loss_streaks) if loss_streaks else 0.0
-
-        return {
-            "max_consecutive_wins": max_wins,
-            "max_consecutive_losses": max_losses,
-            "avg_consecutive_wins": round(avg_wins, 1),
-            "avg_consecutive_losses": round(avg_losses, 1),
-        }
+        return streak_summary(np.array([trade.get("pnl", 0) for trade in trades]) > 0)
 
     def _calculate_win_loss_distribution(
         self, trades: List[Dict[str, Any]], num_buckets: int = 20
@@ -1307,50 +2152,7 @@ class BacktestExecutor:
         Returns:
             List of bucket dicts with bucket_min, bucket_max, count, is_winner
         """
-        if not trades:
-            return []
-
-        pnl_values = [t.get("pnl", 0) for t in trades]
-        min_pnl = min(pnl_values)
-        max_pnl = max(pnl_values)
-
-        # Handle edge case where all trades have same P/L
-        if min_pnl == max_pnl:
-            return [
-                {
-                    "bucket_min": min_pnl,
-                    "bucket_max": max_pnl,
-                    "count": len(trades),
-                    "is_winner": min_pnl > 0,
-                }
-            ]
-
-        # Calculate bucket size
-        bucket_size = (max_pnl - min_pnl) / num_buckets
-        buckets = []
-
-        for i in range(num_buckets):
-            bucket_min = min_pnl + i * bucket_size
-            bucket_max = min_pnl + (i + 1) * bucket_size
-
-            # Count trades in this bucket
-            count = sum(
-                1
-                for pnl in pnl_values
-                if (bucket_min <= pnl < bucket_max) or (i == num_buckets - 1 and pnl == max_pnl)
-            )
-
-            if count > 0:
-                buckets.append(
-                    {
-                        "bucket_min": round(bucket_min, 2),
-                        "bucket_max": round(bucket_max, 2),
-                        "count": count,
-                        "is_winner": (bucket_min + bucket_max) / 2 > 0,
-                    }
-                )
-
-        return buckets
+        return pnl_distribution([t.get("pnl", 0) for t in trades], num_buckets)
 
     def _calculate_holding_period_distribution(
         self, trades: List[Dict[str, Any]], num_buckets: int = 15
@@ -1365,75 +2167,10 @@ class BacktestExecutor:
         Returns:
             List of bucket dicts with bucket_min_minutes, bucket_max_minutes, count
         """
-        if not trades:
-            return []
-
-        durations = []
-        for trade in trades:
-            entry_time = trade.get("entry_time")
-            exit_time = trade.get("exit_time")
-
-            if entry_time and exit_time:
-                try:
-                    # Parse times if strings
-                    if isinstance(entry_time, str):
-                        entry_time = datetime.fromisoformat(entry_time.replace("Z", "+00:00"))
-                        if entry_time.tzinfo is not None:
-                            entry_time = entry_time.replace(tzinfo=None)
-                    if isinstance(exit_time, str):
-                        exit_time = datetime.fromisoformat(exit_time.replace("Z", "+00:00"))
-                        if exit_time.tzinfo is not None:
-                            exit_time = exit_time.replace(tzinfo=None)
-
-                    if hasattr(entry_time, "timestamp") and hasattr(exit_time, "timestamp"):
-                        duration_minutes = (exit_time - entry_time).total_seconds() / 60
-                        if duration_minutes >= 0:
-                            durations.append(duration_minutes)
-                except (ValueError, TypeError):
-                    continue
-
-        if not durations:
-            return []
-
-        min_duration = min(durations)
-        max_duration = max(durations)
-
-        # Handle edge case where all durations are the same
-        if min_duration == max_duration:
-            return [
-                {
-                    "bucket_min_minutes": round(min_duration, 2),
-                    "bucket_max_minutes": round(max_duration, 2),
-                    "count": len(durations),
-                }
-            ]
-
-        # Calculate bucket size
-        bucket_size = (max_duration - min_duration) / num_buckets
-        buckets = []
-
-        for i in range(num_buckets):
-            bucket_min = min_duration + i * bucket_size
-            bucket_max = min_duration + (i + 1) * bucket_size
-
-            # Count durations in this bucket
-            count = sum(
-                1
-                for d in durations
-                if (bucket_min <= d < bucket_max)
-                or (i == num_buckets - 1 and d == max_duration)
-            )
-
-            if count > 0:
-                buckets.append(
-                    {
-                        "bucket_min_minutes": round(bucket_min, 2),
-                        "bucket_max_minutes": round(bucket_max, 2),
-                        "count": count,
-                    }
-                )
-
-        return buckets
+        durations = [trade_duration_minutes(trade) for trade in trades]
+        return holding_period_distribution(
+            [d for d in durations if d is not None], num_buckets
+        )
 
     def _calculate_pl_scatter_data(self, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -1468,6 +2205,38 @@ class BacktestExecutor:
 
         return scatter_data
 
+    def _calculate_monte_carlo(
+        self,
+        trades: List[Dict[str, Any]],
+        initial_balance: float,
+        ruin_threshold: float = 0.5,
+        simulations: int = 10000,
+    ) -> Optional[MonteCarloResult]:
+        """
+        Run the Monte Carlo trade resampling behind risk of ruin and equity bands.
+
+        Args:
+            trades: List of trade dictionaries with pnl field
+            initial_balance: Starting account balance
+            ruin_threshold: Fraction of account lost to trigger "ruin" (0.5 = 50%)
+            simulations: Maximum number of Monte Carlo simulations
+
+        Returns:
+            MonteCarloResult, or None with fewer than 5 trades
+        """
+        if not trades or len(trades) < 5:
+            return None
+
+        return simulate_trade_paths(
+            [t.get("pnl", 0) for t in trades],
+            initial_balance,
+            ruin_threshold=ruin_threshold,
+            max_simulations=simulations,
+            min_simulations=min(settings.MONTE_CARLO_MIN_SIMULATIONS, simulations),
+            tolerance=settings.MONTE_CARLO_TOLERANCE,
+            seed=settings.MONTE_CARLO_SEED,
+        )
+
     def _calculate_risk_of_ruin(
         self,
         trades: List[Dict[str, Any]],
@@ -1479,42 +2248,22 @@ class BacktestExecutor:
         Calculate probability of account ruin using Monte Carlo simulation.
 
         Resamples trade returns with replacement to simulate many possible
-        equity paths. Counts how many paths hit the ruin threshold.
+        equity paths. Counts how many paths hit the ruin threshold; stops
+        early once the estimate has converged.
 
         Args:
             trades: List of trade dictionaries with pnl field
             initial_balance: Starting account balance
             ruin_threshold: Fraction of account lost to trigger "ruin" (0.5 = 50%)
-            simulations: Number of Monte Carlo simulations
+            simulations: Maximum number of Monte Carlo simulations
 
         Returns:
             Tuple of (risk_of_ruin probability, simulation count)
         """
-        import random
-
-        if not trades or len(trades) < 5:
+        result = self._calculate_monte_carlo(trades, initial_balance, ruin_threshold, simulations)
+        if result is None:
             return None, simulations
-
-        # Extract P/L values as returns
-        pnl_values = [t.get("pnl", 0) for t in trades]
-
-        ruin_count = 0
-        ruin_balance = initial_balance * (1 - ruin_threshold)
-
-        for _ in range(simulations):
-            # Simulate one equity path by resampling trades
-            balance = initial_balance
-            for _ in range(len(pnl_values)):
-                # Random sample with replacement
-                sampled_pnl = random.choice(pnl_values)
-                balance += sampled_pnl
-
-                if balance <= ruin_balance:
-                    ruin_count += 1
-                    break
-
-        risk_of_ruin = (ruin_count / simulations) * 100
-        return round(risk_of_ruin, 2), simulations
+        return result.risk_of_ruin, result.simulations
 
     def _calculate_drawdown_durations(
         self,
@@ -1531,128 +2280,7 @@ class BacktestExecutor:
         Returns:
             Dict with avg_duration_minutes, max_duration_minutes, and list of durations
         """
-        if len(equity_curve) < 2:
-            return {
-                "avg_drawdown_duration_minutes": None,
-                "max_drawdown_duration_minutes": None,
-                "drawdown_durations": [],
-            }
-
-        # Identify drawdown periods
-        peak = equity_curve[0]
-        peak_index = 0
-        in_drawdown = False
-        drawdown_start = 0
-        durations = []
-
-        for i, equity in enumerate(equity_curve):
-            if equity >= peak:
-                # New peak or recovery
-                if in_drawdown:
-                    # End of drawdown period - calculate duration
-                    if equity_dates and len(equity_dates) > i and len(equity_dates) > drawdown_start:
-                        try:
-                            start_time = datetime.fromisoformat(
-                                equity_dates[drawdown_start].replace("Z", "+00:00")
-                            )
-                            end_time = datetime.fromisoformat(
-                                equity_dates[i].replace("Z", "+00:00")
-                            )
-                            if start_time.tzinfo:
-                                start_time = start_time.replace(tzinfo=None)
-                            if end_time.tzinfo:
-                                end_time = end_time.replace(tzinfo=None)
-                            duration_minutes = (end_time - start_time).total_seconds() / 60
-                            durations.append(
-                                {
-                                    "start_index": drawdown_start,
-                                    "end_index": i,
-                                    "duration_minutes": round(duration_minutes, 2),
-                                }
-                            )
-                        except (ValueError, TypeError):
-                            # Fallback: use index difference
-                            durations.append(
-                                {
-                                    "start_index": drawdown_start,
-                                    "end_index": i,
-                                    "duration_minutes": (i - drawdown_start) * 60,  # Assume 1 hour per candle
-                                }
-                            )
-                    else:
-                        # No date info, use index as proxy (assume 1 hour per candle)
-                        durations.append(
-                            {
-                                "start_index": drawdown_start,
-                                "end_index": i,
-                                "duration_minutes": (i - drawdown_start) * 60,
-                            }
-                        )
-                    in_drawdown = False
-
-                peak = equity
-                peak_index = i
-            else:
-                # In drawdown
-                if not in_drawdown:
-                    in_drawdown = True
-                    drawdown_start = peak_index
-
-        # Handle case where we end in a drawdown
-        if in_drawdown:
-            i = len(equity_curve) - 1
-            if equity_dates and len(equity_dates) > i and len(equity_dates) > drawdown_start:
-                try:
-                    start_time = datetime.fromisoformat(
-                        equity_dates[drawdown_start].replace("Z", "+00:00")
-                    )
-                    end_time = datetime.fromisoformat(equity_dates[i].replace("Z", "+00:00"))
-                    if start_time.tzinfo:
-                        start_time = start_time.replace(tzinfo=None)
-                    if end_time.tzinfo:
-                        end_time = end_time.replace(tzinfo=None)
-                    duration_minutes = (end_time - start_time).total_seconds() / 60
-                    durations.append(
-                        {
-                            "start_index": drawdown_start,
-                            "end_index": i,
-                            "duration_minutes": round(duration_minutes, 2),
-                        }
-                    )
-                except (ValueError, TypeError):
-                    durations.append(
-                        {
-                            "start_index": drawdown_start,
-                            "end_index": i,
-                            "duration_minutes": (i - drawdown_start) * 60,
-                        }
-                    )
-            else:
-                durations.append(
-                    {
-                        "start_index": drawdown_start,
-                        "end_index": i,
-                        "duration_minutes": (i - drawdown_start) * 60,
-                    }
-                )
-
-        # Calculate stats
-        if not durations:
-            return {
-                "avg_drawdown_duration_minutes": None,
-                "max_drawdown_duration_minutes": None,
-                "drawdown_durations": [],
-            }
-
-        duration_values = [d["duration_minutes"] for d in durations]
-        avg_duration = sum(duration_values) / len(duration_values)
-        max_duration = max(duration_values)
-
-        return {
-            "avg_drawdown_duration_minutes": round(avg_duration, 2),
-            "max_drawdown_duration_minutes": round(max_duration, 2),
-            "drawdown_durations": durations,
-        }
+        return EquityAnalytics.from_dates(equity_curve, equity_dates).drawdown_durations()
 
     def _calculate_var(
         self, trades: List[Dict[str, Any]], confidence_levels: List[float] = None
@@ -1671,27 +2299,7 @@ class BacktestExecutor:
         """
         if confidence_levels is None:
             confidence_levels = [0.95, 0.99]
-
-        if not trades or len(trades) < 5:
-            return {"var_95": None, "var_99": None}
-
-        # Get sorted P/L values (ascending)
-        pnl_values = sorted([t.get("pnl", 0) for t in trades])
-        n = len(pnl_values)
-
-        result = {}
-        for level in confidence_levels:
-            # VaR at X% confidence = (1-X)th percentile of returns
-            # For 95% confidence, we want the 5th percentile (worst 5%)
-            percentile = 1 - level
-            index = int(percentile * n)
-            index = max(0, min(index, n - 1))  # Clamp to valid range
-
-            var_value = pnl_values[index]
-            key = f"var_{int(level * 100)}"
-            result[key] = round(var_value, 2)
-
-        return result
+        return value_at_risk([t.get("pnl", 0) for t in trades], confidence_levels)
 
     def _calculate_average_trade_duration(self, trades: List[Dict[str, Any]]) -> float:
         """
@@ -1703,43 +2311,11 @@ class BacktestExecutor:
         Returns:
             Average duration in minutes
         """
-        if not trades:
-            return 0.0
-
-        total_duration_minutes = 0.0
-        valid_trades = 0
-
-        for trade in trades:
-            entry_time = trade.get("entry_time")
-            exit_time = trade.get("exit_time")
-
-            if entry_time and exit_time:
-                try:
-                    # Parse times if they're strings
-                    if isinstance(entry_time, str):
-                        entry_time = datetime.fromisoformat(entry_time.replace("Z", "+00:00"))
-                        # Normalize to timezone-naive for consistent comparisons
-                        if entry_time.tzinfo is not None:
-                            entry_time = entry_time.replace(tzinfo=None)
-                    if isinstance(exit_time, str):
-                        exit_time = datetime.fromisoformat(exit_time.replace("Z", "+00:00"))
-                        # Normalize to timezone-naive for consistent comparisons
-                        if exit_time.tzinfo is not None:
-                            exit_time = exit_time.replace(tzinfo=None)
-
-                    # Ensure both are datetime objects
-                    if hasattr(entry_time, "timestamp") and hasattr(exit_time, "timestamp"):
-                        duration = (exit_time - entry_time).total_seconds() / 60
-                        if duration >= 0:
-                            total_duration_minutes += duration
-                            valid_trades += 1
-                except (ValueError, TypeError):
-                    continue
-
-        if valid_trades == 0:
+        durations = [trade_duration_minutes(trade) for trade in trades]
+        durations = [d for d in durations if d is not None]
+        if not durations:
             return 0.0
-
-        return round(total_duration_minutes / valid_trades, 2)
+        return round(sum(durations) / len(durations), 2)
 
     def _calculate_results(
         self,
@@ -1747,20 +2323,21 @@ class BacktestExecutor:
         initial_balance: float,
         final_balance: float,
         equity_curve: Optional[List[float]] = None,
-        candles: Optional[List[Dict[str, Any]]] = None,
+        candles: Optional[Union[CandleBuffer, List[Dict[str, Any]]]] = None,
+        ledger: Optional[TradeLedger] = None,
     ) -> Dict[str, Any]:
-        """Calculate comprehensive backtest results summary."""
+        """
+        Calculate comprehensive backtest results summary.
+
+        Every trade-derived metric comes from one TradeAnalytics stage over
+        the columnar ledger; pass the ledger if the caller already built it.
+        """
+        candles = CandleBuffer.coerce(candles) if candles is not None else None
+
         # Handle empty trades case
         if not trades:
             # Extract dates from candles
-            equity_curve_dates = []
-            if candles:
-                equity_curve_dates = [
-                    candle["time"].isoformat()
-                    if hasattr(candle["time"], "isoformat")
-                    else candle["time"]
-                    for candle in candles
-                ]
+            equity_curve_dates = candles.iso_times() if candles else []
 
             return BacktestResultsSummary(
                 total_net_profit=0.0,
@@ -1793,42 +2370,6 @@ class BacktestExecutor:
                 trades=[],
             ).model_dump()
 
-        # Categorize trades
-        winning_trade_list = [t for t in trades if t.get("pnl", 0) > 0]
-        losing_trade_list = [t for t in trades if t.get("pnl", 0) < 0]
-
-        # Calculate basic metrics
-        total_trades = len(trades)
-        num_winning = len(winning_trade_list)
-        num_losing = len(losing_trade_list)
-        win_rate = (num_winning / total_trades * 100) if total_trades > 0 else 0.0
-
-        # Calculate P/L metrics
-        total_wins = sum(t.get("pnl", 0) for t in winning_trade_list)
-        total_losses = abs(sum(t.get("pnl", 0) for t in losing_trade_list))
-
-        avg_win = (total_wins / num_winning) if num_winning > 0 else 0.0
-        avg_loss = (total_losses / num_losing) if num_losing > 0 else 0.0
-        win_loss_ratio = (avg_win / avg_loss) if avg_loss > 0 else 0.0
-
-        # Find largest win/loss
-        pnl_values = [t.get("pnl", 0) for t in trades]
-        largest_win = max(pnl_values) if pnl_values else 0.0
-        largest_loss = abs(min(pnl_values)) if pnl_values else 0.0
-
-        # Calculate profit factor
-        profit_factor = (total_wins / total_losses) if total_losses > 0 else 0.0
-
-        # Calculate total P/L and ROI
-        total_net_profit = final_balance - initial_balance
-        roi = (total_net_profit / initial_balance * 100) if initial_balance > 0 else 0.0
-
-        # Calculate expectancy
-        expectancy = self._calculate_expectancy(win_rate, avg_win, avg_loss)
-
-        # Calculate average trade duration
-        avg_duration = self._calculate_average_trade_duration(trades)
-
         # Build full equity curve if not provided
         if equity_curve is None or len(equity_curve) < 2:
             # Reconstruct from trades
@@ -1838,25 +2379,13 @@ class BacktestExecutor:
                 running_balance += trade.get("pnl", 0)
                 equity_curve.append(round(running_balance, 2))
 
-        # Calculate max drawdown
-        max_dd_dollars, max_dd_percent = self._calculate_max_drawdown(equity_curve)
-
-        # Calculate recovery factor
-        recovery_factor = self._calculate_recovery_factor(total_net_profit, max_dd_dollars)
-
-        # Calculate daily returns for Sharpe/Sortino
-        daily_returns = []
-        if len(equity_curve) >= 2:
-            for i in range(1, len(equity_curve)):
-                if equity_curve[i - 1] > 0:
-                    daily_return = (
-                        (equity_curve[i] - equity_curve[i - 1]) / equity_curve[i - 1] * 100
-                    )
-                    daily_returns.append(daily_return)
-
-        # Calculate Sharpe and Sortino ratios
-        sharpe_ratio = self._calculate_sharpe_ratio(daily_returns)
-        sortino_ratio = self._calculate_sortino_ratio(daily_returns)
+        analytics = TradeAnalytics(
+            ledger if ledger is not None else TradeLedger.from_trades(trades),
+            initial_balance,
+            equity_curve,
+            start_time=candles.datetime_at(0) if candles else trades[0].get("entry_time"),
+        )
+        summary = analytics.summary(final_balance)
 
         # Calculate buy-and-hold benchmark
         buy_hold_return = 0.0
@@ -1867,104 +2396,51 @@ class BacktestExecutor:
             )
 
         # Calculate strategy vs benchmark
+        roi = 0.0
+        if initial_balance > 0:
+            roi = (final_balance - initial_balance) / initial_balance * 100
         strategy_vs_benchmark = roi - buy_hold_return
 
         # Extract dates from candles for equity curve
-        equity_curve_dates = []
-        if candles:
-            equity_curve_dates = [
-                candle["time"].isoformat()
-                if hasattr(candle["time"], "isoformat")
-                else candle["time"]
-                for candle in candles
-            ]
-
-        # Calculate trade counts per candle
-        trade_counts_per_candle = [0] * len(candles) if candles else []
-        if candles and trades:
-            # Create a mapping of candle times to indices
-            for trade in trades:
-                exit_time = trade.get("exit_time")
-                if exit_time and candles:
-                    # Convert exit_time to datetime if string
-                    if isinstance(exit_time, str):
-                        try:
-                            exit_time = datetime.fromisoformat(exit_time.replace("Z", "+00:00"))
-                            # Normalize to timezone-naive for consistent comparisons with candle times
-                            if exit_time.tzinfo is not None:
-                                exit_time = exit_time.replace(tzinfo=None)
-                        except (ValueError, TypeError):
-                            continue
-                    elif isinstance(exit_time, datetime):
-                        # Also normalize datetime objects that might have timezone info
-                        if exit_time.tzinfo is not None:
-                            exit_time = exit_time.replace(tzinfo=None)
-
-                    # Find the closest candle index
-                    for i, candle in enumerate(candles):
-                        candle_time = candle["time"]
-                        if isinstance(candle_time, str):
-                            try:
-                                candle_time = datetime.fromisoformat(
-                                    candle_time.replace("Z", "+00:00")
-                                )
-                                # Normalize to timezone-naive for consistent comparisons
-                                if candle_time.tzinfo is not None:
-                                    candle_time = candle_time.replace(tzinfo=None)
-                            except (ValueError, TypeError):
-                                continue
-                        elif isinstance(candle_time, datetime):
-                            # Also normalize datetime objects that might have timezone info
-                            if candle_time.tzinfo is not None:
-                                candle_time = candle_time.replace(tzinfo=None)
-
-                        # Check if trade exit is at or before this candle
-                        if hasattr(exit_time, "timestamp") and hasattr(candle_time, "timestamp"):
-                            if exit_time <= candle_time:
-                                trade_counts_per_candle[i] += 1
-                                break
-
-        # Identify drawdown periods
-        drawdown_periods = self._identify_drawdown_periods(equity_curve)
-
-        # Calculate time period metrics
-        time_period_metrics = self._calculate_time_period_metrics(trades)
-
-        # Calculate risk analytics metrics
-        streak_metrics = self._calculate_consecutive_streaks(trades)
-        win_loss_distribution = self._calculate_win_loss_distribution(trades)
-        holding_period_distribution = self._calculate_holding_period_distribution(trades)
-        pl_scatter_data = self._calculate_pl_scatter_data(trades)
-        risk_of_ruin, risk_of_ruin_simulations = self._calculate_risk_of_ruin(
-            trades, initial_balance
-        )
-        drawdown_duration_metrics = self._calculate_drawdown_durations(
-            equity_curve, equity_curve_dates
+        equity_curve_dates = candles.iso_times() if candles else []
+
+        # Calculate trade counts per candle (each trade on the first candle at or after its exit)
+        trade_counts_per_candle = (
+            candles.counts_per_candle(analytics.ledger.exit_time).tolist() if candles else []
         )
-        var_metrics = self._calculate_var(trades)
+
+        # Distributions, period tables and risk metrics from the same analytics stage
+        drawdown_periods = analytics.equity.drawdown_periods()
+        time_period_metrics = analytics.time_period_metrics()
+        win_loss_distribution = analytics.win_loss_distribution()
+        holding_period_distribution = analytics.holding_period_distribution()
+        pl_scatter_data = analytics.pl_scatter_data()
+        monte_carlo = self._calculate_monte_carlo(trades, initial_balance)
+        drawdown_duration_metrics = analytics.equity.drawdown_durations()
+        var_metrics = analytics.value_at_risk()
 
         # Build the results summary
         results = BacktestResultsSummary(
-            total_net_profit=round(total_net_profit, 2),
-            return_on_investment=round(roi, 2),
-            final_balance=round(final_balance, 2),
-            total_trades=total_trades,
-            winning_trades=num_winning,
-            losing_trades=num_losing,
-            win_rate=round(win_rate, 1),
-            profit_factor=round(profit_factor, 2),
-            average_win=round(avg_win, 2),
-            average_loss=round(avg_loss, 2),
-            win_loss_ratio=round(win_loss_ratio, 2),
-            largest_win=round(largest_win, 2),
-            largest_loss=round(largest_loss, 2),
-            expectancy=round(expectancy, 2),
-            average_trade_duration_minutes=avg_duration,
-            max_drawdown_dollars=max_dd_dollars,
-            max_drawdown_percent=max_dd_percent,
-            recovery_factor=recovery_factor,
-            sharpe_ratio=sharpe_ratio,
-            sortino_ratio=sortino_ratio,
+            total_net_profit=summary["total_net_profit"],
+            return_on_investment=summary["return_on_investment"],
+            final_balance=summary["final_balance"],
+            total_trades=summary["total_trades"],
+            winning_trades=summary["winning_trades"],
+            losing_trades=summary["losing_trades"],
+            win_rate=summary["win_rate"],
+            profit_factor=summary["profit_factor"],
+            average_win=summary["average_win"],
+            average_loss=summary["average_loss"],
+            win_loss_ratio=summary["win_loss_ratio"],
+            largest_win=summary["largest_win"],
+            largest_loss=summary["largest_loss"],
+            expectancy=summary["expectancy"],
+            average_trade_duration_minutes=summary["average_trade_duration_minutes"],
+            max_drawdown_dollars=summary["max_drawdown_dollars"],
+            max_drawdown_percent=summary["max_drawdown_percent"],
+            recovery_factor=summary["recovery_factor"],
+            sharpe_ratio=summary["sharpe_ratio"],
+            sortino_ratio=summary["sortino_ratio"],
             buy_hold_return=buy_hold_return,
             strategy_vs_benchmark=round(strategy_vs_benchmark, 2),
             equity_curve=equity_curve,
@@ -1978,17 +2454,18 @@ class BacktestExecutor:
             hourly_performance=time_period_metrics["hourly_performance"],
             day_hour_heatmap=time_period_metrics["day_hour_heatmap"],
             # Risk analytics fields
-            max_consecutive_wins=streak_metrics["max_consecutive_wins"],
-            max_consecutive_losses=streak_metrics["max_consecutive_losses"],
-            avg_consecutive_wins=streak_metrics["avg_consecutive_wins"],
-            avg_consecutive_losses=streak_metrics["avg_consecutive_losses"],
+            max_consecutive_wins=summary["max_consecutive_wins"],
+            max_consecutive_losses=summary["max_consecutive_losses"],
+            avg_consecutive_wins=summary["avg_consecutive_wins"],
+            avg_consecutive_losses=summary["avg_consecutive_losses"],
             win_loss_distribution=win_loss_distribution if win_loss_distribution else None,
             holding_period_distribution=(
                 holding_period_distribution if holding_period_distribution else None
             ),
             pl_scatter_data=pl_scatter_data if pl_scatter_data else None,
-            risk_of_ruin=risk_of_ruin,
-            risk_of_ruin_simulations=risk_of_ruin_simulations,
+            risk_of_ruin=monte_carlo.risk_of_ruin if monte_carlo else None,
+            risk_of_ruin_simulations=monte_carlo.simulations if monte_carlo else 10000,
+            monte_carlo_equity_bands=monte_carlo.bands if monte_carlo else None,
             avg_drawdown_duration_minutes=drawdown_duration_metrics["avg_drawdown_duration_minutes"],
             max_drawdown_duration_minutes=drawdown_duration_metrics["max_drawdown_duration_minutes"],
             drawdown_durations=(
@@ -2002,11 +2479,35 @@ class BacktestExecutor:
 
         return results.model_dump()
 
+    def _complete_from_cache(
+        self,
+        backtest_id: str,
+        execution: BacktestExecution,
+        results: Dict[str, Any],
+        ledger: TradeLedger,
+    ):
+        """Complete a run with the results of an identical earlier run."""
+        logger.info(f"[BACKTEST_EXECUTOR] Backtest {backtest_id} served from the result cache")
+        with self._executions_lock:
+            execution.candles_processed = execution.total_candles
+            execution.trade_count = len(ledger)
+
+        self._complete_backtest(backtest_id, results, ledger)
+        self._discard_checkpoint(backtest_id)
+
+        with self._executions_lock:
+            execution.status = "completed"
+            execution.progress_percentage = 100
+
     def _handle_cancellation(
         self, backtest_id: str, execution: BacktestExecution, trades: List[Dict]
     ):
         """Handle backtest cancellation."""
-        if execution.keep_partial_on_cancel and trades:
+        # Worker processes learn the keep-partial choice through the shared cancel flag
+        keep_partial = getattr(
+            execution.cancel_event, "keep_partial", execution.keep_partial_on_cancel
+        )
+        if keep_partial and trades:
             # Save partial results
             partial_results = {
                 "partial": True,
@@ -2015,6 +2516,8 @@ class BacktestExecutor:
                 "trades": trades,
                 "trade_count": len(trades),
             }
+            if execution.metrics is not None:
+                partial_results["metrics"] = execution.metrics.summary()
             self._save_partial_results(backtest_id, partial_results)
 
         # Update status back to pending
@@ -2032,6 +2535,8 @@ class BacktestExecutor:
         error_message: Optional[str] = None,
     ):
         """Update backtest status in database."""
+        # A progress write landing after the status would overwrite its progress fields
+        self._progress_publisher.flush(backtest_id)
         if not is_configured():
             return
 
@@ -2094,8 +2599,14 @@ class BacktestExecutor:
         except Exception as e:
             logger.error(f"[BACKTEST_EXECUTOR] Error updating backtest progress: {e}")
 
-    def _complete_backtest(self, backtest_id: str, results: Dict[str, Any]):
-        """Mark backtest as completed and save results."""
+    def _complete_backtest(
+        self,
+        backtest_id: str,
+        results: Dict[str, Any],
+        ledger: Optional[TradeLedger] = None,
+    ):
+        """Mark backtest as completed and save results (and the full trade ledger, if given)."""
+        self._progress_publisher.flush(backtest_id)
         if not is_configured():
             return
 
@@ -2104,6 +2615,9 @@ class BacktestExecutor:
             return
 
         try:
+            if ledger is not None:
+                self._store_trade_ledger(client, backtest_id, ledger)
+            results = self._store_result_series(client, backtest_id, results)
             client.table("backtests").update(
                 {
                     "status": "completed",
@@ -2116,8 +2630,66 @@ class BacktestExecutor:
         except Exception as e:
             logger.error(f"[BACKTEST_EXECUTOR] Error completing backtest: {e}")
 
+    def _store_trade_ledger(self, client: Any, backtest_id: str, ledger: TradeLedger):
+        """
+        Save every trade of a run to ``backtest_trades``.
+
+        Results only keep the last trades; the ledger replaces the one of any
+        earlier run, also when this run has no trades.
+        """
+        try:
+            client.table("backtest_trades").upsert(
+                {
+                    "backtest_id": backtest_id,
+                    "encoding": LEDGER_ENCODING,
+                    "trade_count": len(ledger),
+                    "ledger": ledger.encode(),
+                }
+            ).execute()
+        except Exception as e:
+            logger.error(f"[BACKTEST_EXECUTOR] Error saving trade ledger: {e}")
+
+    def _store_result_series(
+        self, client: Any, backtest_id: str, results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Move long per-candle series out of the results row.
+
+        The full resolution series is saved to ``backtest_series`` and the
+        results keep a downsampled copy. If saving fails the results are
+        returned unchanged, so no data is lost.
+
+        Returns:
+            Results dict to save in the backtests row
+        """
+        series = ResultSeries.from_results(results)
+        max_points = settings.RESULT_SERIES_MAX_POINTS
+        if series is None or len(series) <= max_points:
+            return results
+
+        try:
+            encoded = series.encode()
+            client.table("backtest_series").upsert(
+                {
+                    "backtest_id": backtest_id,
+                    "encoding": encoded["encoding"],
+                    "point_count": len(series),
+                    "series": encoded,
+                }
+            ).execute()
+        except Exception as e:
+            logger.error(f"[BACKTEST_EXECUTOR] Error saving result series, keeping it inline: {e}")
+            return results
+
+        return {
+            **results,
+            **series.downsample(max_points).to_results_fields(),
+            "series_points": len(series),
+        }
+
     def _save_partial_results(self, backtest_id: str, partial_results: Dict[str, Any]):
         """Save partial results for a cancelled backtest."""
+        self._progress_publisher.flush(backtest_id)
         if not is_configured():
             return
 
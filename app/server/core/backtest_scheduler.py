@@ -0,0 +1,230 @@
+"""
+Backtest Scheduler
+==================
+Bounded job queue in front of BacktestExecutor.
+
+Runs are admitted in priority order (higher first, FIFO within a priority)
+while fewer than ``max_concurrent`` are running and the estimated memory of
+the running jobs stays within the memory budget. Memory is estimated from
+the candle count of the requested date range, so a burst of long M1 runs
+queues up instead of exhausting the API host.
+
+Queued jobs are removed lazily: cancelling one only drops it from the
+lookup table, and the stale heap entry is skipped when it reaches the head.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.backtest_validation import calculate_estimated_duration, estimate_candle_count
+
+logger = logging.getLogger(__name__)
+
+# Approximate peak memory per candle of a run: the columnar buffer, signal
+# masks, indicator series and the per-candle result series
+BYTES_PER_CANDLE = 256
+
+# Weight of the newest run when updating the observed candles/second rate
+THROUGHPUT_SMOOTHING = 0.3
+
+
+@dataclass
+class QueuedJob:
+    """A backtest run waiting for (or holding) an execution slot."""
+
+    backtest_id: str
+    priority: int
+    estimated_candles: int
+    estimated_seconds: float
+    payload: Dict[str, Any] = field(default_factory=dict)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+    @property
+    def estimated_bytes(self) -> int:
+        return self.estimated_candles * BYTES_PER_CANDLE
+
+
+def estimate_job(backtest_data: Dict[str, Any]) -> Tuple[int, float]:
+    """
+    Estimate the candle count and duration of a backtest row.
+
+    Returns:
+        Tuple of (estimated_candles, estimated_seconds); (0, 0.0) if the
+        date range cannot be parsed
+    """
+    try:
+        start_date = _parse_date(backtest_data.get("start_date"))
+        end_date = _parse_date(backtest_data.get("end_date"))
+    except (TypeError, ValueError):
+        return 0, 0.0
+
+    timeframe = backtest_data.get("timeframe")
+    candles = estimate_candle_count(timeframe, start_date, end_date)
+    seconds = calculate_estimated_duration(
+        backtest_data.get("pair"), timeframe, start_date, end_date
+    )
+    return candles, float(seconds or 0)
+
+
+def _parse_date(value: Any) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if not isinstance(value, datetime):
+        raise TypeError(f"Invalid date: {value!r}")
+    return value.replace(tzinfo=None)
+
+
+class BacktestScheduler:
+    """
+    Thread-safe priority queue with concurrency and memory admission control.
+
+    Attributes:
+        max_concurrent: Maximum number of running jobs
+        max_queued: Maximum number of waiting jobs
+        memory_budget_bytes: Estimated memory the running jobs may use together
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int, memory_budget_bytes: int):
+        self.max_concurrent = max(max_concurrent, 1)
+        self.max_queued = max_queued
+        self.memory_budget_bytes = memory_budget_bytes
+
+        self._heap: List[Tuple[int, int, str]] = []
+        self._queued: Dict[str, QueuedJob] = {}
+        self._running: Dict[str, QueuedJob] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        # Observed candles/second of finished runs (None until one finishes)
+        self.throughput: Optional[float] = None
+
+    def enqueue(self, job: QueuedJob) -> bool:
+        """
+        Add a job to the queue.
+
+        Returns:
+            False if the queue is full or the backtest is already queued/running
+        """
+        with self._lock:
+            if job.backtest_id in self._queued or job.backtest_id in self._running:
+                return False
+            if len(self._queued) >= self.max_queued:
+                return False
+            self._queued[job.backtest_id] = job
+            heapq.heappush(self._heap, (-job.priority, next(self._sequence), job.backtest_id))
+            return True
+
+    def remove(self, backtest_id: str) -> Optional[QueuedJob]:
+        """Drop a waiting job. Returns the job, or None if it was not queued."""
+        with self._lock:
+            return self._queued.pop(backtest_id, None)
+
+    def pop_ready(self) -> List[QueuedJob]:
+        """
+        Pop every job that can start now and mark it as running.
+
+        Jobs start strictly in queue order; a head job that does not fit in
+        the memory budget blocks the queue until memory frees up (a job
+        larger than the whole budget runs once nothing else is running).
+        """
+        ready = []
+        with self._lock:
+            while self._heap and len(self._running) < self.max_concurrent:
+                _, _, backtest_id = self._heap[0]
+                job = self._queued.get(backtest_id)
+                if job is None:
+                    # Cancelled while queued
+                    heapq.heappop(self._heap)
+                    continue
+
+                running_bytes = sum(j.estimated_bytes for j in self._running.values())
+                if self._running and running_bytes + job.estimated_bytes > self.memory_budget_bytes:
+                    break
+
+                heapq.heappop(self._heap)
+                del self._queued[backtest_id]
+                job.started_at = time.monotonic()
+                self._running[backtest_id] = job
+                ready.append(job)
+        return ready
+
+    def finish(self, backtest_id: str, candles_processed: int = 0) -> None:
+        """Release a running job's slot and learn from its throughput."""
+        with self._lock:
+            job = self._running.pop(backtest_id, None)
+            if job is None or job.started_at is None or candles_processed <= 0:
+                return
+            elapsed = time.monotonic() - job.started_at
+            if elapsed <= 0:
+                return
+            rate = candles_processed / elapsed
+            self.throughput = (
+                rate
+                if self.throughput is None
+                else THROUGHPUT_SMOOTHING * rate + (1 - THROUGHPUT_SMOOTHING) * self.throughput
+            )
+
+    def is_queued(self, backtest_id: str) -> bool:
+        with self._lock:
+            return backtest_id in self._queued
+
+    def queue_status(self, backtest_id: str) -> Optional[Tuple[int, float]]:
+        """
+        Queue position (1-based) and estimated seconds until a queued job starts.
+
+        The ETA replays the queue against the remaining time of the running
+        jobs, ignoring memory admission.
+
+        Returns:
+            Tuple of (position, eta_seconds), or None if the job is not queued
+        """
+        with self._lock:
+            if backtest_id not in self._queued:
+                return None
+
+            now = time.monotonic()
+            slot_free_at = [
+                max(self._duration(job) - (now - job.started_at), 0.0)
+                for job in self._running.values()
+            ]
+            slot_free_at += [0.0] * (self.max_concurrent - len(slot_free_at))
+            heapq.heapify(slot_free_at)
+
+            live = sorted(entry for entry in self._heap if entry[2] in self._queued)
+            for position, (_, _, queued_id) in enumerate(live, start=1):
+                start = heapq.heappop(slot_free_at)
+                if queued_id == backtest_id:
+                    return position, start
+                heapq.heappush(slot_free_at, start + self._duration(self._queued[queued_id]))
+        return None
+
+    def estimated_duration(self, backtest_id: str) -> Optional[float]:
+        """Estimated run time in seconds of a queued or running job (None if unknown)."""
+        with self._lock:
+            job = self._queued.get(backtest_id) or self._running.get(backtest_id)
+            return self._duration(job) if job is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue and admission counters."""
+        with self._lock:
+            return {
+                "queued": len(self._queued),
+                "running": len(self._running),
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+                "running_bytes": sum(j.estimated_bytes for j in self._running.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "throughput": self.throughput,
+            }
+
+    def _duration(self, job: QueuedJob) -> float:
+        # Prefer the observed throughput over the static per-candle estimate
+        if self.throughput and job.estimated_candles > 0:
+            return job.estimated_candles / self.throughput
+        return job.estimated_seconds
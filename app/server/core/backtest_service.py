@@ -8,7 +8,7 @@ import logging
 import re
 import uuid
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
 from core.data_models import (
     BacktestConfig,
@@ -20,7 +20,10 @@ from core.data_models import (
     StopLossConfig,
     TakeProfitConfig,
     TrailingStopConfig,
+    WalkForwardConfig,
 )
+from core.result_series import ResultSeries
+from core.trade_ledger import TradeLedger
 from db.supabase_client import get_supabase_client, is_configured
 
 logger = logging.getLogger(__name__)
@@ -46,6 +49,8 @@ def _backtest_to_db_row(backtest: BacktestConfig) -> dict:
         if backtest.risk_management
         else {},
         "status": backtest.status,
+        "engine": backtest.engine,
+        "walk_forward": backtest.walk_forward.model_dump() if backtest.walk_forward else None,
         "results": backtest.results,
         "notes": backtest.notes,
         "updated_at": datetime.now(timezone.utc).isoformat(),
@@ -90,6 +95,10 @@ def _db_row_to_backtest(row: dict, strategy_name: Optional[str] = None) -> Backt
             position_sizing=position_sizing,
             risk_management=risk_management,
             status=row.get("status", "pending"),
+            engine=row.get("engine") or "vectorized",
+            walk_forward=WalkForwardConfig(**row["walk_forward"])
+            if row.get("walk_forward")
+            else None,
             results=row.get("results"),
             notes=row.get("notes"),
             created_at=row.get("created_at"),
@@ -418,6 +427,8 @@ def duplicate_backtest(
             currency=original_backtest.currency,
             position_sizing=original_backtest.position_sizing,
             risk_management=original_backtest.risk_management,
+            engine=original_backtest.engine,
+            walk_forward=original_backtest.walk_forward,
             status="pending",  # Reset status for duplicate
             results=None,  # Clear results for duplicate
             created_at=None,
@@ -506,3 +517,163 @@ def get_backtest_with_results(backtest_id: str) -> Tuple[bool, Optional[Backtest
         return False, None, None, error
 
     return True, backtest, backtest.results, None
+
+
+def get_backtest_series(
+    backtest_id: str,
+    start: Optional[Union[datetime, str]] = None,
+    end: Optional[Union[datetime, str]] = None,
+    max_points: Optional[int] = None,
+) -> Tuple[bool, Optional[dict], Optional[str]]:
+    """
+    Get the per-candle result series of a backtest for a time window.
+
+    Series that were downsampled in the results row are read at full
+    resolution from the backtest_series table.
+
+    Args:
+        backtest_id: The backtest ID
+        start: Inclusive window start (None for the first candle)
+        end: Inclusive window end (None for the last candle)
+        max_points: Downsample the window to at most this many points (None for all)
+
+    Returns:
+        Tuple of (success, series_dict, error_message)
+    """
+    if not is_configured():
+        return False, None, "Supabase not configured"
+
+    client = get_supabase_client()
+    if client is None:
+        return False, None, "Failed to get Supabase client"
+
+    try:
+        result = client.table("backtests").select("results").eq("id", backtest_id).execute()
+        if not result.data:
+            return False, None, f"Backtest not found: {backtest_id}"
+        results = result.data[0].get("results")
+        if not results:
+            return False, None, f"Backtest has no results: {backtest_id}"
+
+        series = None
+        if results.get("series_points"):
+            series_result = (
+                client.table("backtest_series")
+                .select("series")
+                .eq("backtest_id", backtest_id)
+                .execute()
+            )
+            if series_result.data:
+                series = ResultSeries.decode(series_result.data[0]["series"])
+            else:
+                logger.warning(f"Full resolution series missing for backtest {backtest_id}")
+        if series is None:
+            series = ResultSeries.from_results(results)
+        if series is None:
+            return False, None, f"Backtest results have no per-candle series: {backtest_id}"
+
+        window = series.slice_dates(start, end)
+        window_points = len(window)
+        if max_points and window_points > max_points:
+            window = window.downsample(max_points)
+
+        return (
+            True,
+            {
+                "total_points": len(series),
+                "window_points": window_points,
+                "downsampled": len(window) < window_points,
+                **window.to_results_fields(),
+            },
+            None,
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to get series for backtest {backtest_id}: {e}")
+        return False, None, str(e)
+
+
+def load_trade_ledger(backtest_id: str) -> Tuple[bool, Optional[TradeLedger], Optional[str]]:
+    """
+    Load the full trade ledger of a backtest.
+
+    Backtests completed before ledgers were stored fall back to the trades
+    kept in their results.
+
+    Args:
+        backtest_id: The backtest ID
+
+    Returns:
+        Tuple of (success, ledger, error_message)
+    """
+    if not is_configured():
+        return False, None, "Supabase not configured"
+
+    client = get_supabase_client()
+    if client is None:
+        return False, None, "Failed to get Supabase client"
+
+    try:
+        result = (
+            client.table("backtest_trades")
+            .select("ledger")
+            .eq("backtest_id", backtest_id)
+            .execute()
+        )
+        if result.data:
+            return True, TradeLedger.decode(result.data[0]["ledger"]), None
+
+        result = client.table("backtests").select("results").eq("id", backtest_id).execute()
+        if not result.data:
+            return False, None, f"Backtest not found: {backtest_id}"
+        results = result.data[0].get("results")
+        if not results:
+            return False, None, f"Backtest has no results: {backtest_id}"
+        return True, TradeLedger.from_trades(results.get("trades") or []), None
+
+    except Exception as e:
+        logger.error(f"Failed to load trade ledger for backtest {backtest_id}: {e}")
+        return False, None, str(e)
+
+
+def get_backtest_trades(
+    backtest_id: str,
+    sort_by: str = "exit_time",
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    **filters,
+) -> Tuple[bool, Optional[dict], Optional[str]]:
+    """
+    Get one page of the trade ledger of a backtest.
+
+    Args:
+        backtest_id: The backtest ID
+        sort_by: Sort field (entry_time, exit_time, pnl or duration)
+        descending: Sort largest first
+        cursor: ``next_cursor`` of the previous page
+        limit: Maximum number of trades on the page
+        **filters: side, outcome, exit_reason, start and end (see TradeLedger.filter_mask)
+
+    Returns:
+        Tuple of (success, page_dict, error_message)
+    """
+    success, ledger, error = load_trade_ledger(backtest_id)
+    if not success:
+        return False, None, error
+
+    try:
+        page, next_cursor, matched = ledger.page(sort_by, descending, cursor, limit, **filters)
+    except ValueError as e:
+        return False, None, str(e)
+
+    return (
+        True,
+        {
+            "total_trades": len(ledger),
+            "matched": matched,
+            "trades": page.to_dicts(),
+            "next_cursor": next_cursor,
+        },
+        None,
+    )
@@ -145,6 +145,36 @@ def check_data_availability(
         )
 
 
+def estimate_candle_count(
+    timeframe: Optional[str], start_date: datetime, end_date: datetime
+) -> int:
+    """
+    Estimate the number of candles a backtest will process.
+
+    Args:
+        timeframe: Timeframe (defaults to H1 when unknown)
+        start_date: Start date
+        end_date: End date
+
+    Returns:
+        Estimated candle count (0 for an empty or inverted range)
+    """
+    # Map timeframe to minutes per candle
+    timeframe_minutes = {
+        "M1": 1,
+        "M5": 5,
+        "M15": 15,
+        "M30": 30,
+        "H1": 60,
+        "H4": 240,
+        "D": 1440,
+    }
+
+    total_minutes = (end_date - start_date).total_seconds() / 60
+    minutes_per_candle = timeframe_minutes.get(timeframe, 60)
+    return max(int(total_minutes / minutes_per_candle), 0)
+
+
 def calculate_estimated_duration(
     pair: Optional[str],
     timeframe: Optional[str],
@@ -167,22 +197,7 @@ def calculate_estimated_duration(
     """
     try:
         # Calculate number of candles based on timeframe
-        duration = end_date - start_date
-        total_minutes = duration.total_seconds() / 60
-
-        # Map timeframe to minutes per candle
-        timeframe_minutes = {
-            "M1": 1,
-            "M5": 5,
-            "M15": 15,
-            "M30": 30,
-            "H1": 60,
-            "H4": 240,
-            "D": 1440,
-        }
-
-        minutes_per_candle = timeframe_minutes.get(timeframe, 60)
-        estimated_candles = int(total_minutes / minutes_per_candle)
+        estimated_candles = estimate_candle_count(timeframe, start_date, end_date)
 
         # Estimate processing time per candle based on complexity
         # Simple: 0.001s, Medium: 0.005s, Complex: 0.01s per candle
@@ -0,0 +1,263 @@
+"""
+Backtest Worker Pool
+====================
+Process-pool backend for BacktestExecutor.
+
+Backtests run in a pool of spawned worker processes so concurrent runs do
+not contend for the GIL or slow down the API event loop. State that the
+thread backend shares in memory is carried over IPC instead:
+
+- Cancellation: one byte per job slot in a shared-memory array. The parent
+  sets it; workers read it without a round trip, so the engines can keep
+  polling it as often as they poll a threading.Event.
+- Progress: workers push execution snapshots onto a multiprocessing queue;
+  a listener thread in the parent applies them to the parent-side
+  BacktestExecution that get_progress() reads.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared cancel flag values
+FLAG_CLEAR = 0
+FLAG_CANCEL = 1
+FLAG_CANCEL_KEEP_PARTIAL = 2
+
+# Worker process globals, set by _init_worker
+_worker_progress_queue: Optional[Any] = None
+_worker_cancel_flags: Optional[Any] = None
+
+
+@dataclass
+class ExecutionSnapshot:
+    """Picklable view of a BacktestExecution sent from a worker to the parent."""
+
+    backtest_id: str
+    sequence: int
+    status: str
+    progress_percentage: int
+    current_date: Optional[datetime]
+    candles_processed: int
+    total_candles: int
+    trade_count: int
+    error_message: Optional[str]
+    current_pnl: float
+    running_win_rate: float
+    current_drawdown: float
+    equity_curve: List[float]
+    peak_equity: float
+    initial_balance: float
+    live_metrics: Optional[Dict[str, Any]]
+
+    # Fields copied onto the parent-side execution
+    FIELDS = (
+        "status",
+        "progress_percentage",
+        "current_date",
+        "candles_processed",
+        "total_candles",
+        "trade_count",
+        "error_message",
+        "current_pnl",
+        "running_win_rate",
+        "current_drawdown",
+        "equity_curve",
+        "peak_equity",
+        "initial_balance",
+        "live_metrics",
+    )
+
+    @classmethod
+    def capture(cls, execution: Any, sequence: int) -> "ExecutionSnapshot":
+        """Capture the live fields of an execution (trades are not sent)."""
+        values = {name: getattr(execution, name) for name in cls.FIELDS}
+        values["equity_curve"] = list(values["equity_curve"])
+        if execution.metrics is not None:
+            values["live_metrics"] = execution.metrics.summary()
+        return cls(backtest_id=execution.backtest_id, sequence=sequence, **values)
+
+    def apply_to(self, execution: Any) -> None:
+        """Copy the snapshot fields onto an execution."""
+        for name, value in asdict(self).items():
+            if name in self.FIELDS:
+                setattr(execution, name, value)
+
+
+class SharedCancelFlag:
+    """
+    threading.Event-compatible cancel flag backed by a shared-memory slot.
+
+    Setting the flag with ``keep_partial=True`` also tells the worker to save
+    partial results when it stops.
+    """
+
+    def __init__(self, flags: Any, slot: int):
+        self._flags = flags
+        self.slot = slot
+
+    def set(self, keep_partial: bool = False) -> None:
+        self._flags[self.slot] = FLAG_CANCEL_KEEP_PARTIAL if keep_partial else FLAG_CANCEL
+
+    def clear(self) -> None:
+        self._flags[self.slot] = FLAG_CLEAR
+
+    def is_set(self) -> bool:
+        return self._flags[self.slot] != FLAG_CLEAR
+
+    @property
+    def keep_partial(self) -> bool:
+        return self._flags[self.slot] == FLAG_CANCEL_KEEP_PARTIAL
+
+
+def _init_worker(progress_queue: Any, cancel_flags: Any) -> None:
+    """Pool initializer: keep the IPC handles in worker globals."""
+    global _worker_progress_queue, _worker_cancel_flags
+    _worker_progress_queue = progress_queue
+    _worker_cancel_flags = cancel_flags
+
+
+def _run_backtest_job(backtest_id: str, slot: int, backtest_data: dict) -> ExecutionSnapshot:
+    """
+    Worker entry point: run one backtest and return its final snapshot.
+
+    Runs the same BacktestExecutor code as the thread backend against a
+    worker-local execution record; every progress update is mirrored to the
+    parent through the progress queue.
+    """
+    # Imported here so the module stays importable from backtest_executor
+    from core.backtest_executor import BacktestExecution, BacktestExecutor
+
+    executor = BacktestExecutor()
+    cancel_flag = SharedCancelFlag(_worker_cancel_flags, slot)
+    sequence = 0
+
+    def publish(execution: BacktestExecution) -> None:
+        nonlocal sequence
+        sequence += 1
+        try:
+            _worker_progress_queue.put_nowait(ExecutionSnapshot.capture(execution, sequence))
+        except Exception as e:
+            logger.warning(f"[BACKTEST_WORKERS] Dropped progress update for {backtest_id}: {e}")
+
+    execution = BacktestExecution(
+        backtest_id=backtest_id,
+        thread=None,
+        cancel_event=cancel_flag,
+        status="pending",
+        started_at=datetime.now(timezone.utc),
+    )
+    with executor._executions_lock:
+        executor._running_backtests[backtest_id] = execution
+    executor._progress_sink = publish
+
+    try:
+        executor._execute_backtest(backtest_id, cancel_flag, backtest_data)
+    finally:
+        executor._progress_sink = None
+
+    sequence += 1
+    return ExecutionSnapshot.capture(execution, sequence)
+
+
+class BacktestProcessPool:
+    """
+    Pool of worker processes that run backtests.
+
+    Attributes:
+        max_workers: Number of worker processes
+        max_jobs: Maximum number of submitted, unfinished jobs (cancel flag slots)
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        on_snapshot: Callable[[ExecutionSnapshot], None],
+        max_jobs: int = 256,
+    ):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self._on_snapshot = on_snapshot
+
+        # Spawn keeps workers independent of the API process' threads and sockets
+        context = multiprocessing.get_context("spawn")
+        self._progress_queue = context.Queue()
+        self._cancel_flags = context.Array("b", max_jobs, lock=False)
+        self._free_slots: List[int] = list(range(max_jobs))
+        self._slots_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._progress_queue, self._cancel_flags),
+        )
+        self._listener = threading.Thread(
+            target=self._listen, daemon=True, name="backtest-progress-listener"
+        )
+        self._listener.start()
+        logger.info(f"[BACKTEST_WORKERS] Started process pool with {max_workers} workers")
+
+    def submit(self, backtest_id: str, backtest_data: dict) -> Optional[tuple]:
+        """
+        Submit a backtest to the pool.
+
+        Returns:
+            Tuple of (future, cancel_flag), or None if every job slot is in use
+        """
+        with self._slots_lock:
+            if not self._free_slots:
+                return None
+            slot = self._free_slots.pop()
+
+        cancel_flag = SharedCancelFlag(self._cancel_flags, slot)
+        cancel_flag.clear()
+        try:
+            future = self._executor.submit(_run_backtest_job, backtest_id, slot, backtest_data)
+        except Exception:
+            self._release_slot(slot)
+            raise
+        future.add_done_callback(lambda _: self._release_slot(slot))
+        return future, cancel_flag
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the workers and the progress listener."""
+        self._stopped.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("[BACKTEST_WORKERS] Process pool shut down")
+
+    def _release_slot(self, slot: int) -> None:
+        with self._slots_lock:
+            self._free_slots.append(slot)
+
+    def _listen(self) -> None:
+        """Apply progress snapshots from workers until the pool is shut down."""
+        while not self._stopped.is_set():
+            try:
+                snapshot = self._progress_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            try:
+                self._on_snapshot(snapshot)
+            except Exception as e:
+                logger.error(f"[BACKTEST_WORKERS] Error applying progress snapshot: {e}")
+
+
+def wait_for(future: Optional[Future], timeout: float) -> None:
+    """Wait up to ``timeout`` seconds for a job future, ignoring its outcome."""
+    if future is None:
+        return
+    try:
+        future.result(timeout=timeout)
+    except Exception:
+        pass
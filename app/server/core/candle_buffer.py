@@ -0,0 +1,285 @@
+"""
+Candle Buffer
+=============
+Columnar (struct-of-arrays) candle container for the backtest path.
+
+Candles are stored as an int64 epoch-seconds time array plus float64
+open/high/low/close/volume arrays. Slicing by index or date range returns
+views over the same memory, so windows of a large history cost nothing to
+create. Times are always UTC; naive datetimes are treated as UTC.
+
+Compared to a list of candle dicts with a datetime per candle, one year of
+M1 data (~525k candles) takes ~24 MB instead of ~200 MB, builds ~100x
+faster and computes the buy-and-hold curve ~100x faster
+(see scripts/benchmark_candle_buffer.py).
+"""
+
+import warnings
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Time format of the price API responses (see OpenFxApi.web_api_candles)
+PRICE_API_TIME_FORMAT = "%y-%m-%d %H:%M"
+
+
+def to_epoch_seconds(value: Union[datetime, str, int, float]) -> int:
+    """
+    Convert a datetime, ISO string or epoch value to UTC epoch seconds.
+
+    Args:
+        value: Datetime (naive is treated as UTC), ISO 8601 string or epoch seconds
+
+    Returns:
+        Epoch seconds as int
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def to_epoch_seconds_array(values: Sequence[Union[datetime, str, int]]) -> np.ndarray:
+    """
+    Convert many times to an int64 array of UTC epoch seconds.
+
+    Naive ISO strings and datetimes are parsed by numpy in one call; values
+    with a timezone fall back to to_epoch_seconds one at a time.
+    """
+    with warnings.catch_warnings():
+        # numpy only warns about timezone offsets, so make that a fallback
+        warnings.simplefilter("error")
+        try:
+            times = np.array(values, dtype="datetime64[s]")
+            # None parses as NaT; let to_epoch_seconds reject it
+            if not np.isnat(times).any():
+                return times.astype(np.int64)
+        except (ValueError, TypeError, UserWarning):
+            pass
+    return np.array([to_epoch_seconds(value) for value in values], dtype=np.int64)
+
+
+def from_epoch_seconds(value: int) -> datetime:
+    """Convert UTC epoch seconds to a timezone-naive UTC datetime."""
+    return datetime.fromtimestamp(int(value), tz=timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
+class CandleBuffer:
+    """
+    Struct-of-arrays candle container.
+
+    Attributes:
+        time: int64 epoch seconds (UTC), sorted ascending
+        open: float64 open prices
+        high: float64 high prices
+        low: float64 low prices
+        close: float64 close prices
+        volume: float64 volumes
+    """
+
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "CandleBuffer":
+        """Create an empty buffer."""
+        return cls.from_arrays(time=[], open=[], high=[], low=[], close=[], volume=[])
+
+    @classmethod
+    def from_arrays(
+        cls,
+        time: Sequence[int],
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Optional[Sequence[float]] = None,
+    ) -> "CandleBuffer":
+        """
+        Create a buffer from column arrays.
+
+        Arrays that already have the right dtype are used without copying.
+        """
+        close_arr = np.asarray(close, dtype=np.float64)
+        return cls(
+            time=np.asarray(time, dtype=np.int64),
+            open=np.asarray(open, dtype=np.float64),
+            high=np.asarray(high, dtype=np.float64),
+            low=np.asarray(low, dtype=np.float64),
+            close=close_arr,
+            volume=(
+                np.asarray(volume, dtype=np.float64)
+                if volume is not None
+                else np.zeros(len(close_arr), dtype=np.float64)
+            ),
+        )
+
+    @classmethod
+    def from_dicts(cls, candles: Sequence[Dict[str, Any]]) -> "CandleBuffer":
+        """
+        Create a buffer from a list of candle dicts.
+
+        Missing price fields default to the close price (volume to 0) so
+        partial candles such as ``{"time": ..., "close": ...}`` are accepted.
+        """
+        n = len(candles)
+        time = np.fromiter(
+            (to_epoch_seconds(c["time"]) if "time" in c else i for i, c in enumerate(candles)),
+            dtype=np.int64,
+            count=n,
+        )
+        close = np.fromiter((c["close"] for c in candles), dtype=np.float64, count=n)
+        columns = {
+            name: np.fromiter(
+                (c.get(name, c["close"]) for c in candles), dtype=np.float64, count=n
+            )
+            for name in ("open", "high", "low")
+        }
+        volume = np.fromiter((c.get("volume", 0) for c in candles), dtype=np.float64, count=n)
+        return cls(time=time, close=close, volume=volume, **columns)
+
+    @classmethod
+    def from_price_columns(cls, data: Dict[str, Sequence]) -> "CandleBuffer":
+        """
+        Create a buffer from a price API response.
+
+        Accepts the ``{"time", "mid_o", "mid_h", "mid_l", "mid_c"}`` column
+        dict returned by ``OpenFxApi.web_api_candles`` (``volume`` optional).
+        """
+        times = [
+            to_epoch_seconds(datetime.strptime(t, PRICE_API_TIME_FORMAT))
+            for t in data.get("time", [])
+        ]
+        return cls.from_arrays(
+            time=times,
+            open=data.get("mid_o", []),
+            high=data.get("mid_h", []),
+            low=data.get("mid_l", []),
+            close=data.get("mid_c", []),
+            volume=data.get("volume"),
+        )
+
+    @classmethod
+    def coerce(
+        cls, candles: Optional[Union["CandleBuffer", Sequence[Dict[str, Any]]]]
+    ) -> "CandleBuffer":
+        """Return ``candles`` as a CandleBuffer, converting candle dicts if needed."""
+        if isinstance(candles, CandleBuffer):
+            return candles
+        if not candles:
+            return cls.empty()
+        return cls.from_dicts(candles)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["CandleBuffer", Dict[str, Any]]:
+        """
+        Index the buffer.
+
+        A slice returns a CandleBuffer of views; an integer returns a candle
+        dict (with a datetime ``time``) for compatibility with dict consumers.
+        """
+        if isinstance(index, slice):
+            return CandleBuffer(
+                time=self.time[index],
+                open=self.open[index],
+                high=self.high[index],
+                low=self.low[index],
+                close=self.close[index],
+                volume=self.volume[index],
+            )
+        return {
+            "time": from_epoch_seconds(self.time[index]),
+            "open": float(self.open[index]),
+            "high": float(self.high[index]),
+            "low": float(self.low[index]),
+            "close": float(self.close[index]),
+            "volume": float(self.volume[index]),
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes referenced by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in ("time",) + PRICE_FIELDS)
+
+    def slice_dates(
+        self,
+        start: Optional[Union[datetime, str, int]] = None,
+        end: Optional[Union[datetime, str, int]] = None,
+    ) -> "CandleBuffer":
+        """
+        Zero-copy slice of candles with start <= time <= end.
+
+        Args:
+            start: Inclusive start (None for the beginning)
+            end: Inclusive end (None for the end)
+
+        Returns:
+            CandleBuffer whose arrays are views into this buffer
+        """
+        lo = (
+            int(np.searchsorted(self.time, to_epoch_seconds(start), side="left"))
+            if start is not None
+            else 0
+        )
+        hi = (
+            int(np.searchsorted(self.time, to_epoch_seconds(end), side="right"))
+            if end is not None
+            else len(self)
+        )
+        return self[lo:max(lo, hi)]
+
+    def candle_indices(self, times: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Map epoch times to candles by binary search over the sorted time column.
+
+        Args:
+            times: Epoch seconds, in any order
+
+        Returns:
+            int64 index of the first candle at or after each time; ``len(self)``
+            for times after the last candle
+        """
+        return np.searchsorted(self.time, np.asarray(times, dtype=np.int64), side="left")
+
+    def counts_per_candle(self, times: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Count events per candle, each landing on the first candle at or after it.
+
+        Args:
+            times: Epoch seconds of the events; events after the last candle are dropped
+
+        Returns:
+            int64 array with one count per candle
+        """
+        indices = self.candle_indices(times)
+        return np.bincount(indices[indices < len(self)], minlength=len(self))
+
+    def datetime_at(self, index: int) -> datetime:
+        """Candle time at ``index`` as a timezone-naive UTC datetime."""
+        return from_epoch_seconds(self.time[index])
+
+    def iso_times(self) -> List[str]:
+        """Candle times as ISO 8601 strings (naive UTC, second precision)."""
+        return np.datetime_as_string(self.time.astype("datetime64[s]"), unit="s").tolist()
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to a list of candle dicts."""
+        return list(self)
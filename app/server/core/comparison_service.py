@@ -5,9 +5,13 @@ Service layer for comparing multiple backtest results with statistical analysis.
 """
 
 import logging
-import random
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
+import numpy as np
+
+from config import settings
 from core.backtest_service import get_backtest
 from core.data_models import (
     BacktestComparisonResult,
@@ -61,6 +65,12 @@ KEY_METRICS_FOR_STATS = [
     "max_drawdown_percent",
 ]
 
+# p-value below which a difference is reported as significant
+SIGNIFICANCE_LEVEL = 0.05
+
+# Memory budget of one batch of permutations (bytes)
+PERMUTATION_CHUNK_BYTES = 32 * 1024 * 1024
+
 # Metrics to include in comparison table
 COMPARISON_METRICS = [
     "total_net_profit",
@@ -197,49 +207,101 @@ def _calculate_best_index(values: List[Optional[float]], direction: str) -> Opti
     return best[0]
 
 
+def _permutation_tests(
+    pairs: List[Tuple[List[float], List[float]]],
+    n_iterations: int = 1000,
+    seed: Optional[int] = None,
+) -> List[Tuple[float, bool]]:
+    """
+    Perform permutation tests on the difference in means of several pairs at once.
+
+    Each pair's values are pooled into one row of a zero-padded matrix. A
+    permutation sorts one random key per value (padding keys sort last), so a
+    single argsort shuffles every pair for a whole batch of iterations, and
+    the first len(values1) positions of each row form the permuted first sample.
+
+    Args:
+        pairs: (values1, values2) per test, e.g. trade returns of two backtests
+        n_iterations: Number of permutations per test
+        seed: Random seed for reproducible results (None for fresh entropy)
+
+    Returns:
+        List of (p_value, is_significant), one per pair
+    """
+    outcomes = [(1.0, False)] * len(pairs)
+    testable = [i for i, (a, b) in enumerate(pairs) if len(a) >= 2 and len(b) >= 2]
+    if not testable:
+        return outcomes
+
+    sizes1 = np.array([len(pairs[i][0]) for i in testable])
+    sizes2 = np.array([len(pairs[i][1]) for i in testable])
+    width = int((sizes1 + sizes2).max())
+    pooled = np.zeros((len(testable), width))
+    for row, i in enumerate(testable):
+        pooled[row, : sizes1[row] + sizes2[row]] = pairs[i][0] + pairs[i][1]
+
+    columns = np.arange(width)
+    padding = columns >= (sizes1 + sizes2)[:, None]
+    in_first = columns[: sizes1.max()] < sizes1[:, None]
+    totals = pooled.sum(axis=1)
+
+    def mean_differences(first_sums: np.ndarray) -> np.ndarray:
+        return first_sums / sizes1 - (totals - first_sums) / sizes2
+
+    observed = np.abs(mean_differences((pooled[:, : sizes1.max()] * in_first).sum(axis=1)))
+    # Permuted sums add the same values in another order; allow for rounding
+    threshold = observed - 1e-9 * np.abs(pooled).max(axis=1)
+
+    rng = np.random.default_rng(seed)
+    rows = np.arange(len(testable))[:, None]
+    # Random keys, sort order and gathered values per batch
+    chunk = max(PERMUTATION_CHUNK_BYTES // (len(testable) * width * 24), 1)
+    count_extreme = np.zeros(len(testable), dtype=np.int64)
+    done = 0
+    while done < n_iterations:
+        size = min(chunk, n_iterations - done)
+        keys = rng.random((size, len(testable), width))
+        keys[:, padding] = 2.0
+        order = np.argsort(keys, axis=2)[:, :, : sizes1.max()]
+        first_sums = (pooled[rows, order] * in_first).sum(axis=2)
+        count_extreme += (np.abs(mean_differences(first_sums)) >= threshold).sum(axis=0)
+        done += size
+
+    for row, i in enumerate(testable):
+        p_value = float(count_extreme[row] / n_iterations)
+        outcomes[i] = (p_value, p_value < SIGNIFICANCE_LEVEL)
+    return outcomes
+
+
 def _bootstrap_test(
     values1: List[float], values2: List[float], n_iterations: int = 10000
 ) -> Tuple[float, bool]:
     """
-    Perform bootstrap test to determine statistical significance.
+    Perform a permutation test to determine statistical significance.
 
-    Uses resampling to estimate the distribution of the difference in means.
+    Estimates how often random splits of the pooled values produce a
+    difference in means at least as extreme as the observed one.
 
     Args:
         values1: First set of values (e.g., trade returns from backtest 1)
         values2: Second set of values (e.g., trade returns from backtest 2)
-        n_iterations: Number of bootstrap iterations
+        n_iterations: Number of permutations
 
     Returns:
         Tuple of (p_value, is_significant)
     """
-    if len(values1) < 2 or len(values2) < 2:
-        return 1.0, False
-
-    # Observed difference in means
-    observed_diff = sum(values1) / len(values1) - sum(values2) / len(values2)
+    return _permutation_tests([(values1, values2)], n_iterations)[0]
 
-    # Combined pool for permutation test
-    combined = values1 + values2
-    n1 = len(values1)
 
-    # Count how many times random splits produce differences as extreme
-    count_extreme = 0
-    for _ in range(n_iterations):
-        # Shuffle and split
-        random.shuffle(combined)
-        sample1 = combined[:n1]
-        sample2 = combined[n1:]
+# Significance tests keyed by the (id, updated_at) of every compared backtest
+_significance_cache: "OrderedDict[FrozenSet, List[StatisticalTest]]" = OrderedDict()
+_significance_cache_lock = threading.Lock()
 
-        sample_diff = sum(sample1) / len(sample1) - sum(sample2) / len(sample2)
 
-        if abs(sample_diff) >= abs(observed_diff):
-            count_extreme += 1
-
-    p_value = count_extreme / n_iterations
-    is_significant = p_value < 0.05
-
-    return p_value, is_significant
+def clear_significance_cache() -> None:
+    """Drop all cached significance tests."""
+    with _significance_cache_lock:
+        _significance_cache.clear()
 
 
 def calculate_statistical_significance(
@@ -248,7 +310,10 @@ def calculate_statistical_significance(
     """
     Calculate statistical significance of metric differences between backtests.
 
-    Uses bootstrap resampling on trade returns to test for significant differences.
+    Uses permutation tests on trade returns to test for significant differences.
+    The best and runner-up backtest of every key metric are compared, with all
+    distinct pairs tested in one batch. Results are cached per set of backtests
+    and their update times, so repeated compare and export calls reuse them.
 
     Args:
         backtests: List of backtest configs with results
@@ -256,11 +321,19 @@ def calculate_statistical_significance(
     Returns:
         List of StatisticalTest results for key metrics
     """
-    results = []
-
     # Need at least 2 backtests to compare
     if len(backtests) < 2:
-        return results
+        return []
+
+    # Backtests without an update time cannot be told apart from edited copies
+    cache_key = None
+    if all(bt.id and bt.updated_at for bt in backtests):
+        cache_key = frozenset((bt.id, bt.updated_at) for bt in backtests)
+        with _significance_cache_lock:
+            cached = _significance_cache.get(cache_key)
+            if cached is not None:
+                _significance_cache.move_to_end(cache_key)
+                return list(cached)
 
     # Extract trade returns for each backtest
     backtest_returns = []
@@ -272,7 +345,8 @@ def calculate_statistical_significance(
         else:
             backtest_returns.append([])
 
-    # Compare each key metric
+    # Find the best and runner-up backtest of each key metric
+    selections = []
     for metric_name in KEY_METRICS_FOR_STATS:
         values = []
         for bt in backtests:
@@ -292,27 +366,32 @@ def calculate_statistical_significance(
         if best_idx is None:
             continue
 
-        best_bt = backtests[best_idx]
+        # Compare the two best backtests if we have trade returns
+        pair = None
+        other_values = [(i, v) for i, v in enumerate(values) if v is not None and i != best_idx]
+        if other_values:
+            if direction == "higher":
+                second_idx = max(other_values, key=lambda x: x[1])[0]
+            else:
+                second_idx = min(other_values, key=lambda x: x[1])[0]
 
-        # Perform statistical test if we have trade data
-        p_value = None
-        is_significant = False
+            if len(backtest_returns[best_idx]) >= 5 and len(backtest_returns[second_idx]) >= 5:
+                pair = tuple(sorted((best_idx, second_idx)))
 
-        # Compare the two best backtests if we have trade returns
-        if len(backtest_returns) >= 2:
-            # Find the second best
-            other_values = [(i, v) for i, v in enumerate(values) if v is not None and i != best_idx]
-            if other_values:
-                if direction == "higher":
-                    second_idx = max(other_values, key=lambda x: x[1])[0]
-                else:
-                    second_idx = min(other_values, key=lambda x: x[1])[0]
+        selections.append((metric_name, direction, best_idx, pair))
 
-                returns1 = backtest_returns[best_idx]
-                returns2 = backtest_returns[second_idx]
+    # Test every distinct pair once; the test is symmetric in its two samples
+    pairs = list(dict.fromkeys(pair for *_, pair in selections if pair))
+    tests = _permutation_tests(
+        [(backtest_returns[i], backtest_returns[j]) for i, j in pairs],
+        n_iterations=settings.COMPARISON_PERMUTATIONS,
+    )
+    pair_tests = dict(zip(pairs, tests))
 
-                if len(returns1) >= 5 and len(returns2) >= 5:
-                    p_value, is_significant = _bootstrap_test(returns1, returns2, n_iterations=1000)
+    results = []
+    for metric_name, direction, best_idx, pair in selections:
+        best_bt = backtests[best_idx]
+        p_value, is_significant = pair_tests[pair] if pair else (None, False)
 
         # Generate interpretation
         if is_significant:
@@ -340,7 +419,13 @@ def calculate_statistical_significance(
             )
         )
 
-    return results
+    if cache_key is not None:
+        with _significance_cache_lock:
+            _significance_cache[cache_key] = results
+            while len(_significance_cache) > settings.COMPARISON_CACHE_MAX_ENTRIES:
+                _significance_cache.popitem(last=False)
+
+    return list(results)
 
 
 def _metric_display_name(metric_name: str) -> str:
@@ -0,0 +1,525 @@
+"""
+Condition Compiler
+==================
+Compiles a saved strategy's conditions, condition groups and time filter into
+an evaluation plan. Running the plan against a candle buffer and a set of
+indicator series yields boolean long_entry / long_exit / short_entry /
+short_exit arrays in one vectorized pass.
+
+Semantics follow the strategy builder's "Test Logic" evaluation
+(app/client/src/app/conditionDefaults.js):
+- Top-level groups and ungrouped conditions in a section are ANDed
+- Groups combine their children (conditions or nested groups) with AND/OR
+- An empty section or group never signals
+- Crosses operators compare the previous left value against the current right
+  value, matching the client implementation
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.candle_buffer import CandleBuffer
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("long_entry", "long_exit", "short_entry", "short_exit")
+
+# Legacy section names written by older strategy builder versions
+LEGACY_SECTIONS = {"entry": "long_entry", "exit": "long_exit"}
+
+COMPARISON_OPERATORS = {
+    "is_above",
+    "is_below",
+    "is_greater_or_equal",
+    "is_less_or_equal",
+    "equals",
+    "is_between",
+    "crosses_above",
+    "crosses_below",
+    "is_detected",
+}
+
+PRICE_SOURCES = ("open", "high", "low", "close")
+
+# Timezone offsets in hours, matching TIMEZONES in the client constants
+TIMEZONE_OFFSETS = {"UTC": 0, "GMT": 0, "EST": -5, "LOCAL": 0}
+
+MAX_GROUP_DEPTH = 10
+
+# Indicator series keyed by instance ID, then component (None for single-value indicators)
+IndicatorValues = Dict[str, Dict[Optional[str], np.ndarray]]
+
+
+@dataclass(frozen=True)
+class Operand:
+    """Resolved reference to an operand series or constant."""
+
+    kind: str  # price, indicator, referenceIndicator, value, pattern
+    key: Optional[str] = None
+    component: Optional[str] = None
+    value: Optional[float] = None
+
+
+@dataclass
+class ConditionNode:
+    """Compiled comparison."""
+
+    id: str
+    operator: str
+    left: Operand
+    right: Optional[Operand] = None
+    right_max: Optional[Operand] = None
+
+
+@dataclass
+class GroupNode:
+    """Compiled AND/OR group of conditions and nested groups."""
+
+    id: str
+    operator: str
+    children: List[Union["GroupNode", ConditionNode]] = field(default_factory=list)
+
+
+@dataclass
+class EvaluationPlan:
+    """
+    Compiled strategy logic.
+
+    Attributes:
+        sections: Top-level nodes per section (ANDed together)
+        time_filter: Normalized time filter, or None if disabled
+        trade_direction: long, short or both
+        required_indicators: Indicator instance ID -> (indicator type ID, params)
+        required_reference_indicators: Reference ID -> (timeframe, indicator type ID, params)
+        skipped_conditions: IDs of conditions that could not be compiled
+        missing: Operands the last evaluation had no values for, e.g.
+            ``pattern:<instance ID>`` (their conditions never signal)
+    """
+
+    sections: Dict[str, List[Union[GroupNode, ConditionNode]]]
+    time_filter: Optional[Dict[str, Any]] = None
+    trade_direction: str = "both"
+    required_indicators: Dict[str, Tuple[str, Dict[str, Any]]] = field(default_factory=dict)
+    required_reference_indicators: Dict[str, Tuple[str, str, Dict[str, Any]]] = field(
+        default_factory=dict
+    )
+    skipped_conditions: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+    def has_section(self, section: str) -> bool:
+        """Whether a section has any compiled logic."""
+        return bool(self.sections.get(section))
+
+    def evaluate(
+        self,
+        candles: CandleBuffer,
+        indicator_values: Optional[IndicatorValues] = None,
+        pattern_values: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the plan for every candle.
+
+        Args:
+            candles: Candle buffer to evaluate against
+            indicator_values: Indicator series keyed by instance ID and component
+            pattern_values: Boolean pattern detection series keyed by instance ID
+
+        Returns:
+            Dict of section name -> boolean array (one value per candle)
+        """
+        evaluator = _PlanEvaluator(candles, indicator_values or {}, pattern_values or {})
+        n = len(candles)
+
+        entry_filter = _time_filter_mask(candles, self.time_filter)
+
+        signals = {}
+        for section in SECTIONS:
+            nodes = self.sections.get(section) or []
+            if not nodes or not self._direction_allowed(section):
+                signals[section] = np.zeros(n, dtype=bool)
+                continue
+
+            mask = np.ones(n, dtype=bool)
+            for node in nodes:
+                mask &= evaluator.node(node)
+
+            # Time filters gate new entries only; exits are always honoured
+            if section.endswith("_entry") and entry_filter is not None:
+                mask &= entry_filter
+
+            signals[section] = mask
+
+        self.missing = sorted(evaluator.missing_operands())
+        return signals
+
+    def _direction_allowed(self, section: str) -> bool:
+        if self.trade_direction == "long":
+            return section.startswith("long")
+        if self.trade_direction == "short":
+            return section.startswith("short")
+        return True
+
+
+def compile_strategy(strategy: Dict[str, Any]) -> EvaluationPlan:
+    """
+    Compile a strategy record into an evaluation plan.
+
+    Accepts both the list condition format (each condition has a ``section``)
+    and the legacy dict format keyed by section.
+
+    Args:
+        strategy: Strategy database row or StrategyConfig.model_dump()
+
+    Returns:
+        EvaluationPlan for the strategy
+    """
+    conditions = _normalize_conditions(strategy.get("conditions") or [])
+    groups = [g for g in (strategy.get("groups") or []) if g.get("id")]
+
+    indicators = {
+        ind.get("instance_id"): (ind.get("id"), ind.get("params") or {})
+        for ind in (strategy.get("indicators") or [])
+        if ind.get("instance_id")
+    }
+    reference_indicators = {
+        ref.get("id"): (ref.get("timeframe"), ref.get("indicator_id"), ref.get("params") or {})
+        for ref in (strategy.get("reference_indicators") or [])
+        if ref.get("id")
+    }
+
+    plan = EvaluationPlan(
+        sections={section: [] for section in SECTIONS},
+        time_filter=_normalize_time_filter(strategy.get("time_filter")),
+        trade_direction=strategy.get("trade_direction") or "both",
+    )
+
+    compiled: Dict[str, ConditionNode] = {}
+    for condition in conditions:
+        node = _compile_condition(condition)
+        if node is None:
+            plan.skipped_conditions.append(str(condition.get("id")))
+            continue
+        compiled[node.id] = node
+        for operand in (node.left, node.right, node.right_max):
+            if operand is None:
+                continue
+            if operand.kind == "indicator" and operand.key in indicators:
+                plan.required_indicators[operand.key] = indicators[operand.key]
+            elif operand.kind == "referenceIndicator" and operand.key in reference_indicators:
+                plan.required_reference_indicators[operand.key] = reference_indicators[operand.key]
+
+    groups_by_id = {g["id"]: g for g in groups}
+    children_by_parent: Dict[str, List[str]] = {}
+    for g in groups:
+        if g.get("parent_group_id"):
+            children_by_parent.setdefault(g["parent_group_id"], []).append(g["id"])
+
+    def build_group(group: Dict[str, Any], depth: int, seen: set) -> Optional[GroupNode]:
+        if depth > MAX_GROUP_DEPTH or group["id"] in seen:
+            logger.warning(f"[CONDITION_COMPILER] Skipping cyclic or too deep group {group['id']}")
+            return None
+        seen = seen | {group["id"]}
+
+        item_ids = list(group.get("condition_ids") or [])
+        item_ids += [gid for gid in children_by_parent.get(group["id"], []) if gid not in item_ids]
+
+        node = GroupNode(id=group["id"], operator=str(group.get("operator") or "AND").upper())
+        for item_id in item_ids:
+            if item_id in groups_by_id:
+                child = build_group(groups_by_id[item_id], depth + 1, seen)
+                if child is not None:
+                    node.children.append(child)
+            elif item_id in compiled:
+                node.children.append(compiled[item_id])
+        return node
+
+    grouped_ids = set()
+    for g in groups:
+        grouped_ids.update(g.get("condition_ids") or [])
+
+    for g in groups:
+        if g.get("parent_group_id"):
+            continue
+        section = LEGACY_SECTIONS.get(g.get("section"), g.get("section"))
+        if section not in plan.sections:
+            continue
+        node = build_group(g, 0, set())
+        if node is not None:
+            plan.sections[section].append(node)
+
+    for condition in conditions:
+        node = compiled.get(condition.get("id"))
+        if node is None or node.id in grouped_ids:
+            continue
+        plan.sections[condition["section"]].append(node)
+
+    if plan.skipped_conditions:
+        logger.warning(
+            f"[CONDITION_COMPILER] Skipped {len(plan.skipped_conditions)} invalid conditions"
+        )
+
+    return plan
+
+
+def _normalize_conditions(conditions: Union[List, Dict]) -> List[Dict[str, Any]]:
+    """Flatten both condition formats into a list with V2 section names."""
+    if isinstance(conditions, dict):
+        flattened = []
+        for section, items in conditions.items():
+            for i, item in enumerate(items or []):
+                if isinstance(item, dict):
+                    condition_id = item.get("id") or f"{section}-{i}"
+                    flattened.append({**item, "id": condition_id, "section": section})
+        conditions = flattened
+
+    normalized = []
+    for condition in conditions:
+        if not isinstance(condition, dict):
+            continue
+        section = LEGACY_SECTIONS.get(condition.get("section"), condition.get("section"))
+        if section not in SECTIONS:
+            continue
+        normalized.append({**condition, "section": section})
+    return normalized
+
+
+def _compile_condition(condition: Dict[str, Any]) -> Optional[ConditionNode]:
+    """Compile a single condition; returns None if it is malformed."""
+    operator = condition.get("operator")
+    left_data = condition.get("left_operand") or condition.get("leftOperand")
+    if not condition.get("id") or operator not in COMPARISON_OPERATORS or not left_data:
+        return None
+
+    left = _compile_operand(left_data)
+    if left is None:
+        return None
+
+    if operator == "is_detected" or left.kind == "pattern":
+        return ConditionNode(id=condition["id"], operator="is_detected", left=left)
+
+    right = _compile_operand(condition.get("right_operand") or condition.get("rightOperand"))
+    if right is None:
+        return None
+
+    right_max = None
+    if operator == "is_between":
+        right_max = _compile_operand(
+            condition.get("right_operand_max") or condition.get("rightOperandMax")
+        )
+        if right_max is None:
+            return None
+
+    return ConditionNode(
+        id=condition["id"], operator=operator, left=left, right=right, right_max=right_max
+    )
+
+
+def _compile_operand(data: Optional[Dict[str, Any]]) -> Optional[Operand]:
+    """Compile an operand dict as saved by the strategy builder."""
+    if not isinstance(data, dict):
+        return None
+
+    kind = data.get("type")
+    if kind == "price":
+        source = data.get("value") if data.get("value") in PRICE_SOURCES else "close"
+        return Operand(kind="price", key=source)
+    if kind in ("value", "percentage"):
+        try:
+            return Operand(kind="value", value=float(data.get("value")))
+        except (TypeError, ValueError):
+            return None
+    if kind == "indicator":
+        instance_id = data.get("instanceId") or data.get("instance_id")
+        if not instance_id:
+            return None
+        return Operand(kind="indicator", key=instance_id, component=data.get("component"))
+    if kind == "referenceIndicator":
+        reference_id = data.get("referenceIndicatorId") or data.get("reference_indicator_id")
+        if not reference_id:
+            return None
+        return Operand(
+            kind="referenceIndicator", key=reference_id, component=data.get("component")
+        )
+    if kind == "pattern":
+        instance_id = data.get("instanceId") or data.get("instance_id")
+        if not instance_id:
+            return None
+        return Operand(kind="pattern", key=instance_id)
+    return None
+
+
+def _normalize_time_filter(time_filter: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the time filter if enabled, otherwise None."""
+    if not time_filter or not time_filter.get("enabled"):
+        return None
+    return dict(time_filter)
+
+
+def _time_filter_mask(
+    candles: CandleBuffer, time_filter: Optional[Dict[str, Any]]
+) -> Optional[np.ndarray]:
+    """
+    Evaluate a time filter for every candle.
+
+    ``days_of_week`` uses JavaScript day indices (0=Sunday) as written by the
+    strategy builder. Windows crossing midnight are supported; the end time is
+    exclusive. ``mode`` 'exclude' inverts the window.
+    """
+    if time_filter is None:
+        return None
+
+    offset_hours = TIMEZONE_OFFSETS.get(time_filter.get("timezone") or "UTC", 0)
+    local_seconds = candles.time + offset_hours * 3600
+    minute_of_day = (local_seconds // 60) % 1440
+    # 1970-01-01 was a Thursday (JavaScript day index 4)
+    day_index = ((local_seconds // 86400) + 4) % 7
+
+    exclude = time_filter.get("mode") == "exclude"
+
+    days = time_filter.get("days_of_week") or []
+    day_ok = np.isin(day_index, days) if days else np.ones(len(candles), dtype=bool)
+
+    start_hour = time_filter.get("start_hour")
+    end_hour = time_filter.get("end_hour")
+    if start_hour is None or end_hour is None:
+        # Day filter only
+        return day_ok if not exclude else np.ones(len(candles), dtype=bool)
+
+    start = start_hour * 60 + (time_filter.get("start_minute") or 0)
+    end = end_hour * 60 + (time_filter.get("end_minute") or 0)
+    if end <= start:
+        in_window = (minute_of_day >= start) | (minute_of_day < end)
+    else:
+        in_window = (minute_of_day >= start) & (minute_of_day < end)
+
+    if exclude:
+        # Blocked days pass in exclude mode, matching the client
+        return ~day_ok | ~in_window
+    return day_ok & in_window
+
+
+class _PlanEvaluator:
+    """Evaluates compiled nodes, caching resolved operand series."""
+
+    def __init__(
+        self,
+        candles: CandleBuffer,
+        indicator_values: IndicatorValues,
+        pattern_values: Dict[str, np.ndarray],
+    ):
+        self.candles = candles
+        self.indicator_values = indicator_values
+        self.pattern_values = pattern_values
+        self.n = len(candles)
+        self._cache: Dict[Operand, np.ndarray] = {}
+        self.missing: set = set()
+
+    def node(self, node: Union[GroupNode, ConditionNode]) -> np.ndarray:
+        if isinstance(node, GroupNode):
+            return self.group(node)
+        return self.condition(node)
+
+    def group(self, group: GroupNode) -> np.ndarray:
+        if not group.children:
+            return np.zeros(self.n, dtype=bool)
+        masks = [self.node(child) for child in group.children]
+        if group.operator == "OR":
+            return np.logical_or.reduce(masks)
+        return np.logical_and.reduce(masks)
+
+    def condition(self, node: ConditionNode) -> np.ndarray:
+        left = self.series(node.left)
+
+        if node.operator == "is_detected":
+            return left.astype(bool) if left.dtype == bool else np.zeros(self.n, dtype=bool)
+
+        right = self.series(node.right)
+        with np.errstate(invalid="ignore"):
+            if node.operator == "is_above":
+                return left > right
+            if node.operator == "is_below":
+                return left < right
+            if node.operator == "is_greater_or_equal":
+                return left >= right
+            if node.operator == "is_less_or_equal":
+                return left <= right
+            if node.operator == "equals":
+                return left == right
+            if node.operator == "is_between":
+                right_max = self.series(node.right_max)
+                return (left >= right) & (left <= right_max)
+
+            prev_left = _shift(left)
+            prev_right = _shift(right)
+            has_previous = ~np.isnan(prev_left) & ~np.isnan(prev_right)
+            if node.operator == "crosses_above":
+                return has_previous & (prev_left <= right) & (left > right)
+            if node.operator == "crosses_below":
+                return has_previous & (prev_left >= right) & (left < right)
+
+        return np.zeros(self.n, dtype=bool)
+
+    def series(self, operand: Operand) -> np.ndarray:
+        if operand in self._cache:
+            return self._cache[operand]
+
+        if operand.kind == "price":
+            values = getattr(self.candles, operand.key)
+        elif operand.kind == "value":
+            values = np.full(self.n, operand.value, dtype=np.float64)
+        elif operand.kind == "pattern":
+            values = self.pattern_values.get(operand.key)
+            if values is None:
+                logger.warning(
+                    f"[CONDITION_COMPILER] No detections for pattern {operand.key}; "
+                    f"conditions on it will not signal"
+                )
+                self.missing.add(operand.key)
+                values = np.zeros(self.n, dtype=bool)
+            values = np.asarray(values, dtype=bool)
+        else:
+            values = self._indicator_series(operand)
+
+        self._cache[operand] = values
+        return values
+
+    def missing_operands(self) -> List[str]:
+        """Operands without values, as ``pattern:<id>`` or ``indicator:<id>[.<component>]``."""
+        described = []
+        for entry in self.missing:
+            if isinstance(entry, tuple):
+                key, component = entry
+                described.append(f"indicator:{key}" + (f".{component}" if component else ""))
+            else:
+                described.append(f"pattern:{entry}")
+        return described
+
+    def _indicator_series(self, operand: Operand) -> np.ndarray:
+        components = self.indicator_values.get(operand.key)
+        values = None
+        if components is not None:
+            values = components.get(operand.component)
+            if values is None and operand.component is None:
+                # Single-value operand on a multi-component indicator: use the first component
+                values = next(iter(components.values()), None)
+        if values is None:
+            if (operand.key, operand.component) not in self.missing:
+                logger.warning(
+                    f"[CONDITION_COMPILER] No values for indicator {operand.key} "
+                    f"component {operand.component}; conditions on it will not signal"
+                )
+            self.missing.add((operand.key, operand.component))
+            return np.full(self.n, np.nan)
+        return np.asarray(values, dtype=np.float64)
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """Shift a series forward by one candle, filling the first value with NaN."""
+    shifted = np.empty(len(values), dtype=np.float64)
+    if len(values):
+        shifted[0] = np.nan
+        shifted[1:] = values[:-1]
+    return shifted
@@ -147,6 +147,21 @@ class PriceDataResponse(BaseModel):
     error: Optional[str] = None
 
 
+class IndicatorDataResponse(BaseModel):
+    """Indicator series calculated server-side over price data."""
+
+    pair: str
+    granularity: str
+    indicator_id: str
+    params: Dict[str, Any] = Field(default={}, description="Effective indicator parameters")
+    time: List[str] = Field(default=[], description="Candle times (same format as /api/prices)")
+    values: Dict[str, List[Optional[float]]] = Field(
+        default={},
+        description="Series by component name ('value' for single-value indicators); "
+        "null during warm-up",
+    )
+
+
 # =============================================================================
 # Instrument Models
 # =============================================================================
@@ -745,6 +760,36 @@ class RiskManagementConfig(BaseModel):
     )
 
 
+class WalkForwardConfig(BaseModel):
+    """Walk-forward optimization settings for a backtest."""
+
+    enabled: bool = Field(default=False, description="Whether to run in walk-forward mode")
+    in_sample_days: int = Field(
+        default=90, ge=1, description="Length of each in-sample (optimization) window in days"
+    )
+    out_of_sample_days: int = Field(
+        default=30, ge=1, description="Length of each out-of-sample (trading) window in days"
+    )
+    step_days: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Days between window starts (defaults to out_of_sample_days; "
+        "must not be shorter, so out-of-sample segments do not overlap)",
+    )
+    parameters: Dict[str, List[Any]] = Field(
+        default_factory=dict,
+        description="Parameter grid optimized in each in-sample window (see parameter sweeps)",
+    )
+    objective: Literal[
+        "total_net_profit",
+        "return_on_investment",
+        "sharpe_ratio",
+        "profit_factor",
+        "win_rate",
+        "expectancy",
+    ] = Field(default="total_net_profit", description="In-sample metric to maximize")
+
+
 class BacktestConfig(BaseModel):
     """Complete backtest configuration."""
 
@@ -770,6 +815,13 @@ class BacktestConfig(BaseModel):
     status: Literal["pending", "running", "cancelling", "completed", "failed"] = Field(
         default="pending", description="Backtest status"
     )
+    engine: Literal["loop", "vectorized"] = Field(
+        default="vectorized",
+        description="Execution engine: per-candle loop or vectorized NumPy engine",
+    )
+    walk_forward: Optional[WalkForwardConfig] = Field(
+        None, description="Walk-forward optimization settings (null for a single run)"
+    )
     results: Optional[Dict[str, Any]] = Field(
         None, description="Backtest results (null until completed)"
     )
@@ -893,6 +945,18 @@ class BacktestProgress(BaseModel):
     peak_equity: Optional[float] = Field(
         None, description="Peak equity value for drawdown calculation"
     )
+    live_metrics: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Scalar result metrics of the trades closed so far "
+        "(keyed like the results summary)",
+    )
+    # Job queue
+    queue_position: Optional[int] = Field(
+        None, ge=1, description="Position in the job queue while waiting to start"
+    )
+    queue_eta_seconds: Optional[float] = Field(
+        None, ge=0, description="Estimated seconds until a queued backtest starts"
+    )
 
 
 class RunBacktestRequest(BaseModel):
@@ -901,6 +965,13 @@ class RunBacktestRequest(BaseModel):
     keep_partial_on_cancel: bool = Field(
         default=False, description="Whether to save partial results if cancelled"
     )
+    priority: int = Field(
+        default=0, ge=0, le=10, description="Queue priority (higher starts first)"
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse the results of an identical earlier run (false forces a fresh run)",
+    )
 
 
 class RunBacktestResponse(BaseModel):
@@ -911,6 +982,15 @@ class RunBacktestResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error details if failed")
 
 
+class ExtendBacktestRequest(BaseModel):
+    """Request to move a backtest's end date forward and run it again."""
+
+    end_date: datetime = Field(..., description="New end date, after the current one")
+    priority: int = Field(
+        default=0, ge=0, le=10, description="Queue priority (higher starts first)"
+    )
+
+
 class BacktestProgressResponse(BaseModel):
     """Response containing backtest progress information."""
 
@@ -938,6 +1018,79 @@ class CancelBacktestResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error details if failed")
 
 
+class ParameterSweepRequest(BaseModel):
+    """Request to run a parameter sweep (grid search) over a backtest."""
+
+    parameters: Dict[str, List[Any]] = Field(
+        ...,
+        description=(
+            "Parameter path -> values to try, e.g. 'indicators.<instance_id>.period', "
+            "'risk_management.stop_loss.value' or 'position_sizing.value'"
+        ),
+    )
+    engine: Optional[Literal["loop", "vectorized"]] = Field(
+        None, description="Execution engine (defaults to the backtest's engine)"
+    )
+
+
+class ParameterSweepResponse(BaseModel):
+    """Summary metrics for every combination of a parameter sweep."""
+
+    success: bool = Field(..., description="Whether the sweep ran successfully")
+    message: str = Field(..., description="Success or error message")
+    combinations: int = Field(default=0, ge=0, description="Number of combinations run")
+    signal_evaluations: int = Field(
+        default=0, ge=0, description="Distinct indicator parameter sets evaluated"
+    )
+    total_candles: int = Field(default=0, ge=0, description="Candles in the shared buffer")
+    elapsed_seconds: float = Field(default=0.0, ge=0, description="Sweep run time in seconds")
+    columns: List[str] = Field(
+        default_factory=list, description="Parameter paths followed by summary metric names"
+    )
+    rows: List[List[Any]] = Field(
+        default_factory=list, description="One row of values per combination, in column order"
+    )
+    error: Optional[str] = Field(None, description="Error details if failed")
+
+
+class BacktestSeriesResponse(BaseModel):
+    """Per-candle result series of a backtest for a time window."""
+
+    success: bool = Field(..., description="Whether the series were loaded successfully")
+    backtest_id: Optional[str] = Field(None, description="Backtest ID")
+    total_points: int = Field(
+        default=0, ge=0, description="Points in the full resolution series of the whole run"
+    )
+    window_points: int = Field(default=0, ge=0, description="Points in the requested window")
+    downsampled: bool = Field(
+        default=False, description="Whether the window was downsampled to max_points"
+    )
+    equity_curve_dates: List[str] = Field(
+        default_factory=list, description="ISO 8601 candle times"
+    )
+    buy_hold_curve: List[float] = Field(
+        default_factory=list, description="Buy-and-hold equity at each point"
+    )
+    trade_counts_per_candle: List[int] = Field(
+        default_factory=list, description="Trades closed at each point"
+    )
+    error: Optional[str] = Field(None, description="Error details if failed")
+
+
+class BacktestTradesResponse(BaseModel):
+    """One page of the trade ledger of a backtest."""
+
+    success: bool = Field(..., description="Whether the trades were loaded successfully")
+    backtest_id: Optional[str] = Field(None, description="Backtest ID")
+    total_trades: int = Field(default=0, ge=0, description="Trades in the whole ledger")
+    matched: int = Field(default=0, ge=0, description="Trades passing the filters")
+    trades: List[Dict[str, Any]] = Field(default_factory=list, description="Trades on this page")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page; null on the last page"
+    )
+    error: Optional[str] = Field(None, description="Error details if failed")
+
+
 # ============================================================================
 # Backtest Results Summary Models
 # ============================================================================
@@ -1001,6 +1154,10 @@ class BacktestResultsSummary(BaseModel):
     trade_counts_per_candle: Optional[List[int]] = Field(
         default=None, description="Number of trades executed at each candle"
     )
+    series_points: Optional[int] = Field(
+        default=None,
+        description="Points in the full resolution series when the series above are downsampled",
+    )
     drawdown_periods: Optional[List[Dict[str, Any]]] = Field(
         default=None,
         description="List of drawdown periods with start_index, end_index, max_drawdown_pct",
@@ -1054,6 +1211,10 @@ class BacktestResultsSummary(BaseModel):
     risk_of_ruin_simulations: int = Field(
         default=10000, description="Number of Monte Carlo simulations run"
     )
+    monte_carlo_equity_bands: Optional[Dict[str, List[float]]] = Field(
+        default=None,
+        description="Monte Carlo equity percentiles (trade counts plus p5/p50/p95 equity)",
+    )
     avg_drawdown_duration_minutes: Optional[float] = Field(
         default=None, description="Average drawdown duration in minutes"
     )
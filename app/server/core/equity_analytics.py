@@ -0,0 +1,219 @@
+"""
+Equity Analytics
+================
+Drawdown statistics and risk ratios of a complete equity curve.
+
+The curve is held as a float64 equity array plus float64 epoch-second
+times (NaN where a point has no time), and everything is derived with
+array operations when it is built:
+
+- The running peak is a cumulative maximum; drawdowns are the runs of
+  points below it, found from the diff of the in-drawdown mask
+- The depth of each drawdown is a max-reduce over its run
+- Durations are time differences between each drawdown's peak and its
+  recovery (or the last point, for an open drawdown)
+- Sharpe and Sortino come from the diff of consecutive points
+
+Live progress keeps only the running peak, drawdown and return moments
+(see core.metric_accumulators.EquityTracker); drawdown periods and
+durations are only built here, once a run finishes.
+"""
+
+import math
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.candle_buffer import to_epoch_seconds, to_epoch_seconds_array
+from core.metric_accumulators import TRADING_DAYS, parse_time
+
+# Drawdown periods shallower than this (percent) are not reported
+MIN_DRAWDOWN_PERIOD_PERCENT = 0.01
+
+# Duration assumed per equity point when its time is unknown (minutes)
+FALLBACK_MINUTES_PER_POINT = 60
+
+
+def epoch_times(dates: Sequence[Any]) -> np.ndarray:
+    """Float64 epoch seconds of ISO strings or datetimes (NaN where missing or invalid)."""
+    try:
+        return to_epoch_seconds_array(dates).astype(np.float64)
+    except (ValueError, TypeError):
+        parsed = [parse_time(date) for date in dates]
+        return np.array(
+            [math.nan if time is None else to_epoch_seconds(time) for time in parsed],
+            dtype=np.float64,
+        )
+
+
+def sharpe_ratio(returns: np.ndarray, risk_free_rate: float = 0.0) -> Optional[float]:
+    """
+    Annualized Sharpe Ratio of return percentages.
+
+    Returns:
+        Sharpe Ratio, or None with fewer than 2 returns or no variance
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < 2:
+        return None
+    std_dev = float(returns.std())
+    if std_dev == 0:
+        return None
+    sharpe = (float(returns.mean()) - risk_free_rate / TRADING_DAYS) / std_dev
+    return round(sharpe * math.sqrt(TRADING_DAYS), 2)
+
+
+def sortino_ratio(returns: np.ndarray, risk_free_rate: float = 0.0) -> Optional[float]:
+    """
+    Annualized Sortino Ratio of return percentages (uses only downside deviation).
+
+    Returns:
+        Sortino Ratio, or None with fewer than 2 returns or no negative returns
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    losses = returns[returns < 0]
+    if len(returns) < 2 or not len(losses):
+        return None
+    downside_deviation = math.sqrt(float(np.dot(losses, losses)) / len(returns))
+    if downside_deviation == 0:
+        return None
+    sortino = (float(returns.mean()) - risk_free_rate / TRADING_DAYS) / downside_deviation
+    return round(sortino * math.sqrt(TRADING_DAYS), 2)
+
+
+class EquityAnalytics:
+    """
+    Drawdowns and return ratios of an equity curve.
+
+    A drawdown starts at the last peak and ends at the first point back at
+    or above it. Durations fall back to FALLBACK_MINUTES_PER_POINT per point
+    when either end has no time.
+
+    Attributes:
+        equity: float64 equity values
+        times: float64 epoch seconds of each point, NaN where unknown
+        points: Number of equity points
+        returns: Return percentages between consecutive points
+        max_drawdown: Deepest drawdown in dollars
+        max_drawdown_percent: Deepest drawdown in percent of its peak
+        current_drawdown_percent: Drawdown at the last point
+    """
+
+    def __init__(self, equity: Sequence[float], times: Optional[Sequence[float]] = None):
+        """
+        Args:
+            equity: Equity values
+            times: Epoch seconds of each point, NaN where unknown
+        """
+        self.equity = np.asarray(equity, dtype=np.float64)
+        self.points = len(self.equity)
+        self.times = (
+            np.full(self.points, np.nan) if times is None else np.asarray(times, dtype=np.float64)
+        )
+
+        previous, current = self.equity[:-1], self.equity[1:]
+        valid = previous > 0
+        self.returns = (current[valid] - previous[valid]) / previous[valid] * 100
+
+        peak = np.maximum.accumulate(self.equity) if self.points else self.equity
+        drawdown = peak - self.equity
+        percent = np.zeros(self.points)
+        np.divide(drawdown, peak, out=percent, where=peak > 0)
+        percent *= 100
+
+        self.max_drawdown = float(drawdown.max()) if self.points else 0.0
+        self.max_drawdown_percent = float(percent.max()) if self.points else 0.0
+        self.current_drawdown_percent = float(percent[-1]) if self.points else 0.0
+
+        # Each drawdown is a run of points below the running peak
+        edges = np.diff((drawdown > 0).astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        self._peaks = starts - 1
+        self._last = np.flatnonzero(edges == -1) - 1
+        self._depths = np.maximum.reduceat(percent, starts) if len(starts) else percent[:0]
+        # A closed drawdown lasts until its recovery point, an open one until the last point
+        self._ends = np.minimum(self._last + 1, self.points - 1)
+        self._elapsed = (self.times[self._ends] - self.times[self._peaks]) / 60
+
+    @classmethod
+    def from_dates(
+        cls, equity: Sequence[float], dates: Optional[Sequence[Any]] = None
+    ) -> "EquityAnalytics":
+        """Build from equity values and optional ISO dates or datetimes per point."""
+        if not dates:
+            return cls(equity)
+        times = np.full(len(equity), np.nan)
+        known = epoch_times(dates[: len(equity)])
+        times[: len(known)] = known
+        return cls(equity, times)
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.0) -> Optional[float]:
+        """Annualized Sharpe Ratio of the point returns."""
+        return sharpe_ratio(self.returns, risk_free_rate)
+
+    def sortino_ratio(self, risk_free_rate: float = 0.0) -> Optional[float]:
+        """Annualized Sortino Ratio of the point returns."""
+        return sortino_ratio(self.returns, risk_free_rate)
+
+    def drawdown_periods(self) -> List[Dict[str, Any]]:
+        """Drawdown periods deeper than MIN_DRAWDOWN_PERIOD_PERCENT, including an open one."""
+        return [
+            {"start_index": peak, "end_index": last, "max_drawdown_pct": round(depth, 2)}
+            for peak, last, depth in zip(
+                self._peaks.tolist(), self._last.tolist(), self._depths.tolist()
+            )
+            if depth > MIN_DRAWDOWN_PERIOD_PERCENT
+        ]
+
+    @cached_property
+    def _durations(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "start_index": peak,
+                "end_index": end,
+                "duration_minutes": (
+                    round(minutes, 2)
+                    if not math.isnan(minutes)
+                    else (end - peak) * FALLBACK_MINUTES_PER_POINT
+                ),
+            }
+            for peak, end, minutes in zip(
+                self._peaks.tolist(), self._ends.tolist(), self._elapsed.tolist()
+            )
+        ]
+
+    def drawdown_durations(self) -> Dict[str, Any]:
+        """Drawdown duration list with its average and maximum, including an open drawdown."""
+        if not self._durations:
+            return {
+                "avg_drawdown_duration_minutes": None,
+                "max_drawdown_duration_minutes": None,
+                "drawdown_durations": [],
+            }
+        minutes = [duration["duration_minutes"] for duration in self._durations]
+        return {
+            "avg_drawdown_duration_minutes": round(sum(minutes) / len(minutes), 2),
+            "max_drawdown_duration_minutes": round(max(minutes), 2),
+            "drawdown_durations": list(self._durations),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Every drawdown statistic and risk ratio of the curve.
+
+        Returns:
+            Dict with max_drawdown_dollars, max_drawdown_percent,
+            current_drawdown_percent, sharpe_ratio, sortino_ratio,
+            drawdown_periods and the drawdown_durations() fields
+        """
+        has_curve = self.points >= 2
+        return {
+            "max_drawdown_dollars": round(self.max_drawdown, 2) if has_curve else 0.0,
+            "max_drawdown_percent": round(self.max_drawdown_percent, 2) if has_curve else 0.0,
+            "current_drawdown_percent": round(self.current_drawdown_percent, 2),
+            "sharpe_ratio": self.sharpe_ratio(),
+            "sortino_ratio": self.sortino_ratio(),
+            "drawdown_periods": self.drawdown_periods(),
+            **self.drawdown_durations(),
+        }
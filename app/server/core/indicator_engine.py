@@ -0,0 +1,561 @@
+"""
+Indicator Engine
+================
+Vectorized server-side implementations of the indicator catalogue offered by
+the strategy builder (``app/client/src/app/indicators.js``).
+
+Every indicator computes over the columnar arrays of a CandleBuffer and
+returns its series keyed by component name (``None`` for single-value
+indicators), which is the shape the condition compiler consumes. Warm-up
+values the client reports as ``null`` are NaN here. Formulas mirror
+``indicatorCalculations.js`` so backtests and the chart agree value for value.
+
+Results are cached by (pair, timeframe, data version, indicator id, params)
+in a process-wide LRU so the backtest executor, the chart endpoint and any
+other consumer of the same candles share one computation.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from core.candle_buffer import CandleBuffer
+
+logger = logging.getLogger(__name__)
+
+# Series keyed by component name; None for single-value indicators
+IndicatorSeries = Dict[Optional[str], np.ndarray]
+
+# Proxy volume multiplier used when candles carry no volume (matches the client)
+VOLUME_PROXY_MULTIPLIER = 1_000_000
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Catalogue entry for a server-side indicator.
+
+    Attributes:
+        id: Indicator type ID (matches the client catalogue)
+        calculate: Function (candles, **params) -> IndicatorSeries
+        default_params: Default parameter values
+        components: Component names, or None for single-value indicators
+    """
+
+    id: str
+    calculate: Callable[..., IndicatorSeries]
+    default_params: Dict[str, Any]
+    components: Optional[Tuple[str, ...]] = None
+
+
+# =============================================================================
+# Array Helpers
+# =============================================================================
+
+
+def _nan_array(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _windows(values: np.ndarray, period: int) -> np.ndarray:
+    """Sliding windows (views) ending at each index from period - 1 onward."""
+    return np.lib.stride_tricks.sliding_window_view(values, period)
+
+
+def _rolling(values: np.ndarray, period: int, reducer: Callable) -> np.ndarray:
+    """Apply ``reducer(windows, axis=1)`` with NaN for the warm-up period."""
+    result = _nan_array(len(values))
+    if len(values) >= period:
+        result[period - 1 :] = reducer(_windows(values, period), axis=1)
+    return result
+
+
+def _smooth(values: np.ndarray, seed_index: int, seed: float, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded at ``seed_index``.
+
+    Computes ``y[seed_index] = seed`` and ``y[i] = y[i-1] + alpha * (x[i] - y[i-1])``
+    afterwards (NaN before the seed), using pandas' compiled ewm for the recursion.
+    """
+    result = _nan_array(len(values))
+    if seed_index >= len(values):
+        return result
+    tail = np.concatenate([[seed], values[seed_index + 1 :]])
+    result[seed_index:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    return _rolling(values, period, np.mean)
+
+
+def _ema(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA seeded with the SMA of the first ``period`` values."""
+    if len(values) < period:
+        return _nan_array(len(values))
+    return _smooth(values, period - 1, float(np.mean(values[:period])), 2 / (period + 1))
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing seeded with the SMA of the first ``period`` values."""
+    if len(values) < period:
+        return _nan_array(len(values))
+    return _smooth(values, period - 1, float(np.mean(values[:period])), 1 / period)
+
+
+def _true_range(candles: CandleBuffer) -> np.ndarray:
+    high, low, close = candles.high, candles.low, candles.close
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce(
+            [tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)]
+        )
+    return tr
+
+
+def _volumes(candles: CandleBuffer) -> np.ndarray:
+    """Candle volumes, or the high-low range proxy when no volume is available."""
+    if np.any(candles.volume > 0):
+        return candles.volume
+    return np.abs(candles.high - candles.low) * VOLUME_PROXY_MULTIPLIER
+
+
+# =============================================================================
+# Indicators
+# =============================================================================
+
+
+def sma(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Simple moving average of closes."""
+    return {None: _sma(candles.close, period)}
+
+
+def ema(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Exponential moving average of closes."""
+    return {None: _ema(candles.close, period)}
+
+
+def rsi(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Relative Strength Index with Wilder smoothing (first value at index ``period``)."""
+    close = candles.close
+    result = _nan_array(len(close))
+    if len(close) < period + 1:
+        return {None: result}
+
+    change = np.diff(close)
+    avg_gain = _wilder(np.where(change > 0, change, 0.0), period)
+    avg_loss = _wilder(np.where(change < 0, -change, 0.0), period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    values = np.where(avg_loss == 0, 100.0, values)
+    values[np.isnan(avg_gain)] = np.nan
+    result[1:] = values
+    return {None: result}
+
+
+def macd(
+    candles: CandleBuffer, fastPeriod: int, slowPeriod: int, signalPeriod: int
+) -> IndicatorSeries:
+    """MACD line, signal line (EMA of the defined MACD values) and histogram."""
+    close = candles.close
+    line = _ema(close, fastPeriod) - _ema(close, slowPeriod)
+
+    signal = _nan_array(len(close))
+    defined = ~np.isnan(line)
+    signal[defined] = _ema(line[defined], signalPeriod)
+
+    return {"MACD Line": line, "Signal Line": signal, "Histogram": line - signal}
+
+
+def bollinger_bands(candles: CandleBuffer, period: int, stdDev: float) -> IndicatorSeries:
+    """Bollinger Bands: SMA of closes +/- ``stdDev`` population standard deviations."""
+    close = candles.close
+    middle = _sma(close, period)
+    std = _rolling(close, period, np.std)
+    return {
+        "Upper Band": middle + stdDev * std,
+        "Middle Band": middle,
+        "Lower Band": middle - stdDev * std,
+    }
+
+
+def atr(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Average True Range with Wilder smoothing."""
+    return {None: _wilder(_true_range(candles), period)}
+
+
+def stochastic(candles: CandleBuffer, kPeriod: int, dPeriod: int) -> IndicatorSeries:
+    """Stochastic oscillator %K and %D (SMA of %K)."""
+    highest = _rolling(candles.high, kPeriod, np.max)
+    lowest = _rolling(candles.low, kPeriod, np.min)
+    price_range = highest - lowest
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(price_range == 0, 50.0, (candles.close - lowest) / price_range * 100)
+    k[np.isnan(highest)] = np.nan
+
+    # The client averages %K with warm-up values as 0, then blanks them again
+    d = _sma(np.nan_to_num(k, nan=0.0), dPeriod)
+    d[np.isnan(k)] = np.nan
+    return {"%K": k, "%D": d}
+
+
+def cci(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Commodity Channel Index of the typical price."""
+    typical = (candles.high + candles.low + candles.close) / 3
+    mean = _sma(typical, period)
+    result = _nan_array(len(typical))
+    if len(typical) < period:
+        return {None: result}
+
+    window_mean = mean[period - 1 :]
+    deviation = np.abs(_windows(typical, period) - window_mean[:, None]).mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = (typical[period - 1 :] - window_mean) / (0.015 * deviation)
+    result[period - 1 :] = np.where(deviation == 0, 0.0, values)
+    return {None: result}
+
+
+def williams_r(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Williams %R (-100 to 0)."""
+    highest = _rolling(candles.high, period, np.max)
+    lowest = _rolling(candles.low, period, np.min)
+    price_range = highest - lowest
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(price_range == 0, -50.0, (highest - candles.close) / price_range * -100)
+    values[np.isnan(highest)] = np.nan
+    return {None: values}
+
+
+def adx(candles: CandleBuffer, period: int) -> IndicatorSeries:
+    """Average Directional Index with +DI and -DI."""
+    n = len(candles)
+    if n < period + 1:
+        return {"ADX": _nan_array(n), "+DI": _nan_array(n), "-DI": _nan_array(n)}
+
+    high, low = candles.high, candles.low
+    up_move = np.concatenate([[0.0], np.diff(high)])
+    down_move = np.concatenate([[0.0], -np.diff(low)])
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Wilder running sums: s[i] = s[i-1] - s[i-1] / period + dm[i], seeded with the sum
+    smooth_plus = _smooth(period * plus_dm, period - 1, plus_dm[:period].sum(), 1 / period)
+    smooth_minus = _smooth(period * minus_dm, period - 1, minus_dm[:period].sum(), 1 / period)
+
+    true_range = _wilder(_true_range(candles), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = np.where(true_range == 0, 0.0, smooth_plus / true_range * 100)
+        minus_di = np.where(true_range == 0, 0.0, smooth_minus / true_range * 100)
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum == 0, 0.0, np.abs(plus_di - minus_di) / di_sum * 100)
+    undefined = np.isnan(true_range)
+    for values in (plus_di, minus_di, dx):
+        values[undefined] = np.nan
+
+    first = 2 * period - 1
+    adx_values = _nan_array(n)
+    if first < n:
+        seed = float(np.mean(dx[first - period + 1 : first + 1]))
+        adx_values = _smooth(dx, first, seed, 1 / period)
+
+    return {"ADX": adx_values, "+DI": plus_di, "-DI": minus_di}
+
+
+def obv(candles: CandleBuffer) -> IndicatorSeries:
+    """On Balance Volume (range-based volume proxy when volume is unavailable)."""
+    close = candles.close
+    if len(close) == 0:
+        return {None: np.empty(0)}
+    volume = _volumes(candles)
+    direction = np.sign(np.diff(close))
+    return {None: volume[0] + np.concatenate([[0.0], np.cumsum(direction * volume[1:])])}
+
+
+def keltner_channel(candles: CandleBuffer, period: int, atrMultiplier: float) -> IndicatorSeries:
+    """Keltner Channel: EMA of closes +/- ``atrMultiplier`` ATRs."""
+    middle = _ema(candles.close, period)
+    band = atrMultiplier * _wilder(_true_range(candles), period)
+    return {
+        "Upper Channel": middle + band,
+        "Middle Channel": middle,
+        "Lower Channel": middle - band,
+    }
+
+
+def volume_profile(candles: CandleBuffer, bins: int) -> IndicatorSeries:
+    """
+    Share of traded volume (%) at the current close's price level.
+
+    The price range of the window is split into ``bins`` levels. Each candle
+    reports the volume traded so far at the level of its close as a
+    percentage of all volume so far, so values only use past candles.
+    """
+    close = candles.close
+    n = len(close)
+    if n == 0:
+        return {None: np.empty(0)}
+
+    volume = _volumes(candles)
+    low, high = float(candles.low.min()), float(candles.high.max())
+    if high > low:
+        level = np.clip(((close - low) / (high - low) * bins).astype(np.int64), 0, bins - 1)
+    else:
+        level = np.zeros(n, dtype=np.int64)
+
+    # Running volume per level: cumulative sums within each level, in time order
+    order = np.argsort(level, kind="stable")
+    sorted_volume = np.cumsum(volume[order])
+    sorted_level = level[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_level[1:] != sorted_level[:-1]])
+    offsets = np.repeat(
+        np.r_[0.0, sorted_volume[group_start[1:] - 1]], np.diff(np.r_[group_start, n])
+    )
+    level_volume = np.empty(n)
+    level_volume[order] = sorted_volume - offsets
+
+    total = np.cumsum(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(total > 0, level_volume / total * 100, 0.0)
+    return {None: share}
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {
+    spec.id: spec
+    for spec in (
+        IndicatorSpec("sma", sma, {"period": 20}),
+        IndicatorSpec("ema", ema, {"period": 20}),
+        IndicatorSpec(
+            "macd",
+            macd,
+            {"fastPeriod": 12, "slowPeriod": 26, "signalPeriod": 9},
+            ("MACD Line", "Signal Line", "Histogram"),
+        ),
+        IndicatorSpec("adx", adx, {"period": 14}, ("ADX", "+DI", "-DI")),
+        IndicatorSpec("rsi", rsi, {"period": 14}),
+        IndicatorSpec("stochastic", stochastic, {"kPeriod": 14, "dPeriod": 3}, ("%K", "%D")),
+        IndicatorSpec("cci", cci, {"period": 20}),
+        IndicatorSpec("williams_r", williams_r, {"period": 14}),
+        IndicatorSpec(
+            "bollinger_bands",
+            bollinger_bands,
+            {"period": 20, "stdDev": 2},
+            ("Upper Band", "Middle Band", "Lower Band"),
+        ),
+        IndicatorSpec("atr", atr, {"period": 14}),
+        IndicatorSpec(
+            "keltner_channel",
+            keltner_channel,
+            {"period": 20, "atrMultiplier": 2},
+            ("Upper Channel", "Middle Channel", "Lower Channel"),
+        ),
+        IndicatorSpec("obv", obv, {}),
+        IndicatorSpec("volume_profile", volume_profile, {"bins": 24}),
+    )
+}
+
+# Parameters that must be positive integers (everything else is a positive float)
+INTEGER_PARAMS = {
+    "period",
+    "fastPeriod",
+    "slowPeriod",
+    "signalPeriod",
+    "kPeriod",
+    "dPeriod",
+    "bins",
+}
+
+
+def normalize_params(indicator_id: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Merge ``params`` over the indicator defaults and validate them.
+
+    Unknown parameters are ignored so client-only settings (colors, line
+    styles) do not fragment the cache.
+
+    Raises:
+        ValueError: If the indicator is unknown or a parameter is invalid
+    """
+    spec = INDICATORS.get(indicator_id)
+    if spec is None:
+        raise ValueError(f"Unknown indicator: {indicator_id}")
+
+    merged = dict(spec.default_params)
+    for name in spec.default_params:
+        if params and params.get(name) is not None:
+            merged[name] = params[name]
+
+    for name, value in merged.items():
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {indicator_id} parameter {name}: {value!r}") from None
+        if number <= 0 or (name in INTEGER_PARAMS and not number.is_integer()):
+            raise ValueError(f"Invalid {indicator_id} parameter {name}: {value!r}")
+        merged[name] = int(number) if name in INTEGER_PARAMS else number
+    return merged
+
+
+def calculate_indicator(
+    candles: CandleBuffer, indicator_id: str, params: Optional[Dict[str, Any]] = None
+) -> IndicatorSeries:
+    """
+    Calculate an indicator without caching.
+
+    Args:
+        candles: Candles to calculate over
+        indicator_id: Indicator type ID (e.g. 'macd')
+        params: Indicator parameters (defaults are filled in)
+
+    Returns:
+        Series keyed by component name (None for single-value indicators)
+
+    Raises:
+        ValueError: If the indicator is unknown or a parameter is invalid
+    """
+    normalized = normalize_params(indicator_id, params)
+    return INDICATORS[indicator_id].calculate(candles, **normalized)
+
+
+def data_version(candles: CandleBuffer) -> str:
+    """Content fingerprint of a candle buffer, used as the default cache data version."""
+    digest = hashlib.blake2b(digest_size=16)
+    for column in (
+        candles.time,
+        candles.open,
+        candles.high,
+        candles.low,
+        candles.close,
+        candles.volume,
+    ):
+        digest.update(np.ascontiguousarray(column).data)
+    return digest.hexdigest()
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator series.
+
+    Entries are keyed by (pair, timeframe, data version, indicator id,
+    params). Cached arrays are read-only so callers can share them safely.
+    Least recently used entries are evicted once there are more than
+    ``max_entries`` or their arrays take more than ``max_bytes`` together.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (series, size in bytes)
+        self._entries: "OrderedDict[Tuple, Tuple[IndicatorSeries, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_calculate(
+        self,
+        candles: CandleBuffer,
+        indicator_id: str,
+        params: Optional[Dict[str, Any]] = None,
+        pair: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> IndicatorSeries:
+        """
+        Return cached indicator series, calculating them on a miss.
+
+        Args:
+            candles: Candles to calculate over
+            indicator_id: Indicator type ID
+            params: Indicator parameters (defaults are filled in)
+            pair: Currency pair the candles belong to
+            timeframe: Candle timeframe
+            version: Data version of the candles (content fingerprint if omitted)
+
+        Returns:
+            Read-only series keyed by component name
+
+        Raises:
+            ValueError: If the indicator is unknown or a parameter is invalid
+        """
+        normalized = normalize_params(indicator_id, params)
+        key = (
+            pair,
+            timeframe,
+            version or data_version(candles),
+            indicator_id,
+            tuple(sorted(normalized.items())),
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        series = INDICATORS[indicator_id].calculate(candles, **normalized)
+        size = 0
+        for values in series.values():
+            values.setflags(write=False)
+            size += values.nbytes
+        if size > self.max_bytes:
+            return series
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (series, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return series
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global cache instance shared by backtests and the API
+indicator_cache = IndicatorCache(
+    max_entries=settings.INDICATOR_CACHE_MAX_ENTRIES,
+    max_bytes=settings.INDICATOR_CACHE_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,258 @@
+"""
+Metric Accumulators
+===================
+Live backtest metrics, updated as each trade closes.
+
+A running backtest reports the scalar metrics of the trades closed so far
+as ``live_metrics`` in its progress. They are kept as running state so a
+progress poll never walks the trade list:
+
+- ReturnMoments: Welford mean/variance of equity returns (Sharpe) plus the
+  downside sum of squares (Sortino)
+- EquityTracker: running peak, maximum drawdown and current drawdown of
+  the equity curve
+- MetricAccumulator: the above plus trade counters, gross P/L and the
+  largest win and loss
+
+Updates are O(1) per trade. The results of a finished run (distributions,
+period tables, streaks, drawdown periods and durations) come from
+TradeAnalytics over the run's trade ledger instead (see
+core.trade_analytics); the formulas shared by both live here.
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+# Annualization factor for per-point return ratios
+TRADING_DAYS = 252
+
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """Parse an ISO string or datetime into a naive datetime (None if invalid)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+def expectancy(win_rate: float, avg_win: float, avg_loss: float) -> float:
+    """Expected profit per trade = (win_rate * avg_win) - (loss_rate * avg_loss)."""
+    win_rate_decimal = win_rate / 100
+    return round(win_rate_decimal * avg_win - (1 - win_rate_decimal) * avg_loss, 2)
+
+
+def recovery_factor(total_return: float, max_drawdown: float) -> float:
+    """Recovery factor = total_return / max_drawdown (0 without a drawdown)."""
+    if max_drawdown <= 0:
+        return 0.0
+    return round(total_return / max_drawdown, 2)
+
+
+class ReturnMoments:
+    """Welford mean/variance of return percentages plus the downside sum of squares."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._negatives = 0
+        self._downside_squares = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < 0:
+            self._negatives += 1
+            self._downside_squares += value * value
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.0) -> Optional[float]:
+        """Annualized Sharpe Ratio (None with fewer than 2 returns or no variance)."""
+        if self.count < 2:
+            return None
+        variance = self._m2 / self.count
+        std_dev = math.sqrt(variance) if variance > 0 else 0
+        if std_dev == 0:
+            return None
+        sharpe = (self.mean - risk_free_rate / TRADING_DAYS) / std_dev
+        return round(sharpe * math.sqrt(TRADING_DAYS), 2)
+
+    def sortino_ratio(self, risk_free_rate: float = 0.0) -> Optional[float]:
+        """Annualized Sortino Ratio (None with fewer than 2 returns or no losses)."""
+        if self.count < 2 or not self._negatives:
+            return None
+        downside_deviation = math.sqrt(self._downside_squares / self.count)
+        if downside_deviation == 0:
+            return None
+        sortino = (self.mean - risk_free_rate / TRADING_DAYS) / downside_deviation
+        return round(sortino * math.sqrt(TRADING_DAYS), 2)
+
+
+class EquityTracker:
+    """Running peak, drawdown and return moments of an equity curve."""
+
+    def __init__(self):
+        self.points = 0
+        self.returns = ReturnMoments()
+        self.peak: Optional[float] = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_percent = 0.0
+        self.current_drawdown_percent = 0.0
+        self._last: Optional[float] = None
+
+    @classmethod
+    def from_values(cls, equity_curve: Sequence[float]) -> "EquityTracker":
+        tracker = cls()
+        for equity in equity_curve:
+            tracker.add(equity)
+        return tracker
+
+    def add(self, equity: float) -> None:
+        """Add the next equity point."""
+        if self._last is not None and self._last > 0:
+            self.returns.add((equity - self._last) / self._last * 100)
+        if self.peak is None or equity >= self.peak:
+            self.peak = equity
+            self.current_drawdown_percent = 0.0
+        else:
+            drawdown = self.peak - equity
+            drawdown_percent = drawdown / self.peak * 100 if self.peak > 0 else 0
+            self.current_drawdown_percent = drawdown_percent
+            self.max_drawdown = max(self.max_drawdown, drawdown)
+            self.max_drawdown_percent = max(self.max_drawdown_percent, drawdown_percent)
+        self._last = equity
+        self.points += 1
+
+
+class MetricAccumulator:
+    """
+    Live scalar metrics of a run, fed one closed trade at a time.
+
+    Attributes:
+        initial_balance: Starting account balance
+        balance: Balance after the last trade
+        equity: Drawdown and return state of the equity curve
+    """
+
+    def __init__(self, initial_balance: float, opening_equity: Optional[float] = None):
+        self.initial_balance = initial_balance
+        self.balance = initial_balance
+        self.equity = EquityTracker()
+        self.equity.add(initial_balance if opening_equity is None else opening_equity)
+        self.trade_count = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.largest_pnl: Optional[float] = None
+        self.smallest_pnl: Optional[float] = None
+
+    @classmethod
+    def from_trades(
+        cls,
+        trades: List[Dict[str, Any]],
+        initial_balance: float,
+        equity_curve: Optional[Sequence[float]] = None,
+    ) -> "MetricAccumulator":
+        """
+        Accumulate a trade list in one pass (e.g. the trades of a checkpoint).
+
+        Args:
+            trades: Closed trades in order
+            initial_balance: Starting account balance
+            equity_curve: Equity per closed trade (rebuilt from the trades if omitted)
+
+        Returns:
+            MetricAccumulator holding every trade
+        """
+        if equity_curve is None or len(equity_curve) < 2:
+            accumulator = cls(initial_balance)
+            balance = initial_balance
+            for trade in trades:
+                balance += trade.get("pnl", 0)
+                accumulator.add_trade(trade, balance)
+            return accumulator
+
+        accumulator = cls(initial_balance, opening_equity=equity_curve[0])
+        for trade in trades:
+            accumulator.add_trade(trade)
+        for equity in equity_curve[1:]:
+            accumulator.equity.add(equity)
+        return accumulator
+
+    def add_trade(self, trade: Dict[str, Any], balance: Optional[float] = None) -> None:
+        """
+        Record a closed trade.
+
+        Args:
+            trade: Trade record with pnl
+            balance: Balance after the trade; adds an equity point
+        """
+        pnl = trade.get("pnl", 0)
+
+        self.trade_count += 1
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.losing_trades += 1
+            self.gross_loss += pnl
+        self.largest_pnl = pnl if self.largest_pnl is None else max(self.largest_pnl, pnl)
+        self.smallest_pnl = pnl if self.smallest_pnl is None else min(self.smallest_pnl, pnl)
+
+        if balance is not None:
+            self.balance = balance
+            self.equity.add(round(balance, 2))
+
+    def summary(self, final_balance: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Scalar metrics of the trades so far.
+
+        Args:
+            final_balance: Balance to report (defaults to the balance after the last trade)
+
+        Returns:
+            Dict keyed like the matching BacktestResultsSummary fields
+        """
+        final_balance = self.balance if final_balance is None else final_balance
+        total_net_profit = final_balance - self.initial_balance
+        roi = total_net_profit / self.initial_balance * 100 if self.initial_balance > 0 else 0.0
+
+        trades = self.trade_count
+        win_rate = self.winning_trades / trades * 100 if trades else 0.0
+        total_losses = abs(self.gross_loss)
+        avg_win = self.gross_profit / self.winning_trades if self.winning_trades else 0.0
+        avg_loss = total_losses / self.losing_trades if self.losing_trades else 0.0
+        has_curve = self.equity.points >= 2
+        max_drawdown = round(self.equity.max_drawdown, 2) if has_curve else 0.0
+
+        return {
+            "total_net_profit": round(total_net_profit, 2),
+            "return_on_investment": round(roi, 2),
+            "final_balance": round(final_balance, 2),
+            "total_trades": trades,
+            "winning_trades": self.winning_trades,
+            "losing_trades": self.losing_trades,
+            "win_rate": round(win_rate, 1),
+            "profit_factor": round(self.gross_profit / total_losses, 2) if total_losses else 0.0,
+            "average_win": round(avg_win, 2),
+            "average_loss": round(avg_loss, 2),
+            "win_loss_ratio": round(avg_win / avg_loss, 2) if avg_loss > 0 else 0.0,
+            "largest_win": round(self.largest_pnl, 2) if trades else 0.0,
+            "largest_loss": round(abs(self.smallest_pnl), 2) if trades else 0.0,
+            "expectancy": expectancy(win_rate, avg_win, avg_loss),
+            "max_drawdown_dollars": max_drawdown,
+            "max_drawdown_percent": (
+                round(self.equity.max_drawdown_percent, 2) if has_curve else 0.0
+            ),
+            "current_drawdown_percent": round(self.equity.current_drawdown_percent, 2),
+            "recovery_factor": recovery_factor(total_net_profit, max_drawdown),
+            "sharpe_ratio": self.equity.returns.sharpe_ratio(),
+            "sortino_ratio": self.equity.returns.sortino_ratio(),
+        }
@@ -0,0 +1,135 @@
+"""
+Monte Carlo Engine
+==================
+Batched Monte Carlo simulation of trade sequences.
+
+Equity paths are built by resampling trade P/L with replacement. Instead of
+walking each path trade by trade, a chunk of paths is drawn as one index
+matrix and accumulated with ``cumsum``, with the chunk size chosen so the
+matrix stays within ``settings.MONTE_CARLO_CHUNK_BYTES``. Simulation stops
+early once the risk of ruin estimate has converged (its 95% confidence
+half-width is within the tolerance), and every path contributes to
+percentile equity bands sampled at up to ``BAND_POINTS`` trade counts.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Percentiles reported as equity bands
+BAND_PERCENTILES = (5, 50, 95)
+
+# Maximum number of trade counts the equity bands are sampled at
+BAND_POINTS = 100
+
+# z-score of the confidence interval used for the convergence check
+CONFIDENCE_Z = 1.96
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Outcome of a Monte Carlo run.
+
+    Attributes:
+        risk_of_ruin: Percentage of paths that hit the ruin balance
+        simulations: Number of paths simulated
+        converged: Whether the run stopped because the estimate converged
+        bands: ``trade`` (trade counts) plus one equity series per percentile
+            (``p5``, ``p50``, ``p95``)
+    """
+
+    risk_of_ruin: float
+    simulations: int
+    converged: bool
+    bands: Dict[str, List[float]] = field(default_factory=dict)
+
+
+def simulate_trade_paths(
+    pnl: Sequence[float],
+    initial_balance: float,
+    ruin_threshold: float = 0.5,
+    max_simulations: int = 10000,
+    min_simulations: int = 1000,
+    tolerance: float = 0.5,
+    seed: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Simulate equity paths by resampling trade P/L with replacement.
+
+    Args:
+        pnl: Trade P/L values
+        initial_balance: Starting account balance
+        ruin_threshold: Fraction of the account lost to count as ruin (0.5 = 50%)
+        max_simulations: Upper bound on simulated paths
+        min_simulations: Paths simulated before convergence is checked
+        tolerance: Target 95% confidence half-width of the risk of ruin, in
+            percentage points
+        seed: Random seed for reproducible results (None for fresh entropy)
+        chunk_bytes: Memory budget of one chunk of paths
+
+    Returns:
+        MonteCarloResult with risk of ruin and percentile equity bands
+
+    Raises:
+        ValueError: If there are no trades to resample
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    n_trades = len(pnl)
+    if n_trades == 0:
+        raise ValueError("No trades to resample")
+    rng = np.random.default_rng(seed)
+    ruin_balance = initial_balance * (1 - ruin_threshold)
+    chunk_bytes = chunk_bytes or settings.MONTE_CARLO_CHUNK_BYTES
+
+    # Two float64 matrices (sampled P/L and balances) per chunk; convergence
+    # is checked after every chunk, so chunks hold at most min_simulations paths
+    chunk_size = max(min(int(chunk_bytes // (n_trades * 16)), min_simulations), 1)
+    band_steps = np.unique(np.linspace(0, n_trades, min(n_trades, BAND_POINTS) + 1).astype(int))
+    band_columns = band_steps[1:] - 1
+
+    simulated = 0
+    ruined = 0
+    converged = False
+    sampled_equity = []
+    while simulated < max_simulations:
+        rows = min(chunk_size, max_simulations - simulated)
+        balances = np.cumsum(pnl[rng.integers(0, n_trades, size=(rows, n_trades))], axis=1)
+        balances += initial_balance
+
+        ruined += int(np.count_nonzero((balances <= ruin_balance).any(axis=1)))
+        sampled_equity.append(balances[:, band_columns])
+        simulated += rows
+
+        if simulated >= min_simulations:
+            p = ruined / simulated
+            half_width = CONFIDENCE_Z * np.sqrt(p * (1 - p) / simulated) * 100
+            if half_width <= tolerance:
+                converged = True
+                break
+
+    equity = np.vstack(sampled_equity)
+    bands: Dict[str, List[float]] = {"trade": band_steps.tolist()}
+    for percentile, series in zip(
+        BAND_PERCENTILES, np.percentile(equity, BAND_PERCENTILES, axis=0)
+    ):
+        bands[f"p{percentile}"] = [initial_balance] + np.round(series, 2).tolist()
+
+    logger.debug(
+        f"[MONTE_CARLO] {simulated} paths of {n_trades} trades "
+        f"({'converged' if converged else 'max simulations'})"
+    )
+
+    return MonteCarloResult(
+        risk_of_ruin=round(ruined / simulated * 100, 2),
+        simulations=simulated,
+        converged=converged,
+        bands=bands,
+    )
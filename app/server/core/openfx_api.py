@@ -8,17 +8,22 @@ import datetime as dt
 import hashlib
 import json
 import logging
+import os
 import random
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 
 from config import settings
+from infrastructure.candle_store import COLUMNS, PRICE_SUFFIXES, CandleStore, get_candle_store
 from infrastructure.instrument_collection import instrument_collection
+from infrastructure.price_cache import price_cache
 from models.api_price import ApiPrice
 from models.open_trade import OpenTrade
+from utils.rate_limiter import SharedTokenBucket, TokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -29,26 +34,126 @@ LABEL_MAP = {
     "Close": "c",
 }
 
-THROTTLE_TIME = 0.3
+# Calls drawing from the trading budget: order changes on the trade endpoint.
+# Reads (account, open trades, trade history) use the market data budget so
+# dashboard polling never queues an order.
+ORDER_ENDPOINT = "trade"
+ORDER_VERBS = ("post", "put", "delete")
+
+_rate_limiters: Dict[Tuple[str, str], TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+# Threads per client fetching the second side of a candle request
+SIDE_FETCH_WORKERS = 8
+
+
+def rate_budget(url: str, verb: str = "get") -> str:
+    """Rate limit budget of an API call: "trading" or "market_data"."""
+    is_order = url.split("/", 1)[0] == ORDER_ENDPOINT and verb in ORDER_VERBS
+    return "trading" if is_order else "market_data"
+
+
+def rate_limiter_for(url: str, verb: str = "get") -> TokenBucket:
+    """
+    The rate limiter of an API call's budget.
+
+    Under settings.OPENFX_RATE_LIMIT_DIR the budgets are shared with every
+    process using that directory; without it they are per process.
+    """
+    budget = rate_budget(url, verb)
+    directory = settings.OPENFX_RATE_LIMIT_DIR
+    if budget == "trading":
+        rate, burst = settings.OPENFX_TRADING_REQUESTS_PER_SECOND, settings.OPENFX_TRADING_BURST
+    else:
+        rate = settings.OPENFX_MARKET_DATA_REQUESTS_PER_SECOND
+        burst = settings.OPENFX_MARKET_DATA_BURST
+
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get((directory, budget))
+        if limiter is None:
+            if directory:
+                path = os.path.join(directory, f"{budget}.bucket")
+                limiter = SharedTokenBucket(path, rate, burst)
+            else:
+                limiter = TokenBucket(rate, burst)
+            _rate_limiters[(directory, budget)] = limiter
+        return limiter
+
+
+def trade_history_request(
+    timestamp_from: int, timestamp_to: int, request_page_size: int = 1000
+) -> Dict:
+    """Request body of a forward trade history query between two ms timestamps."""
+    return {
+        "TimestampFrom": timestamp_from,
+        "TimestampTo": timestamp_to,
+        "OrderId": None,
+        "SkipCancelOrder": False,
+        "RequestDirection": "Forward",
+        "RequestPageSize": request_page_size,
+        "RequestLastId": None,
+    }
 
 
 class OpenFxApi:
     """
     Client for the OpenFX trading API.
     Handles authentication, rate limiting, and all API operations.
+
+    requests.Session is not thread-safe, so each thread using the client
+    (including the side fetch threads of fetch_candles) gets its own
+    session. close() releases the sessions and side fetch threads.
     """
 
     def __init__(self):
-        """Initialize API client with session and headers."""
-        self.session = requests.Session()
-        self.session.headers.update(settings.SECURE_HEADER)
+        """Initialize API client; sessions and side fetch threads are created on first use."""
         self.last_req_time = dt.datetime.now()
-
-    def _throttle(self) -> None:
-        """Apply rate limiting between API calls."""
-        elapsed = (dt.datetime.now() - self.last_req_time).total_seconds()
-        if elapsed < THROTTLE_TIME:
-            time.sleep(THROTTLE_TIME - elapsed)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: List[requests.Session] = []
+        self._side_fetch_pool: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "OpenFxApi":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(settings.SECURE_HEADER)
+            with self._lock:
+                self._sessions.append(session)
+            self._local.session = session
+        return session
+
+    def _side_fetch(self) -> ThreadPoolExecutor:
+        """The client's side fetch threads, started on first use."""
+        with self._lock:
+            if self._side_fetch_pool is None:
+                self._side_fetch_pool = ThreadPoolExecutor(
+                    max_workers=SIDE_FETCH_WORKERS, thread_name_prefix="openfx-candles"
+                )
+            return self._side_fetch_pool
+
+    def close(self) -> None:
+        """Stop the side fetch threads and close every session (reopened on next use)."""
+        with self._lock:
+            pool, self._side_fetch_pool = self._side_fetch_pool, None
+            sessions, self._sessions = self._sessions, []
+            self._local = threading.local()
+        if pool is not None:
+            pool.shutdown(wait=True)
+        for session in sessions:
+            session.close()
+
+    def _throttle(self, url: str = "", verb: str = "get") -> None:
+        """Wait until the rate limit budget of the call allows another API call."""
+        rate_limiter_for(url, verb).acquire()
         self.last_req_time = dt.datetime.now()
 
     def _generate_mock_candles(self, pair_name: str, granularity: str, count: int) -> Dict:
@@ -150,7 +255,7 @@ class OpenFxApi:
         Returns:
             Tuple of (success, response_data)
         """
-        self._throttle()
+        self._throttle(url, verb)
         full_url = f"{settings.OPENFX_URL}/{url}"
 
         if data is not None:
@@ -248,6 +353,8 @@ class OpenFxApi:
         """
         Fetch candlestick data for a pair.
 
+        The bid and ask bars are requested concurrently.
+
         Args:
             pair_name: Trading pair symbol
             count: Number of candles (negative for most recent)
@@ -264,8 +371,11 @@ class OpenFxApi:
 
         base_url = f"quotehistory/{pair_name}/{granularity}/bars/"
 
+        ask_request = self._side_fetch().submit(
+            self._make_request, base_url + "ask", params=params
+        )
         ok_bid, bid_data = self._make_request(base_url + "bid", params=params)
-        ok_ask, ask_data = self._make_request(base_url + "ask", params=params)
+        ok_ask, ask_data = ask_request.result()
 
         if ok_ask and ok_bid:
             return True, [ask_data, bid_data]
@@ -289,6 +399,9 @@ class OpenFxApi:
         """
         Get candlestick data as a DataFrame.
 
+        The most recent candles (negative count, no date_from) are served
+        from the local candle store when it is enabled.
+
         Args:
             pair_name: Trading pair symbol
             count: Number of candles
@@ -298,6 +411,10 @@ class OpenFxApi:
         Returns:
             DataFrame with OHLC data or None on error
         """
+        store = get_candle_store()
+        if store is not None and count < 0 and date_from is None:
+            return self._stored_candles_df(store, pair_name, -count, granularity)
+
         ts_from = None
         if date_from is not None:
             ts_from = int(pd.Timestamp(date_from).timestamp() * 1000)
@@ -344,6 +461,27 @@ class OpenFxApi:
 
         return df_merged
 
+    def _stored_candles_df(
+        self, store: CandleStore, pair_name: str, count: int, granularity: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        The last complete candles from the candle store, fetching new ones first.
+
+        Returns:
+            DataFrame like get_candles_df, or None if new candles could not be fetched
+        """
+        synced, columns = store.latest(pair_name, granularity, count, api=self)
+        if not synced:
+            return None
+
+        times = pd.to_datetime(columns["time"], unit="s").astype("datetime64[ns]")
+        df = pd.DataFrame({"time": times})
+        for name in COLUMNS[1:-1]:
+            df[name] = columns[name]
+        for suffix in PRICE_SUFFIXES:
+            df[f"mid{suffix}"] = columns[f"mid{suffix}"]
+        return df
+
     def last_complete_candle(self, pair_name: str, granularity: str) -> Optional[pd.Timestamp]:
         """
         Get the timestamp of the last complete candle.
@@ -364,6 +502,8 @@ class OpenFxApi:
         """
         Get candle data formatted for web API response.
 
+        Windows are cached until the next candle closes (see price_cache).
+
         Args:
             pair_name: Trading pair symbol (with or without underscore)
             granularity: Timeframe
@@ -382,6 +522,10 @@ class OpenFxApi:
 
         pair_name = pair_name.replace("_", "")
 
+        cached = price_cache.get(pair_name, granularity, count)
+        if cached is not None:
+            return cached
+
         try:
             df = self.get_candles_df(pair_name, granularity=granularity, count=count * -1)
 
@@ -399,9 +543,12 @@ class OpenFxApi:
 
             cols = ["time", "mid_o", "mid_h", "mid_l", "mid_c"]
             df = df[cols].copy()
+            last_candle_time = int(df.time.iloc[-1].timestamp())
             df["time"] = df.time.dt.strftime("%y-%m-%d %H:%M")
 
-            return df.to_dict(orient="list")
+            data = df.to_dict(orient="list")
+            price_cache.put(pair_name, granularity, data, last_candle_time)
+            return data
 
         except Exception as e:
             logger.error(
@@ -505,15 +652,7 @@ class OpenFxApi:
         Returns:
             Trade history report dictionary or None on error
         """
-        request_body = {
-            "TimestampFrom": timestamp_from,
-            "TimestampTo": timestamp_to,
-            "OrderId": None,
-            "SkipCancelOrder": False,
-            "RequestDirection": "Forward",
-            "RequestPageSize": request_page_size,
-            "RequestLastId": None,
-        }
+        request_body = trade_history_request(timestamp_from, timestamp_to, request_page_size)
 
         ok, response = self._make_request("tradehistory", verb="post", data=request_body)
 
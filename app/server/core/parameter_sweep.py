@@ -0,0 +1,383 @@
+"""
+Parameter Sweep
+===============
+Grid search over a saved backtest.
+
+A sweep takes a base backtest plus a list of values per parameter and runs
+every combination against one shared candle buffer:
+
+- Candles are loaded once for the whole sweep
+- Signals are evaluated once per distinct set of indicator parameters, so
+  combinations that only change risk management or position sizing reuse
+  the same entry/exit masks
+- Indicator series come from the shared indicator cache, so an indicator
+  whose parameters do not change between combinations is computed once
+
+Parameters are addressed by dotted paths:
+
+- ``indicators.<instance_id>.<param>``: a strategy indicator parameter
+- ``risk_management.<section>.<field>``: e.g. ``risk_management.stop_loss.value``
+- ``position_sizing.<field>``: e.g. ``position_sizing.value``
+
+Results come back as one table of summary metrics, one row per combination.
+"""
+
+import copy
+import itertools
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Event
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from core.backtest_executor import BacktestExecution, BacktestExecutor, backtest_executor
+from core.candle_buffer import CandleBuffer
+from core.condition_compiler import compile_strategy
+from core.trade_analytics import TradeAnalytics
+from core.trade_ledger import TradeLedger
+from core.vectorized_engine import ENGINE_VECTORIZED, ENGINES
+from db.supabase_client import get_supabase_client, is_configured
+
+logger = logging.getLogger(__name__)
+
+PARAMETER_ROOTS = ("indicators", "risk_management", "position_sizing")
+
+# Summary metrics reported per combination, in column order
+SUMMARY_METRICS = (
+    "total_trades",
+    "win_rate",
+    "total_net_profit",
+    "return_on_investment",
+    "profit_factor",
+    "max_drawdown_percent",
+    "sharpe_ratio",
+    "expectancy",
+    "final_balance",
+)
+
+
+def expand_grid(parameters: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand parameter value lists into every combination.
+
+    Args:
+        parameters: Parameter path -> candidate values
+
+    Returns:
+        List of combinations (parameter path -> value), in grid order
+
+    Raises:
+        ValueError: If a path is invalid, a value list is empty or the grid
+            exceeds ``settings.SWEEP_MAX_COMBINATIONS``
+    """
+    if not parameters:
+        raise ValueError("At least one sweep parameter is required")
+
+    for path, values in parameters.items():
+        _split_path(path)
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Parameter {path} needs a non-empty list of values")
+
+    combinations = int(np.prod([len(values) for values in parameters.values()]))
+    if combinations > settings.SWEEP_MAX_COMBINATIONS:
+        raise ValueError(
+            f"Sweep has {combinations} combinations "
+            f"(maximum {settings.SWEEP_MAX_COMBINATIONS})"
+        )
+
+    paths = list(parameters)
+    return [dict(zip(paths, values)) for values in itertools.product(*parameters.values())]
+
+
+def apply_combination(
+    backtest: Dict[str, Any], strategy: Dict[str, Any], combination: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Apply one combination to copies of the backtest and strategy rows.
+
+    Returns:
+        Tuple of (backtest, strategy) with the combination's values set
+
+    Raises:
+        ValueError: If an indicator path names an unknown indicator instance
+    """
+    backtest = copy.deepcopy(backtest)
+    strategy = copy.deepcopy(strategy)
+
+    for path, value in combination.items():
+        root, keys = _split_path(path)
+        if root == "indicators":
+            instance_id, param = keys
+            indicator = next(
+                (
+                    ind
+                    for ind in strategy.get("indicators") or []
+                    if ind.get("instance_id") == instance_id
+                ),
+                None,
+            )
+            if indicator is None:
+                raise ValueError(f"Strategy has no indicator instance {instance_id}")
+            indicator["params"] = {**(indicator.get("params") or {}), param: value}
+        else:
+            target = backtest.get(root) or {}
+            backtest[root] = target
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = value
+
+    return backtest, strategy
+
+
+@dataclass
+class SweepGrid:
+    """
+    Expanded parameter grid with the run configuration of every combination.
+
+    Attributes:
+        parameters: Parameter path -> candidate values
+        combinations: Parameter path -> value, one dict per combination
+        backtests: Backtest row with each combination applied
+        signal_keys: Signal set each combination uses
+        strategies: Signal key -> strategy row to evaluate for it
+    """
+
+    parameters: Dict[str, List[Any]]
+    combinations: List[Dict[str, Any]]
+    backtests: List[Dict[str, Any]]
+    signal_keys: List[str]
+    strategies: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        backtest: Dict[str, Any],
+        strategy: Dict[str, Any],
+        parameters: Dict[str, List[Any]],
+    ) -> "SweepGrid":
+        """Expand a grid; combinations with the same indicator params share a signal key."""
+        combinations = expand_grid(parameters)
+        grid = cls(parameters, combinations, [], [])
+        for combination in combinations:
+            run_backtest, run_strategy = apply_combination(backtest, strategy, combination)
+            key = _signal_key(combination)
+            grid.backtests.append(run_backtest)
+            grid.signal_keys.append(key)
+            grid.strategies.setdefault(key, run_strategy)
+        return grid
+
+    def evaluate_signals(
+        self,
+        executor: BacktestExecutor,
+        candles: CandleBuffer,
+        pair: Optional[str],
+        timeframe: Optional[str],
+        map_fn: Callable = map,
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Evaluate every distinct signal set over the candles.
+
+        Returns:
+            Signal key -> entry/exit masks
+        """
+
+        def evaluate(run_strategy: Dict[str, Any]) -> Dict[str, np.ndarray]:
+            plan = compile_strategy(run_strategy)
+            values = executor._calculate_indicator_values(plan, candles, pair, timeframe)
+            return plan.evaluate(candles, values)
+
+        keys = list(self.strategies)
+        return dict(zip(keys, map_fn(evaluate, self.strategies.values())))
+
+
+def simulate(
+    executor: BacktestExecutor,
+    engine: str,
+    candles: CandleBuffer,
+    signals: Dict[str, np.ndarray],
+    backtest: Dict[str, Any],
+    initial_balance: float,
+) -> Tuple[List[Dict[str, Any]], float, List[float]]:
+    """
+    Run one configuration through an engine without a database row.
+
+    Returns:
+        Tuple of (trades, final_balance, full_equity_curve)
+    """
+    run_engine = (
+        executor._run_vectorized_engine
+        if engine == ENGINE_VECTORIZED
+        else executor._run_loop_engine
+    )
+    # Detached execution: no database row and nothing to cancel
+    execution = BacktestExecution(backtest_id="detached", thread=None, cancel_event=Event())
+    return run_engine(
+        backtest_id=None,
+        execution=execution,
+        cancel_event=execution.cancel_event,
+        candles=candles,
+        signals=signals,
+        initial_balance=initial_balance,
+        position_sizing=backtest.get("position_sizing") or {},
+        risk_management=backtest.get("risk_management") or {},
+    )
+
+
+def summarize(
+    trades: List[Dict[str, Any]],
+    initial_balance: float,
+    final_balance: float,
+    equity_curve: List[float],
+) -> Dict[str, Any]:
+    """
+    Summary metrics of a run, keyed by SUMMARY_METRICS.
+
+    Only the headline metrics are computed; the Monte Carlo, distribution
+    and period tables of full results are skipped.
+    """
+    if not trades:
+        # As reported by the results of a run without trades
+        empty = dict.fromkeys(SUMMARY_METRICS, 0.0)
+        return {**empty, "total_trades": 0, "sharpe_ratio": None, "final_balance": initial_balance}
+    headline = TradeAnalytics(
+        TradeLedger.from_trades(trades), initial_balance, equity_curve
+    ).headline(final_balance)
+    return {metric: headline[metric] for metric in SUMMARY_METRICS}
+
+
+def sweep_backtest(
+    backtest: Dict[str, Any],
+    strategy: Dict[str, Any],
+    parameters: Dict[str, List[Any]],
+    engine: Optional[str] = None,
+    executor: Optional[BacktestExecutor] = None,
+) -> Dict[str, Any]:
+    """
+    Run every parameter combination of a backtest over one candle buffer.
+
+    Args:
+        backtest: Base backtest row
+        strategy: Linked strategy row
+        parameters: Parameter path -> candidate values
+        engine: Execution engine (defaults to the backtest's engine)
+        executor: Executor whose engines run the combinations
+
+    Returns:
+        dict with the table ``columns`` and ``rows`` plus sweep statistics
+
+    Raises:
+        ValueError: If the parameters or engine are invalid
+    """
+    executor = executor or backtest_executor
+    engine = engine or backtest.get("engine") or executor.DEFAULT_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown backtest engine: {engine}")
+
+    grid = SweepGrid.build(backtest, strategy, parameters)
+    started = time.perf_counter()
+
+    candles, pair, timeframe = executor._load_candles(backtest, strategy)
+    initial_balance = float(backtest.get("initial_balance", 10000))
+
+    def run(index: int) -> List[Any]:
+        outcome = simulate(
+            executor,
+            engine,
+            candles,
+            signals[grid.signal_keys[index]],
+            grid.backtests[index],
+            initial_balance,
+        )
+        summary = summarize(outcome[0], initial_balance, outcome[1], outcome[2])
+        return list(grid.combinations[index].values()) + list(summary.values())
+
+    with ThreadPoolExecutor(max_workers=max(settings.SWEEP_WORKERS, 1)) as pool:
+        signals = grid.evaluate_signals(executor, candles, pair, timeframe, pool.map)
+        rows = list(pool.map(run, range(len(grid.combinations))))
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"[PARAMETER_SWEEP] Ran {len(rows)} combinations over {len(candles)} candles "
+        f"({len(signals)} signal evaluations) in {elapsed:.2f}s"
+    )
+
+    return {
+        "backtest_id": backtest.get("id"),
+        "engine": engine,
+        "total_candles": len(candles),
+        "combinations": len(rows),
+        "signal_evaluations": len(signals),
+        "elapsed_seconds": round(elapsed, 3),
+        "columns": list(parameters) + list(SUMMARY_METRICS),
+        "rows": rows,
+    }
+
+
+def run_parameter_sweep(
+    backtest_id: str, parameters: Dict[str, List[Any]], engine: Optional[str] = None
+) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Run a parameter sweep over a saved backtest.
+
+    Args:
+        backtest_id: The base backtest ID
+        parameters: Parameter path -> candidate values
+        engine: Execution engine (defaults to the backtest's engine)
+
+    Returns:
+        Tuple of (success, sweep_result, error_message)
+    """
+    if not is_configured():
+        return False, None, "Supabase not configured"
+
+    client = get_supabase_client()
+    if client is None:
+        return False, None, "Failed to get Supabase client"
+
+    try:
+        result = client.table("backtests").select("*").eq("id", backtest_id).execute()
+        if not result.data:
+            return False, None, f"Backtest not found: {backtest_id}"
+        backtest = result.data[0]
+
+        strategy_id = backtest.get("strategy_id")
+        if not strategy_id:
+            return False, None, "Backtest has no linked strategy"
+        result = client.table("strategies").select("*").eq("id", strategy_id).execute()
+        if not result.data:
+            return False, None, f"Strategy not found: {strategy_id}"
+
+        return True, sweep_backtest(backtest, result.data[0], parameters, engine), None
+
+    except ValueError as e:
+        return False, None, str(e)
+    except Exception as e:
+        logger.error(f"[PARAMETER_SWEEP] Sweep of backtest {backtest_id} failed: {e}")
+        return False, None, str(e)
+
+
+def _split_path(path: str) -> Tuple[str, List[str]]:
+    """Split and validate a parameter path into its root and keys."""
+    root, _, rest = path.partition(".")
+    keys = rest.split(".") if rest else []
+    if root not in PARAMETER_ROOTS or not keys or not all(keys):
+        raise ValueError(
+            f"Invalid sweep parameter {path!r}: expected one of "
+            f"{', '.join(r + '.*' for r in PARAMETER_ROOTS)}"
+        )
+    if root == "indicators" and len(keys) != 2:
+        raise ValueError(f"Invalid sweep parameter {path!r}: use indicators.<instance_id>.<param>")
+    return root, keys
+
+
+def _signal_key(combination: Dict[str, Any]) -> str:
+    """Identify the indicator parameters of a combination (they alone change signals)."""
+    return json.dumps(
+        sorted((p, v) for p, v in combination.items() if p.startswith("indicators.")),
+        default=str,
+    )
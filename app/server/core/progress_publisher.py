@@ -0,0 +1,132 @@
+"""
+Progress Publisher
+==================
+Coalescing background writer for backtest progress.
+
+The engines report progress every few candles. Writing each report to the
+database from the simulation thread would make fast runs wait on network
+round trips, so reports are handed to a ProgressPublisher instead:
+
+- ``publish()`` only merges the fields into the pending update of that
+  backtest and returns; it never waits for a write
+- A background thread writes a backtest's pending update at most once per
+  ``min_interval`` seconds; reports that arrive in between are merged into
+  it (later values win), and each merged report is counted as a saved write
+- ``flush()`` writes the pending update immediately; callers flush before
+  writing a final status so a late progress write cannot land after it
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressPublisher:
+    """
+    Coalesces progress updates per backtest and writes them in the background.
+
+    Attributes:
+        min_interval: Minimum seconds between two writes of one backtest
+        published: Updates handed to publish()
+        written: Database writes made
+        saved: Updates merged into a pending write instead of written
+    """
+
+    def __init__(
+        self, write: Callable[[str, Dict[str, Any]], None], min_interval: float = 0.5
+    ):
+        self.min_interval = min_interval
+        self._write = write
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last_write: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        # Held while taking and writing an update, so writes of a backtest stay in order
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self.published = 0
+        self.written = 0
+        self.saved = 0
+
+    def publish(self, backtest_id: str, fields: Dict[str, Any]) -> None:
+        """Queue a progress update without waiting for it to be written."""
+        with self._condition:
+            self.published += 1
+            pending = self._pending.get(backtest_id)
+            if pending is None:
+                self._pending[backtest_id] = dict(fields)
+            else:
+                pending.update(fields)
+                self.saved += 1
+            self._ensure_thread()
+            self._condition.notify()
+
+    def flush(self, backtest_id: str) -> None:
+        """Write the pending update of a backtest now, if there is one."""
+        with self._write_lock:
+            with self._condition:
+                fields = self._pending.pop(backtest_id, None)
+            if fields is not None:
+                self._write_update(backtest_id, fields)
+        with self._condition:
+            self._last_write.pop(backtest_id, None)
+
+    def discard(self, backtest_id: str) -> None:
+        """Drop the pending update of a backtest without writing it."""
+        with self._condition:
+            if self._pending.pop(backtest_id, None) is not None:
+                self.saved += 1
+            self._last_write.pop(backtest_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Update and write counters."""
+        with self._condition:
+            return {
+                "published": self.published,
+                "written": self.written,
+                "saved": self.saved,
+                "pending": len(self._pending),
+            }
+
+    def _ensure_thread(self) -> None:
+        """Start the writer thread on first use (caller holds the condition)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="progress-publisher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Write pending updates as their backtests become due."""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                now = time.monotonic()
+                due_at = {
+                    backtest_id: self._last_write.get(backtest_id, 0.0) + self.min_interval
+                    for backtest_id in self._pending
+                }
+                due = [backtest_id for backtest_id, at in due_at.items() if at <= now]
+                if not due:
+                    self._condition.wait(min(due_at.values()) - now)
+                    continue
+
+            for backtest_id in due:
+                with self._write_lock:
+                    with self._condition:
+                        fields = self._pending.pop(backtest_id, None)
+                    if fields is not None:
+                        self._write_update(backtest_id, fields)
+
+    def _write_update(self, backtest_id: str, fields: Dict[str, Any]) -> None:
+        """Write one update (caller holds the write lock)."""
+        try:
+            self._write(backtest_id, fields)
+        except Exception as e:
+            logger.error(f"[PROGRESS_PUBLISHER] Failed to write progress of {backtest_id}: {e}")
+        with self._condition:
+            self.written += 1
+            self._last_write[backtest_id] = time.monotonic()
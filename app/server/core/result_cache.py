@@ -0,0 +1,187 @@
+"""
+Result Cache
+============
+Content-addressed cache of finished backtest runs.
+
+Two runs with the same strategy logic, backtest settings and candle data
+produce the same results, for example after ``duplicate_backtest`` or
+when a backtest is run again from the UI. Runs are therefore keyed by a
+SHA-256 hash of a canonical JSON document holding:
+
+- The strategy fields that affect execution (not its name, tags or drawings)
+- The resolved backtest settings (pair, timeframe, dates, balance, sizing,
+  risk management, engine, walk-forward)
+- The data version of the candles: the seed of simulated candles or the
+  fetched range of stored ones, known before they are loaded, else a hash
+  of their content (see indicator_engine.data_version)
+
+Entries hold the results as JSON bytes, so every hit gets its own copy,
+plus the trade ledger. The cache is an LRU bounded by entry count and total
+size. Under the process backend every worker keeps its own cache.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+from core.candle_buffer import to_epoch_seconds
+from core.trade_ledger import COLUMN_DTYPES, TradeLedger
+
+# Bump when results change for identical inputs, so older entries stop matching
+RESULT_CACHE_VERSION = 1
+
+# Strategy fields that change how a backtest runs
+STRATEGY_KEY_FIELDS = (
+    "trade_direction",
+    "confirm_on_candle_close",
+    "indicators",
+    "patterns",
+    "conditions",
+    "groups",
+    "reference_indicators",
+    "time_filter",
+)
+
+# Backtest fields that change how a backtest runs (pair, timeframe, dates and
+# engine are resolved separately)
+BACKTEST_KEY_FIELDS = (
+    "initial_balance",
+    "currency",
+    "position_sizing",
+    "risk_management",
+    "walk_forward",
+)
+
+
+def result_cache_key(
+    strategy: Dict[str, Any],
+    backtest_data: Dict[str, Any],
+    pair: str,
+    timeframe: str,
+    engine: str,
+    data_version: str,
+) -> str:
+    """
+    Canonical hash of everything that determines a backtest's results.
+
+    Args:
+        strategy: The linked strategy row
+        backtest_data: The backtest row
+        pair: Resolved currency pair
+        timeframe: Resolved timeframe
+        engine: Resolved execution engine
+        data_version: Data version of the candles
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    document = {
+        "version": RESULT_CACHE_VERSION,
+        "strategy": {name: strategy.get(name) for name in STRATEGY_KEY_FIELDS},
+        "backtest": {name: backtest_data.get(name) for name in BACKTEST_KEY_FIELDS},
+        "pair": pair,
+        "timeframe": timeframe,
+        "start": to_epoch_seconds(backtest_data["start_date"]),
+        "end": to_epoch_seconds(backtest_data["end_date"]),
+        "engine": engine,
+        "data_version": data_version,
+    }
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _ledger_bytes(ledger: TradeLedger) -> int:
+    return sum(getattr(ledger, name).nbytes for name in COLUMN_DTYPES)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of backtest results and trade ledgers.
+
+    Least recently used entries are evicted once there are more than
+    ``max_entries`` or they take more than ``max_bytes`` together. A run
+    larger than ``max_bytes`` on its own is not cached.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[bytes, TradeLedger, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], TradeLedger]]:
+        """
+        Look up a run.
+
+        Returns:
+            Tuple of (results, ledger) with a fresh results dict, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        encoded, ledger, _ = entry
+        return json.loads(encoded), ledger
+
+    def put(self, key: str, results: Dict[str, Any], ledger: TradeLedger) -> bool:
+        """
+        Store a finished run.
+
+        Returns:
+            Whether the run was cached (False if it alone exceeds max_bytes)
+        """
+        encoded = json.dumps(results, separators=(",", ":"), default=str).encode()
+        size = len(encoded) + _ledger_bytes(ledger)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (encoded, ledger, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global cache instance shared by backtest runs
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESULT_CACHE_MAX_MB * 1024 * 1024,
+)
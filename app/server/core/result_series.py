@@ -0,0 +1,204 @@
+"""
+Result Series
+=============
+Compact storage and downsampling of per-candle backtest result series.
+
+Candle times, the buy-and-hold curve and trade counts per candle have one
+point per candle; for a year of M1 data that is ~525k points and several MB
+of JSON in every ``backtests.results`` row. Results therefore keep a
+downsampled copy for default chart views, and the full resolution series is
+stored once in the ``backtest_series`` table in a compact encoding:
+
+- Times are delta-encoded int64 epoch seconds (constant steps compress to
+  almost nothing)
+- Curve values are float32 and counts int32
+- Each column is zlib-compressed and base64-encoded for the JSON column
+
+Downsampling uses Largest-Triangle-Three-Buckets (LTTB) on the buy-and-hold
+curve, which keeps the peaks and troughs a chart shows. Trade counts are
+summed into the kept points so totals stay exact.
+"""
+
+import base64
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from core.candle_buffer import to_epoch_seconds
+
+SERIES_ENCODING = "delta-zlib-v1"
+
+# Stored dtype of each value column
+VALUE_COLUMNS = {"buy_hold_curve": np.float32, "trade_counts_per_candle": np.int32}
+
+
+def pack_column(values: np.ndarray) -> str:
+    """Compress an array's bytes and encode them as base64 text."""
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(values).tobytes(), 6)).decode()
+
+
+def unpack_column(text: str, dtype: Any) -> np.ndarray:
+    """Inverse of pack_column."""
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=dtype)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points of a line with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into ``threshold - 2`` buckets, and from each bucket the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket is kept.
+
+    Args:
+        x: Ascending x values
+        y: y values
+        threshold: Number of points to keep
+
+    Returns:
+        Ascending int64 indices of the kept points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n, dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+@dataclass(frozen=True)
+class ResultSeries:
+    """
+    Per-candle result series in columnar form.
+
+    Attributes:
+        time: int64 epoch seconds (UTC), sorted ascending
+        buy_hold_curve: Buy-and-hold equity at each candle
+        trade_counts_per_candle: Trades closed at each candle
+    """
+
+    time: np.ndarray
+    buy_hold_curve: np.ndarray
+    trade_counts_per_candle: np.ndarray
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Any]) -> Optional["ResultSeries"]:
+        """
+        Take the per-candle series out of a results dict.
+
+        Returns:
+            ResultSeries, or None if the results have no complete per-candle series
+        """
+        dates = results.get("equity_curve_dates") or []
+        buy_hold = results.get("buy_hold_curve") or []
+        counts = results.get("trade_counts_per_candle") or []
+        if not dates or len(buy_hold) != len(dates) or len(counts) != len(dates):
+            return None
+        return cls(
+            time=np.array([to_epoch_seconds(value) for value in dates], dtype=np.int64),
+            buy_hold_curve=np.asarray(buy_hold, dtype=np.float64),
+            trade_counts_per_candle=np.asarray(counts, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def encode(self) -> Dict[str, Any]:
+        """Encode as a JSON-serializable dict (see module docstring)."""
+        deltas = np.diff(self.time, prepend=self.time[:1])
+        encoded = {
+            "encoding": SERIES_ENCODING,
+            "length": len(self),
+            "start_time": int(self.time[0]) if len(self) else 0,
+            "time": pack_column(deltas.astype(np.int64)),
+        }
+        for name, dtype in VALUE_COLUMNS.items():
+            encoded[name] = pack_column(getattr(self, name).astype(dtype))
+        return encoded
+
+    @classmethod
+    def decode(cls, encoded: Dict[str, Any]) -> "ResultSeries":
+        """
+        Decode a dict made by ``encode()``.
+
+        Raises:
+            ValueError: If the encoding is unknown
+        """
+        if encoded.get("encoding") != SERIES_ENCODING:
+            raise ValueError(f"Unknown result series encoding: {encoded.get('encoding')}")
+        time = np.cumsum(unpack_column(encoded["time"], np.int64)) + int(encoded["start_time"])
+        columns = {
+            name: unpack_column(encoded[name], dtype) for name, dtype in VALUE_COLUMNS.items()
+        }
+        return cls(
+            time=time,
+            buy_hold_curve=np.round(columns["buy_hold_curve"].astype(np.float64), 2),
+            trade_counts_per_candle=columns["trade_counts_per_candle"].astype(np.int64),
+        )
+
+    def slice_dates(
+        self,
+        start: Optional[Union[datetime, str, int]] = None,
+        end: Optional[Union[datetime, str, int]] = None,
+    ) -> "ResultSeries":
+        """Points with start <= time <= end (both bounds optional and inclusive)."""
+        lo = int(np.searchsorted(self.time, to_epoch_seconds(start))) if start is not None else 0
+        hi = (
+            int(np.searchsorted(self.time, to_epoch_seconds(end), side="right"))
+            if end is not None
+            else len(self)
+        )
+        window = slice(lo, max(lo, hi))
+        return ResultSeries(
+            time=self.time[window],
+            buy_hold_curve=self.buy_hold_curve[window],
+            trade_counts_per_candle=self.trade_counts_per_candle[window],
+        )
+
+    def downsample(self, max_points: int) -> "ResultSeries":
+        """
+        Keep at most ``max_points`` points chosen by LTTB on the buy-and-hold curve.
+
+        Trade counts between two kept points are added to the later one, so
+        the total trade count does not change.
+        """
+        if len(self) <= max_points:
+            return self
+        indices = lttb_indices(self.time - self.time[0], self.buy_hold_curve, max_points)
+        kept_totals = np.cumsum(self.trade_counts_per_candle)[indices]
+        return ResultSeries(
+            time=self.time[indices],
+            buy_hold_curve=self.buy_hold_curve[indices],
+            trade_counts_per_candle=np.diff(kept_totals, prepend=0),
+        )
+
+    def to_results_fields(self) -> Dict[str, Any]:
+        """The series as the list fields of BacktestResultsSummary."""
+        return {
+            "equity_curve_dates": np.datetime_as_string(
+                self.time.astype("datetime64[s]"), unit="s"
+            ).tolist(),
+            "buy_hold_curve": np.round(self.buy_hold_curve, 2).tolist(),
+            "trade_counts_per_candle": self.trade_counts_per_candle.tolist(),
+        }
@@ -0,0 +1,415 @@
+"""
+Trade Analytics
+===============
+Trade-derived backtest metrics computed from a TradeLedger in one stage.
+
+The ledger is built once per run; every metric is derived from its
+columns with array operations instead of walking the trade records again:
+
+- Streaks from run lengths of the win/loss sequence
+- Period tables (month, weekday, hour, weekday-hour) from bincount
+  group-bys over epoch-derived keys
+- P/L and holding period histograms, VaR and the entry time vs P/L scatter
+- Drawdowns and return ratios of the equity curve (see core.equity_analytics)
+
+This is the only path to the results of a finished run; engines keep just
+the live scalar metrics of progress up to date as trades close (see
+core.metric_accumulators). scripts/benchmark_trade_analytics.py times both
+at 100k trades.
+"""
+
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.candle_buffer import to_epoch_seconds
+from core.equity_analytics import EquityAnalytics
+from core.metric_accumulators import expectancy, parse_time, recovery_factor
+from core.trade_ledger import TradeLedger, iso_times
+
+SECONDS_PER_DAY = 86400
+
+# 1970-01-01 was a Thursday (weekday 3)
+EPOCH_WEEKDAY = 3
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def histogram(values: Sequence[float], num_buckets: int) -> List[Tuple[float, float, int]]:
+    """
+    Equal-width buckets between the smallest and largest value.
+
+    Buckets are half-open except the last, which also holds the maximum.
+
+    Returns:
+        (bucket_min, bucket_max, count) for every non-empty bucket; a single
+        bucket when all values are equal
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return []
+    low, high = float(values.min()), float(values.max())
+    if low == high:
+        return [(low, high, len(values))]
+
+    edges = low + np.arange(num_buckets + 1) * ((high - low) / num_buckets)
+    index = np.minimum(np.searchsorted(edges, values, side="right") - 1, num_buckets - 1)
+    counts = np.bincount(index, minlength=num_buckets)
+    return [
+        (float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in np.flatnonzero(counts)
+    ]
+
+
+def pnl_distribution(pnl: Sequence[float], num_buckets: int = 20) -> List[Dict[str, Any]]:
+    """Histogram buckets of trade P/L with bucket_min, bucket_max, count and is_winner."""
+    buckets = histogram(pnl, num_buckets)
+    if len(buckets) == 1 and buckets[0][0] == buckets[0][1]:
+        low, high, count = buckets[0]
+        return [{"bucket_min": low, "bucket_max": high, "count": count, "is_winner": low > 0}]
+    return [
+        {
+            "bucket_min": round(low, 2),
+            "bucket_max": round(high, 2),
+            "count": count,
+            "is_winner": (low + high) / 2 > 0,
+        }
+        for low, high, count in buckets
+    ]
+
+
+def trade_duration_minutes(trade: Dict[str, Any]) -> Optional[float]:
+    """Holding time of a trade record in minutes (None if its times are missing or reversed)."""
+    entry_time = parse_time(trade.get("entry_time"))
+    exit_time = parse_time(trade.get("exit_time"))
+    if entry_time is None or exit_time is None:
+        return None
+    duration = (exit_time - entry_time).total_seconds() / 60
+    return duration if duration >= 0 else None
+
+
+def holding_period_distribution(
+    durations: Sequence[float], num_buckets: int = 15
+) -> List[Dict[str, Any]]:
+    """Histogram buckets of holding times with bucket_min_minutes, bucket_max_minutes, count."""
+    return [
+        {
+            "bucket_min_minutes": round(low, 2),
+            "bucket_max_minutes": round(high, 2),
+            "count": count,
+        }
+        for low, high, count in histogram(durations, num_buckets)
+    ]
+
+
+def period_row(bucket: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Period table row of a bucket with trades, wins and pnl (all zero if None)."""
+    trades = bucket["trades"] if bucket else 0
+    win_rate = bucket["wins"] / trades * 100 if trades else 0.0
+    return {
+        "trades": trades,
+        "win_rate": round(win_rate, 1),
+        "net_pnl": round(bucket["pnl"], 2) if bucket else 0.0,
+        "is_best": False,
+        "is_worst": False,
+    }
+
+
+def flag_best_worst(rows: List[Dict[str, Any]]) -> None:
+    """Flag the rows with the highest and lowest net P/L among rows with trades."""
+    traded = [row for row in rows if row["trades"] > 0]
+    if not traded:
+        return
+    best = max(row["net_pnl"] for row in traded)
+    worst = min(row["net_pnl"] for row in traded)
+    for row in traded:
+        row["is_best"] = row["net_pnl"] == best
+        row["is_worst"] = row["net_pnl"] == worst
+
+
+def streak_summary(wins: np.ndarray) -> Dict[str, Any]:
+    """
+    Longest and average win/loss streaks (a break-even trade counts as a loss).
+
+    Args:
+        wins: Boolean win flag of each trade, in trade order
+
+    Returns:
+        Dict with max_consecutive_wins, max_consecutive_losses,
+        avg_consecutive_wins, avg_consecutive_losses
+    """
+    wins = np.asarray(wins, dtype=bool)
+    starts = np.flatnonzero(np.diff(wins, prepend=not wins[0])) if len(wins) else wins[:0]
+    lengths = np.diff(starts, append=len(wins))
+    run_wins = wins[starts]
+
+    def longest_and_average(is_win: bool):
+        runs = lengths[run_wins == is_win]
+        if not len(runs):
+            return 0, 0.0
+        return int(runs.max()), round(int(runs.sum()) / len(runs), 1)
+
+    max_wins, avg_wins = longest_and_average(True)
+    max_losses, avg_losses = longest_and_average(False)
+    return {
+        "max_consecutive_wins": max_wins,
+        "max_consecutive_losses": max_losses,
+        "avg_consecutive_wins": avg_wins,
+        "avg_consecutive_losses": avg_losses,
+    }
+
+
+def time_period_summary(entry_time: np.ndarray, pnl: np.ndarray) -> Dict[str, Any]:
+    """
+    Period tables of trades grouped by entry time.
+
+    Args:
+        entry_time: int64 entry epoch seconds (UTC)
+        pnl: P/L of each trade
+
+    Returns:
+        Dict containing monthly_performance, day_of_week_performance,
+        hourly_performance, and day_hour_heatmap (all None without trades)
+    """
+    if not len(pnl):
+        return {
+            "monthly_performance": None,
+            "day_of_week_performance": None,
+            "hourly_performance": None,
+            "day_hour_heatmap": None,
+        }
+
+    wins = (pnl > 0).astype(np.float64)
+    day = (entry_time // SECONDS_PER_DAY + EPOCH_WEEKDAY) % 7
+    hour = entry_time // 3600 % 24
+    months, month_index = np.unique(
+        entry_time.astype("datetime64[s]").astype("datetime64[M]"), return_inverse=True
+    )
+
+    def rows(index: np.ndarray, size: int) -> List[Dict[str, Any]]:
+        # bincount adds weights in trade order
+        trades = np.bincount(index, minlength=size).tolist()
+        win_counts = np.bincount(index, weights=wins, minlength=size).tolist()
+        totals = np.bincount(index, weights=pnl, minlength=size).tolist()
+        return [
+            period_row({"trades": count, "wins": won, "pnl": total} if count else None)
+            for count, won, total in zip(trades, win_counts, totals)
+        ]
+
+    monthly = [
+        {"month": month, **row}
+        for month, row in zip(np.datetime_as_string(months).tolist(), rows(month_index, 0))
+    ]
+    day_of_week = [
+        {"day": i, "day_name": DAY_NAMES[i], **row} for i, row in enumerate(rows(day, 7))
+    ]
+    hourly = [{"hour": i, **row} for i, row in enumerate(rows(hour, 24))]
+    for table in (monthly, day_of_week, hourly):
+        flag_best_worst(table)
+
+    cells = day * 24 + hour
+    cell_trades = np.bincount(cells, minlength=7 * 24).tolist()
+    cell_pnl = np.bincount(cells, weights=pnl, minlength=7 * 24).tolist()
+    heatmap = [
+        {"day": i // 24, "hour": i % 24, "net_pnl": round(cell_pnl[i], 2), "trades": count}
+        for i, count in enumerate(cell_trades)
+    ]
+
+    return {
+        "monthly_performance": monthly if monthly else None,
+        "day_of_week_performance": day_of_week,
+        "hourly_performance": hourly,
+        "day_hour_heatmap": heatmap,
+    }
+
+
+def value_at_risk(
+    pnl: Sequence[float], confidence_levels: Sequence[float] = (0.95, 0.99)
+) -> Dict[str, Optional[float]]:
+    """
+    Value at Risk by historical simulation.
+
+    VaR at X% confidence is the (1 - X) percentile of trade P/L, e.g. the
+    5th percentile (worst 5%) for 95% confidence.
+
+    Args:
+        pnl: Trade P/L values
+        confidence_levels: Confidence levels as fractions
+
+    Returns:
+        Dict with a var_<level> value per confidence level (None with fewer than 5 trades)
+    """
+    keys = [f"var_{int(level * 100)}" for level in confidence_levels]
+    n = len(pnl)
+    if n < 5:
+        return dict.fromkeys(keys)
+    ordered = np.sort(np.asarray(pnl, dtype=np.float64))
+    return {
+        key: round(float(ordered[max(0, min(int((1 - level) * n), n - 1))]), 2)
+        for key, level in zip(keys, confidence_levels)
+    }
+
+
+class TradeAnalytics:
+    """
+    All trade-derived result metrics of a finished run.
+
+    Attributes:
+        ledger: The run's trades
+        initial_balance: Starting account balance
+        equity: Drawdowns and return ratios of the equity curve
+    """
+
+    def __init__(
+        self,
+        ledger: TradeLedger,
+        initial_balance: float,
+        equity_curve: Optional[Sequence[float]] = None,
+        start_time: Any = None,
+    ):
+        """
+        Args:
+            ledger: Closed trades in order
+            initial_balance: Starting account balance
+            equity_curve: Equity per closed trade (rebuilt from the trades if omitted)
+            start_time: Time of the opening equity point
+        """
+        self.ledger = ledger
+        self.initial_balance = initial_balance
+        self.wins = ledger.pnl > 0
+
+        durations = ledger.duration
+        self.durations = durations[durations >= 0] / 60
+
+        if equity_curve is None or len(equity_curve) < 2:
+            balance = initial_balance + np.cumsum(ledger.pnl)
+            equity_curve = np.concatenate(([initial_balance], np.round(balance, 2)))
+        times = np.full(len(equity_curve), np.nan)
+        start_time = parse_time(start_time)
+        if start_time is not None:
+            times[0] = to_epoch_seconds(start_time)
+        # One equity point per trade: each point is timed by its trade's exit
+        if len(equity_curve) == len(ledger) + 1:
+            times[1:] = ledger.exit_time
+        self.equity = EquityAnalytics(equity_curve, times)
+
+    def summary(self, final_balance: float) -> Dict[str, Any]:
+        """
+        Scalar result metrics.
+
+        Returns:
+            Dict keyed like the matching BacktestResultsSummary fields
+        """
+        pnl = self.ledger.pnl
+        stats = self._pnl_stats
+        total_net_profit = final_balance - self.initial_balance
+        trades = stats["trades"]
+        avg_win, avg_loss = stats["average_win"], stats["average_loss"]
+        has_curve = self.equity.points >= 2
+        max_drawdown = round(self.equity.max_drawdown, 2) if has_curve else 0.0
+        durations = self.equity.drawdown_durations()
+
+        return {
+            **self.headline(final_balance),
+            "winning_trades": stats["winning_trades"],
+            "losing_trades": stats["losing_trades"],
+            "average_win": round(avg_win, 2),
+            "average_loss": round(avg_loss, 2),
+            "win_loss_ratio": round(avg_win / avg_loss, 2) if avg_loss > 0 else 0.0,
+            "largest_win": round(float(pnl.max()), 2) if trades else 0.0,
+            "largest_loss": round(abs(float(pnl.min())), 2) if trades else 0.0,
+            "average_trade_duration_minutes": self.average_trade_duration(),
+            "max_drawdown_dollars": max_drawdown,
+            "current_drawdown_percent": round(self.equity.current_drawdown_percent, 2),
+            "recovery_factor": recovery_factor(total_net_profit, max_drawdown),
+            "sortino_ratio": self.equity.sortino_ratio(),
+            **streak_summary(self.wins),
+            "avg_drawdown_duration_minutes": durations["avg_drawdown_duration_minutes"],
+            "max_drawdown_duration_minutes": durations["max_drawdown_duration_minutes"],
+        }
+
+    def headline(self, final_balance: float) -> Dict[str, Any]:
+        """
+        The metrics ranking a run (as used by parameter sweeps), without
+        the duration, streak and distribution work of summary().
+
+        Returns:
+            Subset of summary() with the same keys and values
+        """
+        stats = self._pnl_stats
+        total_net_profit = final_balance - self.initial_balance
+        roi = total_net_profit / self.initial_balance * 100 if self.initial_balance > 0 else 0.0
+        total_losses = stats["total_losses"]
+        has_curve = self.equity.points >= 2
+
+        return {
+            "total_net_profit": round(total_net_profit, 2),
+            "return_on_investment": round(roi, 2),
+            "final_balance": round(final_balance, 2),
+            "total_trades": stats["trades"],
+            "win_rate": round(stats["win_rate"], 1),
+            "profit_factor": (
+                round(stats["gross_profit"] / total_losses, 2) if total_losses else 0.0
+            ),
+            "expectancy": expectancy(
+                stats["win_rate"], stats["average_win"], stats["average_loss"]
+            ),
+            "max_drawdown_percent": (
+                round(self.equity.max_drawdown_percent, 2) if has_curve else 0.0
+            ),
+            "sharpe_ratio": self.equity.sharpe_ratio(),
+        }
+
+    @cached_property
+    def _pnl_stats(self) -> Dict[str, Any]:
+        pnl = self.ledger.pnl
+        trades = len(pnl)
+        winning_trades = int(self.wins.sum())
+        losing = pnl < 0
+        losing_trades = int(losing.sum())
+        gross_profit = float(pnl[self.wins].sum())
+        total_losses = abs(float(pnl[losing].sum()))
+        return {
+            "trades": trades,
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            "gross_profit": gross_profit,
+            "total_losses": total_losses,
+            "win_rate": winning_trades / trades * 100 if trades else 0.0,
+            "average_win": gross_profit / winning_trades if winning_trades else 0.0,
+            "average_loss": total_losses / losing_trades if losing_trades else 0.0,
+        }
+
+    def average_trade_duration(self) -> float:
+        """Average holding time in minutes."""
+        if not len(self.durations):
+            return 0.0
+        return round(float(self.durations.sum()) / len(self.durations), 2)
+
+    def time_period_metrics(self) -> Dict[str, Any]:
+        """Monthly, weekday, hourly and weekday-hour tables by entry time."""
+        return time_period_summary(self.ledger.entry_time, self.ledger.pnl)
+
+    def win_loss_distribution(self, num_buckets: int = 20) -> List[Dict[str, Any]]:
+        """Histogram buckets of trade P/L."""
+        return pnl_distribution(self.ledger.pnl, num_buckets)
+
+    def holding_period_distribution(self, num_buckets: int = 15) -> List[Dict[str, Any]]:
+        """Histogram buckets of trade holding times."""
+        return holding_period_distribution(self.durations, num_buckets)
+
+    def pl_scatter_data(self) -> List[Dict[str, Any]]:
+        """Entry time vs P/L points."""
+        pnl = self.ledger.pnl
+        return [
+            {"entry_time": entry_time, "pnl": value, "is_winner": is_winner}
+            for entry_time, value, is_winner in zip(
+                iso_times(self.ledger.entry_time), np.round(pnl, 2).tolist(), self.wins.tolist()
+            )
+        ]
+
+    def value_at_risk(
+        self, confidence_levels: Sequence[float] = (0.95, 0.99)
+    ) -> Dict[str, Optional[float]]:
+        """Historical-simulation VaR of the trade P/L (see value_at_risk)."""
+        return value_at_risk(self.ledger.pnl, confidence_levels)
@@ -0,0 +1,316 @@
+"""
+Trade Ledger
+============
+Columnar store of every trade of a backtest.
+
+Saved results only keep the last trades for a quick preview; the full
+ledger is stored once per backtest in the ``backtest_trades`` table and
+served page by page. Trades are held as one array per field:
+
+- Entry and exit times as int64 epoch seconds
+- Side as int8 (1 long, -1 short)
+- Size, prices and P/L as float64, so stored values round-trip exactly
+- Exit reasons as uint8 codes into a list of reason names
+
+Encoded like the result series (see core.result_series): times are
+delta-encoded and every column is zlib-compressed and base64-encoded.
+
+Pages are cut with keyset cursors: a cursor holds the sort value and trade
+index of the last row returned, so pages stay consistent whatever filter
+is applied and never skip or repeat a trade.
+"""
+
+import base64
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.candle_buffer import to_epoch_seconds, to_epoch_seconds_array
+from core.result_series import pack_column, unpack_column
+
+LEDGER_ENCODING = "trades-delta-zlib-v1"
+
+SIDES = {"long": 1, "short": -1}
+
+# Fields trades can be sorted by
+SORT_FIELDS = ("entry_time", "exit_time", "pnl", "duration")
+
+OUTCOMES = ("win", "loss")
+
+# Largest page served at once
+MAX_PAGE_SIZE = 1000
+
+# Stored dtype of each column; times are delta-encoded before packing
+COLUMN_DTYPES = {
+    "entry_time": np.int64,
+    "exit_time": np.int64,
+    "side": np.int8,
+    "size": np.float64,
+    "entry_price": np.float64,
+    "exit_price": np.float64,
+    "pnl": np.float64,
+    "exit_reason": np.uint8,
+}
+TIME_COLUMNS = ("entry_time", "exit_time")
+
+
+def iso_times(times: np.ndarray) -> List[str]:
+    """Epoch seconds as ISO 8601 strings (naive UTC, like the trade records)."""
+    return np.datetime_as_string(times.astype("datetime64[s]"), unit="s").tolist()
+
+
+def _encode_cursor(sort_by: str, descending: bool, value: float, index: int) -> str:
+    payload = json.dumps([sort_by, descending, value, index]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[float, int]:
+    """
+    Read the position stored in a cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for another sort
+    """
+    try:
+        cursor_sort, cursor_descending, value, index = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        value, index = float(value), int(index)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if cursor_sort != sort_by or bool(cursor_descending) != descending:
+        raise ValueError("Cursor was created for a different sort order")
+    return value, index
+
+
+@dataclass(frozen=True)
+class TradeLedger:
+    """
+    Struct-of-arrays trade ledger in trade order.
+
+    Attributes:
+        entry_time: int64 entry epoch seconds (UTC)
+        exit_time: int64 exit epoch seconds (UTC)
+        side: int8, 1 for long and -1 for short
+        size: float64 position sizes (NaN where a trade has none)
+        entry_price: float64 entry prices
+        exit_price: float64 exit prices
+        pnl: float64 realized P/L
+        exit_reason: uint8 codes into ``exit_reasons``
+        exit_reasons: Exit reason names
+    """
+
+    entry_time: np.ndarray
+    exit_time: np.ndarray
+    side: np.ndarray
+    size: np.ndarray
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    pnl: np.ndarray
+    exit_reason: np.ndarray
+    exit_reasons: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Dict[str, Any]]) -> "TradeLedger":
+        """Build a ledger from trade records as produced by the backtest engines."""
+        exit_reasons: Dict[str, int] = {}
+        reason_codes = [
+            exit_reasons.setdefault(trade.get("exit_reason") or "", len(exit_reasons))
+            for trade in trades
+        ]
+        return cls(
+            entry_time=to_epoch_seconds_array([trade["entry_time"] for trade in trades]),
+            exit_time=to_epoch_seconds_array([trade["exit_time"] for trade in trades]),
+            side=np.array([SIDES.get(trade.get("type"), 1) for trade in trades], dtype=np.int8),
+            size=np.array([trade.get("size", math.nan) for trade in trades], dtype=np.float64),
+            entry_price=np.array([trade.get("entry_price", 0.0) for trade in trades], dtype=float),
+            exit_price=np.array([trade.get("exit_price", 0.0) for trade in trades], dtype=float),
+            pnl=np.array([trade.get("pnl", 0.0) for trade in trades], dtype=np.float64),
+            exit_reason=np.array(reason_codes, dtype=np.uint8),
+            exit_reasons=tuple(exit_reasons),
+        )
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+    @property
+    def duration(self) -> np.ndarray:
+        """Holding time of each trade in seconds."""
+        return self.exit_time - self.entry_time
+
+    def encode(self) -> Dict[str, Any]:
+        """Encode as a JSON-serializable dict (see module docstring)."""
+        encoded = {
+            "encoding": LEDGER_ENCODING,
+            "length": len(self),
+            "exit_reasons": list(self.exit_reasons),
+        }
+        for name, dtype in COLUMN_DTYPES.items():
+            values = getattr(self, name).astype(dtype)
+            if name in TIME_COLUMNS:
+                encoded[f"{name}_start"] = int(values[0]) if len(values) else 0
+                values = np.diff(values, prepend=values[:1])
+            encoded[name] = pack_column(values)
+        return encoded
+
+    @classmethod
+    def decode(cls, encoded: Dict[str, Any]) -> "TradeLedger":
+        """
+        Decode a dict made by ``encode()``.
+
+        Raises:
+            ValueError: If the encoding is unknown
+        """
+        if encoded.get("encoding") != LEDGER_ENCODING:
+            raise ValueError(f"Unknown trade ledger encoding: {encoded.get('encoding')}")
+        columns = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            if name not in encoded:
+                # Columns added after a ledger was saved decode as missing
+                columns[name] = np.full(int(encoded["length"]), np.nan, dtype=dtype)
+                continue
+            values = unpack_column(encoded[name], dtype)
+            if name in TIME_COLUMNS:
+                values = np.cumsum(values) + int(encoded[f"{name}_start"])
+            columns[name] = values
+        return cls(**columns, exit_reasons=tuple(encoded["exit_reasons"]))
+
+    def take(self, indices: np.ndarray) -> "TradeLedger":
+        """Ledger of the trades at ``indices``, in that order."""
+        return TradeLedger(
+            **{name: getattr(self, name)[indices] for name in COLUMN_DTYPES},
+            exit_reasons=self.exit_reasons,
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Trade records in the format of the backtest engines."""
+        sides = {value: name for name, value in SIDES.items()}
+        return [
+            {
+                "type": sides[side],
+                "size": None if math.isnan(size) else size,
+                "entry_price": entry_price,
+                "entry_time": entry_time,
+                "exit_price": exit_price,
+                "exit_time": exit_time,
+                "pnl": pnl,
+                "exit_reason": self.exit_reasons[reason],
+            }
+            for side, size, entry_price, entry_time, exit_price, exit_time, pnl, reason in zip(
+                self.side.tolist(),
+                self.size.tolist(),
+                self.entry_price.tolist(),
+                iso_times(self.entry_time),
+                self.exit_price.tolist(),
+                iso_times(self.exit_time),
+                self.pnl.tolist(),
+                self.exit_reason.tolist(),
+            )
+        ]
+
+    def iter_dicts(self, chunk_size: int = MAX_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Trade records in trade order, ``chunk_size`` at a time."""
+        for start in range(0, len(self), chunk_size):
+            yield self.take(slice(start, start + chunk_size)).to_dicts()
+
+    def filter_mask(
+        self,
+        side: Optional[str] = None,
+        outcome: Optional[str] = None,
+        exit_reason: Optional[str] = None,
+        start: Optional[Union[datetime, str, int]] = None,
+        end: Optional[Union[datetime, str, int]] = None,
+    ) -> np.ndarray:
+        """
+        Select trades by side, outcome, exit reason and exit time window.
+
+        Args:
+            side: "long" or "short"
+            outcome: "win" (P/L > 0) or "loss" (P/L < 0)
+            exit_reason: Exit reason name
+            start: Inclusive earliest exit time
+            end: Inclusive latest exit time
+
+        Returns:
+            Boolean mask over the trades
+
+        Raises:
+            ValueError: If a filter value is not recognized
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if side is not None:
+            if side not in SIDES:
+                raise ValueError(f"Invalid side filter: {side}")
+            mask &= self.side == SIDES[side]
+        if outcome is not None:
+            if outcome not in OUTCOMES:
+                raise ValueError(f"Invalid outcome filter: {outcome}")
+            mask &= self.pnl > 0 if outcome == "win" else self.pnl < 0
+        if exit_reason is not None:
+            if exit_reason not in self.exit_reasons:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.exit_reason == self.exit_reasons.index(exit_reason)
+        if start is not None:
+            mask &= self.exit_time >= to_epoch_seconds(start)
+        if end is not None:
+            mask &= self.exit_time <= to_epoch_seconds(end)
+        return mask
+
+    def page(
+        self,
+        sort_by: str = "exit_time",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        **filters: Any,
+    ) -> Tuple["TradeLedger", Optional[str], int]:
+        """
+        Return one page of sorted, filtered trades.
+
+        Ties are broken by trade order, so the order is total and stable.
+
+        Args:
+            sort_by: One of SORT_FIELDS
+            descending: Sort largest first
+            cursor: ``next_cursor`` of the previous page (None for the first page)
+            limit: Maximum number of trades on the page (capped at MAX_PAGE_SIZE)
+            **filters: Arguments of ``filter_mask()``
+
+        Returns:
+            Tuple of (page, next_cursor, matched) where next_cursor is None on
+            the last page and matched counts the trades passing the filters
+
+        Raises:
+            ValueError: If the sort field, a filter or the cursor is invalid
+        """
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort field: {sort_by}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        limit = min(limit, MAX_PAGE_SIZE)
+
+        indices = np.flatnonzero(self.filter_mask(**filters))
+        direction = -1 if descending else 1
+        keys = direction * getattr(self, sort_by)[indices].astype(np.float64)
+        tiebreak = direction * indices
+        order = np.lexsort((tiebreak, keys))
+        keys, tiebreak, indices = keys[order], tiebreak[order], indices[order]
+
+        position = 0
+        if cursor:
+            value, index = _decode_cursor(cursor, sort_by, descending)
+            lo = int(np.searchsorted(keys, direction * value, side="left"))
+            hi = int(np.searchsorted(keys, direction * value, side="right"))
+            position = lo + int(np.searchsorted(tiebreak[lo:hi], direction * index, side="right"))
+
+        selected = indices[position:position + limit]
+        next_cursor = None
+        if position + limit < len(indices):
+            last = int(selected[-1])
+            last_value = float(getattr(self, sort_by)[last])
+            next_cursor = _encode_cursor(sort_by, descending, last_value, last)
+        return self.take(selected), next_cursor, len(indices)
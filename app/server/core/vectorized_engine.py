@@ -0,0 +1,155 @@
+"""
+Vectorized Backtest Engine
+==========================
+NumPy helpers for the event-driven "vectorized" backtest engine.
+
+Instead of visiting every candle, the engine takes the per-candle entry and
+exit masks compiled from the strategy and jumps directly between state
+changes (flat -> entry, in position -> exit). The decision rules mirror the
+per-candle loop in BacktestExecutor exactly so both engines produce
+identical trades.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Supported execution engines
+ENGINE_LOOP = "loop"
+ENGINE_VECTORIZED = "vectorized"
+ENGINES = (ENGINE_LOOP, ENGINE_VECTORIZED)
+
+# Initial number of candles scanned when searching for an exit
+EXIT_SEARCH_WINDOW = 64
+
+
+def build_entry_masks(
+    long_entry: np.ndarray, short_entry: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve long and short entry masks for every candle.
+
+    Long entries take precedence over short entries on the same candle,
+    matching the if/elif order of the loop engine.
+
+    Args:
+        long_entry: Boolean long entry signals
+        short_entry: Boolean short entry signals
+
+    Returns:
+        Tuple of (long_mask, short_mask) boolean arrays
+    """
+    long_mask = np.asarray(long_entry, dtype=bool)
+    short_mask = np.asarray(short_entry, dtype=bool) & ~long_mask
+    return long_mask, short_mask
+
+
+def exit_thresholds(risk_management: dict) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Resolve stop loss and take profit thresholds in pips.
+
+    Args:
+        risk_management: Risk management configuration dict
+
+    Returns:
+        Tuple of (stop_loss_pips, take_profit_pips); None when disabled
+    """
+    stop_loss = risk_management.get("stop_loss", {})
+    sl_type = stop_loss.get("type", "none")
+    sl_value = stop_loss.get("value")
+
+    sl_pips = None
+    if sl_type != "none" and sl_value and sl_type in ("fixed_pips", "percentage"):
+        sl_pips = sl_value
+
+    take_profit = risk_management.get("take_profit", {})
+    tp_type = take_profit.get("type", "none")
+    tp_value = take_profit.get("value")
+
+    tp_pips = None
+    if tp_type != "none" and tp_value:
+        if tp_type in ("fixed_pips", "percentage"):
+            tp_pips = tp_value
+        elif tp_type == "risk_reward" and sl_value:
+            tp_pips = sl_value * tp_value
+
+    return sl_pips, tp_pips
+
+
+def find_next_entry(entry_indices: np.ndarray, start: int) -> Optional[int]:
+    """
+    Find the first entry signal at or after a candle index.
+
+    Args:
+        entry_indices: Sorted candle indices with an entry signal
+        start: Candle index to search from
+
+    Returns:
+        Candle index of the next entry, or None if there is none
+    """
+    pos = int(np.searchsorted(entry_indices, start, side="left"))
+    if pos >= len(entry_indices):
+        return None
+    return int(entry_indices[pos])
+
+
+def find_exit(
+    closes: np.ndarray,
+    exit_signals: np.ndarray,
+    start: int,
+    entry_price: float,
+    is_long: bool,
+    sl_pips: Optional[float],
+    tp_pips: Optional[float],
+) -> Tuple[Optional[int], str]:
+    """
+    Find the first candle at or after ``start`` that closes an open position.
+
+    The search window doubles on each miss so short trades only touch a few
+    candles while long trades stay O(n) overall.
+
+    Args:
+        closes: Close prices for every candle
+        exit_signals: Boolean mask of signal exits for every candle
+        start: First candle index evaluated for exit
+        entry_price: Position entry price
+        is_long: Whether the position is long
+        sl_pips: Stop loss threshold in pips (None if disabled)
+        tp_pips: Take profit threshold in pips (None if disabled)
+
+    Returns:
+        Tuple of (exit_index, exit_reason); exit_index is None if the
+        position is still open at the last candle
+    """
+    n = len(closes)
+    window = EXIT_SEARCH_WINDOW
+
+    while start < n:
+        end = min(start + window, n)
+        pips_change = (closes[start:end] - entry_price) * 10000
+        if not is_long:
+            pips_change = -pips_change
+
+        sl_hit = pips_change < -sl_pips if sl_pips is not None else None
+        tp_hit = pips_change > tp_pips if tp_pips is not None else None
+
+        hit = exit_signals[start:end].copy()
+        if sl_hit is not None:
+            hit |= sl_hit
+        if tp_hit is not None:
+            hit |= tp_hit
+
+        if hit.any():
+            offset = int(np.argmax(hit))
+            if sl_hit is not None and sl_hit[offset]:
+                reason = "stop_loss"
+            elif tp_hit is not None and tp_hit[offset]:
+                reason = "take_profit"
+            else:
+                reason = "signal"
+            return start + offset, reason
+
+        start = end
+        window *= 2
+
+    return None, ""
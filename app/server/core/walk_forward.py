@@ -0,0 +1,243 @@
+"""
+Walk-Forward Optimization
+=========================
+Rolling in-sample / out-of-sample optimization over a backtest's date range.
+
+The date range is cut into windows of ``in_sample_days`` followed by
+``out_of_sample_days``, advancing by ``step_days``. For every window the
+parameter grid is optimized on the in-sample candles and the winning
+parameters are traded on the out-of-sample candles that follow. The
+out-of-sample segments are stitched into one trade list and equity curve,
+carrying the balance from one segment into the next.
+
+Candles are loaded once. Signals are evaluated once per distinct set of
+indicator parameters over the full buffer (indicators are causal, so the
+warm-up of a window comes from the candles before it) and every window
+runs on zero-copy slices of the buffer and the signal masks. In-sample
+optimizations run in parallel; the out-of-sample segments then run in
+order because each starts from the previous segment's balance.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Event, Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from core.backtest_executor import BacktestExecutor
+from core.candle_buffer import CandleBuffer
+from core.parameter_sweep import SweepGrid, simulate, summarize
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+# Summary metrics a walk-forward can optimize (higher is better)
+OBJECTIVES = (
+    "total_net_profit",
+    "return_on_investment",
+    "sharpe_ratio",
+    "profit_factor",
+    "win_rate",
+    "expectancy",
+)
+
+
+@dataclass
+class WalkForwardWindow:
+    """Candle index ranges of one in-sample / out-of-sample window."""
+
+    index: int
+    in_sample_start: int
+    in_sample_end: int
+    out_of_sample_start: int
+    out_of_sample_end: int
+
+
+def build_windows(
+    times: np.ndarray, in_sample_days: int, out_of_sample_days: int, step_days: Optional[int]
+) -> List[WalkForwardWindow]:
+    """
+    Cut candle times into rolling windows.
+
+    Args:
+        times: Sorted candle times (epoch seconds)
+        in_sample_days: Length of each in-sample period
+        out_of_sample_days: Length of each out-of-sample period
+        step_days: Offset between window starts (defaults to out_of_sample_days)
+
+    Returns:
+        Windows whose in-sample and out-of-sample ranges both hold candles;
+        the last out-of-sample range may be cut short by the end of the data
+    """
+    if len(times) == 0:
+        return []
+
+    step = (step_days or out_of_sample_days) * SECONDS_PER_DAY
+    in_sample = in_sample_days * SECONDS_PER_DAY
+    out_of_sample = out_of_sample_days * SECONDS_PER_DAY
+
+    windows = []
+    start = int(times[0])
+    while True:
+        is_start, is_end, oos_end = np.searchsorted(
+            times, [start, start + in_sample, start + in_sample + out_of_sample], side="left"
+        )
+        if is_end >= len(times):
+            break
+        if is_end > is_start:
+            windows.append(
+                WalkForwardWindow(
+                    index=len(windows),
+                    in_sample_start=int(is_start),
+                    in_sample_end=int(is_end),
+                    out_of_sample_start=int(is_end),
+                    out_of_sample_end=int(oos_end),
+                )
+            )
+        start += step
+    return windows
+
+
+def run_walk_forward(
+    executor: BacktestExecutor,
+    backtest: Dict[str, Any],
+    strategy: Dict[str, Any],
+    candles: CandleBuffer,
+    pair: Optional[str],
+    timeframe: Optional[str],
+    engine: str,
+    cancel_event: Optional[Event] = None,
+    on_window: Optional[Callable[[int, int], None]] = None,
+) -> Optional[Tuple[List[Dict[str, Any]], float, List[float], Dict[str, Any]]]:
+    """
+    Run a walk-forward optimization over loaded candles.
+
+    Args:
+        executor: Executor whose engines run the simulations
+        backtest: Backtest row with a ``walk_forward`` configuration
+        strategy: Linked strategy row
+        candles: Candles of the whole backtest date range
+        pair: Currency pair
+        timeframe: Candle timeframe
+        engine: Execution engine
+        cancel_event: Checked before every in-sample combination and window
+        on_window: Called with (windows_done, total_windows) as in-sample
+            optimizations finish
+
+    Returns:
+        Tuple of (out_of_sample_trades, final_balance, stitched_equity_curve,
+        walk_forward_report), or None if cancelled
+
+    Raises:
+        ValueError: If the configuration is invalid or leaves no window
+    """
+    config = backtest.get("walk_forward") or {}
+    objective = config.get("objective") or "total_net_profit"
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown walk-forward objective: {objective}")
+
+    grid = SweepGrid.build(backtest, strategy, config.get("parameters") or {})
+    windows = build_windows(
+        candles.time,
+        int(config.get("in_sample_days") or 0),
+        int(config.get("out_of_sample_days") or 0),
+        config.get("step_days"),
+    )
+    if not windows:
+        raise ValueError("Date range is too short for one walk-forward window")
+    if config.get("step_days") and config["step_days"] < config.get("out_of_sample_days", 0):
+        raise ValueError("step_days must not be shorter than out_of_sample_days")
+
+    initial_balance = float(backtest.get("initial_balance", 10000))
+    cancel_event = cancel_event or Event()
+    completed = 0
+    completed_lock = Lock()
+
+    def optimize(window: WalkForwardWindow) -> Optional[Tuple[int, Any]]:
+        """Pick the combination with the best in-sample objective."""
+        nonlocal completed
+        lo, hi = window.in_sample_start, window.in_sample_end
+        best = None
+        for index, run_backtest in enumerate(grid.backtests):
+            if cancel_event.is_set():
+                return None
+            masks = _slice_signals(signals[grid.signal_keys[index]], lo, hi)
+            trades, balance, curve = simulate(
+                executor, engine, candles[lo:hi], masks, run_backtest, initial_balance
+            )
+            score = summarize(trades, initial_balance, balance, curve)[objective]
+            score = float("-inf") if score is None else score
+            if best is None or score > best[1]:
+                best = (index, score)
+
+        with completed_lock:
+            completed += 1
+            done = completed
+        if on_window is not None:
+            on_window(done, len(windows))
+        return best
+
+    with ThreadPoolExecutor(max_workers=max(settings.SWEEP_WORKERS, 1)) as pool:
+        signals = grid.evaluate_signals(executor, candles, pair, timeframe, pool.map)
+        selections = list(pool.map(optimize, windows))
+
+    if cancel_event.is_set() or any(selection is None for selection in selections):
+        return None
+
+    # Trade each window's winner out of sample, carrying the balance forward
+    trades: List[Dict[str, Any]] = []
+    balance = initial_balance
+    equity_curve = [initial_balance]
+    report_windows = []
+    for window, (index, score) in zip(windows, selections):
+        lo, hi = window.out_of_sample_start, window.out_of_sample_end
+        start_balance = balance
+        segment_trades, balance, segment_curve = simulate(
+            executor,
+            engine,
+            candles[lo:hi],
+            _slice_signals(signals[grid.signal_keys[index]], lo, hi),
+            grid.backtests[index],
+            balance,
+        )
+        trades.extend(segment_trades)
+        equity_curve.extend(segment_curve[1:])
+
+        report_windows.append(
+            {
+                "index": window.index,
+                "in_sample_start": candles.datetime_at(window.in_sample_start).isoformat(),
+                "in_sample_end": candles.datetime_at(window.in_sample_end - 1).isoformat(),
+                "out_of_sample_start": candles.datetime_at(lo).isoformat(),
+                "out_of_sample_end": candles.datetime_at(hi - 1).isoformat(),
+                "parameters": grid.combinations[index],
+                "in_sample_objective": None if np.isinf(score) else score,
+                "out_of_sample_trades": len(segment_trades),
+                "out_of_sample_net_profit": round(balance - start_balance, 2),
+            }
+        )
+
+    logger.info(
+        f"[WALK_FORWARD] {len(windows)} windows x {len(grid.combinations)} combinations, "
+        f"{len(trades)} out-of-sample trades"
+    )
+
+    report = {
+        "objective": objective,
+        "combinations": len(grid.combinations),
+        "out_of_sample_start": report_windows[0]["out_of_sample_start"],
+        "out_of_sample_end": report_windows[-1]["out_of_sample_end"],
+        "windows": report_windows,
+    }
+    return trades, balance, equity_curve, report
+
+
+def _slice_signals(
+    signals: Dict[str, np.ndarray], start: int, stop: int
+) -> Dict[str, np.ndarray]:
+    """Zero-copy slice of every signal mask."""
+    return {section: mask[start:stop] for section, mask in signals.items()}
@@ -0,0 +1,14 @@
+-- Migration: Add Backtest Engine Field
+-- Description: Add engine field to backtests table to select the execution engine
+-- Date: 2026-10-17
+
+-- Add engine column to backtests table
+ALTER TABLE backtests ADD COLUMN IF NOT EXISTS engine TEXT NOT NULL DEFAULT 'vectorized';
+
+-- Add constraint for engine values
+ALTER TABLE backtests DROP CONSTRAINT IF EXISTS backtests_engine_valid;
+ALTER TABLE backtests ADD CONSTRAINT backtests_engine_valid
+    CHECK (engine IN ('loop', 'vectorized'));
+
+-- Add comment for new column
+COMMENT ON COLUMN backtests.engine IS 'Execution engine used for the backtest (loop or vectorized)';
@@ -0,0 +1,9 @@
+-- Migration: Add Backtest Walk-Forward Field
+-- Description: Add walk_forward field to backtests table for walk-forward optimization mode
+-- Date: 2026-10-17
+
+-- Add walk_forward column to backtests table (null runs a single backtest)
+ALTER TABLE backtests ADD COLUMN IF NOT EXISTS walk_forward JSONB;
+
+-- Add comment for new column
+COMMENT ON COLUMN backtests.walk_forward IS 'Walk-forward optimization settings (in/out-of-sample windows, parameter grid, objective)';
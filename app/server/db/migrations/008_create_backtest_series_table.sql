@@ -0,0 +1,20 @@
+-- Migration: Create Backtest Series Table
+-- Description: Store full resolution per-candle result series outside the backtests row
+-- Date: 2026-10-17
+
+-- One row per backtest; results keep a downsampled copy of the series
+CREATE TABLE IF NOT EXISTS backtest_series (
+    backtest_id UUID PRIMARY KEY REFERENCES backtests(id) ON DELETE CASCADE,
+    encoding TEXT NOT NULL,
+    point_count INTEGER NOT NULL,
+    series JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    CONSTRAINT backtest_series_point_count_min CHECK (point_count >= 0)
+);
+
+-- Add comments
+COMMENT ON TABLE backtest_series IS 'Full resolution per-candle result series of completed backtests';
+COMMENT ON COLUMN backtest_series.encoding IS 'Series encoding version (delta-encoded times, float32 values, zlib + base64)';
+COMMENT ON COLUMN backtest_series.point_count IS 'Number of candles in the series';
+COMMENT ON COLUMN backtest_series.series IS 'Encoded columns: time deltas, buy_hold_curve, trade_counts_per_candle';
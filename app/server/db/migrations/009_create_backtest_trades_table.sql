@@ -0,0 +1,20 @@
+-- Migration: Create Backtest Trades Table
+-- Description: Store the full trade ledger of each backtest outside the backtests row
+-- Date: 2026-10-17
+
+-- One row per backtest; results keep only the last trades as a preview
+CREATE TABLE IF NOT EXISTS backtest_trades (
+    backtest_id UUID PRIMARY KEY REFERENCES backtests(id) ON DELETE CASCADE,
+    encoding TEXT NOT NULL,
+    trade_count INTEGER NOT NULL,
+    ledger JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    CONSTRAINT backtest_trades_trade_count_min CHECK (trade_count >= 0)
+);
+
+-- Add comments
+COMMENT ON TABLE backtest_trades IS 'Full trade ledger of the latest completed run of each backtest';
+COMMENT ON COLUMN backtest_trades.encoding IS 'Ledger encoding version (columnar, delta-encoded times, zlib + base64)';
+COMMENT ON COLUMN backtest_trades.trade_count IS 'Number of trades in the ledger';
+COMMENT ON COLUMN backtest_trades.ledger IS 'Encoded trade columns: times, side, prices, pnl, exit reason codes';
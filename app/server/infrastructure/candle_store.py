@@ -0,0 +1,473 @@
+"""
+Candle Store
+============
+Local store of historical candles per pair and timeframe, filled
+incrementally from the OpenFX ``quotehistory`` endpoints.
+
+Layout under the store directory::
+
+    <PAIR>/<TIMEFRAME>/<YYYY-MM>.npy    one partition per calendar month
+    <PAIR>/<TIMEFRAME>/coverage.json    time ranges already fetched
+
+A partition is a Fortran-ordered float64 array with one column per field
+of COLUMNS, so every column is contiguous on disk. Partitions are opened
+with ``np.load(mmap_mode="r")``: a read touches only the pages of the
+requested rows, and years of M1 candles load without the network.
+
+The coverage file records which time ranges were fetched, including
+ranges without candles (weekends, holidays), so a sync only requests the
+ranges that were never fetched. Coverage never extends past the close of
+the newest candle the server returned, so a candle the server publishes
+late is fetched by a later sync. Only complete candles are stored.
+
+Partitions and the coverage file are replaced atomically. Within a
+process, syncs of one series are serialized; concurrent processes may
+fetch a range twice but never corrupt a partition.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stored fields in column order; times are UTC epoch seconds
+COLUMNS = (
+    "time",
+    "bid_o",
+    "bid_h",
+    "bid_l",
+    "bid_c",
+    "ask_o",
+    "ask_h",
+    "ask_l",
+    "ask_c",
+    "volume",
+)
+
+PRICE_SUFFIXES = ("_o", "_h", "_l", "_c")
+
+BAR_FIELDS = ("Open", "High", "Low", "Close")
+
+_PAIR_PATTERN = re.compile(r"^[A-Za-z0-9]+$")
+
+_COVERAGE_FILE = "coverage.json"
+
+# Trading days per week, for estimating how far back ``count`` candles reach
+_WEEK_FACTOR = 7 / 5
+
+
+def _empty_rows() -> np.ndarray:
+    return np.empty((0, len(COLUMNS)), dtype=np.float64, order="F")
+
+
+def _month_keys(times: np.ndarray) -> np.ndarray:
+    """Calendar month (``YYYY-MM``) of each epoch time."""
+    return np.datetime_as_string(times.astype("datetime64[s]").astype("datetime64[M]"))
+
+
+def _month_key(epoch: int) -> str:
+    return str(_month_keys(np.array([epoch], dtype=np.int64))[0])
+
+
+def in_progress_open(timeframe: str, now: Optional[float] = None) -> int:
+    """Open time of the candle in progress; every earlier candle is complete."""
+    step = settings.TFS[timeframe]
+    now = time.time() if now is None else now
+    return int(now) // step * step
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort half-open ranges and join the ones that overlap or touch."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def bar_rows(ask_data: Dict[str, Any], bid_data: Dict[str, Any]) -> np.ndarray:
+    """
+    Join the ask and bid bars of a quotehistory response into store rows.
+
+    Bars present on only one side are dropped.
+
+    Returns:
+        Array of shape (n, len(COLUMNS)) sorted by time
+    """
+    bids = {bar["Timestamp"]: bar for bar in (bid_data or {}).get("Bars") or []}
+    rows = []
+    for ask in (ask_data or {}).get("Bars") or []:
+        bid = bids.get(ask["Timestamp"])
+        if bid is None:
+            continue
+        rows.append(
+            (ask["Timestamp"] // 1000,)
+            + tuple(bid[name] for name in BAR_FIELDS)
+            + tuple(ask[name] for name in BAR_FIELDS)
+            + (bid.get("Volume", 0),)
+        )
+    if not rows:
+        return _empty_rows()
+    array = np.array(rows, dtype=np.float64)
+    return array[np.argsort(array[:, 0], kind="stable")]
+
+
+class CandleStore:
+    """
+    Month-partitioned, memory-mapped candle store.
+
+    ``load`` and ``latest`` are the read API: given an API client they first
+    fetch the missing ranges, then read from disk. Without a client they
+    only read what is stored.
+    """
+
+    def __init__(self, directory: str, page_size: int = 1000):
+        self.directory = directory
+        self.page_size = page_size
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    # =========================================================================
+    # Paths and coverage
+    # =========================================================================
+
+    def _series_dir(self, pair: str, timeframe: str) -> str:
+        symbol = pair.replace("_", "")
+        if not _PAIR_PATTERN.match(symbol):
+            raise ValueError(f"Invalid pair: {pair}")
+        if timeframe not in settings.TFS:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+        return os.path.join(self.directory, symbol.upper(), timeframe)
+
+    def _series_lock(self, pair: str, timeframe: str) -> threading.Lock:
+        key = (pair.replace("_", "").upper(), timeframe)
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _write_atomic(self, directory: str, name: str, write) -> None:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                write(handle)
+            os.replace(temp_path, os.path.join(directory, name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def coverage(self, pair: str, timeframe: str) -> List[Tuple[int, int]]:
+        """Fetched time ranges of a series as sorted half-open epoch ranges."""
+        path = os.path.join(self._series_dir(pair, timeframe), _COVERAGE_FILE)
+        try:
+            with open(path, "r") as handle:
+                return _merge_ranges([(int(a), int(b)) for a, b in json.load(handle)])
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"[CANDLE_STORE] Ignoring unreadable coverage of {path}: {e}")
+            return []
+
+    def _add_coverage(self, pair: str, timeframe: str, start: int, end: int) -> None:
+        ranges = _merge_ranges(self.coverage(pair, timeframe) + [(start, end)])
+        encoded = json.dumps(ranges).encode()
+        self._write_atomic(
+            self._series_dir(pair, timeframe), _COVERAGE_FILE, lambda h: h.write(encoded)
+        )
+
+    def missing_ranges(
+        self, pair: str, timeframe: str, start: int, end: int
+    ) -> List[Tuple[int, int]]:
+        """Parts of the half-open range [start, end) that were never fetched."""
+        missing = []
+        cursor = start
+        for covered_start, covered_end in self.coverage(pair, timeframe):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    # =========================================================================
+    # Partitions
+    # =========================================================================
+
+    def _partitions(self, pair: str, timeframe: str) -> List[str]:
+        try:
+            names = os.listdir(self._series_dir(pair, timeframe))
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-4] for name in names if name.endswith(".npy"))
+
+    def _open_partition(self, pair: str, timeframe: str, month: str) -> Optional[np.ndarray]:
+        path = os.path.join(self._series_dir(pair, timeframe), f"{month}.npy")
+        try:
+            array = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[CANDLE_STORE] Ignoring unreadable partition {path}: {e}")
+            return None
+        if array.ndim != 2 or array.shape[1] != len(COLUMNS):
+            logger.warning(f"[CANDLE_STORE] Ignoring partition {path} with shape {array.shape}")
+            return None
+        return array
+
+    def write(
+        self, pair: str, timeframe: str, rows: np.ndarray, covered: Tuple[int, int]
+    ) -> None:
+        """
+        Merge rows into their month partitions and mark a range as fetched.
+
+        Rows replace stored rows with the same time. The coverage is only
+        extended after the partitions are written.
+
+        Args:
+            pair: Currency pair (with or without underscore)
+            timeframe: Timeframe key of settings.TFS
+            rows: Array of shape (n, len(COLUMNS))
+            covered: Half-open epoch range the rows were fetched for
+        """
+        directory = self._series_dir(pair, timeframe)
+        if len(rows):
+            months = _month_keys(rows[:, 0].astype(np.int64))
+            for month in np.unique(months):
+                new_rows = rows[months == month]
+                stored = self._open_partition(pair, timeframe, month)
+                if stored is not None:
+                    new_rows = np.concatenate([np.asarray(stored), new_rows])
+                # Keep the last row of every time, i.e. the fetched one
+                reversed_rows = new_rows[::-1]
+                _, first = np.unique(reversed_rows[:, 0], return_index=True)
+                merged = np.asfortranarray(reversed_rows[first])
+                self._write_atomic(
+                    directory, f"{month}.npy", lambda h: np.save(h, merged, allow_pickle=False)
+                )
+        self._add_coverage(pair, timeframe, *covered)
+
+    def read(
+        self,
+        pair: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Stored candles with start <= time <= end.
+
+        Args:
+            pair: Currency pair (with or without underscore)
+            timeframe: Timeframe key of settings.TFS
+            start: Inclusive start in epoch seconds (None for the first candle)
+            end: Inclusive end in epoch seconds (None for the last candle)
+
+        Returns:
+            Dict of column arrays: ``time`` (int64), bid/ask/mid OHLC and ``volume``
+        """
+        first_month = None if start is None else _month_key(start)
+        last_month = None if end is None else _month_key(end)
+
+        parts = []
+        for month in self._partitions(pair, timeframe):
+            if (first_month and month < first_month) or (last_month and month > last_month):
+                continue
+            array = self._open_partition(pair, timeframe, month)
+            if array is None:
+                continue
+            times = array[:, 0]
+            lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+            hi = len(times) if end is None else int(np.searchsorted(times, end, side="right"))
+            if hi > lo:
+                parts.append(array[lo:hi])
+
+        columns: Dict[str, np.ndarray] = {}
+        for index, name in enumerate(COLUMNS):
+            column = (
+                np.concatenate([part[:, index] for part in parts])
+                if parts
+                else np.empty(0, dtype=np.float64)
+            )
+            columns[name] = column.astype(np.int64) if name == "time" else column
+        for suffix in PRICE_SUFFIXES:
+            bid = columns[f"bid{suffix}"]
+            columns[f"mid{suffix}"] = (columns[f"ask{suffix}"] - bid) / 2 + bid
+        return columns
+
+    def version(self, pair: str, timeframe: str, start: int, end: int) -> Optional[str]:
+        """
+        Version of the stored candles with start <= time <= end, without reading them.
+
+        Stored candles of a fetched range never change, so a fully fetched
+        range is identified by the series and the range itself (cut at the
+        candle in progress).
+
+        Returns:
+            Version string, or None if part of the range was never fetched
+            or it holds no candles
+        """
+        end = min(end + 1, in_progress_open(timeframe))
+        if self.missing_ranges(pair, timeframe, start, end) or not self._has_rows(
+            pair, timeframe, start, end
+        ):
+            return None
+        symbol = pair.replace("_", "").upper()
+        return f"store:{symbol}:{timeframe}:{start}:{end}"
+
+    def _has_rows(self, pair: str, timeframe: str, start: int, end: int) -> bool:
+        """Whether any stored candle has start <= time < end."""
+        first_month, last_month = _month_key(start), _month_key(max(end - 1, start))
+        for month in self._partitions(pair, timeframe):
+            if month < first_month or month > last_month:
+                continue
+            array = self._open_partition(pair, timeframe, month)
+            if array is None:
+                continue
+            times = array[:, 0]
+            if np.searchsorted(times, end, side="left") > np.searchsorted(times, start):
+                return True
+        return False
+
+    # =========================================================================
+    # Sync
+    # =========================================================================
+
+    def sync(self, api: Any, pair: str, timeframe: str, start: int, end: int) -> bool:
+        """
+        Fetch the never-fetched parts of [start, end) from quotehistory.
+
+        Only complete candles are stored, so the range is cut at the open
+        of the candle in progress. Every fetched page is written straight
+        away, so an interrupted sync keeps what it got. A range is marked
+        fetched up to the close of the newest candle returned for it, so
+        candles the server has not published yet are requested again.
+
+        Args:
+            api: Client with OpenFxApi.fetch_candles
+            pair: Currency pair (with or without underscore)
+            timeframe: Timeframe key of settings.TFS
+            start: Inclusive start in epoch seconds
+            end: Exclusive end in epoch seconds
+
+        Returns:
+            Whether all missing ranges were fetched
+        """
+        step = settings.TFS[timeframe]
+        end = min(end, in_progress_open(timeframe))
+        symbol = pair.replace("_", "")
+
+        with self._series_lock(pair, timeframe):
+            for range_start, range_end in self.missing_ranges(pair, timeframe, start, end):
+                cursor = range_start
+                while cursor < range_end:
+                    ok, data = api.fetch_candles(
+                        symbol, count=self.page_size, granularity=timeframe, ts_from=cursor * 1000
+                    )
+                    if not ok or not data:
+                        logger.warning(
+                            f"[CANDLE_STORE] Could not fetch {symbol}/{timeframe} "
+                            f"from {cursor}: {data}"
+                        )
+                        return False
+
+                    data_ask, data_bid = data
+                    page_bars = len((data_bid or {}).get("Bars") or [])
+                    rows = bar_rows(data_ask, data_bid)
+                    rows = rows[rows[:, 0] >= cursor]
+                    if not len(rows):
+                        # The server has no candles from cursor on yet
+                        break
+
+                    # Everything up to the close of the newest returned candle was fetched
+                    covered_end = min(range_end, int(rows[-1, 0]) + step)
+                    rows = rows[rows[:, 0] < covered_end]
+                    self.write(pair, timeframe, rows, (cursor, covered_end))
+                    if page_bars < self.page_size:
+                        # Short page: the rest of the range is not published yet
+                        break
+                    cursor = covered_end
+        return True
+
+    # =========================================================================
+    # Read API
+    # =========================================================================
+
+    def load(
+        self, pair: str, timeframe: str, start: int, end: int, api: Any = None
+    ) -> Tuple[bool, Dict[str, np.ndarray]]:
+        """
+        Candles with start <= time <= end, fetching missing ranges first.
+
+        Args:
+            pair: Currency pair (with or without underscore)
+            timeframe: Timeframe key of settings.TFS
+            start: Inclusive start in epoch seconds
+            end: Inclusive end in epoch seconds
+            api: Client to fetch missing ranges with (None reads the store only)
+
+        Returns:
+            Tuple of (synced, columns); synced is False if fetching failed,
+            in which case columns hold what was stored
+        """
+        synced = True
+        if api is not None:
+            synced = self.sync(api, pair, timeframe, start, end + 1)
+        return synced, self.read(pair, timeframe, start, end)
+
+    def latest(
+        self, pair: str, timeframe: str, count: int, api: Any = None
+    ) -> Tuple[bool, Dict[str, np.ndarray]]:
+        """
+        The last ``count`` complete candles, fetching missing ranges first.
+
+        The lookback is estimated from the timeframe (allowing for weekends)
+        and widened while too few candles are found.
+
+        Returns:
+            Tuple of (synced, columns) as for ``load``
+        """
+        step = settings.TFS[timeframe]
+        # Up to the candle in progress, so polls within one candle fetch nothing
+        end = in_progress_open(timeframe) - 1
+        lookback = int(count * step * _WEEK_FACTOR) + 3 * 86400
+        for _ in range(3):
+            synced, columns = self.load(pair, timeframe, end - lookback, end, api=api)
+            if len(columns["time"]) >= count or not synced:
+                break
+            lookback *= 2
+        first = max(len(columns["time"]) - count, 0)
+        return synced, {name: values[first:] for name, values in columns.items()}
+
+
+_stores: Dict[str, CandleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_candle_store() -> Optional[CandleStore]:
+    """The store at settings.CANDLE_STORE_DIR, or None if the store is disabled."""
+    directory = settings.CANDLE_STORE_DIR
+    if not directory:
+        return None
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = CandleStore(directory, page_size=settings.CANDLE_STORE_PAGE_SIZE)
+            _stores[directory] = store
+        return store
@@ -0,0 +1,163 @@
+"""
+Price Cache
+===========
+In-process cache of the candle windows returned by
+``OpenFxApi.web_api_candles``.
+
+Charts, the strategy builder and every open browser tab request the same
+recent candles. The newest complete candle only changes when the candle
+in progress closes, so an entry expires exactly at the next candle
+boundary of its granularity. Boundaries follow the candle grid of the
+cached data itself, so weekly candles that do not start on the epoch's
+week grid expire correctly too.
+
+One entry is kept per pair and granularity: the largest window fetched
+since the last boundary. It also serves requests for fewer candles. The
+cache is an LRU bounded by entry count and total size.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+
+PriceColumns = Dict[str, List]
+
+
+class PriceCache:
+    """
+    Thread-safe LRU cache of candle windows per pair and granularity.
+
+    Least recently used entries are evicted once there are more than
+    ``max_entries`` or they take more than ``max_bytes`` together.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (pair, granularity) -> (columns, candle count, expiry epoch, size)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[PriceColumns, int, float, int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(pair: str, granularity: str) -> Tuple[str, str]:
+        return pair.replace("_", "").upper(), granularity
+
+    @staticmethod
+    def next_boundary(last_candle_time: int, granularity: str, now: float) -> int:
+        """
+        Epoch time the candle in progress closes.
+
+        Args:
+            last_candle_time: Open time of the newest complete candle (epoch seconds)
+            granularity: Timeframe key of settings.TFS
+            now: Current epoch time
+        """
+        step = settings.TFS[granularity]
+        elapsed = max(now - last_candle_time, 0)
+        return int(last_candle_time + step * (elapsed // step + 1))
+
+    def get(self, pair: str, granularity: str, count: int) -> Optional[PriceColumns]:
+        """
+        Look up the last ``count`` candles.
+
+        Returns:
+            Fresh column lists, or None on a miss (including expired entries
+            and entries holding fewer candles)
+        """
+        key = self._key(pair, granularity)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.time():
+                self._drop(key)
+                entry = None
+            if entry is None or entry[1] < count:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        columns, cached_count, _, _ = entry
+        first = cached_count - count
+        return {name: values[first:] for name, values in columns.items()}
+
+    def put(
+        self, pair: str, granularity: str, columns: PriceColumns, last_candle_time: int
+    ) -> bool:
+        """
+        Store a candle window until the next candle boundary.
+
+        A window smaller than the cached one of the same series is ignored.
+
+        Args:
+            pair: Currency pair (with or without underscore)
+            granularity: Timeframe key of settings.TFS
+            columns: Column lists as returned by web_api_candles
+            last_candle_time: Open time of the newest candle in ``columns`` (epoch seconds)
+
+        Returns:
+            Whether the window was cached
+        """
+        if granularity not in settings.TFS:
+            return False
+        count = len(columns.get("time", []))
+        size = len(json.dumps(columns, separators=(",", ":"), default=str))
+        if count == 0 or size > self.max_bytes:
+            return False
+        expires = self.next_boundary(last_candle_time, granularity, time.time())
+
+        key = self._key(pair, granularity)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous[1] > count and previous[2] > time.time():
+                return False
+            if previous is not None:
+                self._drop(key)
+            self._entries[key] = (columns, count, expires, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        _, _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global cache instance shared by the price endpoints
+price_cache = PriceCache(
+    max_entries=settings.PRICE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PRICE_CACHE_MAX_MB * 1024 * 1024,
+)
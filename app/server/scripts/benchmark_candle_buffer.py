@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Candle Buffer Benchmark
+=======================
+Compares the columnar CandleBuffer against the list-of-dict candle format
+for memory use and the hot operations in the backtest results path.
+
+Usage:
+    python scripts/benchmark_candle_buffer.py [--candles 525600]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from core.candle_buffer import CandleBuffer, to_epoch_seconds  # noqa: E402
+
+
+def build_dicts(n: int) -> list:
+    """Build candles the way the executor used to: one dict per candle."""
+    rng = np.random.default_rng(0)
+    closes = (1.1 + np.cumsum(rng.uniform(-0.002, 0.002, n))).tolist()
+    start = datetime(2025, 1, 1)
+    candles = []
+    for i, close in enumerate(closes):
+        candles.append(
+            {
+                "time": start + timedelta(minutes=i),
+                "open": close,
+                "high": close + 0.0005,
+                "low": close - 0.0005,
+                "close": close,
+                "volume": 1000,
+            }
+        )
+    return candles
+
+
+def build_buffer(n: int) -> CandleBuffer:
+    """Build the equivalent columnar buffer."""
+    rng = np.random.default_rng(0)
+    closes = 1.1 + np.cumsum(rng.uniform(-0.002, 0.002, n))
+    start = to_epoch_seconds(datetime(2025, 1, 1))
+    return CandleBuffer.from_arrays(
+        time=start + np.arange(n, dtype=np.int64) * 60,
+        open=closes,
+        high=closes + 0.0005,
+        low=closes - 0.0005,
+        close=closes,
+        volume=np.full(n, 1000.0),
+    )
+
+
+def measure(label: str, func):
+    """Time func, then re-run it under tracemalloc to record peak memory."""
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<38} {elapsed * 1000:>10.1f} ms  {peak / 1024 / 1024:>10.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CandleBuffer vs candle dicts")
+    parser.add_argument("--candles", type=int, default=525_600, help="Number of M1 candles")
+    args = parser.parse_args()
+    n = args.candles
+
+    print(f"Candles: {n:,}")
+    print(f"  {'operation':<38} {'time':>13}  {'peak memory':>13}")
+
+    candles = measure("build list[dict]", lambda: build_dicts(n))
+    buffer = measure("build CandleBuffer", lambda: build_buffer(n))
+
+    first_close = candles[0]["close"]
+    measure(
+        "buy-hold curve (dicts)",
+        lambda: [round(10000 * (1 + (c["close"] - first_close) / first_close), 2) for c in candles],
+    )
+    measure(
+        "buy-hold curve (buffer)",
+        lambda: (10000 * (1 + (buffer.close - buffer.close[0]) / buffer.close[0])).round(2),
+    )
+    measure("iso dates (dicts)", lambda: [c["time"].isoformat() for c in candles])
+    measure("iso dates (buffer)", buffer.iso_times)
+
+    window_start, window_end = datetime(2025, 3, 1), datetime(2025, 3, 31)
+    measure(
+        "date slice (dicts)",
+        lambda: [c for c in candles if window_start <= c["time"] <= window_end],
+    )
+    measure("date slice (buffer, zero-copy)", lambda: buffer.slice_dates(window_start, window_end))
+
+    print(f"Buffer array memory: {buffer.nbytes / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
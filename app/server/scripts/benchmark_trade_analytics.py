@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Trade Analytics Benchmark
+=========================
+Times the trade-derived results metrics of a finished run (building the
+columnar TradeLedger, then one vectorized TradeAnalytics stage) and the
+live metric accumulator the engines update as each trade closes.
+
+Usage:
+    python scripts/benchmark_trade_analytics.py [--trades 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from core.metric_accumulators import MetricAccumulator  # noqa: E402
+from core.trade_analytics import TradeAnalytics  # noqa: E402
+from core.trade_ledger import TradeLedger  # noqa: E402
+
+
+def build_trades(n: int) -> list:
+    """Build trade records the way the engines do."""
+    rng = np.random.default_rng(0)
+    gaps = rng.integers(5, 240, n)
+    holds = rng.integers(1, 600, n)
+    pnl = np.round(rng.normal(2, 40, n), 2)
+    start = datetime(2020, 1, 1)
+    trades = []
+    entry = start
+    for gap, hold, value in zip(gaps.tolist(), holds.tolist(), pnl.tolist()):
+        entry += timedelta(minutes=gap)
+        trades.append(
+            {
+                "type": "long",
+                "size": 200.0,
+                "entry_price": 1.1,
+                "entry_time": entry.isoformat(),
+                "exit_price": 1.1,
+                "exit_time": (entry + timedelta(minutes=hold)).isoformat(),
+                "pnl": value,
+                "exit_reason": "signal",
+            }
+        )
+    return trades
+
+
+def equity_curve(trades: list, initial_balance: float) -> list:
+    curve, balance = [initial_balance], initial_balance
+    for trade in trades:
+        balance += trade["pnl"]
+        curve.append(round(balance, 2))
+    return curve
+
+
+def live_metrics(trades, curve, initial_balance):
+    """The live scalar metrics, fed one trade at a time as the engines do."""
+    metrics = MetricAccumulator(initial_balance)
+    for trade, balance in zip(trades, curve[1:]):
+        metrics.add_trade(trade, balance)
+    return metrics.summary()
+
+
+def ledger_results(ledger, trades, curve, initial_balance):
+    """Every trade-derived metric through one TradeAnalytics stage."""
+    analytics = TradeAnalytics(ledger, initial_balance, curve, trades[0]["entry_time"])
+    return (
+        analytics.summary(curve[-1]),
+        analytics.time_period_metrics(),
+        analytics.win_loss_distribution(),
+        analytics.holding_period_distribution(),
+        analytics.pl_scatter_data(),
+        analytics.equity.drawdown_periods(),
+        analytics.equity.drawdown_durations(),
+        analytics.value_at_risk(),
+    )
+
+
+def measure(label: str, func, repeat: int = 3):
+    """Best of ``repeat`` runs."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<40} {best * 1000:>10.1f} ms")
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trade analytics")
+    parser.add_argument("--trades", type=int, default=100_000, help="Number of trades")
+    args = parser.parse_args()
+
+    initial_balance = 10000.0
+    trades = build_trades(args.trades)
+    curve = equity_curve(trades, initial_balance)
+
+    print(f"Trades: {args.trades:,}")
+    live, _ = measure(
+        "live accumulator, one trade at a time",
+        lambda: live_metrics(trades, curve, initial_balance),
+    )
+    built, ledger = measure("build TradeLedger", lambda: TradeLedger.from_trades(trades))
+    analyzed, _ = measure(
+        "TradeAnalytics over ledger",
+        lambda: ledger_results(ledger, trades, curve, initial_balance),
+    )
+    print(f"Live update per trade: {live / args.trades * 1e6:.2f} us")
+    print(f"Results at completion: {(built + analyzed) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
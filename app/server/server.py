@@ -11,19 +11,23 @@ This server provides endpoints for:
 """
 
 import logging
+import math
 import sys
 import traceback
 from datetime import datetime, timedelta
+from itertools import chain
 from typing import Optional
 
 import requests.exceptions
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.price_feed import BatchSpreadsResponse, fetch_batch_spreads
 from api.routes import get_options
 from config import settings
+from core.async_openfx_api import AsyncOpenFxApi
 from core.backtest_executor import backtest_executor
 from core.backtest_service import (
     delete_backtest as service_delete_backtest,
@@ -34,12 +38,21 @@ from core.backtest_service import (
 from core.backtest_service import (
     get_backtest as service_get_backtest,
 )
+from core.backtest_service import (
+    get_backtest_series as service_get_backtest_series,
+)
+from core.backtest_service import (
+    get_backtest_trades as service_get_backtest_trades,
+)
 from core.backtest_service import (
     get_backtest_with_results as service_get_backtest_with_results,
 )
 from core.backtest_service import (
     list_backtests as service_list_backtests,
 )
+from core.backtest_service import (
+    load_trade_ledger as service_load_trade_ledger,
+)
 from core.backtest_service import (
     save_backtest as service_save_backtest,
 )
@@ -48,9 +61,12 @@ from core.backtest_service import (
 )
 from core.bot_controller import bot_controller
 from core.bot_status import bot_status_tracker
+from core.candle_buffer import CandleBuffer
 from core.data_models import (
     AllBotsStatusResponse,
     BacktestProgressResponse,
+    BacktestSeriesResponse,
+    BacktestTradesResponse,
     BotControlResponse,
     BotPauseRequest,
     BotPauseResponse,
@@ -68,6 +84,7 @@ from core.data_models import (
     DuplicateBacktestResponse,
     DuplicateStrategyResponse,
     EmergencyStopResponse,
+    ExtendBacktestRequest,
     HeadlineItem,
     HeadlinesResponse,
     HealthCheckResponse,
@@ -75,12 +92,15 @@ from core.data_models import (
     ImportStrategyResponse,
     ImportStrategySaveRequest,
     ImportValidationResult,
+    IndicatorDataResponse,
     ListBacktestsResponse,
     ListStrategiesExtendedResponse,
     ListStrategiesResponse,
     LoadBacktestResponse,
     LoadStrategyResponse,
     OpenTradesResponse,
+    ParameterSweepRequest,
+    ParameterSweepResponse,
     PreStartChecklistResponse,
     RunBacktestRequest,
     RunBacktestResponse,
@@ -96,7 +116,8 @@ from core.data_models import (
     TradeInfo,
     TradingOptionsResponse,
 )
-from core.openfx_api import OpenFxApi
+from core.indicator_engine import indicator_cache, normalize_params
+from core.parameter_sweep import run_parameter_sweep
 from core.strategy_service import (
     check_name_exists as service_check_name_exists,
 )
@@ -168,8 +189,8 @@ app.add_middleware(
 # Global app state
 app_start_time = datetime.now()
 
-# Initialize API client
-api = OpenFxApi()
+# Initialize API client (async, so broker calls do not block the event loop)
+api = AsyncOpenFxApi()
 
 
 # =============================================================================
@@ -179,7 +200,7 @@ api = OpenFxApi()
 
 @app.on_event("startup")
 async def startup_event():
-    """Validate database connection on startup."""
+    """Validate database connection and resume interrupted backtests on startup."""
     if is_configured():
         if validate_connection():
             logger.info("[STARTUP] Supabase connection validated successfully")
@@ -194,6 +215,18 @@ async def startup_event():
             "Set SUPABASE_URL and SUPABASE_ANON_KEY to enable database features."
         )
 
+    # Continue backtests interrupted by the last shutdown from their checkpoints
+    resumed = backtest_executor.resume_interrupted()
+    if resumed:
+        logger.info(f"[STARTUP] Resumed {len(resumed)} interrupted backtest(s)")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop backtest worker processes and close broker connections."""
+    backtest_executor.shutdown()
+    await api.aclose()
+
 
 # =============================================================================
 # API Routes
@@ -241,7 +274,7 @@ async def account():
         Margin, MarginLevel, and Leverage
     """
     try:
-        data = api.get_account_summary()
+        data = await api.get_account_summary()
 
         if data is None:
             logger.warning("[WARNING] Account summary returned None - API call may have failed")
@@ -266,7 +299,7 @@ async def open_trades():
         current price, P/L in pips, open time, duration, and bot name
     """
     try:
-        trades = api.get_open_trades()
+        trades = await api.get_open_trades()
 
         if trades is None:
             logger.warning("[WARNING] Open trades returned None - API call may have failed")
@@ -276,7 +309,7 @@ async def open_trades():
         instruments = list(set(trade.instrument for trade in trades))
         current_prices = {}
         if instruments:
-            prices = api.get_prices(instruments)
+            prices = await api.get_prices(instruments)
             if prices:
                 for price in prices:
                     current_prices[price.name] = {"bid": price.bid, "ask": price.ask}
@@ -374,7 +407,7 @@ async def trade_history(
             timestamp_from = int((now - timedelta(hours=24)).timestamp() * 1000)
 
         # Fetch trade history from FXOpen API
-        history_data = api.get_trade_history(timestamp_from, timestamp_to)
+        history_data = await api.get_trade_history(timestamp_from, timestamp_to)
 
         if history_data is None:
             logger.warning("[WARNING] Trade history returned None from API")
@@ -548,7 +581,7 @@ async def close_trade(trade_id: int):
         logger.info(f"[TRADE] Close trade request for ID: {trade_id}")
 
         # First get the trade to verify it exists and get its current state
-        trade = api.get_open_trade(trade_id)
+        trade = await api.get_open_trade(trade_id)
         if trade is None:
             logger.warning(f"[WARNING] Trade not found: {trade_id}")
             return CloseTradeResponse(
@@ -559,14 +592,14 @@ async def close_trade(trade_id: int):
             )
 
         # Get current price for the close
-        prices = api.get_prices([trade.instrument])
+        prices = await api.get_prices([trade.instrument])
         current_price = None
         if prices and len(prices) > 0:
             is_long = trade.side == "Buy" or trade.initialAmount > 0
             current_price = prices[0].bid if is_long else prices[0].ask
 
         # Close the trade
-        success = api.close_trade(trade_id)
+        success = await api.close_trade(trade_id)
 
         if success:
             logger.info(f"[SUCCESS] Trade closed: {trade_id}")
@@ -1044,7 +1077,7 @@ async def spread(pair: str):
 
         # Get price data (API expects pair without underscore)
         symbol = pair.replace("_", "")
-        prices = api.get_prices([symbol])
+        prices = await api.get_prices([symbol])
 
         if prices is None or len(prices) == 0:
             logger.warning(f"[WARNING] Could not fetch price for {pair}")
@@ -1101,7 +1134,7 @@ async def batch_spreads(pairs: str):
             pair_list = pair_list[:20]
             logger.warning("[WARNING] Batch spreads request truncated to 20 pairs")
 
-        response = fetch_batch_spreads(pair_list, api)
+        response = await fetch_batch_spreads(pair_list, api)
         logger.info(f"[SUCCESS] Batch spreads fetched for {response.count} pairs")
         return response
 
@@ -1175,7 +1208,7 @@ async def prices(pair: str, granularity: str, count: str):
         JSON object with OHLC price arrays for charting
     """
     try:
-        data = api.web_api_candles(pair, granularity, count)
+        data = await api.web_api_candles(pair, granularity, count)
 
         # Check if the response contains an error
         if data is not None and "error" in data:
@@ -1210,6 +1243,70 @@ async def prices(pair: str, granularity: str, count: str):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@app.get(
+    "/api/indicators/{pair}/{granularity}/{count}/{indicator_id}",
+    response_model=IndicatorDataResponse,
+    tags=["Price Data"],
+)
+async def indicator_values(
+    pair: str, granularity: str, count: str, indicator_id: str, request: Request
+):
+    """
+    Get indicator values calculated server-side over the same candles as /api/prices.
+
+    Indicator parameters are passed as query parameters (e.g. ``?period=50``);
+    missing parameters use the catalogue defaults. Results are served from the
+    shared indicator cache when the candles have not changed.
+
+    Args:
+        pair: Currency pair (e.g., 'EUR_USD')
+        granularity: Timeframe (e.g., 'H1', 'D')
+        count: Number of candles to fetch
+        indicator_id: Indicator type ID (e.g., 'rsi', 'macd')
+
+    Returns:
+        JSON object with candle times and the indicator series by component
+    """
+    try:
+        try:
+            params = normalize_params(indicator_id, dict(request.query_params))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        data = await api.web_api_candles(pair, granularity, count)
+        if data is None or "error" in data:
+            detail = (data or {}).get("message") or f"Price data not found for {pair}/{granularity}"
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+        candles = CandleBuffer.from_price_columns(data)
+        series = indicator_cache.get_or_calculate(
+            candles, indicator_id, params, pair=pair, timeframe=granularity
+        )
+
+        values = {
+            component or "value": [None if math.isnan(v) else v for v in array.tolist()]
+            for component, array in series.items()
+        }
+
+        logger.info(
+            f"[SUCCESS] Indicator {indicator_id} calculated for {pair}/{granularity}, "
+            f"count: {count}"
+        )
+        return IndicatorDataResponse(
+            pair=pair,
+            granularity=granularity,
+            indicator_id=indicator_id,
+            params=params,
+            time=list(data.get("time", [])),
+            values=values,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[ERROR] Indicator calculation failed: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 # =============================================================================
 # Strategy Routes
 # =============================================================================
@@ -1683,6 +1780,115 @@ async def get_backtest(backtest_id: str):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@app.get(
+    "/api/backtests/{backtest_id}/series",
+    response_model=BacktestSeriesResponse,
+    tags=["Backtests"],
+)
+async def get_backtest_series(
+    backtest_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    max_points: Optional[int] = None,
+):
+    """
+    Get the per-candle result series of a backtest at full resolution.
+
+    Saved results only keep a downsampled copy of long series; charts call
+    this endpoint for the window they zoom into.
+
+    Args:
+        backtest_id: The backtest ID
+        start: Inclusive ISO 8601 window start (defaults to the first candle)
+        end: Inclusive ISO 8601 window end (defaults to the last candle)
+        max_points: Optional limit; larger windows are downsampled to it
+
+    Returns:
+        JSON object with candle times, buy-and-hold curve and trade counts
+    """
+    try:
+        logger.debug(f"[BACKTEST] Series request for ID: {backtest_id} ({start} - {end})")
+
+        success, series, error = await run_in_threadpool(
+            service_get_backtest_series, backtest_id, start, end, max_points
+        )
+
+        if not success:
+            logger.warning(f"[WARNING] Backtest series failed: {error}")
+            return BacktestSeriesResponse(success=False, backtest_id=backtest_id, error=error)
+
+        return BacktestSeriesResponse(success=True, backtest_id=backtest_id, **series)
+
+    except Exception as e:
+        logger.error(f"[ERROR] Backtest series failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return BacktestSeriesResponse(success=False, backtest_id=backtest_id, error=str(e))
+
+
+@app.get(
+    "/api/backtests/{backtest_id}/trades",
+    response_model=BacktestTradesResponse,
+    tags=["Backtests"],
+)
+async def get_backtest_trades(
+    backtest_id: str,
+    sort_by: str = "exit_time",
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    side: Optional[str] = None,
+    outcome: Optional[str] = None,
+    exit_reason: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    """
+    Get one page of the full trade ledger of a backtest.
+
+    Args:
+        backtest_id: The backtest ID
+        sort_by: entry_time, exit_time, pnl or duration
+        descending: Sort largest first
+        cursor: next_cursor of the previous page (omit for the first page)
+        limit: Trades per page (at most 1000)
+        side: Filter by "long" or "short"
+        outcome: Filter by "win" or "loss"
+        exit_reason: Filter by exit reason (signal, stop_loss, take_profit)
+        start: Inclusive ISO 8601 earliest exit time
+        end: Inclusive ISO 8601 latest exit time
+
+    Returns:
+        JSON object with the trades of the page and the cursor of the next one
+    """
+    try:
+        logger.debug(f"[BACKTEST] Trades request for ID: {backtest_id}")
+
+        success, page, error = await run_in_threadpool(
+            service_get_backtest_trades,
+            backtest_id,
+            sort_by,
+            descending,
+            cursor,
+            limit,
+            side=side,
+            outcome=outcome,
+            exit_reason=exit_reason,
+            start=start,
+            end=end,
+        )
+
+        if not success:
+            logger.warning(f"[WARNING] Backtest trades failed: {error}")
+            return BacktestTradesResponse(success=False, backtest_id=backtest_id, error=error)
+
+        return BacktestTradesResponse(success=True, backtest_id=backtest_id, **page)
+
+    except Exception as e:
+        logger.error(f"[ERROR] Backtest trades failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return BacktestTradesResponse(success=False, backtest_id=backtest_id, error=str(e))
+
+
 @app.delete(
     "/api/backtests/{backtest_id}", response_model=DeleteBacktestResponse, tags=["Backtests"]
 )
@@ -1787,7 +1993,9 @@ async def run_backtest(backtest_id: str, request: RunBacktestRequest = None):
         logger.info(f"[BACKTEST] Run backtest request for ID: {backtest_id}")
 
         keep_partial = request.keep_partial_on_cancel if request else False
-        result = backtest_executor.start_backtest(backtest_id, keep_partial)
+        priority = request.priority if request else 0
+        use_cache = request.use_cache if request else True
+        result = backtest_executor.start_backtest(backtest_id, keep_partial, priority, use_cache)
 
         if result["success"]:
             logger.info(f"[SUCCESS] Backtest started: {backtest_id}")
@@ -1804,6 +2012,47 @@ async def run_backtest(backtest_id: str, request: RunBacktestRequest = None):
         return RunBacktestResponse(success=False, message="Failed to start backtest", error=str(e))
 
 
+@app.post(
+    "/api/backtests/{backtest_id}/extend",
+    response_model=RunBacktestResponse,
+    tags=["Backtest Execution"],
+)
+async def extend_backtest(backtest_id: str, request: ExtendBacktestRequest):
+    """
+    Move a backtest's end date forward and run it again.
+
+    A completed run continues from its final engine state, so only the
+    candles after the old end date are simulated.
+
+    Args:
+        backtest_id: The backtest ID to extend
+        request: The new end date and queue priority
+
+    Returns:
+        JSON object with success status and message
+    """
+    try:
+        logger.info(f"[BACKTEST] Extend backtest request for ID: {backtest_id}")
+
+        result = backtest_executor.extend_backtest(
+            backtest_id, request.end_date, request.priority
+        )
+
+        if result["success"]:
+            logger.info(f"[SUCCESS] Backtest extension started: {backtest_id}")
+            return RunBacktestResponse(success=True, message=result["message"])
+        else:
+            logger.warning(f"[WARNING] Backtest extension failed: {result.get('message')}")
+            return RunBacktestResponse(
+                success=False, message=result["message"], error=result.get("error")
+            )
+
+    except Exception as e:
+        logger.error(f"[ERROR] Backtest extension failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return RunBacktestResponse(success=False, message="Failed to extend backtest", error=str(e))
+
+
 @app.get(
     "/api/backtests/{backtest_id}/progress",
     response_model=BacktestProgressResponse,
@@ -1886,6 +2135,58 @@ async def cancel_backtest(backtest_id: str, request: CancelBacktestRequest = Non
         )
 
 
+@app.post(
+    "/api/backtests/{backtest_id}/sweep",
+    response_model=ParameterSweepResponse,
+    tags=["Backtest Execution"],
+)
+async def sweep_backtest(backtest_id: str, request: ParameterSweepRequest):
+    """
+    Run a parameter sweep (grid search) over a backtest.
+
+    Every combination of the requested parameter values runs over one
+    shared candle buffer; nothing is saved to the database.
+
+    Args:
+        backtest_id: The base backtest ID
+        request: Parameter paths and the values to try
+
+    Returns:
+        JSON object with one row of summary metrics per combination
+    """
+    try:
+        logger.info(f"[BACKTEST] Parameter sweep request for ID: {backtest_id}")
+
+        success, result, error = await run_in_threadpool(
+            run_parameter_sweep, backtest_id, request.parameters, request.engine
+        )
+
+        if not success:
+            logger.warning(f"[WARNING] Parameter sweep failed: {error}")
+            return ParameterSweepResponse(success=False, message=error, error=error)
+
+        logger.info(
+            f"[SUCCESS] Parameter sweep of {backtest_id}: {result['combinations']} combinations"
+        )
+        return ParameterSweepResponse(
+            success=True,
+            message=f"Ran {result['combinations']} combinations",
+            combinations=result["combinations"],
+            signal_evaluations=result["signal_evaluations"],
+            total_candles=result["total_candles"],
+            elapsed_seconds=result["elapsed_seconds"],
+            columns=result["columns"],
+            rows=result["rows"],
+        )
+
+    except Exception as e:
+        logger.error(f"[ERROR] Parameter sweep failed: {str(e)}")
+        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
+        return ParameterSweepResponse(
+            success=False, message="Failed to run parameter sweep", error=str(e)
+        )
+
+
 @app.put(
     "/api/backtests/{backtest_id}/notes",
     summary="Update backtest notes",
@@ -1953,15 +2254,24 @@ async def export_backtest_csv(backtest_id: str):
 
         # Parse results into BacktestResultsSummary
         from core.data_models import BacktestResultsSummary
-        from utils.export_generators import generate_csv_export
+        from utils.export_generators import generate_csv_export, iter_csv_trade_list
 
         results = BacktestResultsSummary(**results_dict)
 
+        # The trade list comes from the full ledger, streamed in chunks
+        ledger_loaded, ledger, ledger_error = service_load_trade_ledger(backtest_id)
+        if not ledger_loaded:
+            logger.warning(f"[WARNING] Exporting trade preview only: {ledger_error}")
+
         # Generate CSV
-        csv_content = generate_csv_export(results, backtest)
+        if ledger_loaded:
+            summary_csv = generate_csv_export(results.model_copy(update={"trades": []}), backtest)
+            csv_chunks = chain([summary_csv], iter_csv_trade_list(ledger.iter_dicts()))
+        else:
+            csv_chunks = iter([generate_csv_export(results, backtest)])
 
         # Return as downloadable file
-        from fastapi.responses import Response
+        from fastapi.responses import StreamingResponse
 
         filename = f"{backtest.name.replace(' ', '_')}.csv"
         headers = {
@@ -1970,7 +2280,7 @@ async def export_backtest_csv(backtest_id: str):
         }
 
         logger.info(f"[SUCCESS] CSV export generated for backtest: {backtest_id}")
-        return Response(content=csv_content, headers=headers, media_type="text/csv")
+        return StreamingResponse(csv_chunks, headers=headers, media_type="text/csv")
 
     except HTTPException:
         raise
@@ -0,0 +1,31 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from config import settings
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    """Keep backtest checkpoints written by tests out of the shared checkpoint directory."""
+    directory = tmp_path / "checkpoints"
+    monkeypatch.setattr(settings, "BACKTEST_CHECKPOINT_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def candle_store_dir(tmp_path, monkeypatch):
+    """Keep candles stored by tests out of the shared candle store."""
+    directory = tmp_path / "candles"
+    monkeypatch.setattr(settings, "CANDLE_STORE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_dir(tmp_path, monkeypatch):
+    """Keep broker rate limit state of tests out of the shared directory."""
+    directory = tmp_path / "rate-limits"
+    monkeypatch.setattr(settings, "OPENFX_RATE_LIMIT_DIR", str(directory))
+    return directory
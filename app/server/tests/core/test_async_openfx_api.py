@@ -0,0 +1,169 @@
+"""
+Tests for Async OpenFX API Client
+=================================
+Unit tests for the asyncio-native OpenFX client used by the API routes.
+"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core.async_openfx_api import AsyncOpenFxApi
+from utils.rate_limiter import TokenBucket
+
+
+def _client(handler) -> AsyncOpenFxApi:
+    return AsyncOpenFxApi(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture(autouse=True)
+def no_throttle():
+    with patch("core.async_openfx_api.rate_limiter_for", return_value=TokenBucket(0)):
+        yield
+
+
+class TestAsyncOpenFxApi:
+    """Test cases for AsyncOpenFxApi."""
+
+    async def test_get_account_summary(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"Id": 7, "Balance": 10000.0})
+
+        api = _client(handler)
+        result = await api.get_account_summary()
+        await api.aclose()
+
+        assert result == {"Id": 7, "Balance": 10000.0}
+        assert requests[0].url.path.endswith("/account")
+        assert requests[0].headers["Authorization"].startswith("Basic ")
+
+    async def test_failed_request_returns_none(self):
+        api = _client(lambda request: httpx.Response(401, json={"error": "Unauthorized"}))
+
+        assert await api.get_account_summary() is None
+        assert await api.get_open_trades() is None
+
+    async def test_connection_error_is_reported(self):
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        ok, data = await _client(handler)._make_request("account")
+
+        assert not ok
+        assert "refused" in data["Exception"]
+
+    async def test_trade_history_posts_the_query(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append((request.method, json.loads(request.content)))
+            return httpx.Response(200, json={"Records": []})
+
+        result = await _client(handler).get_trade_history(1000, 2000)
+
+        assert result == {"Records": []}
+        assert bodies[0][0] == "POST"
+        assert bodies[0][1]["TimestampFrom"] == 1000
+        assert bodies[0][1]["RequestDirection"] == "Forward"
+
+    async def test_connections_are_pooled(self):
+        api = _client(lambda request: httpx.Response(200, json=[]))
+
+        await api.get_open_trades()
+        client = api._client
+        await api.get_prices(["EURUSD", "GBPUSD"])
+
+        assert api._client is client
+        await api.aclose()
+        assert api._client is None
+
+    async def test_per_request_timeout(self):
+        timeouts = []
+
+        def handler(request):
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200, json={})
+
+        api = _client(handler)
+        await api._make_request("account")
+        await api._make_request("account", timeout=0.5)
+
+        assert timeouts[0]["connect"] == 5.0
+        assert timeouts[0]["read"] == 10.0
+        assert timeouts[1]["read"] == 0.5
+
+    async def test_slow_requests_run_concurrently(self):
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json={"Id": 1})
+
+        api = _client(handler)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*(api.get_account_summary() for _ in range(5)))
+
+        assert results == [{"Id": 1}] * 5
+        assert loop.time() - started < 0.6
+
+    async def test_throttle_spaces_requests_without_blocking(self):
+        api = _client(lambda request: httpx.Response(200, json={}))
+        loop = asyncio.get_running_loop()
+
+        limiter = TokenBucket(20, burst=1)
+        with patch("core.async_openfx_api.rate_limiter_for", return_value=limiter):
+            started = loop.time()
+            await asyncio.gather(*(api._make_request("account") for _ in range(3)))
+
+        assert loop.time() - started >= 0.1
+
+    async def test_throttle_reserves_off_the_event_loop(self):
+        api = _client(lambda request: httpx.Response(200, json={}))
+        threads = []
+        limiter = TokenBucket(0)
+        limiter.reserve = lambda: threads.append(threading.current_thread()) or 0.0
+
+        with patch("core.async_openfx_api.rate_limiter_for", return_value=limiter):
+            await api._make_request("account")
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    async def test_cancellation_propagates(self):
+        async def handler(request):
+            await asyncio.sleep(10)
+            return httpx.Response(200, json={})
+
+        task = asyncio.ensure_future(_client(handler).get_account_summary())
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    async def test_web_api_candles_runs_off_the_event_loop(self):
+        api = AsyncOpenFxApi()
+
+        with patch(
+            "core.openfx_api.OpenFxApi.web_api_candles", return_value={"time": []}
+        ) as mock_candles:
+            result = await api.web_api_candles("EUR_USD", "H1", 10)
+
+        assert result == {"time": []}
+        mock_candles.assert_called_once_with("EUR_USD", "H1", 10)
+
+    async def test_aclose_closes_the_candle_client(self):
+        api = AsyncOpenFxApi()
+        with patch("core.openfx_api.OpenFxApi.web_api_candles", return_value={"time": []}):
+            await api.web_api_candles("EUR_USD", "H1", 10)
+
+        with patch("core.openfx_api.OpenFxApi.close") as mock_close:
+            await api.aclose()
+
+        mock_close.assert_called_once_with()
+        assert api._sync_api is None
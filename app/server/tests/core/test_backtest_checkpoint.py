@@ -0,0 +1,484 @@
+"""
+Tests for Backtest Checkpoints
+==============================
+Unit tests for the checkpoint store and for engines and the executor
+resuming runs from a checkpoint.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from core.backtest_checkpoint import (
+    BacktestCheckpoint,
+    CheckpointStore,
+    EngineState,
+    RunCheckpointer,
+)
+from core.backtest_executor import BacktestExecution, BacktestExecutor
+from core.condition_compiler import compile_strategy
+from core.indicator_engine import indicator_cache
+from core.result_cache import result_cache
+
+BACKTEST = {
+    "id": "backtest-1",
+    "strategy_id": "strategy-1",
+    "pair": "EUR_USD",
+    "timeframe": "H1",
+    "start_date": "2025-01-01T00:00:00Z",
+    "end_date": "2025-03-01T00:00:00Z",
+    "initial_balance": 10000.0,
+    "position_sizing": {"method": "percentage", "value": 2.0},
+    "risk_management": {"stop_loss": {"type": "fixed_pips", "value": 20}},
+    "engine": "loop",
+    "use_result_cache": False,
+}
+
+STRATEGY = {
+    "id": "strategy-1",
+    "indicators": [{"id": "rsi", "instance_id": "rsi-1", "params": {"period": 14}}],
+    "conditions": [
+        {
+            "id": "entry",
+            "section": "long_entry",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_below",
+            "right_operand": {"type": "value", "value": 40},
+        },
+        {
+            "id": "exit",
+            "section": "long_exit",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_above",
+            "right_operand": {"type": "value", "value": 60},
+        },
+    ],
+}
+
+
+class CancelAfter:
+    """Cancel event that reports cancellation from its ``checks``-th check on."""
+
+    def __init__(self, checks: int):
+        self.remaining = checks
+
+    def is_set(self) -> bool:
+        self.remaining -= 1
+        return self.remaining < 0
+
+
+def _checkpoint(backtest_id="backtest-1", cursor=10, **kwargs):
+    return BacktestCheckpoint(
+        backtest_id=backtest_id,
+        run_key="key",
+        candle_seed=7,
+        state=EngineState(cursor=cursor, balance=10000.0, **kwargs),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "interrupted"))
+
+
+@pytest.fixture
+def final_states(tmp_path):
+    return CheckpointStore(str(tmp_path / "completed"))
+
+
+@pytest.fixture
+def executor(store, final_states):
+    BacktestExecutor._instance = None
+    instance = BacktestExecutor()
+    instance._checkpoints = store
+    instance._final_states = final_states
+    indicator_cache.clear()
+    result_cache.clear()
+    yield instance
+    indicator_cache.clear()
+    result_cache.clear()
+    BacktestExecutor._instance = None
+
+
+class TestCheckpointStore:
+    """Test cases for the checkpoint files."""
+
+    def test_round_trip(self, store):
+        position = {"type": "long", "entry_time": datetime(2025, 1, 2), "size": 200.0}
+        store.save(_checkpoint(trades=[{"pnl": 1.5}], position=position))
+
+        loaded = store.load("backtest-1")
+
+        assert loaded.state.trades == [{"pnl": 1.5}]
+        assert loaded.state.position == position
+        assert loaded.candle_seed == 7
+        assert os.listdir(store.directory) == ["backtest-1.json"]
+        assert store.backtest_ids() == ["backtest-1"]
+
+    def test_unusable_checkpoints_are_ignored(self, store):
+        """Test missing, corrupt and outdated checkpoints load as None."""
+        assert store.load("missing") is None
+
+        os.makedirs(store.directory)
+        with open(os.path.join(store.directory, "corrupt.json"), "wb") as handle:
+            handle.write(b"not json")
+        assert store.load("corrupt") is None
+
+        outdated = _checkpoint("outdated")
+        outdated.version = 0
+        store.save(outdated)
+        assert store.load("outdated") is None
+
+    def test_files_are_private(self, store):
+        store.save(_checkpoint())
+
+        assert os.stat(store.directory).st_mode & 0o777 == 0o700
+        assert os.stat(os.path.join(store.directory, "backtest-1.json")).st_mode & 0o777 == 0o600
+
+    def test_checkpoints_others_can_write_are_ignored(self, store):
+        store.save(_checkpoint())
+        path = os.path.join(store.directory, "backtest-1.json")
+
+        os.chmod(path, 0o666)
+        assert store.load("backtest-1") is None
+
+        os.chmod(path, 0o600)
+        with patch("core.backtest_checkpoint.os.getuid", return_value=os.getuid() + 1):
+            assert store.load("backtest-1") is None
+        assert store.load("backtest-1") is not None
+
+    def test_open_directory_is_made_private(self, store):
+        os.makedirs(store.directory, mode=0o777)
+        os.chmod(store.directory, 0o777)
+
+        assert store.save(_checkpoint())
+        assert os.stat(store.directory).st_mode & 0o777 == 0o700
+
+    def test_rejects_ids_that_are_not_file_names(self, store, tmp_path):
+        assert not store.save(_checkpoint("../escape"))
+        assert store.load("../escape") is None
+        assert not (tmp_path / "escape.json").exists()
+
+    def test_discard_and_prune(self, store):
+        store.save(_checkpoint("old"))
+        store.save(_checkpoint("new"))
+        past = time.time() - 3600
+        os.utime(os.path.join(store.directory, "old.json"), (past, past))
+
+        assert store.prune(60) == ["old"]
+        store.discard("new")
+        store.discard("new")
+
+        assert store.backtest_ids() == []
+
+    def test_checkpointer_interval(self, store):
+        checkpointer = RunCheckpointer(store, "backtest-1", "key", 7, interval=3600)
+        assert not checkpointer.due()
+
+        checkpointer.interval = 0
+        assert checkpointer.due()
+        assert checkpointer.save(EngineState(cursor=5, balance=1.0))
+        assert store.load("backtest-1").state.cursor == 5
+        assert checkpointer.saves == 1
+
+
+class TestEngineResume:
+    """Test cases for engines continuing from a checkpoint."""
+
+    @pytest.fixture
+    def run(self, executor):
+        candles = executor._generate_simulated_candles(
+            datetime(2025, 1, 1), datetime(2025, 3, 1), "M15", rng=np.random.default_rng(3)
+        )
+        plan = compile_strategy(STRATEGY)
+        signals = plan.evaluate(candles, executor._calculate_indicator_values(plan, candles))
+
+        def run(engine, cancel_event, resume=None, checkpointer=None):
+            execution = BacktestExecution(
+                backtest_id="backtest-1", thread=None, cancel_event=Event()
+            )
+            engine_method = getattr(executor, f"_run_{engine}_engine")
+            with patch.object(executor, "_update_backtest_status"):
+                outcome = engine_method(
+                    "backtest-1",
+                    execution,
+                    cancel_event,
+                    candles,
+                    signals,
+                    BACKTEST["initial_balance"],
+                    BACKTEST["position_sizing"],
+                    BACKTEST["risk_management"],
+                    resume=resume,
+                    checkpointer=checkpointer,
+                )
+            return outcome, execution
+
+        return run
+
+    @pytest.mark.parametrize("engine, checks", [("loop", 20), ("vectorized", 15)])
+    def test_resumed_run_matches_uninterrupted_run(self, run, store, engine, checks):
+        """Test a run cancelled midway and resumed gives the uninterrupted results."""
+        expected, expected_execution = run(engine, Event())
+        checkpointer = RunCheckpointer(store, "backtest-1", "key", 7, interval=3600)
+
+        cancelled, _ = run(engine, CancelAfter(checks), checkpointer=checkpointer)
+        state = store.load("backtest-1").state
+        resumed, execution = run(engine, Event(), resume=state)
+
+        assert cancelled is None
+        assert 0 < state.cursor
+        assert 0 < len(state.trades) < len(expected[0])
+        assert resumed == expected
+        assert execution.metrics.summary(expected[1]) == (
+            expected_execution.metrics.summary(expected[1])
+        )
+        assert execution.peak_equity == expected_execution.peak_equity
+
+    def test_checkpoints_periodically(self, run, store):
+        checkpointer = RunCheckpointer(store, "backtest-1", "key", 7, interval=0)
+
+        outcome, _ = run("loop", Event(), checkpointer=checkpointer)
+
+        assert checkpointer.saves > 1
+        assert store.load("backtest-1").state.trades == outcome[0]
+
+
+def _execute(executor, backtest=BACKTEST, cancel_event=None):
+    """Run a backtest through the executor, returning its execution and mocks."""
+    execution = BacktestExecution(
+        backtest_id="backtest-1", thread=None, cancel_event=cancel_event or Event()
+    )
+    executor._running_backtests["backtest-1"] = execution
+    client = MagicMock()
+    client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+        MagicMock(data=[STRATEGY])
+    )
+    engine_method = f"_run_{backtest['engine']}_engine"
+    with (
+        patch("core.backtest_executor.get_supabase_client", return_value=client),
+        patch("core.backtest_executor.settings.MONTE_CARLO_SEED", 42),
+        patch.object(executor, "_complete_backtest") as mock_complete,
+        patch.object(executor, "_update_backtest_progress"),
+        patch.object(executor, "_update_backtest_status"),
+        patch.object(
+            executor, engine_method, wraps=getattr(executor, engine_method)
+        ) as engine,
+    ):
+        executor._execute_backtest("backtest-1", execution.cancel_event, backtest)
+    return execution, mock_complete, engine
+
+
+class TestExecutorCheckpoints:
+    """Test cases for the executor resuming interrupted runs."""
+
+    def test_interrupted_run_resumes_and_completes(self, executor, store):
+        """Test a cancelled run resumes on the same candles and matches a fresh run."""
+        cancelled, _, _ = _execute(executor, cancel_event=CancelAfter(10))
+        checkpoint = store.load("backtest-1")
+
+        resumed, complete, engine = _execute(executor)
+
+        assert cancelled.status == "pending"
+        assert engine.call_args.kwargs["resume"].cursor == checkpoint.state.cursor
+        assert resumed.status == "completed"
+        assert store.load("backtest-1") is None
+
+        # A fresh run simulates the checkpoint's candles and gives the same results
+        executor._final_states = None
+        _, fresh_complete, _ = _execute(executor)
+        assert complete.call_args.args[1] == fresh_complete.call_args.args[1]
+
+    def test_stale_checkpoint_is_not_used(self, executor, store):
+        store.save(_checkpoint(cursor=500, trades=[{"pnl": 1.0}]))
+
+        execution, _, engine = _execute(executor)
+
+        assert engine.call_args.kwargs["resume"] is None
+        assert execution.status == "completed"
+        assert store.load("backtest-1") is None
+
+    @pytest.mark.parametrize(
+        "rows, resumed, kept",
+        [
+            ([{"id": "backtest-1", "status": "running"}], ["backtest-1"], True),
+            ([{"id": "backtest-1", "status": "pending"}], [], True),
+            ([], [], False),
+        ],
+    )
+    def test_resume_interrupted(self, executor, store, rows, resumed, kept):
+        """Test only runs the database still marks as running are restarted."""
+        store.save(_checkpoint())
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(data=rows)
+        )
+
+        with (
+            patch("core.backtest_executor.is_configured", return_value=True),
+            patch("core.backtest_executor.get_supabase_client", return_value=client),
+            patch.object(
+                executor, "start_backtest", return_value={"success": True, "message": ""}
+            ) as start,
+        ):
+            assert executor.resume_interrupted() == resumed
+
+        assert start.called == bool(resumed)
+        assert (store.load("backtest-1") is not None) == kept
+
+
+class TestExtension:
+    """Test cases for extending a completed run to a later end date."""
+
+    def test_simulated_candles_keep_their_prefix(self, executor):
+        """Test a longer range generated from the same seed starts with the same candles."""
+        short = executor._generate_simulated_candles(
+            datetime(2025, 1, 1), datetime(2025, 1, 10), "H1", rng=np.random.default_rng(4)
+        )
+        long = executor._generate_simulated_candles(
+            datetime(2025, 1, 1), datetime(2025, 2, 1), "H1", rng=np.random.default_rng(4)
+        )
+
+        assert long[: len(short)].to_dicts() == short.to_dicts()
+
+    @pytest.mark.parametrize("engine", ["loop", "vectorized"])
+    def test_extended_run_matches_full_run(self, executor, final_states, engine):
+        """Test extending continues from the old end and matches a run over the full range."""
+        first = {**BACKTEST, "engine": engine, "end_date": "2025-02-01T00:00:00Z"}
+        extended = {**first, "end_date": "2025-03-01T00:00:00Z"}
+        _execute(executor, first)
+        final_state = final_states.load("backtest-1")
+
+        execution, complete, engine_mock = _execute(executor, extended)
+
+        resume = engine_mock.call_args.kwargs["resume"]
+        assert resume is not None
+        assert resume.cursor == final_state.state.cursor > 0
+        assert execution.status == "completed"
+        assert final_states.load("backtest-1").end_time > final_state.end_time
+
+        # A fresh run over the full range gives the same results
+        executor._final_states = None
+        with patch(
+            "core.backtest_executor.derive_candle_seed", return_value=final_state.candle_seed
+        ):
+            _, fresh_complete, fresh_engine = _execute(executor, extended)
+        assert fresh_engine.call_args.kwargs["resume"] is None
+        assert complete.call_args.args[1] == fresh_complete.call_args.args[1]
+
+    def test_changed_settings_run_from_the_start(self, executor):
+        _execute(executor, {**BACKTEST, "end_date": "2025-02-01T00:00:00Z"})
+
+        _, _, engine = _execute(executor, {**BACKTEST, "initial_balance": 5000.0})
+
+        assert engine.call_args.kwargs["resume"] is None
+
+
+class TestExtendBacktest:
+    """Test cases for the extend operation."""
+
+    @pytest.fixture
+    def client(self):
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(
+                data=[
+                    {
+                        "id": "backtest-1",
+                        "status": "completed",
+                        "end_date": "2025-02-01T00:00:00+00:00",
+                        "updated_at": "2025-02-02T00:00:00+00:00",
+                    }
+                ]
+            )
+        )
+        with (
+            patch("core.backtest_executor.is_configured", return_value=True),
+            patch("core.backtest_executor.get_supabase_client", return_value=client),
+        ):
+            yield client
+
+    def test_moves_end_date_and_starts_run(self, executor, client):
+        with patch.object(
+            executor, "_queue_backtest", return_value={"success": True, "message": "started"}
+        ) as queue:
+            result = executor.extend_backtest("backtest-1", datetime(2025, 3, 1), priority=2)
+
+        assert result["success"]
+        queue.assert_called_once_with(
+            "backtest-1", keep_partial_on_cancel=False, priority=2, use_cache=True
+        )
+        update = client.table.return_value.update.call_args.args[0]
+        assert update["end_date"] == "2025-03-01T00:00:00"
+
+    def test_rejects_earlier_end_date(self, executor, client):
+        result = executor.extend_backtest("backtest-1", datetime(2025, 1, 15))
+
+        assert result["error"] == "validation_error"
+        client.table.return_value.update.assert_not_called()
+
+    @pytest.mark.parametrize("status", ["pending", "running", "failed", "cancelled"])
+    def test_rejects_backtest_that_is_not_completed(self, executor, client, status):
+        select = client.table.return_value.select.return_value.eq.return_value.execute
+        select.return_value.data[0]["status"] = status
+
+        result = executor.extend_backtest("backtest-1", datetime(2025, 3, 1))
+
+        assert result["error"] == "validation_error"
+        client.table.return_value.update.assert_not_called()
+
+    def test_rejects_running_backtest(self, executor, client):
+        executor._running_backtests["backtest-1"] = BacktestExecution(
+            backtest_id="backtest-1", thread=None, cancel_event=Event(), status="pending"
+        )
+
+        result = executor.extend_backtest("backtest-1", datetime(2025, 3, 1))
+
+        assert result["error"] == "conflict"
+        client.table.return_value.update.assert_not_called()
+
+    def test_concurrent_extends_start_one_run(self, executor, client):
+        """Test the running check and the start are atomic across requests."""
+        started = []
+
+        def queue(backtest_id, **kwargs):
+            time.sleep(0.05)
+            started.append(backtest_id)
+            executor._running_backtests[backtest_id] = BacktestExecution(
+                backtest_id=backtest_id, thread=None, cancel_event=Event(), status="pending"
+            )
+            return {"success": True, "message": "started", "error": None}
+
+        with (
+            patch.object(executor, "_queue_backtest", side_effect=queue),
+            ThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            results = list(
+                pool.map(
+                    lambda _: executor.extend_backtest("backtest-1", datetime(2025, 3, 1)),
+                    range(2),
+                )
+            )
+
+        assert started == ["backtest-1"]
+        assert sorted(result["error"] or "" for result in results) == ["", "conflict"]
+
+    def test_restores_end_date_when_run_cannot_start(self, executor, client):
+        with patch.object(
+            executor,
+            "_queue_backtest",
+            return_value={"success": False, "message": "busy", "error": "busy"},
+        ):
+            result = executor.extend_backtest("backtest-1", datetime(2025, 3, 1))
+
+        assert result["error"] == "busy"
+        restored = client.table.return_value.update.call_args.args[0]
+        assert restored == {
+            "end_date": "2025-02-01T00:00:00+00:00",
+            "updated_at": "2025-02-02T00:00:00+00:00",
+        }
@@ -0,0 +1,133 @@
+"""
+Tests for Backtest Scheduler
+============================
+Unit tests for the bounded backtest job queue.
+"""
+
+import time
+
+from core.backtest_scheduler import (
+    BYTES_PER_CANDLE,
+    BacktestScheduler,
+    QueuedJob,
+    estimate_job,
+)
+
+
+def _job(backtest_id, priority=0, candles=1000, seconds=10.0):
+    return QueuedJob(
+        backtest_id=backtest_id,
+        priority=priority,
+        estimated_candles=candles,
+        estimated_seconds=seconds,
+    )
+
+
+def _ids(jobs):
+    return [job.backtest_id for job in jobs]
+
+
+class TestAdmission:
+    """Test cases for queue ordering and admission control."""
+
+    def test_priority_then_fifo(self):
+        """Test higher priorities start first and equal priorities keep arrival order."""
+        scheduler = BacktestScheduler(max_concurrent=3, max_queued=10, memory_budget_bytes=1 << 30)
+        for backtest_id, priority in [("a", 0), ("b", 5), ("c", 0), ("d", 5)]:
+            assert scheduler.enqueue(_job(backtest_id, priority))
+
+        assert _ids(scheduler.pop_ready()) == ["b", "d", "a"]
+        assert scheduler.pop_ready() == []
+
+        scheduler.finish("b")
+        assert _ids(scheduler.pop_ready()) == ["c"]
+
+    def test_queue_bound_and_duplicates(self):
+        """Test a full queue and already-queued backtests are rejected."""
+        scheduler = BacktestScheduler(max_concurrent=1, max_queued=2, memory_budget_bytes=1 << 30)
+
+        assert scheduler.enqueue(_job("a"))
+        assert not scheduler.enqueue(_job("a"))
+        assert scheduler.enqueue(_job("b"))
+        assert not scheduler.enqueue(_job("c"))
+
+    def test_memory_budget_blocks_head(self):
+        """Test a job that does not fit the memory budget waits for running jobs."""
+        budget = 1500 * BYTES_PER_CANDLE
+        scheduler = BacktestScheduler(max_concurrent=4, max_queued=10, memory_budget_bytes=budget)
+        scheduler.enqueue(_job("small", candles=1000))
+        scheduler.enqueue(_job("large", candles=1000))
+        scheduler.enqueue(_job("tiny", candles=10))
+
+        # "tiny" would fit but may not overtake the blocked head
+        assert _ids(scheduler.pop_ready()) == ["small"]
+
+        scheduler.finish("small")
+        assert _ids(scheduler.pop_ready()) == ["large", "tiny"]
+
+    def test_oversized_job_runs_alone(self):
+        """Test a job larger than the whole budget still runs when nothing else does."""
+        scheduler = BacktestScheduler(max_concurrent=2, max_queued=10, memory_budget_bytes=1)
+        scheduler.enqueue(_job("huge", candles=10**6))
+
+        assert _ids(scheduler.pop_ready()) == ["huge"]
+
+    def test_remove_is_lazy(self):
+        """Test removed jobs are skipped when they reach the head of the heap."""
+        scheduler = BacktestScheduler(max_concurrent=1, max_queued=10, memory_budget_bytes=1 << 30)
+        scheduler.enqueue(_job("a"))
+        scheduler.enqueue(_job("b"))
+
+        assert scheduler.remove("a").backtest_id == "a"
+        assert scheduler.remove("a") is None
+        assert not scheduler.is_queued("a")
+        assert _ids(scheduler.pop_ready()) == ["b"]
+
+
+class TestEstimates:
+    """Test cases for queue position, ETA and throughput estimates."""
+
+    def test_queue_status_replays_slots(self):
+        """Test the ETA accounts for running jobs and the jobs queued ahead."""
+        scheduler = BacktestScheduler(max_concurrent=2, max_queued=10, memory_budget_bytes=1 << 30)
+        scheduler.enqueue(_job("r1", seconds=10.0))
+        scheduler.enqueue(_job("r2", seconds=30.0))
+        scheduler.pop_ready()
+        for backtest_id in ("q1", "q2", "q3"):
+            scheduler.enqueue(_job(backtest_id, seconds=20.0))
+
+        position, eta = scheduler.queue_status("q3")
+
+        # q1 starts when r1 frees (10s), q2 at r2 (30s), q3 when q1 ends (30s)
+        assert position == 3
+        assert 29.0 < eta <= 30.0
+        assert scheduler.queue_status("r1") is None
+
+    def test_finish_learns_throughput(self):
+        """Test observed throughput replaces the static duration estimate."""
+        scheduler = BacktestScheduler(max_concurrent=1, max_queued=10, memory_budget_bytes=1 << 30)
+        scheduler.enqueue(_job("a", candles=100, seconds=999.0))
+        scheduler.enqueue(_job("b", candles=100, seconds=999.0))
+        scheduler.pop_ready()
+        time.sleep(0.01)
+
+        scheduler.finish("a", candles_processed=100)
+
+        assert scheduler.throughput > 0
+        assert scheduler.estimated_duration("b") < 999.0
+        assert scheduler.stats()["running"] == 0
+
+    def test_estimate_job(self):
+        """Test estimates come from the backtest date range and timeframe."""
+        candles, seconds = estimate_job(
+            {
+                "pair": "EUR_USD",
+                "timeframe": "H1",
+                "start_date": "2025-01-01T00:00:00Z",
+                "end_date": "2025-01-02T00:00:00Z",
+            }
+        )
+
+        assert candles == 24
+        assert seconds > 0
+        assert estimate_job({"start_date": None}) == (0, 0.0)
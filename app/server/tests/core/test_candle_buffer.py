@@ -0,0 +1,162 @@
+"""
+Tests for Candle Buffer
+=======================
+Unit tests for the columnar CandleBuffer container.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from core.candle_buffer import CandleBuffer, from_epoch_seconds, to_epoch_seconds
+
+
+def _hourly_buffer(n: int = 48) -> CandleBuffer:
+    """Create an hourly buffer starting 2025-01-01 00:00 UTC."""
+    start = to_epoch_seconds(datetime(2025, 1, 1))
+    close = 1.1 + np.arange(n) * 0.0001
+    return CandleBuffer.from_arrays(
+        time=start + np.arange(n) * 3600,
+        open=close - 0.00005,
+        high=close + 0.0002,
+        low=close - 0.0002,
+        close=close,
+        volume=np.full(n, 1000.0),
+    )
+
+
+class TestEpochConversion:
+    """Test cases for epoch conversion helpers."""
+
+    def test_naive_datetime_treated_as_utc(self):
+        """Test that naive datetimes are interpreted as UTC."""
+        naive = datetime(2025, 1, 1, 12, 0)
+        aware = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+        assert to_epoch_seconds(naive) == to_epoch_seconds(aware)
+
+    def test_iso_string_with_z_suffix(self):
+        """Test converting ISO strings with a Z suffix."""
+        assert to_epoch_seconds("2025-01-01T00:00:00Z") == 1735689600
+
+    def test_round_trip(self):
+        """Test that epoch seconds round-trip to a naive UTC datetime."""
+        assert from_epoch_seconds(1735689600) == datetime(2025, 1, 1)
+
+
+class TestCandleBuffer:
+    """Test cases for CandleBuffer construction and access."""
+
+    def test_from_dicts_round_trip(self):
+        """Test converting candle dicts to a buffer and back."""
+        candles = [
+            {
+                "time": datetime(2025, 1, 1, h),
+                "open": 1.1,
+                "high": 1.2,
+                "low": 1.0,
+                "close": 1.15,
+                "volume": 500,
+            }
+            for h in range(3)
+        ]
+
+        buffer = CandleBuffer.from_dicts(candles)
+
+        assert len(buffer) == 3
+        assert buffer.time.dtype == np.int64
+        assert buffer.close.dtype == np.float64
+        assert buffer.to_dicts() == [{**c, "volume": 500.0} for c in candles]
+
+    def test_from_dicts_with_close_only(self):
+        """Test that partial candles default missing prices to the close."""
+        buffer = CandleBuffer.from_dicts([{"close": 100.0}, {"close": 105.0}])
+
+        assert buffer.open.tolist() == [100.0, 105.0]
+        assert buffer.volume.tolist() == [0.0, 0.0]
+
+    def test_coerce_empty(self):
+        """Test coercing empty inputs to an empty buffer."""
+        assert len(CandleBuffer.coerce([])) == 0
+        assert len(CandleBuffer.coerce(None)) == 0
+
+    def test_integer_index_returns_candle_dict(self):
+        """Test that integer indexing returns a dict candle."""
+        buffer = _hourly_buffer()
+
+        candle = buffer[1]
+
+        assert candle["time"] == datetime(2025, 1, 1, 1, 0)
+        assert candle["close"] == float(buffer.close[1])
+        assert buffer[-1]["time"] == datetime(2025, 1, 2, 23, 0)
+
+    def test_iso_times(self):
+        """Test ISO formatting matches datetime.isoformat for naive UTC times."""
+        buffer = _hourly_buffer(2)
+
+        assert buffer.iso_times() == [
+            datetime(2025, 1, 1, 0, 0).isoformat(),
+            datetime(2025, 1, 1, 1, 0).isoformat(),
+        ]
+
+
+class TestSliceDates:
+    """Test cases for zero-copy date range slicing."""
+
+    def test_slice_is_inclusive(self):
+        """Test that both slice bounds are inclusive."""
+        buffer = _hourly_buffer()
+
+        window = buffer.slice_dates(datetime(2025, 1, 1, 5), datetime(2025, 1, 1, 10))
+
+        assert len(window) == 6
+        assert window.datetime_at(0) == datetime(2025, 1, 1, 5)
+        assert window.datetime_at(-1) == datetime(2025, 1, 1, 10)
+
+    def test_slice_shares_memory(self):
+        """Test that slices are views and do not copy data."""
+        buffer = _hourly_buffer()
+
+        window = buffer.slice_dates("2025-01-01T05:00:00Z", "2025-01-01T10:00:00Z")
+
+        assert np.shares_memory(window.close, buffer.close)
+        assert np.shares_memory(window.time, buffer.time)
+
+    def test_slice_open_ended_and_out_of_range(self):
+        """Test open-ended slices and ranges outside the data."""
+        buffer = _hourly_buffer()
+
+        assert len(buffer.slice_dates(start=datetime(2025, 1, 2))) == 24
+        assert len(buffer.slice_dates(end=datetime(2024, 12, 31))) == 0
+        assert len(buffer.slice_dates(datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 5))) == 0
+
+
+class TestCandleIndices:
+    """Test cases for mapping times to candles."""
+
+    def test_first_candle_at_or_after(self):
+        """Test exact, in-between and out-of-range times."""
+        buffer = _hourly_buffer(4)
+        start = int(buffer.time[0])
+
+        indices = buffer.candle_indices([start, start + 1800, start - 60, start + 3 * 3600 + 1])
+
+        assert indices.tolist() == [0, 1, 0, 4]
+
+    def test_counts_per_candle_matches_linear_scan(self):
+        """Test binned counts equal a scan for the first candle at or after each time."""
+        buffer = _hourly_buffer()
+        rng = np.random.default_rng(3)
+        times = rng.integers(buffer.time[0] - 7200, buffer.time[-1] + 7200, 500)
+
+        expected = np.zeros(len(buffer), dtype=np.int64)
+        for value in times:
+            at_or_after = buffer.time >= value
+            if at_or_after.any():
+                expected[np.argmax(at_or_after)] += 1
+
+        assert buffer.counts_per_candle(times).tolist() == expected.tolist()
+
+    def test_counts_per_candle_without_times(self):
+        """Test no times give a zero count for every candle."""
+        assert _hourly_buffer(3).counts_per_candle([]).tolist() == [0, 0, 0]
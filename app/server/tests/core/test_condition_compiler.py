@@ -0,0 +1,304 @@
+"""
+Tests for Condition Compiler
+============================
+Unit tests for compiling strategy conditions, groups and time filters into
+vectorized signal masks.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from core.candle_buffer import CandleBuffer, to_epoch_seconds
+from core.condition_compiler import GroupNode, compile_strategy
+
+
+def _buffer(closes, start=datetime(2025, 1, 6), step_minutes=60) -> CandleBuffer:
+    """Create a buffer with the given closes; open is the previous close."""
+    closes = np.asarray(closes, dtype=np.float64)
+    opens = np.concatenate([[closes[0]], closes[:-1]])
+    return CandleBuffer.from_arrays(
+        time=to_epoch_seconds(start) + np.arange(len(closes)) * step_minutes * 60,
+        open=opens,
+        high=np.maximum(opens, closes),
+        low=np.minimum(opens, closes),
+        close=closes,
+    )
+
+
+def _condition(condition_id, section, left, operator, right=None):
+    return {
+        "id": condition_id,
+        "section": section,
+        "left_operand": left,
+        "operator": operator,
+        "right_operand": right,
+    }
+
+
+CLOSE = {"type": "price", "value": "close"}
+
+
+def _value(v):
+    return {"type": "value", "value": v}
+
+
+class TestOperators:
+    """Test cases for comparison operators."""
+
+    def test_threshold_operators(self):
+        """Test is_above / is_below / equals against a constant."""
+        candles = _buffer([1.0, 2.0, 3.0])
+        plan = compile_strategy(
+            {
+                "conditions": [
+                    _condition("a", "long_entry", CLOSE, "is_above", _value(1.5)),
+                    _condition("b", "long_exit", CLOSE, "is_below", _value(1.5)),
+                    _condition("c", "short_entry", CLOSE, "equals", _value(2.0)),
+                ]
+            }
+        )
+
+        signals = plan.evaluate(candles)
+
+        assert signals["long_entry"].tolist() == [False, True, True]
+        assert signals["long_exit"].tolist() == [True, False, False]
+        assert signals["short_entry"].tolist() == [False, True, False]
+        assert signals["short_exit"].tolist() == [False, False, False]
+
+    def test_crosses_above_and_below(self):
+        """Test crossing operators never fire on the first candle."""
+        candles = _buffer([1.0, 2.0, 1.0, 2.0])
+        plan = compile_strategy(
+            {
+                "conditions": [
+                    _condition("a", "long_entry", CLOSE, "crosses_above", _value(1.5)),
+                    _condition("b", "short_entry", CLOSE, "crosses_below", _value(1.5)),
+                ]
+            }
+        )
+
+        signals = plan.evaluate(candles)
+
+        assert signals["long_entry"].tolist() == [False, True, False, True]
+        assert signals["short_entry"].tolist() == [False, False, True, False]
+
+    def test_is_between(self):
+        """Test is_between with an explicit max operand."""
+        candles = _buffer([1.0, 2.0, 3.0])
+        condition = _condition("a", "long_entry", CLOSE, "is_between", _value(1.5))
+        condition["right_operand_max"] = _value(2.5)
+
+        signals = compile_strategy({"conditions": [condition]}).evaluate(candles)
+
+        assert signals["long_entry"].tolist() == [False, True, False]
+
+    def test_indicator_operand_with_component(self):
+        """Test indicator operands resolve by instance ID and component."""
+        candles = _buffer([1.0, 2.0, 3.0])
+        plan = compile_strategy(
+            {
+                "indicators": [{"id": "macd", "instance_id": "macd-1", "params": {}}],
+                "conditions": [
+                    _condition(
+                        "a",
+                        "long_entry",
+                        {"type": "indicator", "instanceId": "macd-1", "component": "MACD Line"},
+                        "is_above",
+                        {"type": "indicator", "instanceId": "macd-1", "component": "Signal"},
+                    )
+                ],
+            }
+        )
+        indicator_values = {
+            "macd-1": {
+                "MACD Line": np.array([0.1, 0.3, np.nan]),
+                "Signal": np.array([0.2, 0.2, 0.2]),
+            }
+        }
+
+        signals = plan.evaluate(candles, indicator_values)
+
+        assert plan.required_indicators == {"macd-1": ("macd", {})}
+        assert signals["long_entry"].tolist() == [False, True, False]
+
+    def test_missing_indicator_never_signals(self):
+        """Test that conditions on unavailable indicators evaluate to False."""
+        candles = _buffer([1.0, 2.0])
+        plan = compile_strategy(
+            {
+                "conditions": [
+                    _condition(
+                        "a",
+                        "long_entry",
+                        {"type": "indicator", "instanceId": "sma-1"},
+                        "is_above",
+                        _value(0),
+                    )
+                ]
+            }
+        )
+
+        assert not plan.evaluate(candles)["long_entry"].any()
+        assert plan.missing == ["indicator:sma-1"]
+
+    def test_missing_pattern_is_reported(self):
+        """Test that pattern conditions without detections are reported as missing."""
+        candles = _buffer([1.0, 2.0])
+        plan = compile_strategy(
+            {
+                "conditions": [
+                    _condition(
+                        "a",
+                        "long_entry",
+                        {"type": "pattern", "instanceId": "hammer-1"},
+                        "is_detected",
+                    )
+                ]
+            }
+        )
+
+        assert not plan.evaluate(candles)["long_entry"].any()
+        assert plan.missing == ["pattern:hammer-1"]
+
+        detections = {"hammer-1": np.array([False, True])}
+        assert plan.evaluate(candles, pattern_values=detections)["long_entry"].tolist() == [
+            False,
+            True,
+        ]
+        assert plan.missing == []
+
+
+class TestGroups:
+    """Test cases for AND/OR groups and nesting."""
+
+    def test_nested_groups(self):
+        """Test (A OR (B AND C)) using parent_group_id nesting."""
+        candles = _buffer([1.0, 2.0, 3.0, 4.0])
+        conditions = [
+            _condition("A", "long_entry", CLOSE, "equals", _value(1.0)),
+            _condition("B", "long_entry", CLOSE, "is_above", _value(2.5)),
+            _condition("C", "long_entry", CLOSE, "is_below", _value(3.5)),
+        ]
+        groups = [
+            {"id": "outer", "operator": "OR", "section": "long_entry", "condition_ids": ["A"]},
+            {
+                "id": "inner",
+                "operator": "AND",
+                "section": "long_entry",
+                "condition_ids": ["B", "C"],
+                "parent_group_id": "outer",
+            },
+        ]
+
+        plan = compile_strategy({"conditions": conditions, "groups": groups})
+        signals = plan.evaluate(candles)
+
+        assert len(plan.sections["long_entry"]) == 1
+        assert isinstance(plan.sections["long_entry"][0], GroupNode)
+        assert signals["long_entry"].tolist() == [True, False, True, False]
+
+    def test_ungrouped_conditions_are_anded_with_groups(self):
+        """Test that top-level groups and ungrouped conditions are combined with AND."""
+        candles = _buffer([1.0, 2.0, 3.0])
+        conditions = [
+            _condition("A", "long_entry", CLOSE, "is_above", _value(1.5)),
+            _condition("B", "long_entry", CLOSE, "equals", _value(1.0)),
+            _condition("C", "long_entry", CLOSE, "is_below", _value(2.5)),
+        ]
+        groups = [
+            {"id": "g", "operator": "OR", "section": "long_entry", "condition_ids": ["A", "B"]}
+        ]
+
+        signals = compile_strategy({"conditions": conditions, "groups": groups}).evaluate(candles)
+
+        assert signals["long_entry"].tolist() == [True, True, False]
+
+    def test_empty_section_never_signals(self):
+        """Test that sections without conditions produce no signals."""
+        signals = compile_strategy({"conditions": []}).evaluate(_buffer([1.0, 2.0]))
+
+        assert all(not mask.any() for mask in signals.values())
+
+
+class TestStrategyOptions:
+    """Test cases for trade direction, legacy formats and time filters."""
+
+    def test_trade_direction_disables_sections(self):
+        """Test that trade_direction 'long' disables short sections."""
+        plan = compile_strategy(
+            {
+                "trade_direction": "long",
+                "conditions": [_condition("a", "short_entry", CLOSE, "is_above", _value(0))],
+            }
+        )
+
+        assert not plan.evaluate(_buffer([1.0, 2.0]))["short_entry"].any()
+
+    def test_legacy_sections_and_dict_format(self):
+        """Test legacy 'entry' sections and dict-format conditions compile."""
+        legacy_list = compile_strategy(
+            {"conditions": [_condition("a", "entry", CLOSE, "is_above", _value(0))]}
+        )
+        legacy_dict = compile_strategy(
+            {
+                "conditions": {
+                    "long_entry": [{"type": "indicator", "config": {}}],
+                    "short_entry": [
+                        {"left_operand": CLOSE, "operator": "is_above", "right_operand": _value(0)}
+                    ],
+                }
+            }
+        )
+
+        assert legacy_list.has_section("long_entry")
+        assert not legacy_dict.has_section("long_entry")
+        assert legacy_dict.skipped_conditions == ["long_entry-0"]
+        assert legacy_dict.has_section("short_entry")
+
+    def test_time_filter_window_and_days(self):
+        """Test time filter gates entries by hour window and day of week."""
+        # 2025-01-06 is a Monday (JavaScript day index 1); 48 hourly candles
+        candles = _buffer(np.full(48, 2.0))
+        plan = compile_strategy(
+            {
+                "conditions": [
+                    _condition("a", "long_entry", CLOSE, "is_above", _value(0)),
+                    _condition("b", "long_exit", CLOSE, "is_above", _value(0)),
+                ],
+                "time_filter": {
+                    "enabled": True,
+                    "start_hour": 8,
+                    "start_minute": 0,
+                    "end_hour": 12,
+                    "end_minute": 0,
+                    "days_of_week": [1],
+                    "timezone": "UTC",
+                },
+            }
+        )
+
+        signals = plan.evaluate(candles)
+
+        assert np.flatnonzero(signals["long_entry"]).tolist() == [8, 9, 10, 11]
+        # Exits are not gated by the time filter
+        assert signals["long_exit"].all()
+
+    def test_time_filter_overnight_exclude(self):
+        """Test overnight windows in exclude mode."""
+        candles = _buffer(np.full(24, 2.0))
+        plan = compile_strategy(
+            {
+                "conditions": [_condition("a", "long_entry", CLOSE, "is_above", _value(0))],
+                "time_filter": {
+                    "enabled": True,
+                    "mode": "exclude",
+                    "start_hour": 22,
+                    "end_hour": 2,
+                },
+            }
+        )
+
+        entries = plan.evaluate(candles)["long_entry"]
+
+        assert np.flatnonzero(~entries).tolist() == [0, 1, 22, 23]
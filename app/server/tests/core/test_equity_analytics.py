@@ -0,0 +1,109 @@
+"""
+Tests for Equity Analytics
+==========================
+Unit tests for the vectorized equity curve analytics behind backtest results.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.equity_analytics import EquityAnalytics, epoch_times, sharpe_ratio, sortino_ratio
+from core.metric_accumulators import EquityTracker, ReturnMoments
+
+START = datetime(2025, 1, 1)
+
+
+def _assert_matches_tracker(analytics: EquityAnalytics, tracker: EquityTracker):
+    """The scalars the live progress reports must agree with the final results."""
+    assert analytics.max_drawdown == tracker.max_drawdown
+    assert analytics.max_drawdown_percent == tracker.max_drawdown_percent
+    assert analytics.current_drawdown_percent == tracker.current_drawdown_percent
+    assert analytics.sharpe_ratio() == pytest.approx(tracker.returns.sharpe_ratio())
+    assert analytics.sortino_ratio() == pytest.approx(tracker.returns.sortino_ratio())
+
+
+class TestEquityAnalytics:
+    """Test cases for EquityAnalytics."""
+
+    @pytest.mark.parametrize(
+        "curve",
+        [
+            [100, 90, 95, 100, 80, 120, 110],
+            [100, 99.995, 100, 50, 60],
+            [100, 100, 100],
+            [0, -10, 5, 3],
+            [100],
+        ],
+    )
+    def test_scalars_match_live_tracker(self, curve):
+        _assert_matches_tracker(EquityAnalytics(curve), EquityTracker.from_values(curve))
+
+    def test_random_walk_matches_live_tracker(self):
+        rng = np.random.default_rng(0)
+        curve = np.round(10000 + np.cumsum(rng.normal(0, 25, 5000)), 2).tolist()
+
+        _assert_matches_tracker(EquityAnalytics(curve), EquityTracker.from_values(curve))
+
+    def test_drawdown_periods_and_durations(self):
+        """Test closed and open drawdown periods with their depth and duration."""
+        hours = [0, 1, 2, 3, 5, 6]
+        analytics = EquityAnalytics.from_dates(
+            [100, 90, 100, 120, 108, 110], [START + timedelta(hours=h) for h in hours]
+        )
+
+        assert analytics.drawdown_periods() == [
+            {"start_index": 0, "end_index": 1, "max_drawdown_pct": 10.0},
+            {"start_index": 3, "end_index": 5, "max_drawdown_pct": 10.0},
+        ]
+        durations = analytics.drawdown_durations()
+        assert [d["duration_minutes"] for d in durations["drawdown_durations"]] == [120.0, 180.0]
+        assert durations["max_drawdown_duration_minutes"] == 180.0
+
+    def test_untimed_durations(self):
+        """Test durations count 60 minutes per point when times are missing."""
+        durations = EquityAnalytics([100, 95, 97, 101]).drawdown_durations()
+
+        assert durations["drawdown_durations"] == [
+            {"start_index": 0, "end_index": 3, "duration_minutes": 180}
+        ]
+
+    def test_summary(self):
+        summary = EquityAnalytics([100, 120, 90, 130, 117]).summary()
+
+        assert summary["max_drawdown_dollars"] == 30.0
+        assert summary["max_drawdown_percent"] == 25.0
+        assert summary["current_drawdown_percent"] == 10.0
+        assert [period["start_index"] for period in summary["drawdown_periods"]] == [1, 3]
+        assert summary["max_drawdown_duration_minutes"] == 2 * 60
+        assert summary["sharpe_ratio"] is not None
+
+    def test_empty_curve(self):
+        summary = EquityAnalytics([]).summary()
+
+        assert summary["max_drawdown_dollars"] == 0.0
+        assert summary["drawdown_periods"] == []
+        assert summary["avg_drawdown_duration_minutes"] is None
+
+
+class TestFunctions:
+    """Test cases for the module-level functions."""
+
+    def test_ratios_match_return_moments(self):
+        returns = np.random.default_rng(1).normal(0.05, 1, 1000)
+        moments = ReturnMoments()
+        for value in returns.tolist():
+            moments.add(value)
+
+        assert sharpe_ratio(returns) == pytest.approx(moments.sharpe_ratio())
+        assert sortino_ratio(returns) == pytest.approx(moments.sortino_ratio())
+        assert sharpe_ratio([0.5, 0.5]) is None
+        assert sortino_ratio([0.5, 0.3]) is None
+
+    def test_epoch_times(self):
+        """Test naive, timezone-aware and invalid dates."""
+        times = epoch_times(["2025-01-01T00:00:00", "2025-01-01T01:00:00Z", None, "bad"])
+
+        assert times[:2].tolist() == [1735689600.0, 1735693200.0]
+        assert np.isnan(times[2:]).all()
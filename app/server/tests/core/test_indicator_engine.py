@@ -0,0 +1,289 @@
+"""
+Tests for Indicator Engine
+==========================
+Unit tests for the vectorized indicator catalogue, the shared indicator
+cache and the indicator endpoint.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from core.candle_buffer import CandleBuffer
+from core.indicator_engine import (
+    INDICATORS,
+    IndicatorCache,
+    calculate_indicator,
+    data_version,
+    normalize_params,
+)
+
+
+def _buffer(closes, highs=None, lows=None, volumes=None) -> CandleBuffer:
+    closes = np.asarray(closes, dtype=np.float64)
+    return CandleBuffer.from_arrays(
+        time=np.arange(len(closes)) * 3600,
+        open=closes,
+        high=closes if highs is None else highs,
+        low=closes if lows is None else lows,
+        close=closes,
+        volume=volumes,
+    )
+
+
+def _values(array):
+    return [None if np.isnan(v) else round(float(v), 6) for v in array]
+
+
+class TestIndicators:
+    """Test cases for indicator formulas (mirroring indicatorCalculations.js)."""
+
+    def test_sma_and_ema(self):
+        """Test SMA warm-up and SMA-seeded EMA."""
+        candles = _buffer([1.0, 2.0, 3.0, 4.0, 5.0])
+
+        assert _values(calculate_indicator(candles, "sma", {"period": 3})[None]) == [
+            None, None, 2.0, 3.0, 4.0,
+        ]
+        # Seed 2.0, multiplier 0.5: 2 -> 3 -> 4
+        assert _values(calculate_indicator(candles, "ema", {"period": 3})[None]) == [
+            None, None, 2.0, 3.0, 4.0,
+        ]
+
+    def test_rsi(self):
+        """Test RSI starts at index ``period`` and is 100 without losses."""
+        rising = calculate_indicator(_buffer([1.0, 2.0, 3.0, 4.0]), "rsi", {"period": 2})[None]
+        mixed = calculate_indicator(_buffer([1.0, 2.0, 1.0, 2.0]), "rsi", {"period": 2})[None]
+
+        assert _values(rising) == [None, None, 100.0, 100.0]
+        # Gains [1, 0, 1], losses [0, 1, 0]: 50, then avg gain 0.75 / avg loss 0.25 -> 75
+        assert _values(mixed) == [None, None, 50.0, 75.0]
+        assert np.isnan(calculate_indicator(_buffer([1.0, 2.0]), "rsi", {"period": 2})[None]).all()
+
+    def test_macd_components(self):
+        """Test MACD returns the client component names and a consistent histogram."""
+        candles = _buffer(1.1 + np.sin(np.arange(80) / 5) / 100)
+
+        series = calculate_indicator(candles, "macd")
+        line, signal = series["MACD Line"], series["Signal Line"]
+
+        assert list(series) == ["MACD Line", "Signal Line", "Histogram"]
+        assert np.isnan(line[:25]).all() and not np.isnan(line[25:]).any()
+        # Signal is an EMA over the defined MACD values only
+        assert np.isnan(signal[:33]).all() and not np.isnan(signal[33:]).any()
+        np.testing.assert_allclose(series["Histogram"][33:], line[33:] - signal[33:])
+
+    def test_bollinger_bands_use_population_std(self):
+        """Test Bollinger Bands use the population standard deviation."""
+        series = calculate_indicator(
+            _buffer([1.0, 3.0, 1.0, 3.0]), "bollinger_bands", {"period": 2, "stdDev": 2}
+        )
+
+        assert _values(series["Middle Band"]) == [None, 2.0, 2.0, 2.0]
+        assert _values(series["Upper Band"]) == [None, 4.0, 4.0, 4.0]
+        assert _values(series["Lower Band"]) == [None, 0.0, 0.0, 0.0]
+
+    def test_atr_uses_previous_close(self):
+        """Test true range includes gaps from the previous close."""
+        candles = _buffer(
+            [1.0, 2.0, 2.0], highs=np.array([1.5, 2.5, 2.5]), lows=np.array([0.5, 1.5, 1.5])
+        )
+
+        # TR = [1, 1.5, 1]; first ATR = 1.25, then (1.25 + 1) / 2
+        assert _values(calculate_indicator(candles, "atr", {"period": 2})[None]) == [
+            None, 1.25, 1.125,
+        ]
+
+    def test_flat_range_defaults(self):
+        """Test stochastic, Williams %R and CCI defaults when prices do not move."""
+        candles = _buffer(np.full(5, 1.2))
+
+        stochastic = calculate_indicator(candles, "stochastic", {"kPeriod": 2, "dPeriod": 2})
+        williams = calculate_indicator(candles, "williams_r", {"period": 2})[None]
+        cci = calculate_indicator(candles, "cci", {"period": 2})[None]
+
+        assert _values(stochastic["%K"]) == [None, 50.0, 50.0, 50.0, 50.0]
+        # %D averages warm-up %K as 0, like the client
+        assert _values(stochastic["%D"]) == [None, 25.0, 50.0, 50.0, 50.0]
+        assert _values(williams) == [None, -50.0, -50.0, -50.0, -50.0]
+        assert _values(cci) == [None, 0.0, 0.0, 0.0, 0.0]
+
+    def test_obv_with_and_without_volume(self):
+        """Test OBV accumulates volume by close direction, with a range proxy fallback."""
+        closes = [1.0, 2.0, 1.5, 1.5]
+        with_volume = _buffer(closes, volumes=np.array([10.0, 5.0, 3.0, 7.0]))
+        without_volume = _buffer(
+            closes, highs=np.array(closes) + 0.5e-6, lows=np.array(closes) - 0.5e-6
+        )
+
+        assert _values(calculate_indicator(with_volume, "obv")[None]) == [10.0, 15.0, 12.0, 12.0]
+        assert _values(calculate_indicator(without_volume, "obv")[None]) == [1.0, 2.0, 1.0, 1.0]
+
+    def test_adx_warm_up(self):
+        """Test ADX starts at 2 * period - 1 and DI lines at period - 1."""
+        closes = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 0.001, 40))
+        series = calculate_indicator(
+            _buffer(closes, highs=closes + 0.0005, lows=closes - 0.0005), "adx", {"period": 5}
+        )
+
+        assert np.isnan(series["+DI"][:4]).all() and not np.isnan(series["+DI"][4:]).any()
+        assert np.isnan(series["ADX"][:9]).all() and not np.isnan(series["ADX"][9:]).any()
+        assert ((series["ADX"][9:] >= 0) & (series["ADX"][9:] <= 100)).all()
+
+    def test_volume_profile_is_causal(self):
+        """Test volume profile only uses volume traded up to each candle."""
+        candles = _buffer([1.0, 2.0, 1.0, 2.0], volumes=np.array([1.0, 1.0, 2.0, 4.0]))
+
+        values = calculate_indicator(candles, "volume_profile", {"bins": 2})[None]
+
+        assert _values(values) == [100.0, 50.0, 75.0, 62.5]
+
+    def test_every_catalogue_indicator_handles_short_input(self):
+        """Test all indicators return full-length series for empty and short buffers."""
+        for indicator_id, spec in INDICATORS.items():
+            for n in (0, 3):
+                series = calculate_indicator(_buffer(np.linspace(1, 2, n)), indicator_id)
+                assert set(series) == set(spec.components or [None])
+                assert all(len(values) == n for values in series.values())
+
+
+class TestParams:
+    """Test cases for parameter normalization."""
+
+    def test_defaults_and_coercion(self):
+        """Test defaults are filled in, strings coerced and unknown keys dropped."""
+        params = normalize_params("macd", {"fastPeriod": "5", "color": "#fff"})
+
+        assert params == {"fastPeriod": 5, "slowPeriod": 26, "signalPeriod": 9}
+        assert normalize_params("bollinger_bands", {"stdDev": "2.5"})["stdDev"] == 2.5
+
+    def test_invalid_params(self):
+        """Test unknown indicators and invalid parameters raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown indicator"):
+            normalize_params("ichimoku")
+        with pytest.raises(ValueError):
+            normalize_params("sma", {"period": 0})
+        with pytest.raises(ValueError):
+            normalize_params("sma", {"period": 2.5})
+
+
+class TestIndicatorCache:
+    """Test cases for the shared indicator cache."""
+
+    def test_hits_on_same_key(self):
+        """Test equivalent parameters share one cached, read-only computation."""
+        cache = IndicatorCache()
+        candles = _buffer(np.linspace(1, 2, 30))
+
+        first = cache.get_or_calculate(candles, "sma", {"period": 5}, pair="EUR_USD")
+        second = cache.get_or_calculate(candles, "sma", {"period": "5"}, pair="EUR_USD")
+
+        assert first is second
+        assert not first[None].flags.writeable
+        stats = cache.stats()
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["bytes"] == first[None].nbytes
+
+    def test_key_includes_data_version_and_pair(self):
+        """Test changed candles, pairs or explicit versions miss the cache."""
+        cache = IndicatorCache()
+        candles = _buffer(np.linspace(1, 2, 30))
+        changed = _buffer(np.linspace(1, 3, 30))
+
+        cache.get_or_calculate(candles, "sma")
+        cache.get_or_calculate(changed, "sma")
+        cache.get_or_calculate(candles, "sma", pair="GBP_USD")
+        cache.get_or_calculate(candles, "sma", version="v1")
+
+        assert cache.stats()["misses"] == 4
+
+    def test_data_version_covers_open_prices(self):
+        """Test candles differing only in their opens get different data versions."""
+        candles = _buffer(np.linspace(1, 2, 30))
+        shifted_opens = CandleBuffer.from_arrays(
+            time=candles.time,
+            open=candles.open + 0.1,
+            high=candles.high,
+            low=candles.low,
+            close=candles.close,
+        )
+
+        assert data_version(candles) != data_version(shifted_opens)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = IndicatorCache(max_entries=2)
+        candles = _buffer(np.linspace(1, 2, 30))
+
+        cache.get_or_calculate(candles, "sma", {"period": 2})
+        cache.get_or_calculate(candles, "sma", {"period": 3})
+        cache.get_or_calculate(candles, "sma", {"period": 2})
+        cache.get_or_calculate(candles, "sma", {"period": 4})
+        cache.get_or_calculate(candles, "sma", {"period": 2})
+
+        stats = cache.stats()
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 2, 3)
+        assert stats["evictions"] == 1
+
+    def test_byte_limit_eviction(self):
+        """Test entries are evicted once the cached series exceed the byte limit."""
+        candles = _buffer(np.linspace(1, 2, 30))
+        series_bytes = candles.close.nbytes
+        cache = IndicatorCache(max_bytes=series_bytes * 2)
+
+        cache.get_or_calculate(candles, "sma", {"period": 2})
+        cache.get_or_calculate(candles, "sma", {"period": 3})
+        cache.get_or_calculate(candles, "sma", {"period": 4})
+        macd = cache.get_or_calculate(candles, "macd")
+
+        assert len(macd) > 2
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] == series_bytes * 2
+
+
+class TestIndicatorEndpoint:
+    """Test cases for GET /api/indicators/{pair}/{granularity}/{count}/{indicator_id}."""
+
+    PRICES = {
+        "time": ["25-01-06 00:00", "25-01-06 01:00", "25-01-06 02:00"],
+        "mid_o": [1.0, 1.0, 2.0],
+        "mid_h": [1.0, 2.0, 3.0],
+        "mid_l": [1.0, 1.0, 2.0],
+        "mid_c": [1.0, 2.0, 3.0],
+    }
+
+    @pytest.fixture
+    def client(self):
+        from server import app
+
+        return TestClient(app)
+
+    def test_returns_series_with_query_params(self, client):
+        """Test the endpoint calculates over the price data with query parameters."""
+        with patch("server.api.web_api_candles", return_value=self.PRICES):
+            response = client.get("/api/indicators/EUR_USD/H1/3/sma?period=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["params"] == {"period": 2}
+        assert data["time"] == self.PRICES["time"]
+        assert data["values"] == {"value": [None, 1.5, 2.5]}
+
+    def test_multi_component_indicator(self, client):
+        """Test multi-component indicators are keyed by component name."""
+        with patch("server.api.web_api_candles", return_value=self.PRICES):
+            response = client.get("/api/indicators/EUR_USD/H1/3/stochastic?kPeriod=2&dPeriod=2")
+
+        assert response.status_code == 200
+        assert set(response.json()["values"]) == {"%K", "%D"}
+
+    def test_invalid_indicator_returns_400(self, client):
+        """Test unknown indicators and invalid parameters are rejected."""
+        with patch("server.api.web_api_candles", return_value=self.PRICES):
+            unknown = client.get("/api/indicators/EUR_USD/H1/3/ichimoku")
+            invalid = client.get("/api/indicators/EUR_USD/H1/3/sma?period=-1")
+
+        assert unknown.status_code == 400
+        assert invalid.status_code == 400
@@ -0,0 +1,108 @@
+"""
+Tests for Metric Accumulators
+=============================
+Unit tests for the incremental metrics behind live backtest progress.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.metric_accumulators import EquityTracker, MetricAccumulator, ReturnMoments
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+def _trades(pnl, hours_apart=5, holding_hours=2):
+    """Trades entering every few hours, each held for a fixed time."""
+    trades = []
+    for i, value in enumerate(pnl):
+        entry = START + timedelta(hours=i * hours_apart)
+        trades.append(
+            {
+                "type": "long",
+                "entry_time": entry.isoformat(),
+                "exit_time": (entry + timedelta(hours=holding_hours)).isoformat(),
+                "pnl": value,
+            }
+        )
+    return trades
+
+
+class TestReturnMoments:
+    """Test cases for the Welford return moments."""
+
+    def test_matches_two_pass_statistics(self):
+        """Test Sharpe and Sortino match the population mean and deviation."""
+        returns = np.random.default_rng(1).normal(0.1, 1.0, 500)
+        moments = ReturnMoments()
+        for value in returns:
+            moments.add(float(value))
+
+        downside = np.sqrt(np.sum(returns[returns < 0] ** 2) / len(returns))
+        assert moments.mean == pytest.approx(returns.mean())
+        assert moments.sharpe_ratio() == round(returns.mean() / returns.std() * np.sqrt(252), 2)
+        assert moments.sortino_ratio() == round(returns.mean() / downside * np.sqrt(252), 2)
+
+    def test_undefined_ratios(self):
+        """Test too few returns, no variance and no losses give None."""
+        moments = ReturnMoments()
+        moments.add(1.0)
+        assert moments.sharpe_ratio() is None
+
+        moments.add(1.0)
+        assert moments.sharpe_ratio() is None
+        assert moments.sortino_ratio() is None
+
+
+class TestEquityTracker:
+    """Test cases for running drawdown state."""
+
+    def test_drawdowns(self):
+        tracker = EquityTracker.from_values([100, 90, 100, 120, 108, 110])
+
+        assert tracker.peak == 120
+        assert tracker.max_drawdown == 12
+        assert tracker.max_drawdown_percent == pytest.approx(10.0)
+        assert tracker.current_drawdown_percent == pytest.approx(100 * 10 / 120)
+
+    def test_recovery_clears_the_current_drawdown(self):
+        tracker = EquityTracker.from_values([100, 95, 101])
+
+        assert tracker.current_drawdown_percent == 0.0
+        assert tracker.max_drawdown == 5
+
+
+class TestMetricAccumulator:
+    """Test cases for the live accumulator."""
+
+    PNL = [120.0, -40.0, -60.0, 200.0, 0.0, -15.0, 80.0, -110.0, 45.0, 30.0]
+
+    def test_summary(self):
+        """Test the scalar metrics of a trade list."""
+        accumulator = MetricAccumulator.from_trades(_trades(self.PNL), 10000.0)
+
+        summary = accumulator.summary()
+
+        assert summary["total_trades"] == 10
+        assert summary["winning_trades"] == 5
+        assert summary["losing_trades"] == 4
+        assert summary["win_rate"] == 50.0
+        assert summary["profit_factor"] == round(475 / 225, 2)
+        assert summary["largest_win"] == 200.0
+        assert summary["largest_loss"] == 110.0
+        assert summary["final_balance"] == 10250.0
+        assert summary["max_drawdown_dollars"] == 110.0
+
+    def test_live_summary_matches_prefix(self):
+        """Test the running summary equals a fresh accumulation of the same trades."""
+        trades = _trades(self.PNL)
+        live = MetricAccumulator(10000.0)
+        balance = 10000.0
+
+        for count, trade in enumerate(trades, start=1):
+            balance += trade["pnl"]
+            live.add_trade(trade, balance)
+            prefix = MetricAccumulator.from_trades(trades[:count], 10000.0)
+            assert live.summary() == prefix.summary()
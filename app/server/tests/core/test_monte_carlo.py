@@ -0,0 +1,107 @@
+"""
+Tests for Monte Carlo Engine
+============================
+Unit tests for the batched trade-resampling simulation.
+"""
+
+from itertools import product
+
+import numpy as np
+import pytest
+
+from core.monte_carlo import BAND_PERCENTILES, simulate_trade_paths
+
+PNL = [250.0, -180.0, 320.0, -400.0, 150.0, -90.0, 600.0, -350.0]
+
+
+def _exact_risk_of_ruin(pnl, initial_balance, ruin_balance):
+    """Enumerate every equally likely path of a short trade list."""
+    ruined = 0
+    paths = list(product(pnl, repeat=len(pnl)))
+    for path in paths:
+        balances = initial_balance + np.cumsum(path)
+        ruined += bool((balances <= ruin_balance).any())
+    return ruined / len(paths) * 100
+
+
+class TestSimulateTradePaths:
+    """Test cases for simulate_trade_paths."""
+
+    def test_matches_exact_probability(self):
+        """Test the estimate agrees with the enumerated ruin probability."""
+        pnl = [-1000.0, 1000.0, -1000.0, 500.0, 1500.0, -500.0]
+        expected = _exact_risk_of_ruin(pnl, 5000.0, 2500.0)
+
+        result = simulate_trade_paths(
+            pnl, 5000.0, max_simulations=50000, min_simulations=50000, seed=3
+        )
+
+        assert result.simulations == 50000
+        assert result.risk_of_ruin == pytest.approx(expected, abs=1.0)
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed gives the same result and another seed does not."""
+        first = simulate_trade_paths(PNL, 1000.0, seed=42)
+        second = simulate_trade_paths(PNL, 1000.0, seed=42)
+        other = simulate_trade_paths(PNL, 1000.0, seed=43)
+
+        assert first == second
+        assert other.bands != first.bands
+
+    def test_chunking_does_not_change_results(self):
+        """Test small chunks draw the same paths as one large chunk."""
+        whole = simulate_trade_paths(
+            PNL, 1000.0, min_simulations=5000, max_simulations=5000, seed=9
+        )
+        chunked = simulate_trade_paths(
+            PNL,
+            1000.0,
+            min_simulations=5000,
+            max_simulations=5000,
+            seed=9,
+            chunk_bytes=len(PNL) * 16 * 37,
+        )
+
+        assert chunked == whole
+
+    def test_stops_early_when_converged(self):
+        """Test a strategy that cannot be ruined stops after min_simulations."""
+        result = simulate_trade_paths(
+            [100.0, 50.0, 10.0], 1000.0, max_simulations=10000, min_simulations=500, seed=1
+        )
+
+        assert result.converged is True
+        assert result.simulations == 500
+        assert result.risk_of_ruin == 0.0
+
+    def test_runs_to_max_without_convergence(self):
+        """Test an unreachable tolerance runs every simulation."""
+        result = simulate_trade_paths(
+            PNL, 1000.0, max_simulations=2000, min_simulations=100, tolerance=0.0, seed=1
+        )
+
+        assert result.converged is False
+        assert result.simulations == 2000
+
+    def test_equity_bands(self):
+        """Test bands start at the initial balance and are ordered by percentile."""
+        pnl = np.random.default_rng(0).normal(5, 100, 250).tolist()
+
+        result = simulate_trade_paths(pnl, 10000.0, seed=5)
+
+        bands = result.bands
+        assert set(bands) == {"trade"} | {f"p{p}" for p in BAND_PERCENTILES}
+        assert bands["trade"][0] == 0 and bands["trade"][-1] == 250
+        assert len(bands["trade"]) == 101
+        for key in ("p5", "p50", "p95"):
+            assert len(bands[key]) == len(bands["trade"])
+            assert bands[key][0] == 10000.0
+        assert all(
+            low <= mid <= high
+            for low, mid, high in zip(bands["p5"], bands["p50"], bands["p95"])
+        )
+
+    def test_requires_trades(self):
+        """Test an empty trade list is rejected."""
+        with pytest.raises(ValueError, match="No trades"):
+            simulate_trade_paths([], 1000.0)
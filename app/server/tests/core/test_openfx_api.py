@@ -4,6 +4,7 @@ Tests for OpenFX API Client
 Unit tests for the OpenFX API client module.
 """
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -36,6 +37,16 @@ class TestOpenFxApi:
         # Verify time was updated
         assert api_client.last_req_time >= initial_time
 
+    @patch("core.openfx_api.requests.Session.delete")
+    def test_order_requests_use_the_trading_budget(self, mock_delete, api_client):
+        """Test the request verb picks the rate limit budget."""
+        mock_delete.return_value = MagicMock(status_code=200, json=lambda: {})
+
+        with patch("core.openfx_api.rate_limiter_for") as mock_limiter:
+            api_client.close_trade(1)
+
+        mock_limiter.assert_called_once_with("trade", "delete")
+
     @patch("core.openfx_api.requests.Session.get")
     def test_get_account_summary_success(self, mock_get, api_client):
         """Test successful account summary retrieval."""
@@ -92,6 +103,60 @@ class TestOpenFxApiCandles:
 
         assert result is None
 
+    def test_fetch_candles_requests_both_sides_concurrently(self, api_client):
+        """Test the bid and ask bars are fetched at the same time."""
+
+        def slow_request(url, params=None):
+            time.sleep(0.2)
+            return True, {"side": url.rsplit("/", 1)[-1], "count": params["count"]}
+
+        with patch.object(api_client, "_make_request", side_effect=slow_request):
+            started = time.monotonic()
+            ok, data = api_client.fetch_candles("EURUSD", count=-10, granularity="H1")
+            elapsed = time.monotonic() - started
+
+        assert ok
+        assert data == [{"side": "ask", "count": -9}, {"side": "bid", "count": -9}]
+        assert elapsed < 0.35
+
+    @patch("core.openfx_api.OpenFxApi._make_request")
+    def test_fetch_candles_fails_if_either_side_fails(self, mock_request, api_client):
+        mock_request.side_effect = lambda url, params=None: (url.endswith("bid"), {})
+
+        assert api_client.fetch_candles("EURUSD") == (False, None)
+
+    def test_side_fetch_uses_its_own_session(self, api_client):
+        """Test the bid and ask requests never share a requests.Session."""
+        sessions = {}
+
+        def request(url, params=None):
+            sessions[url.rsplit("/", 1)[-1]] = api_client.session
+            return True, {}
+
+        with patch.object(api_client, "_make_request", side_effect=request):
+            api_client.fetch_candles("EURUSD")
+
+        assert sessions["ask"] is not sessions["bid"]
+        assert sessions["bid"] is api_client.session
+
+    def test_close_stops_side_fetch_and_sessions(self, api_client):
+        """Test close shuts down the side fetch threads and closes every session."""
+        with patch.object(api_client, "_make_request", return_value=(True, {})):
+            api_client.fetch_candles("EURUSD")
+        pool = api_client._side_fetch_pool
+        session = api_client.session
+
+        with patch.object(session, "close") as close_session:
+            api_client.close()
+
+        close_session.assert_called_once()
+        assert pool._shutdown
+        assert api_client._side_fetch_pool is None
+        assert api_client.session is not session
+
+    def test_side_fetch_pool_created_on_first_fetch(self):
+        assert OpenFxApi()._side_fetch_pool is None
+
     @patch("core.openfx_api.OpenFxApi.get_candles_df")
     def test_last_complete_candle_returns_none_on_empty(self, mock_df, api_client):
         """Test that last_complete_candle returns None for empty data."""
@@ -0,0 +1,243 @@
+"""
+Tests for Parameter Sweep
+=========================
+Unit tests for grid expansion, combination overrides, the sweep runner and
+the sweep endpoint.
+"""
+
+from datetime import datetime
+from threading import Event
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from core.backtest_executor import BacktestExecution, BacktestExecutor
+from core.condition_compiler import compile_strategy
+from core.indicator_engine import indicator_cache
+from core.parameter_sweep import (
+    SUMMARY_METRICS,
+    apply_combination,
+    expand_grid,
+    summarize,
+    sweep_backtest,
+)
+
+BACKTEST = {
+    "id": "backtest-1",
+    "strategy_id": "strategy-1",
+    "pair": "EUR_USD",
+    "timeframe": "H1",
+    "start_date": "2025-01-01T00:00:00Z",
+    "end_date": "2025-03-01T00:00:00Z",
+    "initial_balance": 10000.0,
+    "position_sizing": {"method": "percentage", "value": 2.0},
+    "risk_management": {"stop_loss": {"type": "fixed_pips", "value": 20}},
+    "engine": "vectorized",
+}
+
+STRATEGY = {
+    "id": "strategy-1",
+    "indicators": [{"id": "rsi", "instance_id": "rsi-1", "params": {"period": 14}}],
+    "conditions": [
+        {
+            "id": "entry",
+            "section": "long_entry",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_below",
+            "right_operand": {"type": "value", "value": 40},
+        },
+        {
+            "id": "exit",
+            "section": "long_exit",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_above",
+            "right_operand": {"type": "value", "value": 60},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def executor():
+    """Executor whose simulated candles are the same on every load."""
+    BacktestExecutor._instance = None
+    instance = BacktestExecutor()
+    candles = instance._generate_simulated_candles(
+        datetime(2025, 1, 1), datetime(2025, 3, 1), "H1", rng=np.random.default_rng(7)
+    )
+    indicator_cache.clear()
+    with patch.object(instance, "_generate_simulated_candles", return_value=candles):
+        yield instance
+    indicator_cache.clear()
+    BacktestExecutor._instance = None
+
+
+class TestGrid:
+    """Test cases for grid expansion and combination overrides."""
+
+    def test_expand_grid(self):
+        """Test every combination is produced in grid order."""
+        grid = expand_grid(
+            {"position_sizing.value": [1, 2], "risk_management.stop_loss.value": [10, 20]}
+        )
+
+        assert grid == [
+            {"position_sizing.value": 1, "risk_management.stop_loss.value": 10},
+            {"position_sizing.value": 1, "risk_management.stop_loss.value": 20},
+            {"position_sizing.value": 2, "risk_management.stop_loss.value": 10},
+            {"position_sizing.value": 2, "risk_management.stop_loss.value": 20},
+        ]
+
+    def test_invalid_grids(self):
+        """Test unknown paths, empty value lists and oversized grids are rejected."""
+        with pytest.raises(ValueError, match="Invalid sweep parameter"):
+            expand_grid({"strategy.name": [1]})
+        with pytest.raises(ValueError, match="Invalid sweep parameter"):
+            expand_grid({"indicators.rsi-1": [1]})
+        with pytest.raises(ValueError, match="non-empty"):
+            expand_grid({"position_sizing.value": []})
+        with patch("core.parameter_sweep.settings.SWEEP_MAX_COMBINATIONS", 3):
+            with pytest.raises(ValueError, match="4 combinations"):
+                expand_grid(
+                    {"position_sizing.value": [1, 2], "position_sizing.method": ["a", "b"]}
+                )
+
+    def test_apply_combination_copies(self):
+        """Test overrides land on copies of the backtest and strategy rows."""
+        backtest, strategy = apply_combination(
+            BACKTEST,
+            STRATEGY,
+            {"indicators.rsi-1.period": 7, "risk_management.take_profit.value": 30},
+        )
+
+        assert strategy["indicators"][0]["params"] == {"period": 7}
+        assert backtest["risk_management"]["take_profit"] == {"value": 30}
+        assert backtest["risk_management"]["stop_loss"]["value"] == 20
+        assert STRATEGY["indicators"][0]["params"] == {"period": 14}
+        assert "take_profit" not in BACKTEST["risk_management"]
+
+        with pytest.raises(ValueError, match="no indicator instance"):
+            apply_combination(BACKTEST, STRATEGY, {"indicators.macd-1.fastPeriod": 5})
+
+
+class TestSweep:
+    """Test cases for running a sweep over one candle buffer."""
+
+    PARAMETERS = {
+        "indicators.rsi-1.period": [7, 14],
+        "risk_management.stop_loss.value": [10, 20, 40],
+    }
+
+    def test_table_shape_and_sharing(self, executor):
+        """Test one row per combination and one signal evaluation per indicator set."""
+        result = sweep_backtest(BACKTEST, STRATEGY, self.PARAMETERS, executor=executor)
+
+        assert result["columns"] == list(self.PARAMETERS) + list(SUMMARY_METRICS)
+        assert result["combinations"] == 6
+        assert result["signal_evaluations"] == 2
+        assert [row[:2] for row in result["rows"]] == [
+            [7, 10], [7, 20], [7, 40], [14, 10], [14, 20], [14, 40],
+        ]
+        assert all(len(row) == len(result["columns"]) for row in result["rows"])
+        # Each RSI period is calculated once for the whole sweep
+        assert indicator_cache.stats()["misses"] == 2
+
+    def test_rows_match_single_runs(self, executor):
+        """Test each row matches a standalone run of the same configuration."""
+        result = sweep_backtest(BACKTEST, STRATEGY, self.PARAMETERS, executor=executor)
+        candles = executor._generate_simulated_candles(None, None, "H1")
+
+        for row in result["rows"]:
+            combination = dict(zip(self.PARAMETERS, row))
+            backtest, strategy = apply_combination(BACKTEST, STRATEGY, combination)
+            plan = compile_strategy(strategy)
+            signals = plan.evaluate(
+                candles, executor._calculate_indicator_values(plan, candles, "EUR_USD", "H1")
+            )
+            execution = BacktestExecution(backtest_id="x", thread=None, cancel_event=Event())
+            trades, balance, curve = executor._run_vectorized_engine(
+                None,
+                execution,
+                execution.cancel_event,
+                candles,
+                signals,
+                10000.0,
+                backtest["position_sizing"],
+                backtest["risk_management"],
+            )
+            summary = executor._calculate_results(trades, 10000.0, balance, curve)
+
+            metrics = dict(zip(result["columns"], row))
+            assert metrics["total_trades"] > 0
+            assert {metric: metrics[metric] for metric in SUMMARY_METRICS} == {
+                metric: summary[metric] for metric in SUMMARY_METRICS
+            }
+
+    def test_summary_skips_full_results(self, executor):
+        """Test summaries skip Monte Carlo and match full results, also without trades."""
+        trades = [
+            {"pnl": 120.0, "entry_time": "2025-01-02T00:00:00", "exit_time": "2025-01-02T05:00:00"},
+            {"pnl": -45.5, "entry_time": "2025-01-03T00:00:00", "exit_time": "2025-01-03T02:00:00"},
+            {"pnl": 30.25, "entry_time": "2025-01-04T00:00:00", "exit_time": "2025-01-04T01:00:00"},
+        ]
+
+        with patch.object(
+            executor, "_calculate_monte_carlo", wraps=executor._calculate_monte_carlo
+        ) as monte_carlo:
+            for run in (trades, []):
+                balance = 10000.0 + sum(trade["pnl"] for trade in run)
+                summary = summarize(run, 10000.0, balance, [])
+                results = executor._calculate_results(run, 10000.0, balance, [])
+                assert summary == {metric: results[metric] for metric in SUMMARY_METRICS}
+        assert monte_carlo.call_count == 1  # Only from the full results with trades
+
+    def test_unknown_engine(self, executor):
+        """Test an unknown engine is rejected before any work is done."""
+        with pytest.raises(ValueError, match="Unknown backtest engine"):
+            sweep_backtest(BACKTEST, STRATEGY, self.PARAMETERS, engine="gpu", executor=executor)
+
+
+class TestSweepEndpoint:
+    """Test cases for POST /api/backtests/{backtest_id}/sweep."""
+
+    @pytest.fixture
+    def client(self):
+        from server import app
+
+        return TestClient(app)
+
+    def test_returns_table(self, client):
+        """Test the endpoint returns the sweep table."""
+        result = {
+            "combinations": 2,
+            "signal_evaluations": 1,
+            "total_candles": 100,
+            "elapsed_seconds": 0.1,
+            "columns": ["position_sizing.value", "total_trades"],
+            "rows": [[1, 5], [2, 5]],
+        }
+        with patch("server.run_parameter_sweep", return_value=(True, result, None)) as mock_run:
+            response = client.post(
+                "/api/backtests/backtest-1/sweep",
+                json={"parameters": {"position_sizing.value": [1, 2]}},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["rows"] == [[1, 5], [2, 5]]
+        mock_run.assert_called_once_with("backtest-1", {"position_sizing.value": [1, 2]}, None)
+
+    def test_reports_errors(self, client):
+        """Test sweep errors are returned in the response body."""
+        with patch(
+            "server.run_parameter_sweep", return_value=(False, None, "Invalid sweep parameter")
+        ):
+            response = client.post(
+                "/api/backtests/backtest-1/sweep", json={"parameters": {"x": [1]}}
+            )
+
+        assert response.json()["success"] is False
+        assert response.json()["error"] == "Invalid sweep parameter"
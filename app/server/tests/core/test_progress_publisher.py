@@ -0,0 +1,115 @@
+"""
+Tests for Progress Publisher
+============================
+Unit tests for the coalescing background progress writer.
+"""
+
+import threading
+import time
+
+from core.progress_publisher import ProgressPublisher
+
+
+class _Recorder:
+    """Write callback recording every write, optionally slowed down."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.writes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, backtest_id, fields):
+        time.sleep(self.delay)
+        with self.lock:
+            self.writes.append((backtest_id, dict(fields)))
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class TestProgressPublisher:
+    """Test cases for ProgressPublisher."""
+
+    def test_coalesces_updates_within_interval(self):
+        """Test a burst of updates is written once with the latest values."""
+        recorder = _Recorder()
+        publisher = ProgressPublisher(recorder, min_interval=0.2)
+
+        publisher.publish("bt-1", {"candles_processed": 0})
+        assert _wait_for(lambda: len(recorder.writes) == 1)
+        for processed in range(100, 1100, 100):
+            publisher.publish("bt-1", {"candles_processed": processed})
+
+        assert _wait_for(lambda: len(recorder.writes) == 2)
+        assert recorder.writes[1] == ("bt-1", {"candles_processed": 1000})
+        stats = publisher.stats()
+        assert stats["published"] == 11
+        assert stats["written"] == 2
+        assert stats["saved"] == 9
+
+    def test_publish_does_not_wait_for_writes(self):
+        """Test publishing stays fast while the writer is slow."""
+        recorder = _Recorder(delay=0.3)
+        publisher = ProgressPublisher(recorder, min_interval=0.0)
+
+        started = time.monotonic()
+        for processed in range(50):
+            publisher.publish("bt-1", {"candles_processed": processed})
+
+        assert time.monotonic() - started < 0.1
+        publisher.flush("bt-1")
+        assert recorder.writes[-1] == ("bt-1", {"candles_processed": 49})
+
+    def test_flush_writes_final_state_in_order(self):
+        """Test flush writes the pending update before returning."""
+        recorder = _Recorder()
+        publisher = ProgressPublisher(recorder, min_interval=10.0)
+        publisher.publish("bt-1", {"progress_percentage": 10})
+        assert _wait_for(lambda: len(recorder.writes) == 1)
+
+        publisher.publish("bt-1", {"progress_percentage": 90})
+        publisher.publish("bt-1", {"progress_percentage": 100})
+        publisher.flush("bt-1")
+
+        assert recorder.writes == [
+            ("bt-1", {"progress_percentage": 10}),
+            ("bt-1", {"progress_percentage": 100}),
+        ]
+        assert publisher.stats()["pending"] == 0
+        # Nothing is left to write afterwards
+        time.sleep(0.05)
+        assert len(recorder.writes) == 2
+
+    def test_backtests_are_independent(self):
+        """Test the interval of one backtest does not delay another."""
+        recorder = _Recorder()
+        publisher = ProgressPublisher(recorder, min_interval=10.0)
+
+        publisher.publish("bt-1", {"candles_processed": 1})
+        publisher.publish("bt-2", {"candles_processed": 2})
+
+        assert _wait_for(lambda: len(recorder.writes) == 2)
+        assert sorted(recorder.writes) == [
+            ("bt-1", {"candles_processed": 1}),
+            ("bt-2", {"candles_processed": 2}),
+        ]
+
+    def test_write_errors_are_logged(self):
+        """Test a failing write does not stop later writes."""
+        calls = []
+
+        def failing_write(backtest_id, fields):
+            calls.append(fields)
+            raise RuntimeError("database unavailable")
+
+        publisher = ProgressPublisher(failing_write, min_interval=0.0)
+        publisher.publish("bt-1", {"candles_processed": 1})
+        assert _wait_for(lambda: len(calls) == 1)
+        publisher.publish("bt-1", {"candles_processed": 2})
+        publisher.flush("bt-1")
+
+        assert calls[-1] == {"candles_processed": 2}
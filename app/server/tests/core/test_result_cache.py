@@ -0,0 +1,259 @@
+"""
+Tests for Result Cache
+======================
+Unit tests for the result cache key, the LRU cache and the executor
+serving repeated runs from it.
+"""
+
+from datetime import datetime
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from core.backtest_executor import BacktestExecution, BacktestExecutor
+from core.candle_buffer import CandleBuffer
+from core.indicator_engine import indicator_cache
+from core.result_cache import ResultCache, result_cache, result_cache_key
+from core.trade_ledger import TradeLedger
+
+BACKTEST = {
+    "id": "backtest-1",
+    "strategy_id": "strategy-1",
+    "pair": "EUR_USD",
+    "timeframe": "H1",
+    "start_date": "2025-01-01T00:00:00Z",
+    "end_date": "2025-02-01T00:00:00Z",
+    "initial_balance": 10000.0,
+    "position_sizing": {"method": "percentage", "value": 2.0},
+    "risk_management": {"stop_loss": {"type": "fixed_pips", "value": 20}},
+    "engine": "vectorized",
+}
+
+STRATEGY = {
+    "id": "strategy-1",
+    "name": "RSI dip",
+    "indicators": [{"id": "rsi", "instance_id": "rsi-1", "params": {"period": 14}}],
+    "conditions": [
+        {
+            "id": "entry",
+            "section": "long_entry",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_below",
+            "right_operand": {"type": "value", "value": 40},
+        },
+        {
+            "id": "exit",
+            "section": "long_exit",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_above",
+            "right_operand": {"type": "value", "value": 60},
+        },
+    ],
+}
+
+
+def _key(strategy=STRATEGY, backtest=BACKTEST, data_version="v1"):
+    return result_cache_key(strategy, backtest, "EUR_USD", "H1", "vectorized", data_version)
+
+
+def _ledger(n: int = 3) -> TradeLedger:
+    return TradeLedger.from_trades(
+        [
+            {
+                "type": "long",
+                "size": 100.0,
+                "entry_price": 1.1,
+                "entry_time": f"2025-01-0{i + 1}T00:00:00",
+                "exit_price": 1.1,
+                "exit_time": f"2025-01-0{i + 1}T01:00:00",
+                "pnl": 1.0,
+                "exit_reason": "signal",
+            }
+            for i in range(n)
+        ]
+    )
+
+
+class TestResultCacheKey:
+    """Test cases for the content hash of a run."""
+
+    def test_ignores_presentation_fields(self):
+        """Test renaming or tagging a strategy keeps the same key."""
+        renamed = {**STRATEGY, "name": "Copy of RSI dip", "tags": ["fx"], "drawings": [{}]}
+        copied = {**BACKTEST, "id": "backtest-2", "name": "Copy", "status": "pending"}
+
+        assert _key(renamed, copied) == _key()
+
+    def test_equivalent_dates_share_a_key(self):
+        """Test dates are compared as instants, not as strings."""
+        backtest = {**BACKTEST, "start_date": datetime(2025, 1, 1)}
+
+        assert _key(backtest=backtest) == _key()
+
+    @pytest.mark.parametrize(
+        "strategy, backtest, data_version",
+        [
+            ({**STRATEGY, "conditions": STRATEGY["conditions"][:1]}, BACKTEST, "v1"),
+            ({**STRATEGY, "trade_direction": "short"}, BACKTEST, "v1"),
+            (STRATEGY, {**BACKTEST, "end_date": "2025-02-02T00:00:00Z"}, "v1"),
+            (STRATEGY, {**BACKTEST, "initial_balance": 5000.0}, "v1"),
+            (STRATEGY, BACKTEST, "v2"),
+        ],
+    )
+    def test_changes_with_inputs(self, strategy, backtest, data_version):
+        assert _key(strategy, backtest, data_version) != _key()
+
+
+class TestResultCache:
+    """Test cases for the LRU cache."""
+
+    def test_get_returns_fresh_copies(self):
+        cache = ResultCache()
+        cache.put("a", {"total_trades": 3, "trades": [{"pnl": 1.0}]}, _ledger())
+
+        results, ledger = cache.get("a")
+        results["trades"].append({"pnl": 2.0})
+
+        assert cache.get("a")[0] == {"total_trades": 3, "trades": [{"pnl": 1.0}]}
+        assert len(ledger) == 3
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used_by_count(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {}, _ledger())
+        cache.put("b", {}, _ledger())
+        cache.get("a")
+        cache.put("c", {}, _ledger())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_by_bytes_and_rejects_oversized_runs(self):
+        probe = ResultCache()
+        probe.put("a", {"x": 1}, _ledger())
+        entry_bytes = probe.stats()["bytes"]
+
+        cache = ResultCache(max_bytes=entry_bytes * 3 // 2)
+        assert cache.put("a", {"x": 1}, _ledger())
+        assert cache.put("b", {"x": 2}, _ledger())
+        assert cache.stats()["bytes"] == entry_bytes
+        assert cache.get("a") is None
+
+        assert not cache.put("big", {"x": "y" * entry_bytes * 2}, _ledger(1))
+        assert cache.get("big") is None
+
+    def test_replacing_a_key_keeps_the_byte_count(self):
+        cache = ResultCache()
+        cache.put("a", {"x": 1}, _ledger())
+        before = cache.stats()["bytes"]
+        cache.put("a", {"x": 1}, _ledger())
+
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] == before
+
+
+class TestExecutorResultCache:
+    """Test cases for the executor serving repeated runs from the cache."""
+
+    @pytest.fixture
+    def executor(self):
+        BacktestExecutor._instance = None
+        instance = BacktestExecutor()
+        candles = instance._generate_simulated_candles(
+            datetime(2025, 1, 1), datetime(2025, 2, 1), "H1", rng=np.random.default_rng(5)
+        )
+        indicator_cache.clear()
+        result_cache.clear()
+        with patch.object(instance, "_generate_simulated_candles", return_value=candles):
+            yield instance
+        indicator_cache.clear()
+        result_cache.clear()
+        BacktestExecutor._instance = None
+
+    def _run(self, executor, backtest):
+        execution = BacktestExecution(
+            backtest_id=backtest["id"], thread=None, cancel_event=Event()
+        )
+        executor._running_backtests[backtest["id"]] = execution
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(data=[STRATEGY])
+        )
+        with (
+            patch("core.backtest_executor.get_supabase_client", return_value=client),
+            patch.object(executor, "_complete_backtest") as mock_complete,
+            patch.object(executor, "_update_backtest_progress"),
+            patch.object(
+                executor, "_run_vectorized_engine", wraps=executor._run_vectorized_engine
+            ) as mock_engine,
+        ):
+            executor._execute_backtest(backtest["id"], execution.cancel_event, backtest)
+        return execution, mock_complete, mock_engine
+
+    def test_repeated_run_is_served_from_cache(self, executor):
+        """Test a copy of a finished run completes without running the engine."""
+        first, first_complete, first_engine = self._run(executor, BACKTEST)
+        second, second_complete, second_engine = self._run(
+            executor, {**BACKTEST, "id": "backtest-2"}
+        )
+
+        assert first_engine.called
+        assert not second_engine.called
+        assert second.status == "completed"
+        assert second.progress_percentage == 100
+        assert second.trade_count == first.trade_count
+        assert second_complete.call_args.args[1] == first_complete.call_args.args[1]
+        assert len(second_complete.call_args.args[2]) == first.trade_count
+
+    def test_duplicate_is_served_before_loading_candles(self, executor):
+        """Test a duplicate simulates the same candles, so it never loads them."""
+        generate = BacktestExecutor._generate_simulated_candles
+        with patch.object(
+            executor, "_generate_simulated_candles", lambda *args, **kwargs: generate(
+                executor, *args, **kwargs
+            )
+        ):
+            self._run(executor, BACKTEST)
+            with patch.object(executor, "_load_candles") as mock_load:
+                second, _, second_engine = self._run(executor, {**BACKTEST, "id": "backtest-2"})
+
+        assert not mock_load.called
+        assert not second_engine.called
+        assert second.status == "completed"
+
+    @pytest.mark.parametrize("version, loads", [("store:EURUSD:H1:1:2", 0), (None, 1)])
+    def test_stored_candles_are_looked_up_by_version(self, executor, version, loads):
+        """Test fully fetched stored candles are looked up before loading them."""
+        candles = executor._generate_simulated_candles(
+            datetime(2025, 1, 1), datetime(2025, 2, 1), "H1"
+        )
+        store = MagicMock()
+        store.version.return_value = version
+        with (
+            patch("core.backtest_executor.settings.USE_MOCK_DATA", False),
+            patch("core.backtest_executor.get_candle_store", return_value=store),
+            patch.object(
+                executor, "_load_stored_candles", return_value=CandleBuffer.coerce(candles)
+            ),
+        ):
+            self._run(executor, BACKTEST)
+            with patch.object(
+                executor, "_load_candles", wraps=executor._load_candles
+            ) as mock_load:
+                _, _, second_engine = self._run(executor, {**BACKTEST, "id": "backtest-2"})
+
+        assert mock_load.call_count == loads
+        assert not second_engine.called
+
+    def test_cache_can_be_bypassed(self, executor):
+        self._run(executor, BACKTEST)
+        _, _, engine = self._run(
+            executor, {**BACKTEST, "id": "backtest-2", "use_result_cache": False}
+        )
+
+        assert engine.called
@@ -0,0 +1,263 @@
+"""
+Tests for Result Series
+=======================
+Unit tests for compact per-candle result series storage, LTTB downsampling
+and the ranged series endpoint.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from core.backtest_executor import BacktestExecutor
+from core.backtest_service import get_backtest_series
+from core.candle_buffer import to_epoch_seconds
+from core.result_series import ResultSeries, lttb_indices
+
+START = to_epoch_seconds(datetime(2025, 1, 1))
+
+
+def _series(n: int = 5000, seed: int = 0) -> ResultSeries:
+    """M1 series with a random-walk buy-and-hold curve and sparse trades."""
+    rng = np.random.default_rng(seed)
+    return ResultSeries(
+        time=START + np.arange(n, dtype=np.int64) * 60,
+        buy_hold_curve=np.round(10000 + np.cumsum(rng.normal(0, 5, n)), 2),
+        trade_counts_per_candle=(rng.random(n) < 0.02).astype(np.int64),
+    )
+
+
+def _results(series: ResultSeries) -> dict:
+    return {"total_trades": int(series.trade_counts_per_candle.sum()), **series.to_results_fields()}
+
+
+class TestLttb:
+    """Test cases for Largest-Triangle-Three-Buckets selection."""
+
+    def test_keeps_endpoints_and_spikes(self):
+        """Test the first, last and isolated extreme points are kept."""
+        y = np.zeros(1000)
+        y[321] = 50.0
+        y[654] = -40.0
+
+        indices = lttb_indices(np.arange(1000), y, 20)
+
+        assert len(indices) == 20
+        assert indices[0] == 0 and indices[-1] == 999
+        assert {321, 654} <= set(indices.tolist())
+        assert np.all(np.diff(indices) > 0)
+
+    def test_short_series_unchanged(self):
+        assert lttb_indices(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+class TestResultSeries:
+    """Test cases for ResultSeries."""
+
+    def test_encode_round_trip(self):
+        """Test times and counts round-trip exactly and values to the cent."""
+        series = _series()
+
+        decoded = ResultSeries.decode(series.encode())
+
+        assert decoded.time.tolist() == series.time.tolist()
+        assert decoded.trade_counts_per_candle.tolist() == series.trade_counts_per_candle.tolist()
+        assert decoded.buy_hold_curve.tolist() == series.buy_hold_curve.tolist()
+
+    def test_encoding_is_compact(self):
+        """Test the encoded series is much smaller than the JSON lists."""
+        import json
+
+        series = _series(50000)
+
+        encoded_size = len(json.dumps(series.encode()))
+        assert encoded_size * 3 < len(json.dumps(series.to_results_fields()))
+
+    def test_unknown_encoding(self):
+        with pytest.raises(ValueError, match="Unknown result series encoding"):
+            ResultSeries.decode({"encoding": "csv"})
+
+    def test_from_results_requires_aligned_series(self):
+        """Test results without one value per candle time are not converted."""
+        results = _results(_series(10))
+        assert len(ResultSeries.from_results(results)) == 10
+
+        results["buy_hold_curve"] = results["buy_hold_curve"][:1]
+        assert ResultSeries.from_results(results) is None
+        assert ResultSeries.from_results({}) is None
+
+    def test_downsample_keeps_trade_total(self):
+        """Test downsampling keeps the point budget, endpoints and trade total."""
+        series = _series()
+
+        small = series.downsample(500)
+
+        assert len(small) == 500
+        assert small.time[0] == series.time[0] and small.time[-1] == series.time[-1]
+        assert small.trade_counts_per_candle.sum() == series.trade_counts_per_candle.sum()
+        # The visual range of the curve is kept
+        assert small.buy_hold_curve.max() == pytest.approx(series.buy_hold_curve.max(), rel=1e-3)
+        assert small.buy_hold_curve.min() == pytest.approx(series.buy_hold_curve.min(), rel=1e-3)
+
+    def test_slice_dates(self):
+        """Test windows are inclusive at both ends."""
+        series = _series(100)
+
+        window = series.slice_dates("2025-01-01T00:10:00", datetime(2025, 1, 1, 0, 19))
+
+        assert len(window) == 10
+        assert window.to_results_fields()["equity_curve_dates"][0] == "2025-01-01T00:10:00"
+
+
+class TestStoreResultSeries:
+    """Test cases for moving long series out of the results row."""
+
+    @pytest.fixture
+    def executor(self):
+        BacktestExecutor._instance = None
+        return BacktestExecutor()
+
+    def test_long_series_stored_separately(self, executor):
+        """Test long series are saved encoded and downsampled in the results."""
+        series = _series()
+        client = MagicMock()
+
+        with patch("core.backtest_executor.settings.RESULT_SERIES_MAX_POINTS", 1000):
+            results = executor._store_result_series(client, "bt-1", _results(series))
+
+        row = client.table.return_value.upsert.call_args[0][0]
+        client.table.assert_called_with("backtest_series")
+        assert row["point_count"] == 5000
+        assert len(ResultSeries.decode(row["series"])) == 5000
+        assert results["series_points"] == 5000
+        assert len(results["equity_curve_dates"]) == 1000
+        assert sum(results["trade_counts_per_candle"]) == results["total_trades"]
+
+    def test_short_series_kept_inline(self, executor):
+        client = MagicMock()
+        results = _results(_series(100))
+
+        assert executor._store_result_series(client, "bt-1", results) is results
+        client.table.assert_not_called()
+
+    def test_failed_save_keeps_full_series(self, executor):
+        """Test nothing is dropped from the results if the series cannot be saved."""
+        client = MagicMock()
+        client.table.return_value.upsert.return_value.execute.side_effect = RuntimeError("down")
+        results = _results(_series())
+
+        with patch("core.backtest_executor.settings.RESULT_SERIES_MAX_POINTS", 1000):
+            assert executor._store_result_series(client, "bt-1", results) is results
+
+
+class TestGetBacktestSeries:
+    """Test cases for reading a window of the series."""
+
+    @staticmethod
+    def _client(results, series_rows):
+        client = MagicMock()
+        tables = {"backtests": MagicMock(), "backtest_series": MagicMock()}
+        client.table.side_effect = tables.__getitem__
+        tables["backtests"].select.return_value.eq.return_value.execute.return_value.data = [
+            {"results": results}
+        ]
+        tables["backtest_series"].select.return_value.eq.return_value.execute.return_value.data = (
+            series_rows
+        )
+        return client
+
+    def _get(self, client, *args):
+        with (
+            patch("core.backtest_service.is_configured", return_value=True),
+            patch("core.backtest_service.get_supabase_client", return_value=client),
+        ):
+            return get_backtest_series("bt-1", *args)
+
+    def test_window_at_full_resolution(self):
+        """Test a window of a downsampled run is read from the stored series."""
+        series = _series()
+        results = {**_results(series.downsample(100)), "series_points": len(series)}
+        client = self._client(results, [{"series": series.encode()}])
+
+        success, data, error = self._get(client, "2025-01-01T10:00:00", "2025-01-01T11:59:00")
+
+        assert success is True, error
+        assert data["total_points"] == 5000
+        assert data["window_points"] == 120
+        assert data["downsampled"] is False
+        assert data["buy_hold_curve"] == series.buy_hold_curve[600:720].tolist()
+
+    def test_window_downsampled_to_max_points(self):
+        series = _series()
+        results = {**_results(series.downsample(100)), "series_points": len(series)}
+        client = self._client(results, [{"series": series.encode()}])
+
+        success, data, _ = self._get(client, None, None, 250)
+
+        assert success is True
+        assert (data["window_points"], data["downsampled"]) == (5000, True)
+        assert len(data["equity_curve_dates"]) == 250
+
+    def test_inline_series_without_stored_row(self):
+        """Test results that kept their series inline are sliced directly."""
+        series = _series(50)
+        client = self._client(_results(series), [])
+
+        success, data, _ = self._get(client, None, "2025-01-01T00:09:00")
+
+        assert success is True
+        assert data["trade_counts_per_candle"] == series.trade_counts_per_candle[:10].tolist()
+
+    def test_missing_results(self):
+        client = self._client(None, [])
+
+        success, data, error = self._get(client)
+
+        assert success is False and data is None
+        assert "no results" in error
+
+
+class TestSeriesEndpoint:
+    """Test cases for GET /api/backtests/{backtest_id}/series."""
+
+    @pytest.fixture
+    def client(self):
+        from server import app
+
+        return TestClient(app)
+
+    def test_returns_window(self, client):
+        series = {
+            "total_points": 10,
+            "window_points": 1,
+            "downsampled": False,
+            "equity_curve_dates": ["2025-01-01T00:00:00"],
+            "buy_hold_curve": [10000.0],
+            "trade_counts_per_candle": [0],
+        }
+        with patch(
+            "server.service_get_backtest_series", return_value=(True, series, None)
+        ) as mock_get:
+            response = client.get(
+                "/api/backtests/bt-1/series",
+                params={"start": "2025-01-01T00:00:00", "end": "2025-01-01T00:00:00"},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["buy_hold_curve"] == [10000.0]
+        mock_get.assert_called_once_with(
+            "bt-1", "2025-01-01T00:00:00", "2025-01-01T00:00:00", None
+        )
+
+    def test_reports_errors(self, client):
+        with patch(
+            "server.service_get_backtest_series",
+            return_value=(False, None, "Backtest not found: bt-1"),
+        ):
+            response = client.get("/api/backtests/bt-1/series")
+
+        assert response.json()["success"] is False
+        assert response.json()["error"] == "Backtest not found: bt-1"
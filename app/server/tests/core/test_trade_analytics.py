@@ -0,0 +1,205 @@
+"""
+Tests for Trade Analytics
+=========================
+Unit tests for the vectorized trade analytics behind backtest results.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core.trade_analytics import (
+    TradeAnalytics,
+    histogram,
+    streak_summary,
+    time_period_summary,
+    value_at_risk,
+)
+from core.trade_ledger import TradeLedger
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+def _trades(n: int = 500, seed: int = 0):
+    """Trades spread over several months with wins, losses and break-evens."""
+    rng = np.random.default_rng(seed)
+    trades = []
+    entry = START
+    for _ in range(n):
+        entry += timedelta(minutes=int(rng.integers(30, 600)))
+        trades.append(
+            {
+                "type": "long",
+                "size": 200.0,
+                "entry_price": 1.1,
+                "entry_time": entry.isoformat(),
+                "exit_price": 1.1,
+                "exit_time": (entry + timedelta(minutes=int(rng.integers(1, 300)))).isoformat(),
+                "pnl": float(rng.choice([0.0, round(float(rng.normal(5, 40)), 2)], p=[0.1, 0.9])),
+                "exit_reason": "signal",
+            }
+        )
+    return trades
+
+
+def _fixed_trades(pnl, hours_apart=5, holding_hours=2):
+    """Trades entering every few hours, each held for a fixed time."""
+    trades = []
+    for i, value in enumerate(pnl):
+        entry = START + timedelta(hours=i * hours_apart)
+        trades.append(
+            {
+                "type": "long",
+                "entry_time": entry.isoformat(),
+                "exit_time": (entry + timedelta(hours=holding_hours)).isoformat(),
+                "pnl": value,
+            }
+        )
+    return trades
+
+
+def _equity_curve(trades, initial_balance=10000.0):
+    curve, balance = [initial_balance], initial_balance
+    for trade in trades:
+        balance += trade["pnl"]
+        curve.append(round(balance, 2))
+    return curve
+
+
+class TestTradeAnalytics:
+    """Test cases for the trade-derived result metrics."""
+
+    PNL = [120.0, -40.0, -60.0, 200.0, 0.0, -15.0, 80.0, -110.0, 45.0, 30.0]
+
+    def test_summary(self):
+        """Test the scalar metrics of a trade list."""
+        trades = _fixed_trades(self.PNL)
+        analytics = TradeAnalytics(TradeLedger.from_trades(trades), 10000.0, start_time=START)
+
+        summary = analytics.summary(10250.0)
+
+        assert summary["total_trades"] == 10
+        assert summary["winning_trades"] == 5
+        assert summary["losing_trades"] == 4
+        assert summary["win_rate"] == 50.0
+        assert summary["profit_factor"] == round(475 / 225, 2)
+        assert summary["largest_win"] == 200.0
+        assert summary["largest_loss"] == 110.0
+        assert summary["final_balance"] == 10250.0
+        assert summary["average_trade_duration_minutes"] == 120.0
+        assert summary["max_drawdown_dollars"] == 110.0
+        assert summary["max_consecutive_losses"] == 2
+
+    def test_headline_is_a_subset_of_the_summary(self):
+        trades = _trades(100)
+        analytics = TradeAnalytics(TradeLedger.from_trades(trades), 10000.0)
+        final_balance = _equity_curve(trades)[-1]
+
+        summary = analytics.summary(final_balance)
+
+        assert analytics.headline(final_balance).items() <= summary.items()
+
+    def test_equity_points_timed_by_trade_exit(self):
+        """Test drawdown durations run from the peak's exit to the recovering exit."""
+        trades = _fixed_trades([100.0, -50.0, -20.0, 90.0], hours_apart=24)
+
+        durations = TradeAnalytics(
+            TradeLedger.from_trades(trades), 1000.0
+        ).equity.drawdown_durations()
+
+        # Peak after trade 1 (day 0 + 2h) to recovery at trade 4 (day 3 + 2h)
+        assert durations["drawdown_durations"] == [
+            {"start_index": 1, "end_index": 4, "duration_minutes": 3 * 24 * 60.0}
+        ]
+
+    def test_time_period_tables(self):
+        """Test trades land in their weekday and hour with best and worst flagged."""
+        trades = _fixed_trades([50.0, -20.0], hours_apart=24)
+
+        tables = TradeAnalytics(TradeLedger.from_trades(trades), 1000.0).time_period_metrics()
+
+        monday, tuesday = tables["day_of_week_performance"][:2]
+        assert (monday["net_pnl"], monday["is_best"]) == (50.0, True)
+        assert (tuesday["net_pnl"], tuesday["is_worst"]) == (-20.0, True)
+        assert tables["hourly_performance"][9]["trades"] == 2
+        assert len(tables["day_hour_heatmap"]) == 7 * 24
+
+    def test_distributions_and_scatter(self):
+        trades = _fixed_trades([50.0, -20.0, 10.0], holding_hours=1)
+
+        analytics = TradeAnalytics(TradeLedger.from_trades(trades), 1000.0)
+
+        assert sum(bucket["count"] for bucket in analytics.win_loss_distribution()) == 3
+        assert analytics.holding_period_distribution() == [
+            {"bucket_min_minutes": 60.0, "bucket_max_minutes": 60.0, "count": 3}
+        ]
+        assert analytics.pl_scatter_data()[1] == {
+            "entry_time": trades[1]["entry_time"],
+            "pnl": -20.0,
+            "is_winner": False,
+        }
+
+    def test_rebuilds_equity_without_curve(self):
+        """Test the equity curve is rebuilt from the trades when none is given."""
+        trades = _trades(50)
+
+        analytics = TradeAnalytics(TradeLedger.from_trades(trades), 10000.0)
+
+        assert analytics.equity.equity.tolist() == _equity_curve(trades)
+
+    def test_empty_ledger(self):
+        analytics = TradeAnalytics(TradeLedger.from_trades([]), 10000.0)
+
+        summary = analytics.summary(10000.0)
+        assert summary["total_trades"] == 0
+        assert summary["max_consecutive_wins"] == 0
+        assert analytics.time_period_metrics()["monthly_performance"] is None
+        assert analytics.pl_scatter_data() == []
+        assert analytics.value_at_risk() == {"var_95": None, "var_99": None}
+
+
+class TestFunctions:
+    """Test cases for the module-level analytics functions."""
+
+    def test_streaks_count_the_run_in_progress(self):
+        wins = np.array([True, True, False, True, True, True])
+
+        assert streak_summary(wins) == {
+            "max_consecutive_wins": 3,
+            "max_consecutive_losses": 1,
+            "avg_consecutive_wins": 2.5,
+            "avg_consecutive_losses": 1.0,
+        }
+        assert streak_summary(np.array([], dtype=bool))["max_consecutive_wins"] == 0
+
+    def test_histogram_puts_the_maximum_in_the_last_bucket(self):
+        """Test edges are half-open except the last bucket."""
+        assert histogram([0.0, 1.0, 2.0, 4.0], 4) == [
+            (0.0, 1.0, 1),
+            (1.0, 2.0, 1),
+            (2.0, 3.0, 1),
+            (3.0, 4.0, 1),
+        ]
+        assert histogram([0.0, 0.5, 4.0], 2) == [(0.0, 2.0, 2), (2.0, 4.0, 1)]
+        assert histogram([3.0, 3.0], 5) == [(3.0, 3.0, 2)]
+        assert histogram([], 5) == []
+
+    def test_period_keys_from_epoch(self):
+        """Test weekday and hour are derived from UTC epoch seconds."""
+        # Sunday 2025-01-05 23:30 and Monday 2025-01-06 00:15
+        entry_time = np.array([1736119800, 1736122500], dtype=np.int64)
+
+        tables = time_period_summary(entry_time, np.array([10.0, -5.0]))
+
+        assert [row["trades"] for row in tables["day_of_week_performance"]] == [
+            1, 0, 0, 0, 0, 0, 1
+        ]
+        assert tables["hourly_performance"][23]["net_pnl"] == 10.0
+        assert tables["hourly_performance"][0]["net_pnl"] == -5.0
+        assert [row["month"] for row in tables["monthly_performance"]] == ["2025-01"]
+
+    def test_value_at_risk(self):
+        pnl = [i * 10.0 for i in range(1, 21)]
+
+        assert value_at_risk(pnl) == {"var_95": 20.0, "var_99": 10.0}
+        assert value_at_risk(pnl[:4]) == {"var_95": None, "var_99": None}
@@ -0,0 +1,300 @@
+"""
+Tests for Trade Ledger
+======================
+Unit tests for the columnar trade ledger, its cursor pagination, the
+trades endpoint and the streamed CSV trade list.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from core.backtest_executor import BacktestExecutor
+from core.backtest_service import get_backtest_trades, load_trade_ledger
+from core.trade_ledger import TradeLedger
+from utils.export_generators import iter_csv_trade_list
+
+START = datetime(2025, 1, 6, 9, 0)
+REASONS = ("signal", "stop_loss", "take_profit")
+
+
+def _trades(n: int = 250, seed: int = 0):
+    """Trades as built by the engines, with repeated P/L values to create ties."""
+    rng = np.random.default_rng(seed)
+    trades = []
+    for i in range(n):
+        entry = START + timedelta(hours=3 * i)
+        trades.append(
+            {
+                "type": "long" if rng.random() < 0.6 else "short",
+                "size": 200.0 + i,
+                "entry_price": float(round(1.1 + rng.normal(0, 0.01), 5)),
+                "entry_time": entry.isoformat(),
+                "exit_price": float(round(1.1 + rng.normal(0, 0.01), 5)),
+                "exit_time": (entry + timedelta(minutes=int(rng.integers(5, 170)))).isoformat(),
+                "pnl": float(rng.choice([-50.0, -12.5, 0.0, 20.0, 75.25])),
+                "exit_reason": REASONS[int(rng.integers(0, 3))],
+            }
+        )
+    return trades
+
+
+def _all_pages(ledger, **kwargs):
+    """Follow next_cursor until the last page."""
+    pages, cursor = [], None
+    while True:
+        page, cursor, matched = ledger.page(cursor=cursor, **kwargs)
+        pages.append(page.to_dicts())
+        if cursor is None:
+            return pages, matched
+
+
+class TestTradeLedger:
+    """Test cases for TradeLedger."""
+
+    def test_round_trips_trade_records(self):
+        """Test trades survive ledger conversion and encoding unchanged."""
+        trades = _trades()
+
+        ledger = TradeLedger.decode(TradeLedger.from_trades(trades).encode())
+
+        assert ledger.to_dicts() == trades
+        assert ledger.exit_reasons == tuple(dict.fromkeys(t["exit_reason"] for t in trades))
+
+    def test_decodes_ledgers_saved_without_sizes(self):
+        """Test ledgers encoded before the size column decode with sizes missing."""
+        trades = _trades(5)
+        encoded = TradeLedger.from_trades(trades).encode()
+        del encoded["size"]
+
+        decoded = TradeLedger.decode(encoded).to_dicts()
+
+        assert decoded == [{**trade, "size": None} for trade in trades]
+
+    def test_empty_ledger(self):
+        ledger = TradeLedger.decode(TradeLedger.from_trades([]).encode())
+
+        page, cursor, matched = ledger.page()
+        assert (len(ledger), len(page), cursor, matched) == (0, 0, None, 0)
+
+    def test_filters(self):
+        """Test side, outcome, exit reason and exit time filters."""
+        trades = _trades()
+        ledger = TradeLedger.from_trades(trades)
+        window_start, window_end = trades[10]["exit_time"], trades[20]["exit_time"]
+
+        mask = ledger.filter_mask(
+            side="short",
+            outcome="loss",
+            exit_reason="stop_loss",
+            start=window_start,
+            end=window_end,
+        )
+
+        expected = [
+            i
+            for i, t in enumerate(trades)
+            if t["type"] == "short"
+            and t["pnl"] < 0
+            and t["exit_reason"] == "stop_loss"
+            and window_start <= t["exit_time"] <= window_end
+        ]
+        assert np.flatnonzero(mask).tolist() == expected
+        assert not ledger.filter_mask(exit_reason="trailing_stop").any()
+        with pytest.raises(ValueError, match="Invalid side filter"):
+            ledger.filter_mask(side="flat")
+
+    @pytest.mark.parametrize("sort_by", ["exit_time", "pnl", "duration"])
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_pages_cover_every_trade_once(self, sort_by, descending):
+        """Test following cursors yields every matching trade once, in sort order."""
+        trades = _trades()
+        ledger = TradeLedger.from_trades(trades)
+
+        pages, matched = _all_pages(
+            ledger, sort_by=sort_by, descending=descending, limit=17, outcome="win"
+        )
+
+        returned = [trade for page in pages for trade in page]
+        winners = [i for i, t in enumerate(trades) if t["pnl"] > 0]
+        key = {
+            "exit_time": lambda i: trades[i]["exit_time"],
+            "pnl": lambda i: trades[i]["pnl"],
+            "duration": lambda i: int(ledger.duration[i]),
+        }[sort_by]
+        expected = sorted(winners, key=lambda i: (key(i), i))
+        if descending:
+            expected.reverse()
+        assert matched == len(winners)
+        assert all(len(page) <= 17 for page in pages)
+        assert returned == [trades[i] for i in expected]
+
+    def test_cursor_must_match_sort(self):
+        ledger = TradeLedger.from_trades(_trades())
+        _, cursor, _ = ledger.page(sort_by="pnl", limit=10)
+
+        with pytest.raises(ValueError, match="different sort order"):
+            ledger.page(sort_by="pnl", descending=True, cursor=cursor)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            ledger.page(cursor="not-a-cursor")
+        with pytest.raises(ValueError, match="Invalid sort field"):
+            ledger.page(sort_by="size")
+
+    def test_iter_dicts_in_chunks(self):
+        trades = _trades(25)
+
+        chunks = list(TradeLedger.from_trades(trades).iter_dicts(10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert [trade for chunk in chunks for trade in chunk] == trades
+
+
+class TestLedgerStorage:
+    """Test cases for saving and loading ledgers."""
+
+    def test_executor_stores_full_ledger(self):
+        """Test completing a run saves every trade, not just the results preview."""
+        BacktestExecutor._instance = None
+        executor = BacktestExecutor()
+        client = MagicMock()
+        trades = _trades()
+
+        with (
+            patch("core.backtest_executor.is_configured", return_value=True),
+            patch("core.backtest_executor.get_supabase_client", return_value=client),
+        ):
+            executor._complete_backtest(
+                "bt-1", {"trades": trades[-100:]}, TradeLedger.from_trades(trades)
+            )
+
+        row = client.table.return_value.upsert.call_args[0][0]
+        assert row["trade_count"] == 250
+        assert TradeLedger.decode(row["ledger"]).to_dicts() == trades
+
+    @staticmethod
+    def _client(ledger_rows, results):
+        client = MagicMock()
+        tables = {"backtest_trades": MagicMock(), "backtests": MagicMock()}
+        client.table.side_effect = tables.__getitem__
+        tables["backtest_trades"].select.return_value.eq.return_value.execute.return_value.data = (
+            ledger_rows
+        )
+        tables["backtests"].select.return_value.eq.return_value.execute.return_value.data = [
+            {"results": results}
+        ]
+        return client
+
+    def _call(self, client, function, *args, **kwargs):
+        with (
+            patch("core.backtest_service.is_configured", return_value=True),
+            patch("core.backtest_service.get_supabase_client", return_value=client),
+        ):
+            return function(*args, **kwargs)
+
+    def test_page_from_stored_ledger(self):
+        trades = _trades()
+        client = self._client([{"ledger": TradeLedger.from_trades(trades).encode()}], {})
+
+        success, page, error = self._call(
+            client, get_backtest_trades, "bt-1", "pnl", True, None, 5, side="long"
+        )
+
+        assert success is True, error
+        assert page["total_trades"] == 250
+        assert page["matched"] == sum(t["type"] == "long" for t in trades)
+        assert [t["pnl"] for t in page["trades"]] == [75.25] * 5
+        assert page["next_cursor"] is not None
+
+    def test_falls_back_to_results_trades(self):
+        """Test backtests without a stored ledger serve their results trades."""
+        trades = _trades(5)
+        client = self._client([], {"trades": trades})
+
+        success, ledger, _ = self._call(client, load_trade_ledger, "bt-1")
+
+        assert success is True
+        assert ledger.to_dicts() == trades
+
+    def test_invalid_page_request(self):
+        client = self._client([{"ledger": TradeLedger.from_trades(_trades()).encode()}], {})
+
+        success, page, error = self._call(
+            client, get_backtest_trades, "bt-1", outcome="breakeven"
+        )
+
+        assert (success, page) == (False, None)
+        assert "Invalid outcome filter" in error
+
+
+class TestTradesEndpoint:
+    """Test cases for GET /api/backtests/{backtest_id}/trades."""
+
+    @pytest.fixture
+    def client(self):
+        from server import app
+
+        return TestClient(app)
+
+    def test_returns_page(self, client):
+        page = {"total_trades": 3, "matched": 1, "trades": _trades(1), "next_cursor": None}
+        with patch(
+            "server.service_get_backtest_trades", return_value=(True, page, None)
+        ) as mock_get:
+            response = client.get(
+                "/api/backtests/bt-1/trades",
+                params={"sort_by": "pnl", "descending": "true", "limit": 50, "side": "long"},
+            )
+
+        data = response.json()
+        assert data["success"] is True
+        assert data["trades"] == page["trades"]
+        mock_get.assert_called_once_with(
+            "bt-1",
+            "pnl",
+            True,
+            None,
+            50,
+            side="long",
+            outcome=None,
+            exit_reason=None,
+            start=None,
+            end=None,
+        )
+
+    def test_reports_errors(self, client):
+        with patch(
+            "server.service_get_backtest_trades",
+            return_value=(False, None, "Invalid sort field: size"),
+        ):
+            response = client.get("/api/backtests/bt-1/trades", params={"sort_by": "size"})
+
+        assert response.json() == {
+            "success": False,
+            "backtest_id": "bt-1",
+            "total_trades": 0,
+            "matched": 0,
+            "trades": [],
+            "next_cursor": None,
+            "error": "Invalid sort field: size",
+        }
+
+
+class TestCsvTradeList:
+    """Test cases for the streamed CSV trade list."""
+
+    def test_chunks_form_one_trade_list(self):
+        """Test the header is written once and every trade follows it."""
+        trades = _trades(25)
+
+        text = "".join(iter_csv_trade_list(TradeLedger.from_trades(trades).iter_dicts(10)))
+
+        lines = text.strip().splitlines()
+        assert lines[0] == "TRADE LIST"
+        assert lines[1] == ",".join(trades[0].keys())
+        assert len(lines) == 2 + 25
+
+    def test_no_trades(self):
+        assert list(iter_csv_trade_list([[], []])) == []
@@ -0,0 +1,233 @@
+"""
+Tests for Walk-Forward Optimization
+===================================
+Unit tests for window construction, the walk-forward runner and the
+executor's walk-forward mode.
+"""
+
+from datetime import datetime
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from core.backtest_executor import BacktestExecution, BacktestExecutor
+from core.backtest_service import _backtest_to_db_row, _db_row_to_backtest
+from core.data_models import BacktestConfig, WalkForwardConfig
+from core.indicator_engine import indicator_cache
+from core.parameter_sweep import SweepGrid, simulate
+from core.result_cache import result_cache
+from core.walk_forward import build_windows, run_walk_forward
+
+DAY = 86400
+
+BACKTEST = {
+    "id": "backtest-1",
+    "strategy_id": "strategy-1",
+    "pair": "EUR_USD",
+    "timeframe": "H1",
+    "start_date": "2025-01-01T00:00:00Z",
+    "end_date": "2025-04-01T00:00:00Z",
+    "initial_balance": 10000.0,
+    "position_sizing": {"method": "percentage", "value": 2.0},
+    "risk_management": {"stop_loss": {"type": "fixed_pips", "value": 20}},
+    "engine": "vectorized",
+    "walk_forward": {
+        "enabled": True,
+        "in_sample_days": 30,
+        "out_of_sample_days": 15,
+        "parameters": {
+            "indicators.rsi-1.period": [7, 14],
+            "risk_management.stop_loss.value": [10, 40],
+        },
+        "objective": "total_net_profit",
+    },
+}
+
+STRATEGY = {
+    "id": "strategy-1",
+    "indicators": [{"id": "rsi", "instance_id": "rsi-1", "params": {"period": 14}}],
+    "conditions": [
+        {
+            "id": "entry",
+            "section": "long_entry",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_below",
+            "right_operand": {"type": "value", "value": 40},
+        },
+        {
+            "id": "exit",
+            "section": "long_exit",
+            "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+            "operator": "is_above",
+            "right_operand": {"type": "value", "value": 60},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def executor():
+    """Executor whose simulated candles are the same on every load."""
+    BacktestExecutor._instance = None
+    instance = BacktestExecutor()
+    candles = instance._generate_simulated_candles(
+        datetime(2025, 1, 1), datetime(2025, 4, 1), "H1", rng=np.random.default_rng(11)
+    )
+    indicator_cache.clear()
+    result_cache.clear()
+    with patch.object(instance, "_generate_simulated_candles", return_value=candles):
+        yield instance
+    indicator_cache.clear()
+    result_cache.clear()
+    BacktestExecutor._instance = None
+
+
+def _run(executor, backtest=BACKTEST, **kwargs):
+    candles, pair, timeframe = executor._load_candles(backtest, STRATEGY)
+    outcome = run_walk_forward(
+        executor, backtest, STRATEGY, candles, pair, timeframe, "vectorized", **kwargs
+    )
+    return candles, outcome
+
+
+class TestWindows:
+    """Test cases for rolling window construction."""
+
+    def test_rolling_windows(self):
+        """Test windows advance by the out-of-sample length and stop at the data end."""
+        times = np.arange(0, 10 * DAY, 3600)
+
+        windows = build_windows(times, in_sample_days=3, out_of_sample_days=2, step_days=None)
+
+        assert [(w.in_sample_start, w.out_of_sample_start) for w in windows] == [
+            (0, 72), (48, 120), (96, 168), (144, 216),
+        ]
+        assert all(w.out_of_sample_start == w.in_sample_end for w in windows)
+        # The last out-of-sample range is cut short by the end of the data
+        assert windows[-1].out_of_sample_end == len(times)
+
+    def test_no_window_for_short_ranges(self):
+        """Test ranges shorter than the in-sample window produce no windows."""
+        assert build_windows(np.arange(0, 2 * DAY, 3600), 3, 1, None) == []
+        assert build_windows(np.array([], dtype=np.int64), 3, 1, None) == []
+
+
+class TestRunWalkForward:
+    """Test cases for the walk-forward runner."""
+
+    def test_stitches_out_of_sample_segments(self, executor):
+        """Test out-of-sample trades and equity are stitched across windows."""
+        candles, (trades, balance, curve, report) = _run(executor)
+
+        assert len(report["windows"]) == 5
+        assert report["combinations"] == 4
+        assert len(curve) == len(trades) + 1
+        assert curve[-1] == round(balance, 2)
+        oos_start = report["windows"][0]["out_of_sample_start"]
+        assert all(trade["entry_time"] >= oos_start for trade in trades)
+        assert sum(w["out_of_sample_trades"] for w in report["windows"]) == len(trades)
+        # Each RSI period is calculated once over the whole buffer
+        assert indicator_cache.stats()["misses"] == 2
+
+    def test_segments_use_in_sample_winner(self, executor):
+        """Test a window's segment matches a standalone run of its chosen parameters."""
+        candles, (trades, _, _, report) = _run(executor)
+        first = report["windows"][0]
+
+        grid = SweepGrid.build(BACKTEST, STRATEGY, BACKTEST["walk_forward"]["parameters"])
+        index = grid.combinations.index(first["parameters"])
+        signal_sets = grid.evaluate_signals(executor, candles, "EUR_USD", "H1")
+        signals = signal_sets[grid.signal_keys[index]]
+        segment = candles.slice_dates(first["out_of_sample_start"], first["out_of_sample_end"])
+        lo = int(np.searchsorted(candles.time, segment.time[0]))
+        masks = {k: v[lo:lo + len(segment)] for k, v in signals.items()}
+
+        segment_trades, segment_balance, _ = simulate(
+            executor, "vectorized", segment, masks, grid.backtests[index], 10000.0
+        )
+
+        assert segment_trades == trades[: len(segment_trades)]
+        assert round(segment_balance - 10000.0, 2) == first["out_of_sample_net_profit"]
+
+    def test_invalid_configurations(self, executor):
+        """Test unknown objectives, overlapping steps and short ranges are rejected."""
+        config = BACKTEST["walk_forward"]
+        with pytest.raises(ValueError, match="objective"):
+            _run(executor, {**BACKTEST, "walk_forward": {**config, "objective": "luck"}})
+        with pytest.raises(ValueError, match="step_days"):
+            _run(executor, {**BACKTEST, "walk_forward": {**config, "step_days": 5}})
+        with pytest.raises(ValueError, match="too short"):
+            _run(executor, {**BACKTEST, "walk_forward": {**config, "in_sample_days": 365}})
+
+    def test_cancelled(self, executor):
+        """Test a set cancel event stops the run."""
+        cancel_event = Event()
+        cancel_event.set()
+
+        _, outcome = _run(executor, cancel_event=cancel_event)
+
+        assert outcome is None
+
+    def test_cancel_stops_in_sample_grid(self, executor, monkeypatch):
+        """Test a cancel during an in-sample grid stops it before the next combination."""
+        cancel_event = Event()
+        calls = []
+
+        def cancel_after_first(*args, **kwargs):
+            calls.append(1)
+            cancel_event.set()
+            return simulate(*args, **kwargs)
+
+        monkeypatch.setattr("core.walk_forward.simulate", cancel_after_first)
+        monkeypatch.setattr("core.walk_forward.settings.SWEEP_WORKERS", 1)
+
+        _, outcome = _run(executor, cancel_event=cancel_event)
+
+        assert outcome is None
+        assert len(calls) == 1
+
+
+class TestWalkForwardMode:
+    """Test cases for walk-forward mode in the executor and backtest storage."""
+
+    def test_executor_saves_walk_forward_results(self, executor):
+        """Test a walk-forward backtest completes with its window report."""
+        execution = BacktestExecution(backtest_id="backtest-1", thread=None, cancel_event=Event())
+        executor._running_backtests["backtest-1"] = execution
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(data=[STRATEGY])
+        )
+
+        with (
+            patch("core.backtest_executor.get_supabase_client", return_value=client),
+            patch.object(executor, "_complete_backtest") as mock_complete,
+            patch.object(executor, "_update_backtest_progress"),
+        ):
+            executor._execute_backtest("backtest-1", execution.cancel_event, BACKTEST)
+
+        results = mock_complete.call_args.args[1]
+        assert execution.status == "completed"
+        assert len(results["walk_forward"]["windows"]) == 5
+        assert results["total_trades"] == execution.trade_count
+        assert results["equity_curve_dates"][0] >= results["walk_forward"]["out_of_sample_start"]
+
+    def test_config_round_trip(self):
+        """Test the walk-forward settings survive the database row conversion."""
+        backtest = BacktestConfig(
+            name="Walk-forward",
+            start_date=datetime(2025, 1, 1),
+            end_date=datetime(2025, 4, 1),
+            walk_forward=WalkForwardConfig(
+                enabled=True, parameters={"position_sizing.value": [1, 2]}
+            ),
+        )
+
+        row = _backtest_to_db_row(backtest)
+        restored = _db_row_to_backtest(row)
+
+        assert row["walk_forward"]["in_sample_days"] == 90
+        assert restored.walk_forward == backtest.walk_forward
+        assert _db_row_to_backtest({**row, "walk_forward": None}).walk_forward is None
@@ -6,7 +6,7 @@ Unit tests for the BacktestExecutor class that manages backtest execution.
 
 import threading
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -224,6 +224,38 @@ class TestStartBacktest:
         assert result["success"] is False
         assert result["error"] == "validation_error"
 
+    def test_start_backtest_estimates_with_strategy_timeframe(self, executor, mock_supabase):
+        """Test a backtest without a timeframe is estimated on its strategy's timeframe."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
+            MagicMock(
+                data=[
+                    {
+                        "id": "backtest-1",
+                        "strategy_id": "strategy-1",
+                        "timeframe": None,
+                        "start_date": "2025-01-01T00:00:00Z",
+                        "end_date": "2025-01-02T00:00:00Z",
+                    }
+                ]
+            ),
+            MagicMock(
+                data=[
+                    {
+                        "id": "strategy-1",
+                        "pair": "EUR_USD",
+                        "timeframe": "M1",
+                        "conditions": {"long_entry": [{"type": "test"}], "short_entry": []},
+                    }
+                ]
+            ),
+        ]
+
+        with patch.object(executor._scheduler, "enqueue", return_value=False) as enqueue:
+            result = executor.start_backtest("backtest-1")
+
+        assert result["error"] == "busy"
+        assert enqueue.call_args.args[0].estimated_candles == 24 * 60
+
     def test_start_backtest_already_running(self, executor, mock_supabase):
         """Test starting backtest fails when already running."""
         # Set up mock to return valid data
@@ -305,6 +337,31 @@ class TestGetProgress:
         assert progress.candles_processed == 500
         assert progress.total_candles == 1000
         assert progress.trade_count == 5
+        assert progress.live_metrics is None
+
+    def test_get_progress_live_metrics(self, executor):
+        """Test progress reports the accumulated result metrics of a running backtest."""
+        from core.metric_accumulators import MetricAccumulator
+
+        execution = BacktestExecution(
+            backtest_id="backtest-1",
+            thread=MagicMock(),
+            cancel_event=threading.Event(),
+            status="running",
+            metrics=MetricAccumulator(10000.0),
+        )
+        executor._running_backtests["backtest-1"] = execution
+        for pnl, balance in ((150.0, 10150.0), (-50.0, 10100.0)):
+            trade = {"entry_time": "2025-01-01T00:00:00", "exit_time": "2025-01-01T02:00:00"}
+            executor._record_closed_trade(
+                execution, [{**trade, "pnl": pnl}], balance, 10000.0, 1
+            )
+
+        metrics = executor.get_progress("backtest-1").live_metrics
+
+        assert metrics["total_trades"] == 2
+        assert metrics["profit_factor"] == 3.0
+        assert metrics["max_drawdown_dollars"] == 50.0
 
     def test_get_progress_not_found(self, executor, mock_supabase):
         """Test getting progress returns None when backtest not found."""
@@ -1865,3 +1922,505 @@ class TestRiskAnalyticsInResults:
         assert summary.max_drawdown_duration_minutes == 360.0
         assert summary.var_95 == -50.0
         assert summary.var_99 == -100.0
+
+
+class TestExecutionEngines:
+    """Test cases for the loop and vectorized execution engines."""
+
+    RISK_MANAGEMENT = {
+        "stop_loss": {"type": "fixed_pips", "value": 20},
+        "take_profit": {"type": "risk_reward", "value": 2},
+    }
+
+    STRATEGY = {
+        "conditions": [
+            {
+                "id": "long-entry",
+                "section": "long_entry",
+                "left_operand": {"type": "price", "value": "close"},
+                "operator": "crosses_above",
+                "right_operand": {"type": "price", "value": "open"},
+            },
+            {
+                "id": "long-exit",
+                "section": "long_exit",
+                "left_operand": {"type": "price", "value": "close"},
+                "operator": "is_below",
+                "right_operand": {"type": "price", "value": "open"},
+            },
+            {
+                "id": "short-entry",
+                "section": "short_entry",
+                "left_operand": {"type": "price", "value": "close"},
+                "operator": "crosses_below",
+                "right_operand": {"type": "price", "value": "open"},
+            },
+            {
+                "id": "short-exit",
+                "section": "short_exit",
+                "left_operand": {"type": "price", "value": "close"},
+                "operator": "is_above",
+                "right_operand": {"type": "price", "value": "open"},
+            },
+        ],
+    }
+
+    def _run_engine(self, executor, engine_name, candles, signals):
+        """Run one engine against fixed candles and signals."""
+        execution = BacktestExecution(
+            backtest_id="engine-test",
+            thread=None,
+            cancel_event=threading.Event(),
+            initial_balance=10000.0,
+            peak_equity=10000.0,
+            equity_curve=[10000.0],
+        )
+        run_engine = getattr(executor, f"_run_{engine_name}_engine")
+        with patch("core.backtest_executor.is_configured", return_value=False):
+            return run_engine(
+                backtest_id="engine-test",
+                execution=execution,
+                cancel_event=execution.cancel_event,
+                candles=candles,
+                signals=signals,
+                initial_balance=10000.0,
+                position_sizing={"method": "percentage", "value": 2.0},
+                risk_management=self.RISK_MANAGEMENT,
+            )
+
+    def _fixtures(self, executor, n_days=60, seed=7, trade_direction="both"):
+        """Generate deterministic candles and compiled strategy signals."""
+        import numpy as np
+
+        from core.condition_compiler import compile_strategy
+
+        candles = executor._generate_simulated_candles(
+            datetime(2025, 1, 1),
+            datetime(2025, 1, 1) + timedelta(days=n_days),
+            "H1",
+            rng=np.random.default_rng(seed),
+        )
+        plan = compile_strategy({**self.STRATEGY, "trade_direction": trade_direction})
+        return candles, plan.evaluate(candles)
+
+    def test_vectorized_matches_loop(self, executor):
+        """Test that both engines produce identical trades, equity and summary."""
+        candles, signals = self._fixtures(executor)
+
+        loop_trades, loop_balance, loop_curve = self._run_engine(executor, "loop", candles, signals)
+        vec_trades, vec_balance, vec_curve = self._run_engine(
+            executor, "vectorized", candles, signals
+        )
+
+        assert len(loop_trades) > 10
+        assert vec_trades == loop_trades
+        assert vec_balance == loop_balance
+        assert vec_curve == loop_curve
+        assert {t["exit_reason"] for t in loop_trades} >= {"signal"}
+
+        # Seed the Monte Carlo simulation so risk of ruin and equity bands compare too
+        with patch("core.backtest_executor.settings.MONTE_CARLO_SEED", 42):
+            loop_results = executor._calculate_results(
+                loop_trades, 10000.0, loop_balance, loop_curve, candles
+            )
+            vec_results = executor._calculate_results(
+                vec_trades, 10000.0, vec_balance, vec_curve, candles
+            )
+        assert vec_results == loop_results
+
+    def test_engine_metrics_match_results(self, executor):
+        """Test live metrics accumulated during a run agree with the final results."""
+        candles, signals = self._fixtures(executor)
+        execution = BacktestExecution(
+            backtest_id="engine-test", thread=None, cancel_event=threading.Event()
+        )
+
+        trades, balance, curve = executor._run_vectorized_engine(
+            None,
+            execution,
+            execution.cancel_event,
+            candles,
+            signals,
+            10000.0,
+            {"method": "percentage", "value": 2.0},
+            self.RISK_MANAGEMENT,
+        )
+
+        assert execution.metrics.trade_count == len(trades)
+        metrics = execution.metrics
+        results = executor._calculate_results(trades, 10000.0, balance, curve, candles)
+
+        for key, value in metrics.summary(balance).items():
+            if key in results:
+                assert results[key] == (value if value is None else pytest.approx(value)), key
+
+    def test_progress_flushed_before_completion(self, executor):
+        """Test coalesced progress writes end with the final candle before completion."""
+        candles, signals = self._fixtures(executor)
+        execution = BacktestExecution(
+            backtest_id="progress-test", thread=None, cancel_event=threading.Event()
+        )
+        writes = []
+
+        with patch.object(
+            executor,
+            "_update_backtest_progress",
+            side_effect=lambda backtest_id, **fields: writes.append(fields),
+        ), patch.object(executor._progress_publisher, "min_interval", 60.0):
+            executor._run_loop_engine(
+                "progress-test",
+                execution,
+                execution.cancel_event,
+                candles,
+                signals,
+                10000.0,
+                {"method": "percentage", "value": 2.0},
+                self.RISK_MANAGEMENT,
+            )
+            executor._complete_backtest("progress-test", {})
+
+        published = -(-len(candles) // executor.PROGRESS_UPDATE_INTERVAL)
+        assert 1 <= len(writes) < published
+        assert writes[-1]["candles_processed"] == len(candles)
+        assert writes[-1]["progress_percentage"] == 100
+
+    def test_vectorized_matches_loop_long_only(self, executor):
+        """Test engine equivalence when only long entries are configured."""
+        candles, signals = self._fixtures(executor, n_days=30, seed=11, trade_direction="long")
+
+        loop_outcome = self._run_engine(executor, "loop", candles, signals)
+        vec_outcome = self._run_engine(executor, "vectorized", candles, signals)
+
+        assert vec_outcome == loop_outcome
+        assert all(t["type"] == "long" for t in vec_outcome[0])
+
+    def test_vectorized_engine_empty_candles(self, executor):
+        """Test that the vectorized engine handles an empty candle list."""
+        import numpy as np
+
+        empty = np.zeros(0, dtype=bool)
+        signals = {"long_entry": empty, "long_exit": empty, "short_entry": empty, "short_exit": empty}
+
+        trades, balance, curve = self._run_engine(executor, "vectorized", [], signals)
+
+        assert trades == []
+        assert balance == 10000.0
+        assert curve == [10000.0]
+
+    def test_find_exit_reasons(self):
+        """Test exit search priority: stop loss, take profit, then signal."""
+        import numpy as np
+
+        from core.vectorized_engine import find_exit
+
+        closes = np.array([1.1000, 1.1005, 1.0970, 1.1050])
+        no_signals = np.zeros(4, dtype=bool)
+
+        assert find_exit(closes, no_signals, 1, 1.1000, True, 20, 40) == (2, "stop_loss")
+        assert find_exit(closes, no_signals, 1, 1.1000, False, 20, 25) == (2, "take_profit")
+
+        signals = np.array([False, True, False, False])
+        assert find_exit(closes, signals, 1, 1.1000, True, None, None) == (1, "signal")
+        assert find_exit(closes, no_signals, 1, 1.1000, True, None, None) == (None, "")
+
+    def test_exit_thresholds(self):
+        """Test resolving stop loss and take profit thresholds."""
+        from core.vectorized_engine import exit_thresholds
+
+        assert exit_thresholds({}) == (None, None)
+        assert exit_thresholds(self.RISK_MANAGEMENT) == (20, 40)
+        assert exit_thresholds(
+            {"take_profit": {"type": "risk_reward", "value": 2}}
+        ) == (None, None)
+
+    def test_unknown_engine_fails_backtest(self, executor, mock_supabase):
+        """Test that an unknown engine name marks the backtest as failed."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {"id": "strategy-1", "conditions": [{"section": "long_entry"}]}
+        ]
+        execution = BacktestExecution(
+            backtest_id="bt-engine", thread=None, cancel_event=threading.Event()
+        )
+        executor._running_backtests["bt-engine"] = execution
+
+        with patch.object(executor, "_generate_simulated_candles", return_value=[]):
+            executor._execute_backtest(
+                "bt-engine",
+                execution.cancel_event,
+                {
+                    "strategy_id": "strategy-1",
+                    "start_date": "2025-01-01T00:00:00Z",
+                    "end_date": "2025-01-02T00:00:00Z",
+                    "engine": "gpu",
+                },
+            )
+
+        assert execution.status == "failed"
+        assert "Unknown backtest engine" in execution.error_message
+
+
+class TestIndicatorValues:
+    """Test cases for server-side indicator calculation in backtests."""
+
+    def test_indicator_conditions_signal(self, executor):
+        """Test strategies on catalogue indicators get series from the indicator engine."""
+        import numpy as np
+
+        from core.condition_compiler import compile_strategy
+        from core.indicator_engine import indicator_cache
+
+        candles = executor._generate_simulated_candles(
+            datetime(2025, 1, 1), datetime(2025, 1, 15), "H1", rng=np.random.default_rng(3)
+        )
+        plan = compile_strategy(
+            {
+                "indicators": [
+                    {"id": "rsi", "instance_id": "rsi-1", "params": {"period": 14}},
+                    {"id": "ichimoku", "instance_id": "ichi-1", "params": {}},
+                ],
+                "conditions": [
+                    {
+                        "id": "a",
+                        "section": "long_entry",
+                        "left_operand": {"type": "indicator", "instanceId": "rsi-1"},
+                        "operator": "is_below",
+                        "right_operand": {"type": "value", "value": 50},
+                    },
+                    {
+                        "id": "b",
+                        "section": "short_entry",
+                        "left_operand": {"type": "indicator", "instanceId": "ichi-1"},
+                        "operator": "is_above",
+                        "right_operand": {"type": "value", "value": 0},
+                    },
+                ],
+            }
+        )
+
+        values = executor._calculate_indicator_values(plan, candles, "EUR_USD", "H1")
+        signals = plan.evaluate(candles, values)
+
+        assert set(values) == {"rsi-1"}
+        assert len(values["rsi-1"][None]) == len(candles)
+        assert signals["long_entry"].any()
+        assert not signals["short_entry"].any()
+
+        # A second backtest on the same candles reuses the cached series
+        again = executor._calculate_indicator_values(plan, candles, "EUR_USD", "H1")
+        assert again["rsi-1"] is values["rsi-1"]
+        indicator_cache.clear()
+
+
+class TestProcessBackend:
+    """Test cases for the process-pool execution backend."""
+
+    def _flag(self):
+        import multiprocessing
+
+        from core.backtest_workers import SharedCancelFlag
+
+        return SharedCancelFlag(multiprocessing.Array("b", 4, lock=False), slot=2)
+
+    def test_shared_cancel_flag(self):
+        """Test the shared-memory flag behaves like an Event and carries keep-partial."""
+        flag = self._flag()
+
+        assert not flag.is_set()
+        flag.set(keep_partial=True)
+        assert flag.is_set() and flag.keep_partial
+        flag.clear()
+        flag.set()
+        assert flag.is_set() and not flag.keep_partial
+
+    def test_apply_snapshot_ordering(self, executor):
+        """Test stale snapshots are ignored and a pending cancel is not overwritten."""
+        from core.backtest_workers import ExecutionSnapshot
+
+        execution = BacktestExecution(
+            backtest_id="bt-proc", thread=None, cancel_event=threading.Event()
+        )
+        executor._running_backtests["bt-proc"] = execution
+        worker_state = BacktestExecution(
+            backtest_id="bt-proc", thread=None, cancel_event=None, status="running"
+        )
+
+        worker_state.progress_percentage = 40
+        executor._apply_snapshot(ExecutionSnapshot.capture(worker_state, 2))
+        worker_state.progress_percentage = 20
+        executor._apply_snapshot(ExecutionSnapshot.capture(worker_state, 1))
+        assert execution.progress_percentage == 40
+        assert execution.status == "running"
+
+        execution.status = "cancelling"
+        worker_state.progress_percentage = 60
+        executor._apply_snapshot(ExecutionSnapshot.capture(worker_state, 3))
+        assert execution.progress_percentage == 60
+        assert execution.status == "cancelling"
+
+    def test_snapshot_carries_live_metrics(self, executor):
+        """Test worker metrics reach the parent as a plain summary."""
+        from core.backtest_workers import ExecutionSnapshot
+        from core.metric_accumulators import MetricAccumulator
+
+        execution = BacktestExecution(
+            backtest_id="bt-proc", thread=None, cancel_event=threading.Event()
+        )
+        executor._running_backtests["bt-proc"] = execution
+        worker_state = BacktestExecution(
+            backtest_id="bt-proc",
+            thread=None,
+            cancel_event=None,
+            status="running",
+            metrics=MetricAccumulator(1000.0),
+        )
+        worker_state.metrics.add_trade({"pnl": 25.0}, 1025.0)
+
+        executor._apply_snapshot(ExecutionSnapshot.capture(worker_state, 1))
+
+        assert execution.metrics is None
+        assert executor.get_progress("bt-proc").live_metrics["total_net_profit"] == 25.0
+
+    def test_cancel_queued_job(self, executor, mock_supabase):
+        """Test cancelling a job that has not reached a worker drops it immediately."""
+        future = MagicMock()
+        future.cancel.return_value = True
+        execution = BacktestExecution(
+            backtest_id="bt-queued",
+            thread=None,
+            cancel_event=self._flag(),
+            status="pending",
+            future=future,
+        )
+        executor._running_backtests["bt-queued"] = execution
+
+        result = executor.cancel_backtest("bt-queued")
+
+        assert result["success"] is True
+        assert execution.status == "pending"
+        future.result.assert_not_called()
+
+    def test_cancellation_reads_keep_partial_from_flag(self, executor):
+        """Test workers save partial results when the parent asked for them."""
+        flag = self._flag()
+        flag.set(keep_partial=True)
+        execution = BacktestExecution(
+            backtest_id="bt-partial", thread=None, cancel_event=flag, candles_processed=10
+        )
+
+        with (
+            patch.object(executor, "_save_partial_results") as mock_save,
+            patch.object(executor, "_update_backtest_status"),
+        ):
+            executor._handle_cancellation("bt-partial", execution, [{"pnl": 1.0}])
+
+        mock_save.assert_called_once()
+
+    def test_worker_round_trip(self, executor):
+        """Test a job runs in a worker process and reports back over IPC."""
+        from core.backtest_workers import BacktestProcessPool
+
+        executor._process_pool = BacktestProcessPool(
+            max_workers=1, on_snapshot=executor._apply_snapshot
+        )
+        try:
+            execution = BacktestExecution(
+                backtest_id="bt-worker", thread=None, cancel_event=threading.Event()
+            )
+            with executor._executions_lock:
+                executor._running_backtests["bt-worker"] = execution
+                executor._submit_to_process_pool(execution, {})
+
+            # Without a database the worker fails fetching the strategy
+            final = execution.future.result(timeout=60)
+            deadline = time.time() + 5
+            while execution.status != "failed" and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            executor.shutdown()
+
+        assert final.status == "failed"
+        assert execution.status == "failed"
+        assert execution.snapshot_sequence == final.sequence
+        assert final.sequence >= 2
+
+
+class TestJobQueue:
+    """Test cases for the bounded backtest job queue."""
+
+    BACKTEST = {
+        "id": "backtest-1",
+        "strategy_id": "strategy-1",
+        "timeframe": "H1",
+        "start_date": "2025-01-01T00:00:00Z",
+        "end_date": "2025-01-31T00:00:00Z",
+    }
+    STRATEGY = {
+        "id": "strategy-1",
+        "conditions": {"long_entry": [{"type": "indicator", "config": {}}]},
+    }
+
+    @pytest.fixture
+    def busy_executor(self, executor, mock_supabase):
+        """Executor with a single slot already taken by another run."""
+        from core.backtest_scheduler import BacktestScheduler, QueuedJob
+
+        executor._scheduler = BacktestScheduler(
+            max_concurrent=1, max_queued=1, memory_budget_bytes=1 << 30
+        )
+        executor._scheduler.enqueue(QueuedJob("busy", 0, 1000, 60.0))
+        executor._scheduler.pop_ready()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
+            MagicMock(data=[self.BACKTEST]),
+            MagicMock(data=[self.STRATEGY]),
+        ]
+        return executor
+
+    def test_start_queues_when_slots_are_taken(self, busy_executor, mock_supabase):
+        """Test a run waits in the queue and reports its position and ETA."""
+        result = busy_executor.start_backtest("backtest-1")
+        progress = busy_executor.get_progress("backtest-1")
+
+        assert result["success"] is True
+        assert "queued" in result["message"].lower()
+        assert progress.status == "pending"
+        assert progress.queue_position == 1
+        assert 0 < progress.queue_eta_seconds <= 60.0
+        assert progress.estimated_seconds_remaining > progress.queue_eta_seconds
+        assert busy_executor.is_running("backtest-1")
+        # Nothing is written to the database until the run starts
+        mock_supabase.table.return_value.update.assert_not_called()
+
+    def test_queue_full_returns_busy(self, busy_executor, mock_supabase):
+        """Test runs are rejected once the queue is full."""
+        from core.backtest_scheduler import QueuedJob
+
+        busy_executor._scheduler.enqueue(QueuedJob("waiting", 0, 1000, 60.0))
+
+        result = busy_executor.start_backtest("backtest-1")
+
+        assert result["success"] is False
+        assert result["error"] == "busy"
+        assert "backtest-1" not in busy_executor._running_backtests
+
+    def test_cancel_queued_run(self, busy_executor, mock_supabase):
+        """Test cancelling a queued run drops it without touching the database."""
+        busy_executor.start_backtest("backtest-1")
+
+        result = busy_executor.cancel_backtest("backtest-1")
+
+        assert result["success"] is True
+        assert "backtest-1" not in busy_executor._running_backtests
+        assert not busy_executor._scheduler.is_queued("backtest-1")
+        mock_supabase.table.return_value.update.assert_not_called()
+
+    def test_finished_run_starts_next(self, busy_executor, mock_supabase):
+        """Test a finished run releases its slot to the head of the queue."""
+        busy_executor.start_backtest("backtest-1")
+
+        with patch.object(busy_executor, "_launch") as mock_launch:
+            busy_executor._on_run_finished("busy", candles_processed=1000)
+
+        execution, backtest_data = mock_launch.call_args.args
+        assert execution.backtest_id == "backtest-1"
+        assert backtest_data == {**self.BACKTEST, "use_result_cache": True}
+        assert busy_executor._scheduler.stats()["running"] == 1
@@ -0,0 +1,285 @@
+"""
+Tests for Candle Store
+======================
+Unit tests for the month-partitioned candle store, its incremental sync
+from quotehistory and the readers served from it.
+"""
+
+import os
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from config import settings
+from core.backtest_executor import BacktestExecutor
+from core.candle_buffer import to_epoch_seconds
+from core.openfx_api import OpenFxApi
+from infrastructure.candle_store import CandleStore, bar_rows, get_candle_store
+
+HOUR = 3600
+JAN_30 = to_epoch_seconds("2024-01-30T00:00:00")
+FEB_2 = to_epoch_seconds("2024-02-02T00:00:00")
+
+
+class FakeHistoryApi:
+    """quotehistory stand-in serving hourly bars at the given times."""
+
+    def __init__(self, times, available_to=None):
+        self.times = np.asarray(sorted(times), dtype=np.int64)
+        self.available_to = available_to if available_to is not None else int(self.times[-1])
+        self.calls = []
+        self.fail = False
+
+    def _bars(self, times, offset):
+        return [
+            {
+                "Timestamp": int(t) * 1000,
+                "Open": 1.0 + t / 1e9 + offset,
+                "High": 1.1 + t / 1e9 + offset,
+                "Low": 0.9 + t / 1e9 + offset,
+                "Close": 1.05 + t / 1e9 + offset,
+                "Volume": 10.0,
+            }
+            for t in times
+        ]
+
+    def fetch_candles(self, pair_name, count=-10, granularity="H1", ts_from=None):
+        self.calls.append(ts_from // 1000)
+        if self.fail:
+            return False, None
+        times = self.times[self.times >= ts_from // 1000][:count]
+        available_to = self.available_to * 1000
+        ask = {"Bars": self._bars(times, 0.0002), "AvailableTo": available_to}
+        bid = {"Bars": self._bars(times, 0.0), "AvailableTo": available_to}
+        return True, [ask, bid]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path / "store"), page_size=1000)
+
+
+def _hours(start, end):
+    return list(range(start, end, HOUR))
+
+
+class TestBarRows:
+    """Test cases for joining ask and bid bars."""
+
+    def test_joins_sides_by_timestamp(self):
+        api = FakeHistoryApi(_hours(JAN_30, JAN_30 + 3 * HOUR))
+        ask, bid = api.fetch_candles("EURUSD", count=10, ts_from=JAN_30 * 1000)[1]
+        bid["Bars"] = bid["Bars"][1:]
+
+        rows = bar_rows(ask, bid)
+
+        assert rows[:, 0].tolist() == [JAN_30 + HOUR, JAN_30 + 2 * HOUR]
+        assert rows[0, 5] == pytest.approx(rows[0, 1] + 0.0002)
+
+    def test_empty_response(self):
+        assert bar_rows({}, {"Bars": []}).shape == (0, 10)
+
+
+class TestCandleStore:
+    """Test cases for storing, reading and syncing candles."""
+
+    def test_load_fetches_and_partitions_by_month(self, store):
+        api = FakeHistoryApi(_hours(JAN_30, FEB_2))
+
+        synced, columns = store.load("EUR_USD", "H1", JAN_30, FEB_2 - HOUR, api=api)
+
+        assert synced
+        assert columns["time"].tolist() == _hours(JAN_30, FEB_2)
+        assert columns["time"].dtype == np.int64
+        np.testing.assert_allclose(columns["mid_c"], (columns["bid_c"] + columns["ask_c"]) / 2)
+        assert sorted(os.listdir(os.path.join(store.directory, "EURUSD", "H1"))) == [
+            "2024-01.npy",
+            "2024-02.npy",
+            "coverage.json",
+        ]
+
+    def test_partitions_are_memory_mapped_columns(self, store):
+        store.load("EUR_USD", "H1", JAN_30, FEB_2 - HOUR, api=FakeHistoryApi(_hours(JAN_30, FEB_2)))
+
+        partition = np.load(
+            os.path.join(store.directory, "EURUSD", "H1", "2024-01.npy"), mmap_mode="r"
+        )
+
+        assert isinstance(partition, np.memmap)
+        assert partition.flags.f_contiguous
+
+    def test_only_missing_ranges_are_fetched(self, store):
+        api = FakeHistoryApi(_hours(JAN_30, FEB_2))
+        store.load("EURUSD", "H1", JAN_30, JAN_30 + 23 * HOUR, api=api)
+        api.calls.clear()
+
+        _, columns = store.load("EURUSD", "H1", JAN_30, JAN_30 + 47 * HOUR, api=api)
+
+        assert api.calls == [JAN_30 + 23 * HOUR + 1]
+        assert len(columns["time"]) == 48
+
+        api.calls.clear()
+        store.load("EURUSD", "H1", JAN_30 + HOUR, JAN_30 + 40 * HOUR, api=api)
+        assert api.calls == []
+
+    def test_ranges_without_candles_are_not_fetched_again(self, store):
+        # No candles on the second day, as over a weekend
+        times = _hours(JAN_30, JAN_30 + 24 * HOUR) + _hours(JAN_30 + 48 * HOUR, FEB_2)
+        api = FakeHistoryApi(times)
+        _, columns = store.load("EURUSD", "H1", JAN_30 + 24 * HOUR, JAN_30 + 47 * HOUR, api=api)
+        assert len(columns["time"]) == 0
+        api.calls.clear()
+
+        store.load("EURUSD", "H1", JAN_30 + 24 * HOUR, JAN_30 + 47 * HOUR, api=api)
+
+        assert api.calls == []
+
+    def test_version_of_fully_fetched_ranges(self, store):
+        times = _hours(JAN_30, JAN_30 + 24 * HOUR) + _hours(JAN_30 + 48 * HOUR, FEB_2)
+        assert store.version("EURUSD", "H1", JAN_30, JAN_30 + 23 * HOUR) is None
+
+        store.load("EURUSD", "H1", JAN_30, FEB_2 - HOUR, api=FakeHistoryApi(times))
+
+        version = store.version("EURUSD", "H1", JAN_30, JAN_30 + 23 * HOUR)
+        assert version is not None
+        assert store.version("EUR_USD", "H1", JAN_30, JAN_30 + 23 * HOUR) == version
+        assert store.version("EURUSD", "H1", JAN_30, JAN_30 + 30 * HOUR) != version
+        # Fetched, but without candles
+        assert store.version("EURUSD", "H1", JAN_30 + 24 * HOUR, JAN_30 + 47 * HOUR) is None
+        assert store.version("EURUSD", "H1", JAN_30, FEB_2) is None
+
+    def test_sync_pages_through_long_ranges(self, tmp_path):
+        store = CandleStore(str(tmp_path / "store"), page_size=10)
+        api = FakeHistoryApi(_hours(JAN_30, FEB_2))
+
+        _, columns = store.load("EURUSD", "H1", JAN_30, FEB_2 - HOUR, api=api)
+
+        assert len(api.calls) == 8
+        assert columns["time"].tolist() == _hours(JAN_30, FEB_2)
+
+    def test_failed_fetch_keeps_stored_candles(self, store):
+        api = FakeHistoryApi(_hours(JAN_30, FEB_2))
+        store.load("EURUSD", "H1", JAN_30, JAN_30 + 9 * HOUR, api=api)
+        api.fail = True
+
+        synced, columns = store.load("EURUSD", "H1", JAN_30, JAN_30 + 19 * HOUR, api=api)
+
+        assert not synced
+        assert len(columns["time"]) == 10
+        assert store.missing_ranges("EURUSD", "H1", JAN_30, JAN_30 + 20 * HOUR) == [
+            (JAN_30 + 9 * HOUR + 1, JAN_30 + 20 * HOUR)
+        ]
+
+    def test_candles_after_the_servers_last_bar_are_fetched_later(self, store):
+        api = FakeHistoryApi(_hours(JAN_30, JAN_30 + 10 * HOUR))
+        store.load("EURUSD", "H1", JAN_30, JAN_30 + 19 * HOUR, api=api)
+        api.times = np.array(_hours(JAN_30, FEB_2))
+        api.available_to = FEB_2
+
+        _, columns = store.load("EURUSD", "H1", JAN_30, JAN_30 + 19 * HOUR, api=api)
+
+        assert api.calls[-1] == JAN_30 + 10 * HOUR
+        assert len(columns["time"]) == 20
+
+    def test_late_published_candle_is_fetched_by_a_later_poll(self, store):
+        now = int(time.time()) // HOUR * HOUR
+        # The candle that just closed is not published yet, though AvailableTo is current
+        api = FakeHistoryApi(_hours(now - 400 * HOUR, now - HOUR), available_to=now)
+        _, columns = store.latest("EURUSD", "H1", 5, api=api)
+        assert columns["time"][-1] == now - 2 * HOUR
+
+        api.times = np.array(_hours(now - 400 * HOUR, now + HOUR))
+        _, columns = store.latest("EURUSD", "H1", 5, api=api)
+
+        assert columns["time"].tolist() == _hours(now - 5 * HOUR, now)
+
+    def test_polls_within_one_candle_fetch_nothing(self, store):
+        now = int(time.time()) // HOUR * HOUR
+        api = FakeHistoryApi(_hours(now - 400 * HOUR, now + HOUR))
+        store.latest("EURUSD", "H1", 5, api=api)
+        api.calls.clear()
+
+        for offset in (1, 600, HOUR - 1):
+            with patch("infrastructure.candle_store.time.time", return_value=now + offset):
+                store.latest("EURUSD", "H1", 5, api=api)
+
+        assert api.calls == []
+
+    def test_latest_skips_the_candle_in_progress(self, store):
+        now = int(time.time()) // HOUR * HOUR
+        api = FakeHistoryApi(_hours(now - 400 * HOUR, now + HOUR))
+
+        synced, columns = store.latest("EURUSD", "H1", 5, api=api)
+
+        assert synced
+        assert columns["time"].tolist() == _hours(now - 5 * HOUR, now)
+
+    def test_rejects_unknown_series(self, store):
+        with pytest.raises(ValueError):
+            store.read("../EURUSD", "H1")
+        with pytest.raises(ValueError):
+            store.read("EURUSD", "H2")
+
+    def test_store_follows_settings(self, monkeypatch):
+        assert get_candle_store().directory == settings.CANDLE_STORE_DIR
+
+        monkeypatch.setattr(settings, "CANDLE_STORE_DIR", "")
+        assert get_candle_store() is None
+
+
+class TestStoreReaders:
+    """Test cases for the price API and backtests reading from the store."""
+
+    def test_recent_candles_dataframe_comes_from_the_store(self):
+        now = int(time.time()) // HOUR * HOUR
+        api = FakeHistoryApi(_hours(now - 400 * HOUR, now + HOUR))
+        client = OpenFxApi()
+
+        with patch.object(client, "fetch_candles", side_effect=api.fetch_candles):
+            df = client.get_candles_df("EURUSD", count=-3, granularity="H1")
+            calls = len(api.calls)
+            client.get_candles_df("EURUSD", count=-3, granularity="H1")
+
+        assert [int(t.timestamp()) for t in df.time] == _hours(now - 3 * HOUR, now)
+        assert df.time.dtype == "datetime64[ns]"
+        assert list(df.columns[:2]) == ["time", "bid_o"]
+        assert (df.mid_c > df.bid_c).all()
+        assert len(api.calls) == calls
+
+    def test_backtest_loads_stored_candles(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_MOCK_DATA", False)
+        api = FakeHistoryApi(_hours(JAN_30, FEB_2))
+        BacktestExecutor._instance = None
+        executor = BacktestExecutor()
+        backtest = {
+            "pair": "EUR_USD",
+            "timeframe": "H1",
+            "start_date": "2024-01-30T00:00:00Z",
+            "end_date": "2024-02-01T00:00:00Z",
+        }
+
+        with patch("core.openfx_api.OpenFxApi.fetch_candles", side_effect=api.fetch_candles):
+            candles, pair, timeframe = executor._load_candles(backtest, {})
+        BacktestExecutor._instance = None
+
+        assert (pair, timeframe) == ("EUR_USD", "H1")
+        assert candles.time.tolist() == _hours(JAN_30, JAN_30 + 49 * HOUR)
+        assert candles.close[0] == pytest.approx(1.05 + JAN_30 / 1e9 + 0.0001)
+
+    def test_backtest_falls_back_to_simulated_candles(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_MOCK_DATA", False)
+        BacktestExecutor._instance = None
+        executor = BacktestExecutor()
+        backtest = {
+            "start_date": datetime(2024, 1, 30),
+            "end_date": datetime(2024, 1, 31),
+        }
+
+        with patch("core.openfx_api.OpenFxApi.fetch_candles", return_value=(False, None)):
+            candles, _, _ = executor._load_candles(backtest, {"pair": "EUR_USD"}, seed=1)
+        BacktestExecutor._instance = None
+
+        assert len(candles) == 25
@@ -19,7 +19,9 @@ from core.comparison_service import (
     _format_metric_value,
     _get_metric_value,
     _metric_display_name,
+    _permutation_tests,
     calculate_statistical_significance,
+    clear_significance_cache,
     get_comparison_data,
 )
 from core.data_models import (
@@ -33,6 +35,14 @@ from core.data_models import (
 )
 
 
+@pytest.fixture(autouse=True)
+def empty_significance_cache():
+    """Start every test without cached significance tests."""
+    clear_significance_cache()
+    yield
+    clear_significance_cache()
+
+
 @pytest.fixture
 def sample_backtest():
     """Create a sample backtest configuration for testing."""
@@ -298,6 +308,49 @@ class TestBootstrapTest:
         assert not is_significant
 
 
+class TestPermutationTests:
+    """Tests for _permutation_tests function."""
+
+    def test_batch_matches_single_tests(self):
+        """Test pairs of different sizes give the same p-values in one batch."""
+        shifted = [float(v) for v in range(-20, 30)]
+        centered = [float(v) for v in range(-25, 25)]
+        pairs = [
+            (shifted, centered),
+            ([1000.0] * 5, [1.0] * 7),
+            ([5.0], [1.0, 2.0]),
+            (centered[:10], centered[10:40]),
+        ]
+
+        batched = _permutation_tests(pairs, n_iterations=4000, seed=1)
+
+        # Only the observed split is as extreme: 1 of 792 possible splits
+        assert batched[1][0] < 0.01 and batched[1][1]
+        assert batched[2] == (1.0, False)
+        for (values1, values2), (p_value, _) in zip(pairs, batched):
+            single = _permutation_tests([(values1, values2)], n_iterations=4000, seed=2)[0]
+            assert p_value == pytest.approx(single[0], abs=0.05)
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed draws the same permutations."""
+        pairs = [([1.0, 4.0, 2.0, 8.0], [3.0, 5.0, 1.0])]
+
+        assert _permutation_tests(pairs, seed=7) == _permutation_tests(pairs, seed=7)
+
+    def test_small_chunks(self):
+        """Test permutations split over several batches cover every iteration."""
+        pairs = [([1.0, 2.0, 3.0], [1.0, 2.0, 3.0, 4.0])]
+
+        with patch("core.comparison_service.PERMUTATION_CHUNK_BYTES", 1):
+            p_value, _ = _permutation_tests(pairs, n_iterations=50, seed=3)[0]
+
+        assert p_value * 50 == int(p_value * 50)
+        assert p_value == _permutation_tests(pairs, n_iterations=50, seed=3)[0][0]
+
+    def test_no_pairs(self):
+        assert _permutation_tests([]) == []
+
+
 class TestCalculateStatisticalSignificance:
     """Tests for calculate_statistical_significance function."""
 
@@ -321,6 +374,46 @@ class TestCalculateStatisticalSignificance:
         results = calculate_statistical_significance([])
         assert len(results) == 0
 
+    def test_pairs_tested_once(self, sample_backtest, sample_backtest_2):
+        """Test metrics sharing the same pair of backtests share one test."""
+        with patch(
+            "core.comparison_service._permutation_tests", wraps=_permutation_tests
+        ) as mock_tests:
+            results = calculate_statistical_significance([sample_backtest, sample_backtest_2])
+
+        mock_tests.assert_called_once()
+        assert len(mock_tests.call_args.args[0]) == 1
+        assert len({stat.p_value for stat in results}) == 1
+
+    def test_results_cached_until_updated(self, sample_backtest, sample_backtest_2):
+        """Test repeated calls reuse results until a backtest's updated_at changes."""
+        backtests = [sample_backtest, sample_backtest_2]
+        first = calculate_statistical_significance(backtests)
+
+        with patch("core.comparison_service._permutation_tests") as mock_tests:
+            # Order of the backtests does not matter
+            assert calculate_statistical_significance(backtests[::-1]) == first
+            mock_tests.assert_not_called()
+
+        sample_backtest_2.updated_at = datetime(2026, 2, 1)
+        with patch(
+            "core.comparison_service._permutation_tests", wraps=_permutation_tests
+        ) as mock_tests:
+            calculate_statistical_significance(backtests)
+            mock_tests.assert_called_once()
+
+    def test_not_cached_without_updated_at(self, sample_backtest, sample_backtest_2):
+        """Test backtests without an update time are always recomputed."""
+        sample_backtest.updated_at = None
+        calculate_statistical_significance([sample_backtest, sample_backtest_2])
+
+        with patch(
+            "core.comparison_service._permutation_tests", wraps=_permutation_tests
+        ) as mock_tests:
+            calculate_statistical_significance([sample_backtest, sample_backtest_2])
+
+        mock_tests.assert_called_once()
+
 
 class TestGetComparisonData:
     """Tests for get_comparison_data function."""
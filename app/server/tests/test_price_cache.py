@@ -0,0 +1,128 @@
+"""
+Tests for Price Cache
+=====================
+Unit tests for the candle-close-aware cache of web_api_candles.
+"""
+
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from config import settings
+from core.openfx_api import OpenFxApi
+from infrastructure.price_cache import PriceCache, price_cache
+
+HOUR = 3600
+
+
+def _window(count, last=None):
+    last = last if last is not None else int(time.time()) // HOUR * HOUR - HOUR
+    return {
+        "time": [f"t{last - (count - 1 - i) * HOUR}" for i in range(count)],
+        "mid_c": [float(i) for i in range(count)],
+    }, last
+
+
+class TestPriceCache:
+    """Test cases for the LRU cache of candle windows."""
+
+    def test_larger_window_serves_smaller_counts(self):
+        cache = PriceCache()
+        window, last = _window(10)
+        cache.put("EUR_USD", "H1", window, last)
+
+        served = cache.get("EURUSD", "H1", 3)
+        served["mid_c"].append(99.0)
+
+        assert served["time"] == window["time"][-3:]
+        assert cache.get("EUR_USD", "H1", 3)["mid_c"] == [7.0, 8.0, 9.0]
+        assert cache.get("EUR_USD", "H1", 11) is None
+        assert cache.get("EUR_USD", "M5", 3) is None
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 2
+
+    def test_smaller_window_does_not_replace_a_larger_one(self):
+        cache = PriceCache()
+        cache.put("EURUSD", "H1", *_window(10))
+
+        assert not cache.put("EURUSD", "H1", *_window(5))
+        assert cache.get("EURUSD", "H1", 10) is not None
+
+    @pytest.mark.parametrize(
+        "last, now, expected",
+        [
+            (36000, 36000 + HOUR + 1, 36000 + 2 * HOUR),
+            (36000, 36000 + HOUR, 36000 + 2 * HOUR),
+            # Stale data (weekend): the next boundary on the same grid
+            (36000, 36000 + 50 * HOUR + 5, 36000 + 51 * HOUR),
+        ],
+    )
+    def test_next_boundary(self, last, now, expected):
+        assert PriceCache.next_boundary(last, "H1", now) == expected
+
+    def test_entries_expire_when_the_next_candle_closes(self):
+        cache = PriceCache()
+        window, last = _window(5)
+        cache.put("EURUSD", "H1", window, last)
+        boundary = PriceCache.next_boundary(last, "H1", time.time())
+
+        with patch("infrastructure.price_cache.time.time", return_value=boundary - 1):
+            assert cache.get("EURUSD", "H1", 5) is not None
+        with patch("infrastructure.price_cache.time.time", return_value=boundary):
+            assert cache.get("EURUSD", "H1", 5) is None
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_evicts_least_recently_used(self):
+        probe = PriceCache()
+        probe.put("EURUSD", "H1", *_window(5))
+        entry_bytes = probe.stats()["bytes"]
+
+        cache = PriceCache(max_entries=2, max_bytes=entry_bytes * 5 // 2)
+        cache.put("EURUSD", "H1", *_window(5))
+        cache.put("GBPUSD", "H1", *_window(5))
+        cache.get("EURUSD", "H1", 5)
+        cache.put("USDJPY", "H1", *_window(5))
+
+        assert cache.get("GBPUSD", "H1", 5) is None
+        assert cache.get("EURUSD", "H1", 5) is not None
+        assert cache.stats()["evictions"] == 1
+        assert not cache.put("EURUSD", "D", *_window(50))
+
+
+class TestWebApiCandlesCache:
+    """Test cases for web_api_candles serving repeated requests from the cache."""
+
+    @pytest.fixture(autouse=True)
+    def live_data(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_MOCK_DATA", False)
+        price_cache.clear()
+        yield
+        price_cache.clear()
+
+    def _df(self, count):
+        last = pd.Timestamp(int(time.time()) // HOUR * HOUR - HOUR, unit="s")
+        times = pd.date_range(end=last, periods=count, freq="h")
+        return pd.DataFrame({"time": times, **{f"mid_{x}": [1.1] * count for x in "ohlc"}})
+
+    def test_repeated_requests_skip_the_api(self):
+        api = OpenFxApi()
+
+        with patch.object(api, "get_candles_df", return_value=self._df(100)) as mock_df:
+            first = api.web_api_candles("EUR_USD", "H1", 100)
+            second = api.web_api_candles("EUR_USD", "H1", 20)
+
+        assert mock_df.call_count == 1
+        assert second["time"] == first["time"][-20:]
+        assert price_cache.stats()["hits"] == 1
+
+    def test_fallback_data_is_not_cached(self):
+        api = OpenFxApi()
+
+        with patch.object(api, "get_candles_df", return_value=None) as mock_df:
+            api.web_api_candles("EUR_USD", "H1", 10)
+            api.web_api_candles("EUR_USD", "H1", 10)
+
+        assert mock_df.call_count == 2
@@ -0,0 +1,220 @@
+"""
+Tests for Rate Limiter
+======================
+Unit tests for the token bucket limiting broker requests.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from config import settings
+from core.openfx_api import rate_budget, rate_limiter_for
+from utils.rate_limiter import SharedTokenBucket, TokenBucket
+
+
+def _drain(path, count):
+    """Take ``count`` tokens from a shared bucket in another process."""
+    bucket = SharedTokenBucket(path, rate=1, burst=3)
+    for _ in range(count):
+        bucket.reserve()
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_is_free_then_requests_are_spaced(self):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+        assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+    def test_refills_while_idle_up_to_burst(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        for _ in range(2):
+            bucket.reserve()
+
+        with patch("utils.rate_limiter.time.monotonic", return_value=time.monotonic() + 60):
+            waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] > 0
+
+    def test_zero_rate_disables_limiting(self):
+        bucket = TokenBucket(rate=0)
+
+        assert [bucket.reserve() for _ in range(100)] == [0.0] * 100
+
+    def test_acquire_sleeps_for_the_reserved_slot(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        bucket.acquire()
+        started = time.monotonic()
+
+        waited = bucket.acquire()
+
+        assert waited > 0
+        assert time.monotonic() - started >= waited * 0.9
+
+    def test_threads_share_the_budget(self):
+        bucket = TokenBucket(rate=5, burst=2)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = bucket.reserve()
+            with lock:
+                waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(waits) == pytest.approx([0.0, 0.0, 0.2, 0.4, 0.6, 0.8], abs=0.02)
+
+
+class TestSharedTokenBucket:
+    """Test cases for the file-backed bucket shared between processes."""
+
+    def test_buckets_on_one_file_share_the_budget(self, tmp_path):
+        path = str(tmp_path / "limits" / "market_data.bucket")
+        first = SharedTokenBucket(path, rate=10, burst=2)
+        second = SharedTokenBucket(path, rate=10, burst=2)
+
+        waits = [first.reserve(), second.reserve(), first.reserve(), second.reserve()]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.02)
+        assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+    def test_processes_share_the_budget(self, tmp_path):
+        path = str(tmp_path / "market_data.bucket")
+        process = multiprocessing.get_context("spawn").Process(target=_drain, args=(path, 3))
+        process.start()
+        process.join(timeout=30)
+
+        assert process.exitcode == 0
+        assert SharedTokenBucket(path, rate=1, burst=3).reserve() > 0.5
+
+    def test_files_are_private(self, tmp_path):
+        directory = tmp_path / "limits"
+        directory.mkdir(mode=0o777)
+        os.chmod(directory, 0o777)
+        path = directory / "market_data.bucket"
+
+        SharedTokenBucket(str(path), rate=10, burst=1).reserve()
+
+        assert os.stat(directory).st_mode & 0o777 == 0o700
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_busy_file_does_not_block(self, tmp_path):
+        """Test a reservation gives up on a held lock and limits this process only."""
+        fcntl = pytest.importorskip("fcntl")
+        path = tmp_path / "market_data.bucket"
+        bucket = SharedTokenBucket(str(path), rate=10, burst=1)
+        bucket.reserve()
+
+        fd = os.open(path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            started = time.monotonic()
+            assert bucket.reserve() == 0.0
+            assert time.monotonic() - started < 0.5
+        finally:
+            os.close(fd)
+
+        assert bucket._shared
+        assert bucket.reserve() > 0
+
+    def test_file_of_another_user_is_not_used(self, tmp_path, caplog):
+        path = tmp_path / "market_data.bucket"
+        bucket = SharedTokenBucket(str(path), rate=10, burst=1)
+
+        with patch("utils.rate_limiter.os.getuid", return_value=os.getuid() + 1):
+            bucket.reserve()
+
+        assert not bucket._shared
+        assert "belongs to another user" in caplog.text
+
+    def test_unusable_file_falls_back_to_this_process(self, tmp_path, caplog):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        bucket = SharedTokenBucket(str(blocker / "market_data.bucket"), rate=10, burst=1)
+
+        waits = [bucket.reserve(), bucket.reserve()]
+
+        assert waits[0] == 0.0
+        assert waits[1] > 0
+        assert "limiting this process only" in caplog.text
+
+    def test_without_fcntl_limits_this_process(self, tmp_path):
+        path = tmp_path / "market_data.bucket"
+        with patch("utils.rate_limiter.fcntl", None):
+            bucket = SharedTokenBucket(str(path), rate=10, burst=1)
+            waits = [bucket.reserve(), bucket.reserve()]
+
+        assert waits[1] > 0
+        assert not path.exists()
+
+
+class TestRateBudgets:
+    """Test cases for the separate market data and trading budgets."""
+
+    @pytest.mark.parametrize(
+        "url, verb, budget",
+        [
+            ("quotehistory/EURUSD/H1/bars/bid", "get", "market_data"),
+            ("tick/EURUSD GBPUSD", "get", "market_data"),
+            ("symbol", "get", "market_data"),
+            ("account", "get", "market_data"),
+            ("trade", "get", "market_data"),
+            ("trade/123", "get", "market_data"),
+            ("tradehistory", "post", "market_data"),
+            ("trade", "post", "trading"),
+            ("trade", "put", "trading"),
+            ("trade", "delete", "trading"),
+        ],
+    )
+    def test_rate_budget(self, url, verb, budget):
+        assert rate_budget(url, verb) == budget
+
+    def test_budgets_are_shared_files(self, rate_limit_dir):
+        limiter = rate_limiter_for("trade", "post")
+
+        assert isinstance(limiter, SharedTokenBucket)
+        assert limiter.path == str(rate_limit_dir / "trading.bucket")
+        assert rate_limiter_for("trade", "delete") is limiter
+        assert rate_limiter_for("tick/EURUSD") is not limiter
+
+    def test_orders_are_not_queued_behind_market_data(self):
+        market_data = rate_limiter_for("quotehistory/EURUSD/M1/bars/bid")
+        for _ in range(20):
+            market_data.reserve()
+
+        assert market_data.reserve() > 1
+        assert rate_limiter_for("trade", "post").reserve() == 0.0
+
+    def test_orders_are_not_queued_behind_dashboard_reads(self):
+        """Test draining the read budget (account, open trades, history) never delays an order."""
+        for url, verb in [("account", "get"), ("trade", "get"), ("tradehistory", "post")] * 10:
+            rate_limiter_for(url, verb).reserve()
+
+        assert rate_limiter_for("account").reserve() > 1
+        assert rate_limiter_for("trade", "post").reserve() == 0.0
+        assert rate_limiter_for("trade", "delete").reserve() == 0.0
+
+    def test_empty_directory_limits_each_process(self, monkeypatch):
+        monkeypatch.setattr(settings, "OPENFX_RATE_LIMIT_DIR", "")
+
+        limiter = rate_limiter_for("trade", "post")
+
+        assert type(limiter) is TokenBucket
+        assert limiter.rate == settings.OPENFX_TRADING_REQUESTS_PER_SECOND
@@ -7,7 +7,7 @@ Functions for generating CSV, JSON, and PDF exports from backtest results.
 import csv
 import io
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -217,19 +217,38 @@ def generate_csv_export(
 
     # Section 8: Trade List
     if backtest_result.trades:
-        writer.writerow(["TRADE LIST"])
-        # Get headers from first trade
-        if backtest_result.trades:
-            headers = list(backtest_result.trades[0].keys())
-            writer.writerow(headers)
-
-            # Write each trade
-            for trade in backtest_result.trades:
-                writer.writerow([trade.get(h, "") for h in headers])
+        output.write("".join(iter_csv_trade_list([backtest_result.trades])))
 
     return output.getvalue()
 
 
+def iter_csv_trade_list(trade_chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    """
+    Generate the TRADE LIST section of the CSV export chunk by chunk.
+
+    Args:
+        trade_chunks: Lists of trade records, in export order
+
+    Yields:
+        CSV text, one piece per chunk of trades
+    """
+    headers = None
+    for trades in trade_chunks:
+        if not trades:
+            continue
+        output = io.StringIO()
+        writer = csv.writer(output)
+        if headers is None:
+            # Get headers from first trade
+            headers = list(trades[0].keys())
+            writer.writerow(["TRADE LIST"])
+            writer.writerow(headers)
+
+        for trade in trades:
+            writer.writerow([trade.get(h, "") for h in headers])
+        yield output.getvalue()
+
+
 def generate_json_export(
     backtest_result: BacktestResultsSummary, backtest_config: BacktestConfig
 ) -> Dict[str, Any]:
@@ -0,0 +1,210 @@
+"""
+Rate Limiter
+============
+Token buckets limiting the request rate to the broker API.
+
+A bucket refills at ``rate`` tokens per second up to ``burst`` tokens, so
+up to ``burst`` requests go out at once (e.g. the bid and ask bars of one
+candle fetch) while the sustained rate stays at ``rate``. A request that
+finds the bucket empty reserves the next token and waits for it, so
+waiting callers are served in order.
+
+TokenBucket is shared by the threads of one process. SharedTokenBucket
+keeps its state in a small file locked with ``flock``, so every process
+using the same file (the API server, the bot, backtest workers) draws
+from one budget. The file and its directory are private to the user
+running those processes (modes 0600 and 0700). Where ``fcntl`` is
+unavailable, or the file cannot be used, it falls back to a per-process
+bucket; so does a reservation that cannot get the lock within a few
+milliseconds.
+"""
+
+import logging
+import os
+import stat
+import struct
+import threading
+import time
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Bucket file layout: tokens left and the wall-clock time they were counted
+_STATE = struct.Struct("<dd")
+
+# Attempts to lock a bucket file, and the pause between them (seconds)
+LOCK_ATTEMPTS = 10
+LOCK_RETRY_INTERVAL = 0.002
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    ``reserve`` takes a token and returns how long the caller must wait
+    before using it; ``acquire`` also does the waiting. Async callers
+    await ``asyncio.sleep(bucket.reserve())`` instead of blocking.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Sustained requests per second (0 or less disables limiting)
+            burst: Requests allowed at once after an idle period
+        """
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, going into debt if the bucket is short.
+
+        Returns:
+            Seconds to wait before the tokens may be used
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._tokens, self._updated, wait = self._take(
+                self._tokens, self._updated, time.monotonic(), tokens
+            )
+            return wait
+
+    def _take(
+        self, available: float, updated: float, now: float, tokens: float
+    ) -> Tuple[float, float, float]:
+        """Refill since ``updated`` and take ``tokens``; returns (left, now, wait)."""
+        elapsed = max(now - updated, 0.0)
+        left = min(self.capacity, available + elapsed * self.rate) - tokens
+        return left, now, max(-left / self.rate, 0.0)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping until they may be used.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket shared by all processes using the same state file.
+
+    Each reservation locks the file, refills from the stored state using
+    wall-clock time, takes its tokens and writes the state back. The file
+    is opened per reservation, so forked processes never share a lock.
+
+    Locking never blocks: a reservation retries for at most
+    ``LOCK_ATTEMPTS * LOCK_RETRY_INTERVAL`` seconds and otherwise takes
+    its tokens from the per-process bucket. Async callers should still
+    reserve on a worker thread, as the retries and file I/O do block.
+    """
+
+    def __init__(self, path: str, rate: float, burst: int = 1):
+        """
+        Args:
+            path: State file (created on first use)
+            rate: Sustained requests per second (0 or less disables limiting)
+            burst: Requests allowed at once after an idle period
+        """
+        super().__init__(rate, burst)
+        self.path = path
+        self._shared = fcntl is not None
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the shared state; see TokenBucket.reserve."""
+        if self.rate <= 0 or not self._shared:
+            return super().reserve(tokens)
+        with self._lock:
+            try:
+                wait = self._reserve_shared(tokens)
+            except OSError as e:
+                logger.warning(
+                    f"[RATE_LIMITER] Cannot use {self.path}, limiting this process only: {e}"
+                )
+                self._shared = False
+                wait = None
+        if wait is not None:
+            return wait
+        return super().reserve(tokens)
+
+    def _reserve_shared(self, tokens: float) -> Optional[float]:
+        """Take tokens from the state file; None if it stayed locked by others."""
+        fd = self._open_private()
+        try:
+            if not self._lock_file(fd):
+                logger.debug(f"[RATE_LIMITER] {self.path} is busy, limiting this process only")
+                return None
+            now = time.time()
+            state = os.pread(fd, _STATE.size, 0)
+            available, updated = (
+                _STATE.unpack(state) if len(state) == _STATE.size else (self.capacity, now)
+            )
+            left, updated, wait = self._take(available, updated, now, tokens)
+            os.pwrite(fd, _STATE.pack(left, updated), 0)
+            return wait
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
+
+    def _open_private(self) -> int:
+        """
+        Open the state file, creating it and its directory private to this user.
+
+        Raises:
+            OSError: If the directory or file belongs to another user
+        """
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        status = os.lstat(directory)
+        if not stat.S_ISDIR(status.st_mode):
+            raise NotADirectoryError(f"{directory} is not a directory")
+        _make_private(directory, status, 0o700)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        try:
+            _make_private(self.path, os.fstat(fd), 0o600, fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    @staticmethod
+    def _lock_file(fd: int) -> bool:
+        """Lock the file without blocking, retrying a few times; whether it was locked."""
+        for attempt in range(LOCK_ATTEMPTS):
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if attempt < LOCK_ATTEMPTS - 1:
+                    time.sleep(LOCK_RETRY_INTERVAL)
+        return False
+
+
+def _make_private(path: str, status: os.stat_result, mode: int, fd: int = -1) -> None:
+    """
+    Restrict a file or directory of this user to ``mode``.
+
+    Raises:
+        PermissionError: If it belongs to another user
+    """
+    if hasattr(os, "getuid") and status.st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to another user")
+    if stat.S_IMODE(status.st_mode) != mode:
+        if fd >= 0:
+            os.fchmod(fd, mode)
+        else:
+            os.chmod(path, mode)